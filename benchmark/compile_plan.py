@@ -0,0 +1,73 @@
+'''
+  @file compile_plan.py
+
+  Compile the config into a flat job plan (JSON) with the stable job ids and
+  the estimated runtime of every job.
+'''
+
+import os, sys, inspect
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from parser import *
+from database import *
+from schedule import *
+from plan import *
+
+import argparse
+import datetime
+
+'''
+Compile the given config and save the plan.
+
+@param configfile - The configuration file.
+@param output - The name of the plan file.
+@param blocks - Run only the specified blocks.
+@param methodBlocks - Run only the specified methods.
+'''
+def Main(configfile, output, blocks, methodBlocks):
+  database = "reports/benchmark.db"
+
+  config = Parser(configfile, verbose=False)
+  streamData = config.StreamMerge()
+
+  if "general" in streamData:
+    for key, value in streamData["general"]:
+      if key == "database":
+        database = value
+
+  # The estimates are based on the results of the former runs.
+  history = None
+  if os.path.isfile(database):
+    history = Database(database).GetResultHistory()
+
+  plan = CompilePlan(streamData, blocks.split(",") if blocks else None,
+      methodBlocks.split(",") if methodBlocks else None, CostModel(history))
+  SavePlan(plan, output)
+
+  Log.Info("Plan " + plan["hash"] + ": " + str(len(plan["jobs"])) +
+      " jobs, estimated time " + str(datetime.timedelta(seconds=int(
+      sum(plan["estimates"].values())))) + " (" + output + ")")
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description="""Compile the config into a
+      job plan.""")
+  parser.add_argument('-c','--config', help='Configuration file name.',
+      required=True)
+  parser.add_argument('-o','--output', help="""Name of the plan file (default
+      reports/plan.json).""", default="reports/plan.json", required=False)
+  parser.add_argument('-b','--blocks', help='Run only the specified blocks.',
+      required=False)
+  parser.add_argument('-m','--methodBlocks', help="""Run only the specified
+      method blocks.""", required=False)
+
+  args = parser.parse_args()
+
+  if args:
+    Main(args.config, args.output, args.blocks, args.methodBlocks)
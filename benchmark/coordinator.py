@@ -0,0 +1,132 @@
+'''
+  @file coordinator.py
+
+  Expand the config into jobs and serve them to the benchmark workers. The
+  results of all workers are stored in one database.
+'''
+
+import os, sys, inspect
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from parser import *
+from misc import *
+from database import *
+from jobs import *
+from distributed import *
+from schedule import *
+
+import argparse
+import datetime
+
+'''
+Serve the jobs of the given config until all jobs are done.
+
+@param configfile - Start the benchmark with the given configuration file.
+@param address - The TCP ('host:port') or Unix socket address.
+@param blocks - Run only the specified blocks.
+@param log - If True save the results in the database.
+@param methodBlocks - Run only the specified methods.
+@param authKey - The key used to authenticate the workers.
+'''
+def Main(configfile, address, blocks, log, methodBlocks, authKey):
+  database = "reports/benchmark.db"
+  heartbeat = 10
+  reprobe = 0
+
+  # Read the config.
+  config = Parser(configfile, verbose=False)
+  streamData = config.StreamMerge()
+
+  # Read the general block and set the attributes.
+  if "general" in streamData:
+    for key, value in streamData["general"]:
+      if key == "database":
+        database = value
+      if key == "heartbeat":
+        heartbeat = value
+      if key == "predictTimeout":
+        reprobe = value
+
+  jobs = ExpandJobs(streamData, blocks.split(",") if blocks else None,
+      methodBlocks.split(",") if methodBlocks else None)
+
+  if log:
+    CreateDirectoryStructure([os.path.dirname(database) or "."])
+    db = Database(database)
+    db.CreateTables()
+
+  # Run the longest jobs first, estimated from the results of former runs.
+  history = None
+  if log or os.path.isfile(database):
+    history = (db if log else Database(database)).GetResultHistory()
+  model = CostModel(history)
+
+  # Skip the jobs which timed out in the former builds.
+  predictor = TimeoutPredictor(history, reprobe)
+  skipped = [job for job in jobs if "timing" in job["tasks"] and
+      predictor.Skip(job["library"], job["method"], job["options"],
+      NormalizeDatasetName(job["dataset"]), job["timeout"], job["threads"])]
+  jobs = model.Order([job for job in jobs if job not in skipped])
+
+  progress = Progress(jobs, model)
+  Log.Info("Estimated time of " + str(len(jobs)) + " jobs: " +
+      str(datetime.timedelta(seconds=int(progress.total))))
+
+  # Every library gets one build for all results of this run.
+  builds = {}
+
+  def Store(job, result):
+    Log.Info(job["library"] + " " + job["method"] + " " + job["options"] +
+        " " + NormalizeDatasetName(job["dataset"]) + ": " +
+        str(result.get("time", result.get("error", "-"))))
+    if log:
+      StoreJobResult(db, job, result, builds)
+    progress.Complete(job)
+    Log.Info(progress.Status())
+
+  for job in skipped:
+    Log.Info(job["library"] + " " + job["method"] + " " + job["options"] +
+        " " + NormalizeDatasetName(job["dataset"]) + ": skipped, predicted " +
+        "timeout")
+    if log:
+      StoreJobResult(db, job, {"dataset": (NormalizeDatasetName(
+          job["dataset"]),), "time": TimeoutPredictor.SKIPPED, "var": 0},
+          builds)
+
+  try:
+    coordinator = Coordinator(jobs, address, Store, authKey, heartbeat)
+  except (ValueError, OSError) as e:
+    Log.Fatal(str(e))
+    return
+  coordinator.Run()
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description="""Serve the benchmark jobs of
+      the given config to the workers.""")
+  parser.add_argument('-c','--config', help='Configuration file name.',
+      required=True)
+  parser.add_argument('-a','--address', help="""Address to listen on,
+      'host:port' for TCP or the path of a Unix socket.""", required=True)
+  parser.add_argument('-b','--blocks', help='Run only the specified blocks.',
+      required=False)
+  parser.add_argument('-l','--log', help='Save the results in the logfile.',
+      required=False)
+  parser.add_argument('-m','--methodBlocks', help="""Run only the specified
+      method blocks.""", required=False)
+  parser.add_argument('-k','--key', help="""Key to authenticate the workers
+      (default: BENCHMARK_AUTHKEY environment variable), required for
+      non-loopback addresses.""", required=False)
+
+  args = parser.parse_args()
+
+  if args:
+    log = True if args.log == "True" else False
+    Main(args.config, args.address, args.blocks, log, args.methodBlocks,
+        args.key)
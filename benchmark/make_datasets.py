@@ -0,0 +1,63 @@
+'''
+  @file make_datasets.py
+
+  Generate the synthetic datasets defined in the general block of the config.
+'''
+
+import os, sys, inspect
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from parser import *
+from generator import *
+
+import argparse
+
+'''
+Generate the synthetic datasets.
+
+@param configfile - The configuration file which contains the 'synthetic'
+setting.
+@param names - Generate only the datasets with the given names.
+'''
+def Main(configfile, names):
+  config = Parser(configfile, verbose=False)
+  streamData = config.StreamMerge()
+
+  datasets = {}
+  if "general" in streamData:
+    for key, value in streamData["general"]:
+      if key == "synthetic":
+        datasets = value
+
+  if not datasets:
+    Log.Warn("No synthetic datasets defined in: " + configfile)
+    return
+
+  for name, spec in sorted(datasets.items()):
+    Log.Info(name + ": " + DatasetGenerator.KINDS.get(spec.get("kind"),
+        "unknown kind"))
+
+  files = DatasetGenerator.GenerateAll(datasets, names.split(",") if names else
+      None)
+  for fileName in files:
+    Log.Info("Dataset: " + fileName)
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description="""Generate the synthetic
+      datasets defined in the given config.""")
+  parser.add_argument('-c','--config', help='Configuration file name.',
+      required=True)
+  parser.add_argument('-n','--names', help="""Generate only the datasets with
+      the given names (comma separated).""", required=False)
+
+  args = parser.parse_args()
+
+  if args:
+    Main(args.config, args.names)
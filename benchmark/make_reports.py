@@ -23,7 +23,7 @@ from misc import *
 from profiler import *
 from system import *
 
-import argparse, glob, re, collections, simplejson, codecs, random
+import argparse, glob, re, collections, simplejson, codecs, random, html
 
 '''
 Create the timings table.
@@ -82,7 +82,7 @@ def GetBootstrapTimingTable(results, libraries, datasetName):
 
           # Save the timing data for the timing table.
           if dataset in timingData:
-            if time == 'failure' or '>' in str(time):
+            if not isFloat(time):
               time = '-'
 
             timingData[dataset][l] = time
@@ -174,9 +174,11 @@ def CreateBootstrapTable(result, libaries, counter):
 Create the content for the memory section.
 
 @param results - This data structure contains the memory results.
+@param library - The name of the library.
+@param chartPoints - The maximum number of points in the memory charts.
 @return A string that contains the content for the memory section.
 '''
-def CreateMemoryContent(results):
+def CreateMemoryContent(results, library="mlpack", chartPoints=200):
   memoryContent = ""
   ids = ""
 
@@ -186,6 +188,24 @@ def CreateMemoryContent(results):
       # memoryValues["name"] = result[7]
       # memoryValues["nameID"] = result[7] + str(hash(datetime.datetime.now()))
 
+      # The sampled memory results are stored as JSON in the database.
+      if str(result[5]).startswith("{"):
+        chartInfo = CreateSampledMemoryChart(result[5], result[7])
+
+        fileName = 'memory/memory_' + result[7] + str(hash(result[5])) + '.json'
+        with open('reports/' + fileName, 'wb+') as fid:
+          fid.write(str(result[5]).encode('UTF-8'))
+
+        containerID, container = chartInfo
+        memoryValues['container'] = container
+        memoryValues['massifFilePath'] = fileName
+        memoryValues['massifFile'] = library + " - " + result[7]
+        memoryValues['memorySites'] = ""
+
+        ids += containerID + ","
+        memoryContent += memoryPanelTemplate % memoryValues
+        continue
+
       content = Profiler.MassifMemoryUsageReport(str(result[5]))
       try:
         content = content.decode()
@@ -198,15 +218,24 @@ def CreateMemoryContent(results):
       with open('reports/' + fileName, 'wb+') as fid:
         fid.write(content.encode('UTF-8'))
 
-      chartInfo = CreateMassifChart(result[5], result[7])
+      chartInfo = CreateMassifChart(result[5], result[7], chartPoints)
 
       if not chartInfo:
         continue
 
-      containerID, container = chartInfo
+      containerID, container, massif = chartInfo
       memoryValues['container'] = container
       memoryValues['massifFilePath'] = fileName
-      memoryValues['massifFile'] = result[7]
+      memoryValues['massifFile'] = library + " - " + result[7]
+
+      # Show the top allocation sites of the peak snapshot.
+      memoryValues['memorySites'] = ""
+      if massif["sites"]:
+        sites = ""
+        for size, site in massif["sites"]:
+          sites += "<tr><td>" + html.escape(site) + "</td><td>"
+          sites += "{0:.2f}".format(size / 1024.0) + " KB</td></tr>"
+        memoryValues['memorySites'] = memorySitesTemplate % {"sites": sites}
 
       ids += containerID + ","
       memoryContent += memoryPanelTemplate % memoryValues
@@ -245,9 +274,10 @@ Create the method container with the information from the database.
 
 @param db - The database object.
 @param bootstrapCountb - The number of selections from the metric results.
+@param chartPoints - The maximum number of points in the memory charts.
 @return HTML code which contains the information for the container.
 '''
-def MethodReports(db, bootstrapCount):
+def MethodReports(db, bootstrapCount, chartPoints=200):
   methodsPage = ""
   numDatasets = 0
 
@@ -321,10 +351,15 @@ def MethodReports(db, bootstrapCount):
     methodInfo = ""
     memoryContent = ""
 
-    mlpackMemoryId = db.GetLibrary("mlpack_memory")
-    mlpackMemoryBuilId = ""
-    if mlpackMemoryId:
-        mlpackMemoryBuilId = db.GetLatestBuildFromLibary(mlpackMemoryId[0][0])
+    # Get the latest memory build of every library with memory results (e.g.
+    # 'mlpack_memory', 'scikit_memory').
+    memoryBuilds = []
+    for libraryId, libraryName in libraryIds:
+      if libraryName.endswith("_memory"):
+        memoryBuildId = db.GetLatestBuildFromLibary(libraryId)[0][0]
+        if memoryBuildId > 0:
+          memoryBuilds.append((libraryName[:-len("_memory")], libraryId,
+              memoryBuildId))
 
     # Variables to count the status informations.
     failureCount = 0
@@ -528,11 +563,17 @@ def MethodReports(db, bootstrapCount):
         resultPanelMetric += resultsTemplate % groupPanelMetric
 
       # Create the memory content.
-      if mlpackMemoryBuilId:
-        memoryResults = db.GetMemoryResults(mlpackMemoryBuilId,
-            mlpackMemoryId[0][0], methodId)
-
-        groupPanelTiming["content"], ids = CreateMemoryContent(memoryResults)
+      if memoryBuilds:
+        groupPanelTiming["content"], ids = "", ""
+        for libraryName, memoryLibraryId, memoryBuildId in memoryBuilds:
+          memoryResults = db.GetMemoryResults(memoryBuildId, memoryLibraryId,
+              methodId)
+
+          content, memoryIds = CreateMemoryContent(memoryResults, libraryName,
+              chartPoints)
+          groupPanelTiming["content"] += content
+          if memoryIds:
+            ids += ("," if ids else "") + memoryIds
 
         if groupPanelTiming["content"]:
           groupPanelTiming["nameID"] = chartHash + "_m"
@@ -717,6 +758,48 @@ def ShiftReports():
   if CheckFileAvailable(fileName):
     os.rename(fileName, "reports/index_1.html")
 
+'''
+Get the system information of the machines which produced the latest builds.
+The information is stored with every build; only if there is no stored
+information the current machine is used.
+
+@param db - The database object.
+@return Dictionary with the system information report values.
+'''
+def HostInformation(db):
+  hosts = collections.OrderedDict()
+  for libraryId, name in db.GetLibraryIds():
+    buildId = db.GetLatestBuildFromLibary(libraryId)[0][0]
+    buildInfo = db.GetBuildInfo(buildId) if buildId != -1 else []
+    if not buildInfo:
+      continue
+
+    try:
+      info = simplejson.loads(buildInfo[0][1])
+    except ValueError:
+      info = {}
+    info.setdefault("host", buildInfo[0][0])
+    hosts.setdefault(info.get("fingerprint", info["host"]), info)
+
+  if not hosts:
+    hosts["current"] = SystemInfo.GetHostInfo()
+  elif len(hosts) > 1:
+    Log.Warn("The latest builds were produced on " + str(len(hosts)) +
+        " different machines.")
+
+  values = {}
+  for key, field in [("Host", "host"), ("CPUModel", "cpu_model"),
+      ("Distribution", "distribution"), ("Platform", "platform"),
+      ("Memory", "memory"), ("CPUCores", "cpu_cores"), ("Kernel", "kernel"),
+      ("Governor", "governor"), ("Turbo", "turbo"), ("BLAS", "blas")]:
+    fieldValues = []
+    for info in hosts.values():
+      value = str(info.get(field, "N/A"))
+      if value not in fieldValues:
+        fieldValues.append(value)
+    values[key] = html.escape(", ".join(fieldValues))
+  return values
+
 '''
 Create the new report.
 
@@ -727,6 +810,7 @@ def Main(configfile):
   database = "reports/benchmark.db"
   keepReports = 3
   bootstrapCount = 10
+  chartPoints = 200
 
   # Create the folder structure.
   CreateDirectoryStructure(["reports/img",
@@ -751,6 +835,8 @@ def Main(configfile):
         version = value
       elif key == "bootstrap":
         bootstrapCount = value
+      elif key == "memoryChartPoints":
+        chartPoints = value
 
   # Create a database object and create the necessary tables.
   db = Database(database)
@@ -766,11 +852,7 @@ def Main(configfile):
   reportValues = {}
   chartInfoTop = CreateTopLineChart(db)
 
-  reportValues["CPUModel"] =  SystemInfo.GetCPUModel()
-  reportValues["Distribution"] =  SystemInfo.GetDistribution()
-  reportValues["Platform"] =  SystemInfo.GetPlatform()
-  reportValues["Memory"] =  SystemInfo.GetMemory()
-  reportValues["CPUCores"] =  SystemInfo.GetCPUCores()
+  reportValues.update(HostInformation(db))
 
   reportValues["LibraryInformation"] = ""
   for i, libary in enumerate(libraries):
@@ -781,7 +863,7 @@ def Main(configfile):
 
   reportValues["container"] = chartInfoTop[1]
   reportValues["pagination"] = NewPagination()
-  reportValues["methods"] = MethodReports(db, bootstrapCount)
+  reportValues["methods"] = MethodReports(db, bootstrapCount, chartPoints)
   reportValues["scripts"] = '<script src="' + chartInfoTop[0] + '"></script>'
 
   template = pageTemplate % reportValues
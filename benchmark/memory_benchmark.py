@@ -20,9 +20,13 @@ from parser import *
 from convert import *
 from misc import *
 from database import *
+from generator import *
+from profiler import *
+from system import *
 
 import argparse
 import datetime
+import simplejson
 
 '''
 Return a list with modified dataset.
@@ -73,11 +77,15 @@ Create the new memory report.
 @param log - If True save the reports otherwise use stdout and print the reports.
 @param methodBlocks - Run only the specified methods.
 @param update - Update the latest memory records in the database.
+@param mode - The memory profiling mode ('massif' or 'sample').
+@param rate - The number of samples per second in the 'sample' mode.
 '''
-def Main(configfile, blocks, log, methodBlocks, update):
+def Main(configfile, blocks, log, methodBlocks, update, mode=None, rate=None):
   # Benchmark settings.
   timeout = 23000
   database = "reports/benchmark.db"
+  memoryMode = "massif"
+  sampleRate = 100
 
   # Create the folder structure.
   CreateDirectoryStructure(["reports/img", "reports/etc"])
@@ -93,6 +101,25 @@ def Main(configfile, blocks, log, methodBlocks, update):
         timeout = value
       if key == "database":
         database = value
+      if key == "memoryMode":
+        memoryMode = value
+      if key == "memorySampleRate":
+        sampleRate = value
+
+  # The command line settings override the settings from the config file.
+  memoryMode = mode if mode else memoryMode
+  sampleRate = rate if rate else sampleRate
+
+  if memoryMode not in ["massif", "sample"]:
+    Log.Fatal("Unknown memory mode: " + str(memoryMode))
+    return
+
+  Profiler.memoryMode = memoryMode
+  Profiler.sampleRate = sampleRate
+  Log.Info("Memory mode: " + memoryMode)
+
+  # Generate the synthetic datasets used by the config.
+  DatasetGenerator.GenerateConfig(streamData)
 
   # Temporary datastructures for the current build.
   build = {}
@@ -102,6 +129,9 @@ def Main(configfile, blocks, log, methodBlocks, update):
     db = Database(database)
     db.CreateTables()
 
+    # The host and system information is stored with every build.
+    hostInfo = SystemInfo.GetHostInfo()
+
   # Transform the blocks string to a list.
   if blocks:
     blocks = blocks.split(",")
@@ -117,7 +147,8 @@ def Main(configfile, blocks, log, methodBlocks, update):
 
         if log:
           methodId = db.GetMethod(method, options)
-          methodId = methodId[0][0] if methodId else db.NewMethod(method, options)
+          methodId = methodId[0][0] if methodId else db.NewMethod(method,
+              options, "None")
 
         for libary in libraries:
           name = libary[0]
@@ -142,6 +173,8 @@ def Main(configfile, blocks, log, methodBlocks, update):
                   continue
               else:
                 build[name] = (db.NewBuild(libaryId), libaryId)
+                db.NewBuildInfo(build[name][0], hostInfo["host"],
+                    simplejson.dumps(hostInfo))
 
             # Load the script.
             try:
@@ -171,11 +204,24 @@ def Main(configfile, blocks, log, methodBlocks, update):
                   Log.Fatal("Exception: " + str(e))
                   continue
 
+                # Scripts without a RunMemory() method run the method in
+                # process, in this case we profile the timed region of the
+                # RunTiming() method.
+                inProcess = not hasattr(instance, "RunMemory")
+
                 # Generate a "unique" name for the memory output file.
-                outputName = "reports/etc/" + str(hash(datetime.datetime.now())) + ".mout"
+                outputName = "reports/etc/" + str(hash(datetime.datetime.now()))
+                if memoryMode == "massif" and not inProcess:
+                  outputName += ".mout"
+                else:
+                  outputName += ".json"
 
                 try:
-                  err = instance.RunMemory(options, outputName);
+                  if inProcess:
+                    err = Profiler.InProcessMemoryUsage(instance, options,
+                        outputName)
+                  else:
+                    err = instance.RunMemory(options, outputName);
                 except Exception as e:
                   Log.Fatal("Exception: " + str(e))
 
@@ -183,16 +229,24 @@ def Main(configfile, blocks, log, methodBlocks, update):
                   RemoveDataset(modifiedDataset[1])
                   continue
 
+                # The sampled memory results are small enough to store the
+                # peak values and the timeline directly in the database.
+                memoryInfo = outputName
+                if outputName.endswith(".json") and CheckFileAvailable(outputName):
+                  with open(outputName, "r") as fid:
+                    memoryInfo = fid.read()
+                  os.remove(outputName)
+
                 # Save the results in the database if the user asked for.
-                if err != -1 and log:
+                if err != -1 and err != -2 and log:
                   buildId, libaryId = build[name]
 
                   if update:
                     db.UpdateMemory(buildId, libaryId, methodId, datasetId,
-                        outputName)
+                        memoryInfo)
                   else:
                     db.NewMemory(buildId, libaryId, methodId, datasetId,
-                        outputName)
+                        memoryInfo)
 
                 # Remove temporary datasets.
                 RemoveDataset(modifiedDataset[1])
@@ -210,10 +264,17 @@ if __name__ == '__main__':
       database.""", required=False)
   parser.add_argument('-m','--methodBlocks', help="""Run only the specified
       method blocks.""", required=False)
+  parser.add_argument('-p','--mode', help="""The memory profiling mode:
+      'massif' (valgrind massif) or 'sample' (sample RSS/PSS/USS of the process
+      tree).""", required=False)
+  parser.add_argument('-r','--rate', help="""The number of memory samples per
+      second in the 'sample' mode.""", required=False, type=int)
 
   args = parser.parse_args()
 
   if args:
     log = True if args.log == "True" else False
     update = True if args.update == "True" else False
-    Main(args.config, args.blocks, log, args.methodBlocks, update)
+    mode = args.mode if args.mode else None
+    Main(args.config, args.blocks, log, args.methodBlocks, update, mode,
+        args.rate)
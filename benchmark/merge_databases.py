@@ -0,0 +1,59 @@
+'''
+  @file merge_databases.py
+
+  Merge the results of several benchmark databases (e.g. of different
+  machines) into one database.
+'''
+
+import os, sys, inspect
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from database import *
+
+import argparse
+
+'''
+Merge the given databases into the target database.
+
+@param target - The target database, created if it doesn't exist.
+@param sources - List of source databases.
+@param host - The host name recorded for builds without host information, by
+default the name of the source database.
+'''
+def Main(target, sources, host):
+  db = Database(target)
+  db.CreateTables()
+
+  for source in sources:
+    if not os.path.isfile(source):
+      Log.Fatal("Database not found: " + source)
+      continue
+    if os.path.realpath(source) == os.path.realpath(target):
+      Log.Warn("Skip the target database: " + source)
+      continue
+
+    name = host if host else os.path.splitext(os.path.basename(source))[0]
+    builds = db.Merge(source, name)
+    Log.Info(source + ": merged " + str(builds) + " builds (" + name + ")")
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description="""Merge several benchmark
+      databases into one database.""")
+  parser.add_argument('-t','--target', help='Target database file name.',
+      required=False, default="reports/benchmark.db")
+  parser.add_argument('--host', help="""Host name recorded for builds without
+      host information (default: name of the source database).""",
+      required=False)
+  parser.add_argument('sources', nargs='+', help='Source database file names.')
+
+  args = parser.parse_args()
+
+  if args:
+    Main(args.target, args.sources, args.host)
@@ -21,6 +21,20 @@ from parser import *
 from convert import *
 from misc import *
 from database import *
+from generator import *
+from threads import *
+from scaling import *
+from placement import *
+from timers import *
+from jvm import *
+from bindings import *
+from timer import Results
+from scratch import *
+from schedule import *
+from jobs import *
+from interleave import *
+from containment import *
+from interference import *
 
 try:
   from irc_bot import *
@@ -30,6 +44,7 @@ except ImportError:
 
 import random
 import argparse
+import collections
 import datetime
 import simplejson
 
@@ -39,12 +54,19 @@ import simplejson
 Show system informations. Are there no data available, the value is 'N/A'.
 '''
 def SystemInformation():
-
-  Log.Info("CPU Model: " + SystemInfo.GetCPUModel())
-  Log.Info("Distribution: " + SystemInfo.GetDistribution())
-  Log.Info("Platform: " + SystemInfo.GetPlatform())
-  Log.Info("Memory: " + SystemInfo.GetMemory())
-  Log.Info("CPU Cores: " + SystemInfo.GetCPUCores())
+  info = SystemInfo.GetHostInfo()
+
+  Log.Info("Host: " + info["host"] + " (" + info["fingerprint"] + ")")
+  Log.Info("CPU Model: " + str(info["cpu_model"]))
+  Log.Info("Distribution: " + str(info["distribution"]))
+  Log.Info("Platform: " + str(info["platform"]))
+  Log.Info("Memory: " + str(info["memory"]))
+  Log.Info("CPU Cores: " + str(info["cpu_cores"]))
+  Log.Info("Kernel: " + str(info["kernel"]))
+  Log.Info("Governor: " + str(info["governor"]) + ", Turbo: " +
+      str(info["turbo"]))
+  Log.Info("BLAS: " + str(info["blas"]) + ", numpy: " + str(info["numpy"]) +
+      ", scikit-learn: " + str(info["sklearn"]))
 
 '''
 Return a list with modified datasets.
@@ -103,6 +125,174 @@ def CountLibrariesDatasets(libraries):
 
   return len(datasetList)
 
+'''
+Derive the subsampled datasets for all libraries which use the dataset-size
+scaling mode.
+
+@param libraries - List of library tuples.
+@return Tuple (libraries, sizes); the library tuples contain the subsampled
+datasets and sizes maps the dataset name to the (full dataset name, dimension,
+size) tuples.
+'''
+def ExpandScalingDatasets(libraries):
+  expanded = []
+  sizes = {}
+  for library in libraries:
+    if library[9]:
+      datasets, librarySizes = Scaling.ExpandDatasets(library[1], library[9])
+      for name, values in librarySizes.items():
+        sizes[name] = list(set(sizes.get(name, []) + values))
+      library = library[:1] + (datasets,) + library[2:]
+    expanded.append(library)
+
+  return (expanded, sizes)
+
+'''
+Run the timing trials of all libraries of a method and options block in the
+randomized, interleaved order (see Interleave), dataset by dataset.
+
+@param method - The name of the method.
+@param options - The options of the method.
+@param libraries - List of library tuples.
+@param blocks - Run only the specified libraries.
+@param timeout - The timeout of a run in seconds.
+@param placement - The NUMA placement settings.
+@param predictor - The timeout predictor.
+@return Dictionary with the (trial times, named timers, peak memory,
+interference) tuple of every (library name, thread count, dataset name) key.
+'''
+def RunInterleaved(method, options, libraries, blocks, timeout, placement,
+    predictor):
+  results = {}
+
+  datasets = collections.OrderedDict()
+  for library in libraries:
+    for dataset in library[1]:
+      datasets.setdefault(NormalizeDatasetName(dataset), dataset)
+
+  # The thread count of the last trial.
+  current = {"threads": None}
+
+  Placement.Apply(placement)
+  for datasetName, dataset in datasets.items():
+    runs = {}
+    slots = []
+    for library in libraries:
+      name, trials, script, format, tasks, threads = (library[0], library[2],
+          library[3], library[4], library[5], library[8])
+      if blocks and name not in blocks:
+        continue
+      if 'timing' not in tasks or 'watch' in tasks:
+        continue
+      if datasetName not in map(NormalizeDatasetName, library[1]):
+        continue
+      if predictor.Skip(name, method, options, datasetName, timeout, threads):
+        continue
+
+      # The errors are reported by the sequential run.
+      try:
+        module = Loader.ImportModuleFromPath(script)
+        methodCall = getattr(module, method)
+        modifiedDataset = GetDataset(dataset, format)
+      except Exception:
+        continue
+
+      context = DatasetContext(modifiedDataset[0])
+      if DatasetContext.InProcess(module):
+        try:
+          context.Preload()
+        except Exception as e:
+          Log.Warn("Could not load the dataset: " + str(e))
+
+      # Every library gets its own scratch directory.
+      Scratch.directory = None
+      directory = Scratch.Create(modifiedDataset[0])
+      slots.append((directory, modifiedDataset[1]))
+
+      try:
+        instance = methodCall(modifiedDataset[0], timeout=timeout,
+            verbose=False)
+      except Exception:
+        continue
+
+      key = (name, threads, datasetName)
+      results[key] = ([], [], [], [])
+      runs[key] = (trials, InterleavedTrial(instance, options, context,
+          directory, threads, results[key][1], results[key][2],
+          results[key][3], current))
+
+    Log.Info("Interleaved trials: " + datasetName)
+    for key, times in Interleave.Run(runs).items():
+      phases, memory, interference = results[key][1:]
+      results[key] = (times, phases, memory[-1] if memory else None,
+          interference)
+
+    # Remove the scratch directories and the temporary datasets.
+    for directory, modified in slots:
+      Scratch.directory = directory
+      Scratch.Remove()
+      RemoveDataset(modified)
+    DatasetContext.Deactivate()
+    Threads.Apply(None)
+    current["threads"] = None
+  Placement.Reset()
+
+  return results
+
+'''
+Create the trial function of a library for the interleaved trials.
+
+@param instance - The method instance of the library.
+@param options - The options of the method.
+@param context - The dataset context of the library.
+@param directory - The scratch directory of the library.
+@param threads - The thread count of the library.
+@param phases - List for the named timers of the trials.
+@param memory - List for the peak memory of the trials.
+@param interference - List for the interference of the trials.
+@param current - Dictionary with the thread count of the last trial.
+@return Function which runs one trial and returns the time.
+'''
+def InterleavedTrial(instance, options, context, directory, threads, phases,
+    memory, interference, current):
+  def Trial():
+    if current["threads"] != threads:
+      Threads.Apply(threads)
+      current["threads"] = threads
+    DatasetContext.current = context
+    Scratch.directory = directory
+
+    time, timers, peak, last = RunTrial(instance, options)
+    memory.append(peak)
+    interference.append(last)
+    if timers:
+      phases.append(timers)
+    return time
+  return Trial
+
+'''
+Iterate over the datasets of a library, the longest jobs first (see
+CostModel). A job is marked as finished in the progress as soon as the next
+dataset is requested, so the caller can skip a dataset with 'continue'.
+
+@param datasets - The datasets of the library.
+@param jobs - Dictionary with the job of every dataset name.
+@param model - The cost model.
+@param progress - The progress of the run.
+'''
+def ScheduleDatasets(datasets, jobs, model, progress):
+  def Estimate(dataset):
+    job = jobs.get(NormalizeDatasetName(dataset))
+    return model.Estimate(job) if job else 0
+
+  for dataset in sorted(datasets, key=lambda dataset: -Estimate(dataset)):
+    yield dataset
+
+    job = jobs.get(NormalizeDatasetName(dataset))
+    if job:
+      progress.Complete(job)
+      Log.Info(progress.Status())
+
 '''
 Start the main benchmark routine. The method shows some DEBUG information and
 prints a runtime information table.
@@ -119,6 +309,8 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new):
   database = "reports/benchmark.db"
 
   bootstrapCount = 10
+  placement = None
+  reprobe = 0
 
   watchFiles = watchFiles.split()
 
@@ -145,12 +337,76 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new):
         bootstrapCount = value
       if key == "irc":
         ircData = value
+      if key == "scalingSteps":
+        Scaling.steps = value
+      if key == "scalingSeed":
+        Scaling.seed = value
+      if key == "placement":
+        placement = value
+      if key == "jvm":
+        JVMServer.Configure(value)
+      if key == "mlpackBindings":
+        MlpackBindings.Configure(value)
+      if key == "keepModels":
+        Results.models = value
+      if key == "scalingDirectory":
+        Scaling.directory = value
+      if key == "predictTimeout":
+        reprobe = value
+      if key == "interleave":
+        Interleave.enabled = value
+      if key == "interleaveSeed":
+        Interleave.seed = value
+      if key == "memoryLimit":
+        MemoryLimit.Configure(value)
+      if key == "interference":
+        Interference.Configure(value)
+
+  # Refuse to start if the frequency governor doesn't match the placement
+  # settings.
+  if not Placement.Check(placement):
+    return
+
+  # Generate the synthetic datasets used by the config.
+  DatasetGenerator.GenerateConfig(streamData)
 
   # Create database connection if the user asked for to save the reports.
   if log:
     db = Database(database)
     db.CreateTables()
 
+    # The host and system information is stored with every build.
+    hostInfo = SystemInfo.GetHostInfo()
+
+  # The seed of the interleaved trial order is stored with every build.
+  if Interleave.enabled:
+    seed = Interleave.Seed()
+    if log:
+      hostInfo = dict(hostInfo, interleave_seed=seed)
+
+  # Estimate the cost of the jobs from the results of the former builds.
+  history = None
+  if log or os.path.isfile(database):
+    history = (db if log else Database(database)).GetResultHistory()
+  model = CostModel(history)
+
+  # Skip the cells which timed out in the former builds.
+  predictor = TimeoutPredictor(history if log else None, reprobe)
+
+  # Run the longest method blocks and datasets first and show the progress of
+  # the run.
+  jobs = [job for job in ExpandJobs(streamData, blocks.split(",") if blocks
+      else None, methodBlocks) if not ("timing" in job["tasks"] and
+      predictor.Skip(job["library"], job["method"], job["options"],
+      NormalizeDatasetName(job["dataset"]), job["timeout"], job["threads"]))]
+  progress = Progress(jobs, model)
+  Log.Info("Estimated time of " + str(len(jobs)) + " jobs: " +
+      str(datetime.timedelta(seconds=int(progress.total))))
+
+  cost = collections.Counter()
+  for job in jobs:
+    cost[job["method"]] += model.Estimate(job)
+
   if irc_available and ircData:
     ircBOT = IRCBot(ircData[0], ircData[1], ircData[2])
     watchMessages = []
@@ -163,7 +419,8 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new):
   build = {}
 
   # Iterate through all libraries.
-  for method, sets in streamData.items():
+  for method, sets in sorted(streamData.items(), key=lambda item:
+      -cost[item[0]]):
     if method == "general":
       continue
     if not methodBlocks or method in methodBlocks:
@@ -182,9 +439,18 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new):
         header = ['']
         table.append(header)
 
+        # Derive the subsamples of the dataset-size scaling mode.
+        libraries, scalingSizes = ExpandScalingDatasets(libraries)
+
         # Count the datasets.
         datasetCount = CountLibrariesDatasets(libraries)
 
+        # Run the timing trials of all libraries interleaved.
+        interleaved = {}
+        if Interleave.enabled:
+          interleaved = RunInterleaved(method, options, libraries, blocks,
+              timeout, placement, predictor)
+
         # Create the matrix which contains the time and dataset informations.
         dataMatrix = [['-' for x in range(len(libraries) + 1)] for x in
             range(datasetCount)]
@@ -208,16 +474,28 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new):
           tasks = library[5]
           alias = library[6]
           files = library[7]
+          threads = library[8]
+          scaling = library[9]
+
+          # Collect the (size, time) results of the dataset-size scaling mode
+          # for every (dataset, dimension) combination.
+          scalingTimes = {}
 
           if log:
             db.UpdateMethod(methodId, alias)
 
-          header.append(name)
+          # Show the thread count in the header of the thread scaling sweep.
+          header.append(name if threads is None else name + " (" +
+              str(threads) + "t)")
 
           if not blocks or name in blocks:
             run += 1
             Log.Info("Library: " + name)
 
+            # Set the thread count and the NUMA placement for this run.
+            Threads.Apply(threads)
+            placementInfo = Placement.Apply(placement)
+
             # Logging: create a new build and library record for this library.
             if log and name not in build:
               libraryId = db.GetLibrary(name)
@@ -228,6 +506,8 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new):
                   buildId = db.GetLatestBuildFromLibary(libraryId)[0][0]
                   if buildId:
                     newBuildId = db.NewBuild(libraryId)
+                    db.NewBuildInfo(newBuildId, hostInfo["host"],
+                        simplejson.dumps(hostInfo))
                     db.CopyLatestBuildFromLibary(buildId, newBuildId)
 
                 buildId = db.GetLatestBuildFromLibary(libraryId)
@@ -245,6 +525,8 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new):
                   buildIdPrevious = db.GetLatestBuildFromLibary(libraryId)
 
                 build[name] = (db.NewBuild(libraryId), libraryId)
+                db.NewBuildInfo(build[name][0], hostInfo["host"],
+                    simplejson.dumps(hostInfo))
 
             # Load the script.
             try:
@@ -255,7 +537,13 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new):
               Log.Fatal("Exception: " + str(e))
             else:
 
-              for dataset in datasets:
+              libraryJobs = dict((NormalizeDatasetName(job["dataset"]), job)
+                  for job in jobs if (job["method"], job["options"],
+                  job["library"], job["threads"]) == (method, options, name,
+                  threads))
+
+              for dataset in ScheduleDatasets(datasets, libraryJobs, model,
+                  progress):
                 datasetName = NormalizeDatasetName(dataset)
                 row = FindRightRow(dataMatrix, datasetName, datasetCount)
 
@@ -269,8 +557,31 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new):
 
                 Log.Info("Dataset: " + dataMatrix[row][0])
 
+                if 'timing' in tasks and predictor.Skip(name, method, options,
+                    datasetName, timeout, threads):
+                  Log.Info("Skipped, predicted timeout.")
+                  dataMatrix[row][col] = TimeoutPredictor.SKIPPED
+                  if log and not update:
+                    buildId, libraryId = build[name]
+                    db.NewResult(buildId, libraryId, dataMatrix[row][col], 0,
+                        datasetId, methodId, threads, placementInfo)
+                  continue
+
                 modifiedDataset = GetDataset(dataset, format)
 
+                # Load the dataset tuple once for the timing, metric and
+                # bootstrap tasks of the scripts which use the loaded arrays.
+                context = DatasetContext.Activate(modifiedDataset[0])
+                if DatasetContext.InProcess(module):
+                  try:
+                    context.Preload()
+                  except Exception as e:
+                    Log.Warn("Could not load the dataset: " + str(e))
+
+                # The output files of the methods are written to a new scratch
+                # directory.
+                Scratch.Create(modifiedDataset[0])
+
                 try:
                   instance = methodCall(modifiedDataset[0], timeout=timeout,
                     verbose=False)
@@ -308,27 +619,39 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new):
 
                 if 'timing' in tasks:
                   time = []
-                  for trial in range(trials + 1):
-                    if trial > 0:
+                  phases = []
+                  interference = []
+                  if (name, threads, datasetName) in interleaved:
+                    time, phases, memory, interference = interleaved.pop((name,
+                        threads, datasetName))
+                  else:
+                    # The peak memory of the last trial.
+                    memory = None
+                    for trial in range(trials):
                       try:
-                        time.append(instance.RunTiming(options))
-
-                        # Method unsuccessful.
-                        if sum(time) < 0:
-                          break
+                        trialTime, timers, memory, last = RunTrial(instance,
+                            options)
                       except Exception as e:
                         Log.Fatal("Exception: " + str(e))
+                        continue
 
-                  # Set the correct time label.
-                  if sum(time) == -2:
-                    # Timout failure.
-                    dataMatrix[row][col] = ">" + str(timeout)
-                  elif sum(time) < 0:
-                    # Exception.
-                    dataMatrix[row][col] = "failure"
-                  else:
-                    # Measured time.
-                    dataMatrix[row][col] = "{0:.6f}".format(sum(time) / trials)
+                      time.append(trialTime)
+                      interference.append(last)
+                      if timers:
+                        phases.append(timers)
+
+                      # Method unsuccessful.
+                      if trialTime < 0:
+                        break
+
+                  # Set the correct time label (timeout, oom, failure or the
+                  # measured time).
+                  dataMatrix[row][col] = TimeLabel(time, timeout, trials)
+                  if ((not time or time[-1] >= 0) and scaling and
+                      datasetName in scalingSizes):
+                    for fullName, dimension, size in scalingSizes[datasetName]:
+                      scalingTimes.setdefault((fullName, dimension), []).append(
+                          (size, sum(time) / trials))
 
                   # Save the results in the databse if the user asked for.
                   if log:
@@ -338,21 +661,34 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new):
                       avg = sum(time) / len(time)
                       var = sum((avg - value) ** 2 for value in time) / len(time)
 
+                    phaseInfo = simplejson.dumps(Timers.Mean(phases)) if (
+                        phases) else None
+                    interferenceInfo = Interference.Summary(interference)
+                    if interferenceInfo:
+                      interferenceInfo = simplejson.dumps(interferenceInfo)
+
                     buildId, libraryId = build[name]
                     if update:
                       try:
                         db.UpdateResult(buildId, libraryId, dataMatrix[row][col],
-                          var, datasetId, methodId)
+                          var, datasetId, methodId, threads, placementInfo,
+                          phaseInfo, memory, interferenceInfo)
                       except Exception:
                         pass
                     else:
                       db.NewResult(buildId, libraryId, dataMatrix[row][col], var,
-                          datasetId, methodId)
+                          datasetId, methodId, threads, placementInfo, phaseInfo,
+                          memory, interferenceInfo)
+
+                    # Store the named timers of every trial.
+                    if phases:
+                      db.NewPhaseTimings(buildId, libraryId, methodId,
+                          datasetId, phases, threads)
 
                   if 'watch' in tasks and log:
                     for prevbuildID in buildIdPrevious:
                       resultsPrevious = db.GetResult(prevbuildID[0], libraryId,
-                          datasetId, methodId)
+                          datasetId, methodId, threads)
                       if (resultsPrevious and resultsPrevious[0][3] != '-'):
                         break
 
@@ -420,7 +756,29 @@ def Main(configfile, blocks, log, methodBlocks, update, watchFiles, new):
                           methodId)
 
                 # Remove temporary datasets.
+                DatasetContext.Deactivate()
+                Scratch.Remove()
                 RemoveDataset(modifiedDataset[1])
+
+              # Fit the empirical complexity exponents (time ~ n^k).
+              for (fullName, dimension), points in scalingTimes.items():
+                fit = Scaling.FitExponent(points)
+                if not fit:
+                  continue
+
+                Log.Info("Complexity (" + dimension + "): " + fullName +
+                    " n^{0:.2f} (r2 {1:.2f})".format(*fit))
+                if log:
+                  fullDatasetId = db.GetDataset(fullName)
+                  if fullDatasetId:
+                    buildId, libraryId = build[name]
+                    db.NewComplexityResult(buildId, libraryId, methodId,
+                        fullDatasetId[0][0], dimension, fit[0], fit[1],
+                        len(points), threads)
+
+            # Restore the default thread and placement settings.
+            Threads.Apply(None)
+            Placement.Reset()
           col += 1
         # Show the results.
         if not log and run > 0 and 'timing' in tasks:
@@ -0,0 +1,89 @@
+'''
+  @file run_plan.py
+
+  Run the jobs of a compiled plan (see compile_plan.py) or of one shard of the
+  plan, so independent hosts or CI runners can split the benchmark.
+'''
+
+import os, sys, inspect
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from misc import *
+from database import *
+from jobs import *
+from schedule import *
+from plan import *
+
+import argparse
+import datetime
+
+'''
+Run the jobs of the given shard of the plan.
+
+@param planfile - The plan file.
+@param shard - The shard specification 'i/N'.
+@param log - If True save the results in the database.
+'''
+def Main(planfile, shard, log):
+  plan = LoadPlan(planfile)
+  if not plan:
+    return
+
+  try:
+    index, count = ParseShard(shard)
+  except ValueError as e:
+    Log.Fatal(str(e))
+    return
+
+  database = "reports/benchmark.db"
+  for key, value in plan["general"]:
+    if key == "database":
+      database = value
+
+  jobs = ShardJobs(plan, index, count)
+  Log.Info("Plan " + plan["hash"] + ", shard " + shard + ": " +
+      str(len(jobs)) + " of " + str(len(plan["jobs"])) + " jobs")
+
+  if log:
+    CreateDirectoryStructure([os.path.dirname(database) or "."])
+    db = Database(database)
+    db.CreateTables()
+
+  progress = Progress(jobs, PlanModel(plan))
+  Log.Info("Estimated time: " + str(datetime.timedelta(seconds=int(
+      progress.total))))
+
+  # Every library gets one build for all results of this run.
+  builds = {}
+
+  for job in jobs:
+    result = RunJob(job)
+    Log.Info(job["library"] + " " + job["method"] + " " + job["options"] +
+        " " + NormalizeDatasetName(job["dataset"]) + ": " +
+        str(result.get("time", result.get("error", "-"))))
+    if log:
+      StoreJobResult(db, job, result, builds)
+    progress.Complete(job)
+    Log.Info(progress.Status())
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description="""Run the jobs of a compiled
+      plan.""")
+  parser.add_argument('-p','--plan', help='Plan file name.', required=True)
+  parser.add_argument('-s','--shard', help="""Run only the given shard 'i/N'
+      of the plan (default 1/1).""", default="1/1", required=False)
+  parser.add_argument('-l','--log', help='Save the results in the logfile.',
+      required=False)
+
+  args = parser.parse_args()
+
+  if args:
+    log = True if args.log == "True" else False
+    Main(args.plan, args.shard, log)
@@ -0,0 +1,43 @@
+'''
+  @file worker.py
+
+  Pull the benchmark jobs from the coordinator, run them with the method
+  scripts and send the results back. The worker has to be started in the
+  benchmark root folder.
+'''
+
+import os, sys, inspect
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from jobs import *
+from distributed import *
+
+import argparse
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description="""Run the benchmark jobs of the
+      coordinator.""")
+  parser.add_argument('-a','--address', help="""Address of the coordinator,
+      'host:port' for TCP or the path of a Unix socket.""", required=True)
+  parser.add_argument('-k','--key', help="""Key to authenticate the worker
+      (default: BENCHMARK_AUTHKEY environment variable), required for
+      non-loopback addresses.""", required=False)
+  parser.add_argument('-n','--name', help='Name of the worker.',
+      required=False)
+
+  args = parser.parse_args()
+
+  if args:
+    try:
+      worker = Worker(args.address, RunJob, args.key, name=args.name)
+      count = worker.Run()
+      Log.Info("Executed jobs: " + str(count))
+    except ValueError as e:
+      Log.Fatal(str(e))
@@ -17,18 +17,22 @@ if cmd_subfolder not in sys.path:
   sys.path.insert(0, cmd_subfolder)
 
 from log import *
+from timers import *
 from profiler import *
+from threads import *
 
 import shlex
 import subprocess
 import re
-import collections
 
 '''
 This class implements the K-Means Clustering benchmark.
 '''
 class KMEANS(object):
 
+  # The timers of the measured time (see Timers.Total()).
+  timerPhases = ["total_time"]
+
   '''
   Create the K-Means Clustering benchmark instance.
 
@@ -63,14 +67,14 @@ class KMEANS(object):
       inputCmd = "-i " + self.dataset[0] + " " + options
 
     # Split the command using shell-like syntax.
-    cmd = shlex.split(self.path + "matlab -nodisplay -nosplash -r \"try, " +
+    cmd = shlex.split(self.path + "matlab -nodisplay -nosplash " +
+        Threads.MatlabFlags() + "-r \"try, " +
         "KMEANS('"  + inputCmd + "'), catch, exit(1), end, exit(0)\"")
 
-    # Run command with the nessecary arguments and return its output as a byte
-    # string. We have untrusted input so we disable all shell based features.
+    # Run command with the nessecary arguments and parse the timers of its
+    # output. We have untrusted input so we disable all shell based features.
     try:
-      s = subprocess.check_output(cmd, stderr=subprocess.STDOUT, shell=False,
-          timeout=self.timeout)
+      self.timers = Timers.Run(cmd, self.timeout)
     except subprocess.TimeoutExpired as e:
       Log.Warn(str(e))
       return -2
@@ -79,44 +83,9 @@ class KMEANS(object):
       return -1
 
     # Return the elapsed time.
-    timer = self.parseTimer(s)
-    if not timer:
-      Log.Fatal("Can't parse the timer")
+    time = Timers.Total(self.timers, self.timerPhases)
+    if time is None:
       return -1
-    else:
-      time = self.GetTime(timer)
-      Log.Info(("total time: %fs" % time), self.verbose)
 
-      return time
-
-  '''
-  Parse the timer data form a given string.
-
-  @param data - String to parse timer data from.
-  @return - Namedtuple that contains the timer data or -1 in case of an error.
-  '''
-  def parseTimer(self, data):
-    # Compile the regular expression pattern into a regular expression object to
-    # parse the timer data.
-    pattern = re.compile(br"""
-        .*?total_time: (?P<total_time>.*?)s.*?
-        """, re.VERBOSE|re.MULTILINE|re.DOTALL)
-
-    match = pattern.match(data)
-    if not match:
-      Log.Fatal("Can't parse the data: wrong format")
-      return -1
-    else:
-      # Create a namedtuple and return the timer data.
-      timer = collections.namedtuple("timer", ["total_time"])
-
-      return timer(float(match.group("total_time")))
-
-  '''
-  Return the elapsed time in seconds.
-
-  @param timer - Namedtuple that contains the timer data.
-  @return Elapsed time in seconds.
-  '''
-  def GetTime(self, timer):
-    return timer.total_time
+    Log.Info(("total time: %fs" % (time)), self.verbose)
+    return time
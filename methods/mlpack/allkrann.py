@@ -17,18 +17,24 @@ if cmd_subfolder not in sys.path:
   sys.path.insert(0, cmd_subfolder)
 
 from log import *
+from timers import *
+from bindings import *
+from executables import *
+from scratch import *
 from profiler import *
 
 import shlex
 import subprocess
 import re
-import collections
 
 '''
 This class implements the All K-Rank-Approximate-Nearest-Neighbors benchmark.
 '''
 class ALLKRANN(object):
 
+  # The timers of the measured time (see Timers.Total()).
+  timerPhases = ["total_time", "-loading_data", "-saving_data"]
+
   '''
   Create the All K-Rank-Approximate-Nearest-Neighbors benchmark instance, show
   some informations and return the instance.
@@ -45,26 +51,15 @@ class ALLKRANN(object):
     self.path = path
     self.timeout = timeout
     self.debug = debug
+    self.outputs = None
 
     # Get description from executable.
-    cmd = shlex.split(self.path + "mlpack_allkrann -h")
-    try:
-      s = subprocess.check_output(cmd, stderr=subprocess.STDOUT, shell=False)
-    except Exception as e:
-      Log.Fatal("Could not execute command: " + str(cmd))
+    info = Executables.Info(self.path + "mlpack_allkrann")
+    if info is None:
+      Log.Fatal("Could not execute command: " + self.path +
+          "mlpack_allkrann -h")
     else:
-      # Use regular expression pattern to get the description.
-      pattern = re.compile(br"""(.*?)Required.*?options:""",
-          re.VERBOSE|re.MULTILINE|re.DOTALL)
-
-      match = pattern.match(s)
-      if not match:
-        Log.Warn("Can't parse description", self.verbose)
-        description = ""
-      else:
-        description = match.group(1)
-
-      self.description = description
+      self.description = info["description"]
 
   '''
   Destructor to clean up at the end. Use this method to remove created files.
@@ -72,7 +67,7 @@ class ALLKRANN(object):
   def __del__(self):
     Log.Info("Clean up.", self.verbose)
     filelist = ["gmon.out", "distances.csv", "neighbors.csv"]
-    for f in filelist:
+    for f in map(Scratch.Path, filelist):
       if os.path.isfile(f):
         os.remove(f)
 
@@ -90,17 +85,20 @@ class ALLKRANN(object):
   def RunMemory(self, options, fileName, massifOptions="--depth=2"):
     Log.Info("Perform ALLKRANN Memory Profiling.", self.verbose)
 
+    # The sample mode profiles the release build at native speed.
+    path = Profiler.ExecutablePath(self.path, self.debug)
+
     # If the dataset contains two files then the second file is the query file.
     # In this case we add this to the command line.
     if len(self.dataset) == 2:
-      cmd = shlex.split(self.debug + "mlpack_allkrann -r " + self.dataset[0] +
+      cmd = shlex.split(path + "mlpack_allkrann -r " + self.dataset[0] +
           " -q " + self.dataset[1] + " -v -n neighbors.csv -d distances.csv " +
           options)
     else:
-      cmd = shlex.split(self.debug + "mlpack_allkrann -r " + self.dataset +
+      cmd = shlex.split(path + "mlpack_allkrann -r " + self.dataset +
           " -v -n neighbors.csv -d distances.csv " + options)
 
-    return Profiler.MassifMemoryUsage(cmd, fileName, self.timeout, massifOptions)
+    return Profiler.MemoryUsage(cmd, fileName, self.timeout, massifOptions)
 
   '''
   Perform All K-Rank-Approximate-Nearest-Neighbors. If the method has been
@@ -123,11 +121,10 @@ class ALLKRANN(object):
       cmd = shlex.split(self.path + "mlpack_allkrann -r " + self.dataset +
           " -v -n neighbors.csv -d distances.csv " + options)
 
-    # Run command with the nessecary arguments and return its output as a byte
-    # string. We have untrusted input so we disable all shell based features.
+    # Run command with the nessecary arguments and parse the timers of its
+    # output. We have untrusted input so we disable all shell based features.
     try:
-      s = subprocess.check_output(cmd, stderr=subprocess.STDOUT, shell=False,
-          timeout=self.timeout)
+      self.timers, self.outputs = MlpackBindings.Run(cmd, self.timeout)
     except subprocess.TimeoutExpired as e:
       Log.Warn(str(e))
       return -2
@@ -136,51 +133,9 @@ class ALLKRANN(object):
       return -1
 
     # Return the elapsed time.
-    timer = self.parseTimer(s)
-    if not timer:
-      Log.Fatal("Can't parse the timer")
+    time = Timers.Total(self.timers, self.timerPhases)
+    if time is None:
       return -1
-    else:
-      time = self.GetTime(timer)
-      Log.Info(("total time: %fs" % (time)), self.verbose)
 
-      return time
-
-  '''
-  Parse the timer data form a given string.
-
-  @param data - String to parse timer data from.
-  @return - Namedtuple that contains the timer data or -1 in case of an error.
-  '''
-  def parseTimer(self, data):
-    # Compile the regular expression pattern into a regular expression object to
-    # parse the timer data.
-    pattern = re.compile(br"""
-        .*?loading_data: (?P<loading_data>.*?)s.*?
-        .*?saving_data: (?P<saving_data>.*?)s.*?
-        .*?total_time: (?P<total_time>.*?)s.*?
-        """, re.VERBOSE|re.MULTILINE|re.DOTALL)
-
-    match = pattern.match(data)
-
-    if not match:
-      Log.Fatal("Can't parse the data: wrong format")
-      return -1
-    else:
-      # Create a namedtuple and return the timer data.
-      timer = collections.namedtuple("timer", ["loading_data", "saving_data",
-          "total_time"])
-
-      return timer(float(match.group("loading_data")),
-          float(match.group("saving_data")),
-          float(match.group("total_time")))
-
-  '''
-  Return the elapsed time in seconds.
-
-  @param timer - Namedtuple that contains the timer data.
-  @return Elapsed time in seconds.
-  '''
-  def GetTime(self, timer):
-    time = timer.total_time - timer.loading_data - timer.saving_data
+    Log.Info(("total time: %fs" % (time)), self.verbose)
     return time
@@ -24,19 +24,25 @@ if metrics_folder not in sys.path:
   sys.path.insert(0, metrics_folder)
 
 from log import *
+from timers import *
+from bindings import *
+from executables import *
+from scratch import *
 from profiler import *
 from definitions import *
 from misc import *
 import shlex
 import subprocess
 import re
-import collections
 
 '''
 This class implements the Decision Stump benchmark.
 '''
 class DecisionStump(object):
 
+  # The timers of the measured time (see Timers.Total()).
+  timerPhases = ["total_time", "-loading_data", "-saving_data"]
+
   '''
   Create the Decision Stump benchmark instance, show some
   informations and return the instance.
@@ -53,26 +59,15 @@ class DecisionStump(object):
     self.path = path
     self.timeout = timeout
     self.debug = debug
+    self.outputs = None
 
     # Get description from executable.
-    cmd = shlex.split(self.path + "mlpack_decision_stump -h")
-    try:
-      s = subprocess.check_output(cmd, stderr=subprocess.STDOUT, shell=False)
-    except Exception as e:
-      Log.Fatal("Could not execute command: " + str(cmd))
+    info = Executables.Info(self.path + "mlpack_decision_stump")
+    if info is None:
+      Log.Fatal("Could not execute command: " + self.path +
+          "mlpack_decision_stump -h")
     else:
-      # Use regular expression pattern to get the description.
-      pattern = re.compile(br"""(.*?)Required.*?options:""",
-          re.VERBOSE|re.MULTILINE|re.DOTALL)
-
-      match = pattern.match(s)
-      if not match:
-        Log.Warn("Can't parse description", self.verbose)
-        description = ""
-      else:
-        description = match.group(1)
-
-      self.description = description
+      self.description = info["description"]
 
   '''
   Destructor to clean up at the end. Use this method to remove created files.
@@ -80,7 +75,7 @@ class DecisionStump(object):
   def __del__(self):
     Log.Info("Clean up.", self.verbose)
     filelist = ["gmon.out", "output"]
-    for f in filelist:
+    for f in map(Scratch.Path, filelist):
       if os.path.isfile(f):
         os.remove(f)
   '''
@@ -98,15 +93,18 @@ class DecisionStump(object):
   def RunMemory(self, options, fileName, massifOptions="--depth=2"):
     Log.Info("Perform Memory Profiling.", self.verbose)
 
+    # The sample mode profiles the release build at native speed.
+    path = Profiler.ExecutablePath(self.path, self.debug)
+
     # If the dataset contains two files then the second file is the test file.
     # In this case we add this to the command line.
     if len(self.dataset) >= 2:
-      cmd = shlex.split(self.debug + "mlpack_decision_stump -t " +
+      cmd = shlex.split(path + "mlpack_decision_stump -t " +
           self.dataset[0] + " -T " + self.dataset[1] + " -v " + options)
     else:
       Log.Fatal("This method requires atleast two datasets.")
 
-    return Profiler.MassifMemoryUsage(cmd, fileName, self.timeout, massifOptions)
+    return Profiler.MemoryUsage(cmd, fileName, self.timeout, massifOptions)
 
   '''
   Perform Decision Stump Prediction. If the method has been
@@ -127,11 +125,10 @@ class DecisionStump(object):
     else:
       Log.Fatal("This method requires atleast two datasets.")
 
-    # Run command with the nessecary arguments and return its output as a byte
-    # string. We have untrusted input so we disable all shell based features.
+    # Run command with the nessecary arguments and parse the timers of its
+    # output. We have untrusted input so we disable all shell based features.
     try:
-      s = subprocess.check_output(cmd, stderr=subprocess.STDOUT, shell=False,
-        timeout=self.timeout)
+      self.timers, self.outputs = MlpackBindings.Run(cmd, self.timeout)
     except subprocess.TimeoutExpired as e:
       Log.Warn(str(e))
       return -2
@@ -140,15 +137,12 @@ class DecisionStump(object):
       return -1
 
     # Return the elapsed time.
-    timer = self.parseTimer(s)
-    if not timer:
-      Log.Fatal("Can't parse the timer")
+    time = Timers.Total(self.timers, self.timerPhases)
+    if time is None:
       return -1
-    else:
-      time = self.GetTime(timer)
-      Log.Info(("total time: %fs" % (time)), self.verbose)
 
-      return time
+    Log.Info(("total time: %fs" % (time)), self.verbose)
+    return time
 
   '''
   Run all the metrics for the classifier.
@@ -157,13 +151,15 @@ class DecisionStump(object):
     if len(self.dataset) >= 3:
 
       # Check if we need to build and run the model.
-      if not CheckFileAvailable('output_file'):
+      if not self.outputs and not CheckFileAvailable(
+          Scratch.Path('output_file')):
         self.RunTiming(options)
 
       testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
 
-      predictedlabels = LoadDataset("output_file")
+      predictedlabels = MlpackBindings.Output(self.outputs,
+          ["predictions", "output"], "output_file")
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, predictedlabels)
       AvgAcc = Metrics.AverageAccuracy(confusionMatrix)
@@ -188,39 +184,3 @@ class DecisionStump(object):
 
     else:
       Log.Fatal("This method requires three datasets.")
-
-  '''
-  Parse the timer data form a given string.
-
-  @param data - String to parse timer data from.
-  @return - Namedtuple that contains the timer data or -1 in case of an error.
-  '''
-  def parseTimer(self, data):
-    # Compile the regular expression pattern into a regular expression object to
-    # parse the timer data.
-    pattern = re.compile(br"""
-        .*?loading_data: (?P<loading_data>.*?)s.*?
-        .*?saving_data: (?P<saving_data>.*?)s.*?
-        .*?total_time: (?P<total_time>.*?)s.*?
-        """, re.VERBOSE|re.MULTILINE|re.DOTALL)
-
-    match = pattern.match(data)
-    if not match:
-      Log.Fatal("Can't parse the data: wrong format")
-      return -1
-    else:
-      # Create a namedtuple and return the timer data.
-      timer = collections.namedtuple('timer', ["loading_data", "total_time", "saving_data"])
-      return timer(float(match.group("loading_data")),
-          float(match.group("total_time")), float(match.group("saving_data")))
-
-  '''
-  Return the elapsed time in seconds.
-
-  @param timer - Namedtuple that contains the timer data.
-  @return Elapsed time in seconds.
-  '''
-  def GetTime(self, timer):
-    time = timer.total_time - timer.loading_data - timer.saving_data
-    return time
-
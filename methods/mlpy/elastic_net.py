@@ -30,6 +30,8 @@ from misc import *
 import numpy as np
 import mlpy
 
+IN_PROCESS = True
+
 '''
 This class implements the Elastic Net Classifier benchmark.
 '''
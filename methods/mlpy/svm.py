@@ -30,6 +30,8 @@ from misc import *
 import numpy as np
 from mlpy import LibSvm
 
+IN_PROCESS = True
+
 '''
 This class implements the Support vector machines benchmark.
 '''
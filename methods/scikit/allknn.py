@@ -18,6 +18,7 @@ if cmd_subfolder not in sys.path:
 
 from log import *
 from timer import *
+from threads import *
 
 import numpy as np
 from sklearn.neighbors import NearestNeighbors
@@ -89,7 +90,8 @@ class ALLKNN(object):
 
         try:
           # Perform All K-Nearest-Neighbors.
-          model = NearestNeighbors(n_neighbors=k, algorithm='kd_tree', leaf_size=l)
+          model = NearestNeighbors(n_neighbors=k, algorithm='kd_tree', leaf_size=l,
+              n_jobs=Threads.Count())
           model.fit(referenceData)
 
           if len(self.dataset) == 2:
@@ -30,6 +30,8 @@ from misc import *
 import numpy as np
 from sklearn.tree import DecisionTreeClassifier
 
+IN_PROCESS = True
+
 '''
 This class implements the Decision Tree Classifier benchmark.
 '''
@@ -47,6 +49,7 @@ class DTC(object):
     self.dataset = dataset
     self.timeout = timeout
     self.model = None
+    self.results = Results()
     self.criterion = 'gini'
     self.max_depth = None
     self.seed = 0
@@ -94,18 +97,21 @@ class DTC(object):
         with totalTimer:
           self.model = self.BuildModel(trainData, labels)
           # Run Decision Tree Classifier on the test dataset.
-          self.model.predict(testData)
+          predictions = self.model.predict(testData)
       except Exception as e:
         Log.Debug(str(e))
         q.put(-1)
         return -1
 
       time = totalTimer.ElapsedTime()
+
+      # Pass the predictions to RunMetrics().
+      self.results.Put(predictions=predictions, model=self.model)
       q.put(time)
 
       return time
 
-    return timeout(RunDTCScikit, self.timeout)
+    return timeout(RunDTCScikit, self.timeout, self.results)
 
   '''
   Perform the Decision Tree Classifier. If the method has been
@@ -126,15 +132,19 @@ class DTC(object):
   def RunMetrics(self, options):
     if len(self.dataset) >= 3:
 
-      # Check if we need to create a model.
-      if not self.model:
+      # Use the predictions (or the model) of the timing run if available,
+      # otherwise create a model.
+      predictedlabels = self.results.Get("predictions")
+      self.model = self.results.Get("model", self.model)
+      if predictedlabels is None and not self.model:
         trainData, labels = SplitTrainData(self.dataset)
         self.model = self.BuildModel(trainData, labels)
 
       testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
 
-      predictedlabels = self.model.predict(testData)
+      if predictedlabels is None:
+        predictedlabels = self.model.predict(testData)
 
       # Datastructure to store the results.
       metrics = {}
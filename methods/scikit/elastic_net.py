@@ -30,6 +30,8 @@ from misc import *
 import numpy as np
 from sklearn.linear_model import ElasticNet as SElasticNet
 
+IN_PROCESS = True
+
 '''
 This class implements the Elastic Net Classifier benchmark.
 '''
@@ -47,6 +49,7 @@ class ElasticNet(object):
     self.dataset = dataset
     self.timeout = timeout
     self.model = None
+    self.results = Results()
     self.rho = 0.5
     self.alpha = 0.5
 
@@ -89,18 +92,21 @@ class ElasticNet(object):
         with totalTimer:
           self.model = self.BuildModel(trainData, labels)
           # Run Elastic Net Classifier on the test dataset.
-          self.model.predict(testData)
+          predictions = self.model.predict(testData)
       except Exception as e:
         Log.Debug(str(e))
         q.put(-1)
         return -1
 
       time = totalTimer.ElapsedTime()
+
+      # Pass the predictions to RunMetrics().
+      self.results.Put(predictions=predictions, model=self.model)
       q.put(time)
 
       return time
 
-    return timeout(RunElasticNetScikit, self.timeout)
+    return timeout(RunElasticNetScikit, self.timeout, self.results)
 
   '''
   Perform the Elastic Net Classifier. If the method has been
@@ -121,15 +127,19 @@ class ElasticNet(object):
   def RunMetrics(self, options):
     if len(self.dataset) >= 3:
 
-      # Check if we need to create a model.
-      if not self.model:
+      # Use the predictions (or the model) of the timing run if available,
+      # otherwise create a model.
+      predictedlabels = self.results.Get("predictions")
+      self.model = self.results.Get("model", self.model)
+      if predictedlabels is None and not self.model:
         trainData, labels = SplitTrainData(self.dataset)
         self.model = self.BuildModel(trainData, labels)
 
       testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
 
-      predictedlabels = self.model.predict(testData)
+      if predictedlabels is None:
+        predictedlabels = self.model.predict(testData)
 
       # Datastructure to store the results.
       metrics = {}
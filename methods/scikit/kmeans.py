@@ -18,6 +18,7 @@ if cmd_subfolder not in sys.path:
 
 from log import *
 from timer import *
+from threads import *
 
 import numpy as np
 from sklearn.cluster import KMeans
@@ -83,12 +84,14 @@ class KMEANS(object):
         with totalTimer:
           if len(self.dataset) == 2:
             kmeans = KMeans(n_clusters=int(clusters.group(1)), init=centroids,
-                n_init=1, max_iter=m)
+                n_init=1, max_iter=m, **Threads.JobsArgument(KMeans))
           elif seed:
             kmeans = KMeans(n_clusters=int(clusters.group(1)), init='random',
-                n_init=1, max_iter=m, random_state=int(seed.group(1)))
+                n_init=1, max_iter=m, random_state=int(seed.group(1)),
+                **Threads.JobsArgument(KMeans))
           else:
-            kmeans = KMeans(n_clusters=int(clusters.group(1)), n_init=1, max_iter=m)
+            kmeans = KMeans(n_clusters=int(clusters.group(1)), n_init=1,
+                max_iter=m, **Threads.JobsArgument(KMeans))
 
           kmeans.fit(data)
           labels = kmeans.labels_
@@ -24,12 +24,15 @@ if metrics_folder not in sys.path:
 
 from log import *
 from timer import *
+from threads import *
 from definitions import *
 from misc import *
 
 import numpy as np
 from sklearn.neighbors import KNeighborsClassifier
 
+IN_PROCESS = True
+
 '''
 This class implements the k-nearest neighbors Classifier benchmark.
 '''
@@ -47,6 +50,7 @@ class KNC(object):
     self.dataset = dataset
     self.timeout = timeout
     self.model = None
+    self.results = Results()
     self.n_neighbors = 5
     self.algorithm = 'kd_tree'
     self.leaf_size = 30
@@ -64,7 +68,8 @@ class KNC(object):
     knc = KNeighborsClassifier(n_neighbors=self.n_neighbors,
                                algorithm=self.algorithm,
                                leaf_size=self.leaf_size,
-                               metric=self.metric)
+                               metric=self.metric,
+                               n_jobs=Threads.Count())
     knc.fit(data, labels)
     return knc
 
@@ -98,18 +103,21 @@ class KNC(object):
         with totalTimer:
           self.model = self.BuildModel(trainData, labels)
           # Run k-nearest neighbors Classifier on the test dataset.
-          self.model.predict(testData)
+          predictions = self.model.predict(testData)
       except Exception as e:
         Log.Debug(str(e))
         q.put(-1)
         return -1
 
       time = totalTimer.ElapsedTime()
+
+      # Pass the predictions to RunMetrics().
+      self.results.Put(predictions=predictions, model=self.model)
       q.put(time)
 
       return time
 
-    return timeout(RunKNCScikit, self.timeout)
+    return timeout(RunKNCScikit, self.timeout, self.results)
 
   '''
   Perform the k-nearest neighbors Classifier. If the method has been
@@ -130,15 +138,19 @@ class KNC(object):
   def RunMetrics(self, options):
     if len(self.dataset) >= 3:
 
-      # Check if we need to create a model.
-      if not self.model:
+      # Use the predictions (or the model) of the timing run if available,
+      # otherwise create a model.
+      predictedlabels = self.results.Get("predictions")
+      self.model = self.results.Get("model", self.model)
+      if predictedlabels is None and not self.model:
         trainData, labels = SplitTrainData(self.dataset)
         self.model = self.BuildModel(trainData, labels)
 
       testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
 
-      predictedlabels = self.model.predict(testData)
+      if predictedlabels is None:
+        predictedlabels = self.model.predict(testData)
 
       # Datastructure to store the results.
       metrics = {}
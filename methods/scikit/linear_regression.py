@@ -30,6 +30,8 @@ from misc import *
 import numpy as np
 from sklearn.linear_model import LinearRegression as SLinearRegression
 
+IN_PROCESS = True
+
 '''
 This class implements the Linear Regression benchmark.
 '''
@@ -47,6 +49,7 @@ class LinearRegression(object):
     self.dataset = dataset
     self.timeout = timeout
     self.model = None
+    self.results = Results()
 
   '''
   Build the model for the Linear Regression.
@@ -81,6 +84,7 @@ class LinearRegression(object):
       # Use the last row of the training set as the responses.
       X, y = SplitTrainData(self.dataset)
 
+      predictions = None
       try:
         with totalTimer:
           # Perform linear regression.
@@ -88,16 +92,19 @@ class LinearRegression(object):
           b = self.model.coef_
 
           if len(self.dataset) >= 2:
-            self.model.predict(testSet)
+            predictions = self.model.predict(testSet)
       except Exception as e:
         q.put(-1)
         return -1
 
       time = totalTimer.ElapsedTime()
+
+      # Pass the predictions to RunMetrics().
+      self.results.Put(predictions=predictions, model=self.model)
       q.put(time)
       return time
 
-    return timeout(RunLinearRegressionScikit, self.timeout)
+    return timeout(RunLinearRegressionScikit, self.timeout, self.results)
 
   '''
   Perform Linear Regression. If the method has been successfully completed
@@ -117,15 +124,20 @@ class LinearRegression(object):
   def RunMetrics(self, options):
     if len(self.dataset) >= 3:
 
-      # Check if we need to create a model.
-      if not self.model:
+      # Use the predictions (or the model) of the timing run if available,
+      # otherwise create a model.
+      predictedlabels = self.results.Get("predictions")
+      self.model = self.results.Get("model", self.model)
+      if predictedlabels is None and not self.model:
         trainData, labels = SplitTrainData(self.dataset)
         self.model = self.BuildModel(trainData, labels)
 
       testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
 
-      predictedlabels = np.rint(self.model.predict(testData))
+      if predictedlabels is None:
+        predictedlabels = self.model.predict(testData)
+      predictedlabels = np.rint(predictedlabels)
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, predictedlabels)
       AvgAcc = Metrics.AverageAccuracy(confusionMatrix)
@@ -30,6 +30,8 @@ from misc import *
 import numpy as np
 from sklearn.linear_model import Ridge
 
+IN_PROCESS = True
+
 '''
 This class implements the Linear Ridge Regression benchmark.
 '''
@@ -46,6 +48,7 @@ class LinearRidgeRegression(object):
     self.verbose = verbose
     self.dataset = dataset
     self.timeout = timeout
+    self.results = Results()
 
   '''
   Build the model for the Linear Ridge Regression.
@@ -82,23 +85,28 @@ class LinearRidgeRegression(object):
       alpha = re.search("-t (\d+)", options)
       alpha = 1.0 if not alpha else int(alpha.group(1))
 
+      predictions = None
       try:
         with totalTimer:
           # Perform linear ridge regression.
           model = self.BuildModel(X,y, alpha=alpha)
 
           if len(self.dataset) >= 2:
-            model.predict(testSet)
+            predictions = model.predict(testSet)
 
       except Exception as e:
         q.put(-1)
         return -1
 
       time = totalTimer.ElapsedTime()
+
+      # Pass the predictions to RunMetrics().
+      self.results.Put(predictions=predictions, model=model)
       q.put(time)
       return time
 
-    return timeout(RunLinearRidgeRegressionScikit, self.timeout)
+    return timeout(RunLinearRidgeRegressionScikit, self.timeout,
+        self.results)
 
   '''
   Perform Linear Ridge Regression. If the method has been successfully completed
@@ -118,14 +126,22 @@ class LinearRidgeRegression(object):
   def RunMetrics(self, options):
     if len(self.dataset) >= 3:
 
-      trainData, labels = SplitTrainData(self.dataset)
-
       testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
-      alpha = re.search("-t (\d+)", options)
-      alpha = 1.0 if not alpha else int(alpha.group(1))
 
-      predictedlabels = np.rint(self.BuildModel(trainData, labels, alpha=alpha).predict(testData))
+      # Use the predictions (or the model) of the timing run if available,
+      # otherwise create a model.
+      predictedlabels = self.results.Get("predictions")
+      model = self.results.Get("model")
+      if predictedlabels is None and not model:
+        trainData, labels = SplitTrainData(self.dataset)
+        alpha = re.search("-t (\d+)", options)
+        alpha = 1.0 if not alpha else int(alpha.group(1))
+        model = self.BuildModel(trainData, labels, alpha=alpha)
+
+      if predictedlabels is None:
+        predictedlabels = model.predict(testData)
+      predictedlabels = np.rint(predictedlabels)
 
       SimpleMSE = Metrics.SimpleMeanSquaredError(truelabels, predictedlabels)
       metrics_dict = {}
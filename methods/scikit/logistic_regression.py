@@ -30,6 +30,8 @@ from misc import *
 import numpy as np
 from sklearn.linear_model import LogisticRegression as SLogisticRegression
 
+IN_PROCESS = True
+
 '''
 This class implements the Logistic Regression benchmark.
 '''
@@ -47,6 +49,7 @@ class LogisticRegression(object):
     self.dataset = dataset
     self.timeout = timeout
     self.model = None
+    self.results = Results()
 
   '''
   Build the model for the Logistic Regression.
@@ -91,10 +94,21 @@ class LogisticRegression(object):
         return -1
 
       time = totalTimer.ElapsedTime()
+
+      # Pass the predictions of the test set to RunMetrics(); the predictions
+      # aren't part of the measured time.
+      predictions = None
+      if len(self.dataset) > 1:
+        try:
+          predictions = self.model.predict(testSet)
+        except Exception as e:
+          Log.Debug(str(e))
+      self.results.Put(predictions=predictions, model=self.model)
       q.put(time)
       return time
 
-    return timeout(RunLogisticRegressionScikit, self.timeout)
+    return timeout(RunLogisticRegressionScikit, self.timeout,
+        self.results)
 
   '''
   Perform Logistic Regression. If the method has been successfully completed
@@ -115,16 +129,19 @@ class LogisticRegression(object):
   def RunMetrics(self, options):
     if len(self.dataset) >= 3:
 
-      # Check if we need to create a model.
-      if not self.model:
+      # Use the predictions (or the model) of the timing run if available,
+      # otherwise create a model.
+      predictedlabels = self.results.Get("predictions")
+      self.model = self.results.Get("model", self.model)
+      if predictedlabels is None and not self.model:
         trainData, labels = SplitTrainData(self.dataset)
         self.model = self.BuildModel(trainData, labels)
 
       testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
 
-      probabilities = self.model.predict_proba(testData)
-      predictedlabels = self.model.predict(testData)
+      if predictedlabels is None:
+        predictedlabels = self.model.predict(testData)
 
       confusionMatrix = Metrics.ConfusionMatrix(truelabels, predictedlabels)
       AvgAcc = Metrics.AverageAccuracy(confusionMatrix)
@@ -30,6 +30,8 @@ from misc import *
 import numpy as np
 from sklearn.linear_model import Perceptron
 
+IN_PROCESS = True
+
 '''
 This class implements the Perceptron benchmark.
 '''
@@ -47,6 +49,7 @@ class PERCEPTRON(object):
     self.dataset = dataset
     self.timeout = timeout
     self.model = None
+    self.results = Results()
     self.iterations = 1000
 
   '''
@@ -88,6 +91,7 @@ class PERCEPTRON(object):
       # Use the last row of the training set as the responses.
       X, y = SplitTrainData(self.dataset)
 
+      predictedlabels = None
       try:
         with totalTimer:
           # Perform perceptron classification.
@@ -99,10 +103,13 @@ class PERCEPTRON(object):
         return -1
 
       time = totalTimer.ElapsedTime()
+
+      # Pass the predictions to RunMetrics().
+      self.results.Put(predictions=predictedlabels, model=self.model)
       q.put(time)
       return time
 
-    return timeout(RunPerceptronScikit, self.timeout)
+    return timeout(RunPerceptronScikit, self.timeout, self.results)
 
   '''
   Perform Perceptron Classification. If the method has been successfully completed
@@ -123,8 +130,11 @@ class PERCEPTRON(object):
   def RunMetrics(self, options):
     if len(self.dataset) >= 3:
 
-      # Check if we need to create a model.
-      if not self.model:
+      # Use the predictions (or the model) of the timing run if available,
+      # otherwise create a model.
+      predictedlabels = self.results.Get("predictions")
+      self.model = self.results.Get("model", self.model)
+      if predictedlabels is None and not self.model:
         trainData, labels = SplitTrainData(self.dataset)
         self.model = self.BuildModel(trainData, labels)
 
@@ -132,7 +142,8 @@ class PERCEPTRON(object):
       truelabels = LoadDataset(self.dataset[2])
 
       #probabilities = self.model.predict_proba(testData)
-      predictedlabels = self.model.predict(testData)
+      if predictedlabels is None:
+        predictedlabels = self.model.predict(testData)
 
       # Datastructure to store the results.
       metrics = {}
@@ -30,6 +30,8 @@ from misc import *
 import numpy as np
 from sklearn.qda import QDA as SQDA
 
+IN_PROCESS = True
+
 '''
 This class implements the Quadratic Discriminant Analysis benchmark.
 '''
@@ -47,6 +49,7 @@ class QDA(object):
     self.dataset = dataset
     self.timeout = timeout
     self.model = None
+    self.results = Results()
 
   '''
   Build the model for the Quadratic Discriminant Analysis.
@@ -80,18 +83,21 @@ class QDA(object):
         with totalTimer:
           self.model = self.BuildModel(trainData, labels)
           # Run Quadratic Discriminant Analysis on the test dataset.
-          self.model.predict(testData)
+          predictions = self.model.predict(testData)
       except Exception as e:
         Log.Debug(str(e))
         q.put(-1)
         return -1
 
       time = totalTimer.ElapsedTime()
+
+      # Pass the predictions to RunMetrics().
+      self.results.Put(predictions=predictions, model=self.model)
       q.put(time)
 
       return time
 
-    return timeout(RunQDAScikit, self.timeout)
+    return timeout(RunQDAScikit, self.timeout, self.results)
 
   '''
   Perform the Quadratic Discriminant Analysis. If the method has been
@@ -112,15 +118,19 @@ class QDA(object):
   def RunMetrics(self, options):
     if len(self.dataset) >= 3:
 
-      # Check if we need to create a model.
-      if not self.model:
+      # Use the predictions (or the model) of the timing run if available,
+      # otherwise create a model.
+      predictedlabels = self.results.Get("predictions")
+      self.model = self.results.Get("model", self.model)
+      if predictedlabels is None and not self.model:
         trainData, labels = SplitTrainData(self.dataset)
         self.model = self.BuildModel(trainData, labels)
 
       testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
 
-      predictedlabels = self.model.predict(testData)
+      if predictedlabels is None:
+        predictedlabels = self.model.predict(testData)
 
       # Datastructure to store the results.
       metrics = {}
@@ -24,12 +24,15 @@ if metrics_folder not in sys.path:
 
 from log import *
 from timer import *
+from threads import *
 from definitions import *
 from misc import *
 
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 
+IN_PROCESS = True
+
 '''
 This class implements the Random Forest Classifier benchmark.
 '''
@@ -47,6 +50,7 @@ class RANDOMFOREST(object):
     self.dataset = dataset
     self.timeout = timeout
     self.model = None
+    self.results = Results()
     self.n_estimators = 10
     self.criterion = 'gini'
     self.max_depth = None
@@ -64,7 +68,8 @@ class RANDOMFOREST(object):
     randomforest = RandomForestClassifier(n_estimators=self.n_estimators,
                                           max_depth=self.max_depth,
                                           criterion=self.criterion,
-                                          random_state=self.seed)
+                                          random_state=self.seed,
+                                          n_jobs=Threads.Count())
     randomforest.fit(data, labels)
     return randomforest
 
@@ -98,18 +103,21 @@ class RANDOMFOREST(object):
         with totalTimer:
           self.model = self.BuildModel(trainData, labels)
           # Run Random Forest Classifier on the test dataset.
-          self.model.predict(testData)
+          predictions = self.model.predict(testData)
       except Exception as e:
         Log.Debug(str(e))
         q.put(-1)
         return -1
 
       time = totalTimer.ElapsedTime()
+
+      # Pass the predictions to RunMetrics().
+      self.results.Put(predictions=predictions, model=self.model)
       q.put(time)
 
       return time
 
-    return timeout(RunRANDOMFORESTScikit, self.timeout)
+    return timeout(RunRANDOMFORESTScikit, self.timeout, self.results)
 
   '''
   Perform the Random Forest Classifier. If the method has been
@@ -130,15 +138,19 @@ class RANDOMFOREST(object):
   def RunMetrics(self, options):
     if len(self.dataset) >= 3:
 
-      # Check if we need to create a model.
-      if not self.model:
+      # Use the predictions (or the model) of the timing run if available,
+      # otherwise create a model.
+      predictedlabels = self.results.Get("predictions")
+      self.model = self.results.Get("model", self.model)
+      if predictedlabels is None and not self.model:
         trainData, labels = SplitTrainData(self.dataset)
         self.model = self.BuildModel(trainData, labels)
 
       testData = LoadDataset(self.dataset[1])
       truelabels = LoadDataset(self.dataset[2])
 
-      predictedlabels = self.model.predict(testData)
+      if predictedlabels is None:
+        predictedlabels = self.model.predict(testData)
 
       # Datastructure to store the results.
       metrics = {}
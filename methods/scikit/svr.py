@@ -23,6 +23,8 @@ from misc import *
 import numpy as np
 from sklearn.svm import SVR as SSVR
 
+IN_PROCESS = True
+
 '''
 This class implements the SVR Regression benchmark.
 '''
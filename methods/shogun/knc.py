@@ -30,6 +30,8 @@ from misc import *
 import numpy as np
 from modshogun import RealFeatures, MulticlassLabels, KNN, EuclideanDistance
 
+IN_PROCESS = True
+
 '''
 This class implements the Support vector machines benchmark.
 '''
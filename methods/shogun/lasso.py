@@ -31,6 +31,8 @@ import numpy as np
 from modshogun import RegressionLabels, RealFeatures
 from modshogun import LeastAngleRegression
 
+IN_PROCESS = True
+
 '''
 This class implements the Lasso Regression benchmark.
 '''
@@ -31,6 +31,8 @@ import numpy as np
 from modshogun import RegressionLabels, RealFeatures
 from modshogun import LeastSquaresRegression
 
+IN_PROCESS = True
+
 '''
 This class implements the Linear Regression benchmark.
 '''
@@ -30,6 +30,8 @@ import numpy as np
 from modshogun import RealFeatures, MulticlassLabels
 from modshogun import MulticlassLogisticRegression
 
+IN_PROCESS = True
+
 '''
 This class implements the Logistic Regression benchmark.
 '''
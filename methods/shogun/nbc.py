@@ -29,6 +29,8 @@ from definitions import *
 import numpy as np
 from modshogun import RealFeatures, MulticlassLabels, GaussianNaiveBayes
 
+IN_PROCESS = True
+
 '''
 This class implements the Naive Bayes Classifier benchmark.
 '''
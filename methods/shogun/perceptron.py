@@ -31,6 +31,8 @@ import numpy as np
 from modshogun import Perceptron
 from modshogun import RealFeatures, MulticlassLabels
 
+IN_PROCESS = True
+
 '''
 This class implements the Perceptron benchmark.
 '''
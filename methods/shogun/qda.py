@@ -30,6 +30,8 @@ from misc import *
 import numpy as np
 import modshogun
 
+IN_PROCESS = True
+
 '''
 This class implements the QDA Classifier benchmark.
 '''
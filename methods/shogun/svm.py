@@ -31,6 +31,8 @@ import numpy as np
 from modshogun import RealFeatures, MulticlassLabels, LibSVM
 from modshogun import GaussianKernel, PolyKernel, LinearKernel, SigmoidKernel
 
+IN_PROCESS = True
+
 '''
 This class implements the Support vector machines benchmark.
 '''
@@ -25,6 +25,8 @@ from modshogun import RegressionLabels, RealFeatures
 from modshogun import LibSVR
 from modshogun import GaussianKernel
 
+IN_PROCESS = True
+
 '''
 This class implements the SVR Regression benchmark.
 '''
@@ -17,53 +17,56 @@ if cmd_subfolder not in sys.path:
   sys.path.insert(0, cmd_subfolder)
 
 from log import *
+from timers import *
+from jvm import *
 from profiler import *
 
 import shlex
 import subprocess
 import re
-import collections
 
 '''
 This class implements the Principal Components Analysis benchmark.
 '''
 class PCA(object):
 
-  ''' 
+  # The timers of the measured time (see Timers.Total()).
+  timerPhases = ["total_time", "-loading_data"]
+
+  '''
   Create the Principal Components Analysis benchmark instance.
-  
+
   @param dataset - Input dataset to perform PCA on.
   @param timeout - The time until the timeout. Default no timeout.
   @param path - Path to the mlpack executable.
   @param verbose - Display informational messages.
   '''
-  def __init__(self, dataset, timeout=0, path=os.environ["WEKA_CLASSPATH"], 
-      verbose=True): 
+  def __init__(self, dataset, timeout=0, path=os.environ["WEKA_CLASSPATH"],
+      verbose=True):
     self.verbose = verbose
     self.dataset = dataset
     self.path = path
     self.timeout = timeout
-    
+
   '''
-  Perform Principal Components Analysis. If the method has been successfully 
+  Perform Principal Components Analysis. If the method has been successfully
   completed return the elapsed time in seconds.
 
   @param options - Extra options for the method.
-  @return - Elapsed time in seconds or a negative value if the method was not 
+  @return - Elapsed time in seconds or a negative value if the method was not
   successful.
   '''
   def RunTiming(self, options):
     Log.Info("Perform PCA.", self.verbose)
 
     # Split the command using shell-like syntax.
-    cmd = shlex.split("java -classpath " + self.path + ":methods/weka" + 
+    cmd = shlex.split("java -classpath " + self.path + ":methods/weka" +
       " PCA -i " + self.dataset + " " + options)
 
-    # Run command with the nessecary arguments and return its output as a byte
-    # string. We have untrusted input so we disable all shell based features.
+    # Run command with the nessecary arguments and parse the timers of its
+    # output. We have untrusted input so we disable all shell based features.
     try:
-      s = subprocess.check_output(cmd, stderr=subprocess.STDOUT, shell=False, 
-          timeout=self.timeout)
+      self.timers = JVMServer.Run(cmd, self.timeout)
     except subprocess.TimeoutExpired as e:
       Log.Warn(str(e))
       return -2
@@ -72,54 +75,9 @@ class PCA(object):
       return -1
 
     # Return the elapsed time.
-    timer = self.parseTimer(s)
-    if not timer:
-      Log.Fatal("Can't parse the timer")
+    time = Timers.Total(self.timers, self.timerPhases)
+    if time is None:
       return -1
-    elif isinstance(timer, int):
-      Log.Fatal("Can't parse the timer")
-      return -1
-    else:
-      time = self.GetTime(timer)
-      Log.Info(("total time: %fs" % time), self.verbose)
-
-      return time 
-
-  '''
-  Parse the timer data form a given string.
 
-  @param data - String to parse timer data from.
-  @return - Namedtuple that contains the timer data or -1 in case of an error.
-  '''
-  def parseTimer(self, data):
-    # Compile the regular expression pattern into a regular expression object to
-    # parse the timer data.
-    pattern = re.compile(r"""
-        .*?loading_data: (?P<loading_time>.*?)s.*?
-        .*?total_time: (?P<total_time>.*?)s.*?
-        """, re.VERBOSE|re.MULTILINE|re.DOTALL)
-    
-    match = pattern.match(data.decode())
-    if not match:
-      Log.Fatal("Can't parse the data: wrong format")
-      return -1
-    else:
-      # Create a namedtuple and return the timer data.
-      timer = collections.namedtuple("timer", ["loading_time", "total_time"])
-
-      if match.group("loading_time").count(".") == 1:
-        return timer(float(match.group("loading_time")),
-          float(match.group("total_time")))
-      else:
-        return timer(float(match.group("loading_time").replace(",", ".")),
-              float(match.group("total_time").replace(",", ".")))
-
-  '''
-  Return the elapsed time in seconds.
-
-  @param timer - Namedtuple that contains the timer data.
-  @return Elapsed time in seconds.
-  '''
-  def GetTime(self, timer):
-    time = timer.total_time - timer.loading_time
+    Log.Info(("total time: %fs" % (time)), self.verbose)
     return time
@@ -0,0 +1,168 @@
+/**
+ * @file BenchmarkServer.java
+ *
+ * Long-lived JVM that runs the weka benchmark methods, so the JVM startup,
+ * class loading and JIT compilation are not part of every timing trial.
+ */
+
+import java.io.BufferedReader;
+import java.io.InputStreamReader;
+import java.io.OutputStream;
+import java.io.PrintStream;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.net.InetAddress;
+import java.net.ServerSocket;
+import java.net.Socket;
+import java.security.Permission;
+import java.util.Arrays;
+
+/**
+ * The server listens on a loopback port (printed as 'PORT <port>' on startup)
+ * and accepts one job per line:
+ *
+ *   RUN\t<warmup>\t<class>\t<arg>\t<arg>...
+ *
+ * The main method of the given class is called warmup times with the output
+ * discarded, so the JIT compiler has compiled the hot code, and then once
+ * more with the output sent back to the client. Every job is terminated by an
+ * '#END <status>' line. 'QUIT' stops the server.
+ */
+public class BenchmarkServer {
+
+  /**
+   * Thrown instead of terminating the server if a method calls System.exit().
+   */
+  private static class ExitException extends SecurityException {
+    private final int status;
+
+    public ExitException(final int status) {
+      super("System.exit(" + status + ")");
+      this.status = status;
+    }
+
+    public int GetStatus() {
+      return status;
+    }
+  }
+
+  /**
+   * Output stream which discards the output of the warm-up runs.
+   */
+  private static class NullOutputStream extends OutputStream {
+    @Override
+    public void write(int b) {}
+
+    @Override
+    public void write(byte[] b, int off, int len) {}
+  }
+
+  /**
+   * Convert the System.exit() calls of the methods into exceptions. Newer
+   * JVMs don't allow a security manager; in this case System.exit() stops the
+   * server and the client starts a new one.
+   */
+  @SuppressWarnings("removal")
+  private static void InstallExitGuard() {
+    try {
+      System.setSecurityManager(new SecurityManager() {
+        @Override
+        public void checkPermission(Permission permission) {}
+
+        @Override
+        public void checkPermission(Permission permission, Object context) {}
+
+        @Override
+        public void checkExit(int status) {
+          throw new ExitException(status);
+        }
+      });
+    } catch (UnsupportedOperationException e) {
+      System.out.println("[WARN ] System.exit() stops the benchmark server.");
+    }
+  }
+
+  /**
+   * Run the main method of a benchmark class.
+   *
+   * @param main - The main method.
+   * @param args - The arguments of the method.
+   * @param out - The stream for the method output.
+   * @return The exit status of the method.
+   */
+  private static int Run(final Method main, final String[] args,
+      final PrintStream out) {
+    PrintStream stdout = System.out;
+    PrintStream stderr = System.err;
+    System.setOut(out);
+    System.setErr(out);
+
+    try {
+      main.invoke(null, (Object) args.clone());
+      return 0;
+    } catch (InvocationTargetException e) {
+      if (e.getCause() instanceof ExitException) {
+        return ((ExitException) e.getCause()).GetStatus();
+      }
+      e.getCause().printStackTrace(out);
+      return 1;
+    } catch (Exception e) {
+      e.printStackTrace(out);
+      return 1;
+    } finally {
+      out.flush();
+      System.setOut(stdout);
+      System.setErr(stderr);
+    }
+  }
+
+  public static void main(String args[]) throws Exception {
+    int port = args.length > 0 ? Integer.parseInt(args[0]) : 0;
+    ServerSocket server = new ServerSocket(port, 1,
+        InetAddress.getLoopbackAddress());
+
+    // The client reads the port from the first line.
+    System.out.println("PORT " + server.getLocalPort());
+    System.out.flush();
+
+    InstallExitGuard();
+    PrintStream discard = new PrintStream(new NullOutputStream());
+
+    while (true) {
+      Socket socket = server.accept();
+      BufferedReader in = new BufferedReader(new InputStreamReader(
+          socket.getInputStream(), "UTF-8"));
+      PrintStream out = new PrintStream(socket.getOutputStream(), false,
+          "UTF-8");
+
+      String line;
+      while ((line = in.readLine()) != null) {
+        String[] fields = line.split("\t", -1);
+        if (fields[0].equals("QUIT")) {
+          socket.close();
+          Runtime.getRuntime().halt(0);
+        }
+
+        int status;
+        try {
+          int warmup = Integer.parseInt(fields[1]);
+          Method main = Class.forName(fields[2]).getMethod("main",
+              String[].class);
+          String[] methodArgs = Arrays.copyOfRange(fields, 3, fields.length);
+
+          for (int i = 0; i < warmup; i++) {
+            Run(main, methodArgs, discard);
+          }
+          status = Run(main, methodArgs, out);
+        } catch (Exception e) {
+          e.printStackTrace(out);
+          status = 1;
+        }
+
+        out.println("#END " + status);
+        out.flush();
+      }
+      socket.close();
+    }
+  }
+}
@@ -107,6 +107,9 @@ function chartTypeSelect()
   else if (chartType == "dataset-comparison") { activeChartType = dc; }
   else if (chartType == "metric-comparison") { activeChartType = mc; }
   else if (chartType == "highest-metric-comparison") { activeChartType = hmc; }
+  else if (chartType == "thread-scaling") { activeChartType = tsc; }
+  else if (chartType == "complexity-scaling") { activeChartType = csc; }
+  else if (chartType == "phase-timing") { activeChartType = ptc; }
 
   activeChartType.onTypeSelect();
 }
@@ -0,0 +1,320 @@
+// Define namespace: csc = complexity-scaling-comparison.
+var csc = csc = csc || {};
+
+csc.method_name = ""; // Name of currently selected method.
+csc.param_name = ""; // Name of currently selected parameters.
+csc.dataset_name = ""; // Name of currently selected dataset.
+csc.dimension = ""; // Currently selected scaling dimension (rows, columns).
+csc.libraries = [];
+csc.active_libraries = [];
+csc.exponents = {};
+csc.results = [];
+
+// This chart type has been selected.  What do we do now?
+csc.onTypeSelect = function()
+{
+  // The user needs to be able to select a method, parameters, a dataset and
+  // the scaling dimension.
+  var selectHolder = d3.select(".selectholder");
+  selectHolder.append("label")
+      .attr("for", "method_select")
+      .attr("class", "method-select-label")
+      .text("Select method:");
+  selectHolder.append("select")
+      .attr("id", "method_select")
+      .attr("onchange", "csc.methodSelect()");
+  selectHolder.append("label")
+      .attr("for", "param_select")
+      .attr("class", "param-select-label")
+      .text("Select parameters:");
+  selectHolder.append("select")
+      .attr("id", "param_select")
+      .attr("onchange", "csc.paramSelect()");
+  selectHolder.append("br");
+  selectHolder.append("label")
+      .attr("for", "main_dataset_select")
+      .attr("class", "main-dataset-select-label")
+      .text("Select dataset:");
+  selectHolder.append("select")
+      .attr("id", "main_dataset_select")
+      .attr("onchange", "csc.datasetSelect()");
+
+  csc.listMethods();
+}
+
+// List the methods with complexity results.
+csc.listMethods = function()
+{
+  var methods = db.exec("SELECT DISTINCT methods.name FROM methods, complexity WHERE methods.id == complexity.method_id ORDER BY name;");
+  var method_select_box = document.getElementById("method_select");
+
+  // Remove old things.
+  clearSelectBox(method_select_box);
+  clearSelectBox(document.getElementById("param_select"));
+  clearSelectBox(document.getElementById("main_dataset_select"));
+  if (methods.length == 0) { return; }
+
+  // Add new things.
+  for (i = 0; i < methods[0].values.length; i++)
+  {
+    var new_option = document.createElement("option");
+    new_option.text = methods[0].values[i];
+    method_select_box.add(new_option);
+  }
+  method_select_box.selectedIndex = -1;
+}
+
+// Called when the user selects a method.
+csc.methodSelect = function()
+{
+  var method_select_box = document.getElementById("method_select");
+  csc.method_name = method_select_box.options[method_select_box.selectedIndex].text;
+
+  var sqlstr = "SELECT DISTINCT methods.parameters, complexity.libary_id, COUNT(DISTINCT complexity.libary_id) FROM methods, complexity WHERE methods.name == '" + csc.method_name + "' AND methods.id == complexity.method_id GROUP BY methods.parameters;";
+  var params = db.exec(sqlstr);
+
+  // Loop through results and fill the second list box.
+  var param_select_box = document.getElementById("param_select");
+  clearSelectBox(param_select_box);
+  clearSelectBox(document.getElementById("main_dataset_select"));
+  for (i = 0; i < params[0].values.length; i++)
+  {
+    var new_option = document.createElement("option");
+    if (params[0].values[i][0])
+    {
+      new_option.text = params[0].values[i][0] + " (" + params[0].values[i][2] + " libraries)";
+    }
+    else
+    {
+      new_option.text = "[no parameters] (" + params[0].values[i][2] + " libraries)";
+    }
+    param_select_box.add(new_option);
+  }
+  param_select_box.selectedIndex = -1;
+}
+
+// Called when a set of parameters is selected.
+csc.paramSelect = function()
+{
+  var param_select_box = document.getElementById("param_select");
+  var param_name_full = param_select_box.options[param_select_box.selectedIndex].text;
+
+  // Parse out actual parameters.
+  csc.param_name = param_name_full.split("(")[0].replace(/^\s+|\s+$/g, '');
+  if (csc.param_name == "[no parameters]") { csc.param_name = ""; }
+
+  // Every dataset/dimension combination is a separate option.
+  var sqlstr = "SELECT DISTINCT datasets.name, complexity.dimension FROM complexity, datasets, methods WHERE complexity.dataset_id == datasets.id AND complexity.method_id == methods.id " +
+    "AND methods.name == '" + csc.method_name + "' AND methods.parameters == '" + csc.param_name + "' ORDER BY datasets.name, complexity.dimension;";
+  var datasets = db.exec(sqlstr);
+
+  var dataset_select_box = document.getElementById("main_dataset_select");
+  clearSelectBox(dataset_select_box);
+  for (i = 0; i < datasets[0].values.length; i++)
+  {
+    var new_option = document.createElement("option");
+    new_option.text = datasets[0].values[i][0] + " (" + datasets[0].values[i][1] + ")";
+    dataset_select_box.add(new_option);
+  }
+  dataset_select_box.selectedIndex = -1;
+}
+
+// Called when a dataset is selected.  Now we are ready to draw the chart.
+csc.datasetSelect = function()
+{
+  var dataset_select_box = document.getElementById("main_dataset_select");
+  var dataset_name_full = dataset_select_box.options[dataset_select_box.selectedIndex].text;
+  csc.dataset_name = dataset_name_full.split(" (")[0];
+  csc.dimension = dataset_name_full.split(" (")[1].replace(")", "");
+
+  // The exponents of the latest build of each library.
+  var sqlstr = "SELECT libraries.name, complexity.exponent, complexity.r2, complexity.threads FROM complexity, datasets, methods, libraries " +
+    "WHERE complexity.dataset_id == datasets.id AND complexity.method_id == methods.id AND libraries.id == complexity.libary_id " +
+    "AND methods.name == '" + csc.method_name + "' AND methods.parameters == '" + csc.param_name + "' AND datasets.name == '" + csc.dataset_name + "' " +
+    "AND complexity.dimension == '" + csc.dimension + "' AND complexity.build_id == (SELECT MAX(builds.id) FROM builds WHERE builds.libary_id == complexity.libary_id) " +
+    "ORDER BY libraries.name;";
+  var exponents = db.exec(sqlstr);
+
+  csc.exponents = {};
+  csc.libraries = [];
+  for (i = 0; i < exponents[0].values.length; i++)
+  {
+    var library = exponents[0].values[i][0];
+    if (exponents[0].values[i][3] != null) { library += " (" + exponents[0].values[i][3] + "t)"; }
+    csc.exponents[library] = exponents[0].values[i];
+    csc.libraries.push(library);
+  }
+
+  // The runtimes of the full dataset and the subsamples (e.g. wine-r512).
+  var size = csc.dimension == "rows" ? "datasets.instances" : "datasets.attributes";
+  var prefix = csc.dataset_name + "-" + csc.dimension.charAt(0);
+  sqlstr = "SELECT " + size + ", results.time, libraries.name, results.threads, datasets.name FROM results, datasets, methods, libraries " +
+    "WHERE results.dataset_id == datasets.id AND results.method_id == methods.id AND libraries.id == results.libary_id " +
+    "AND methods.name == '" + csc.method_name + "' AND methods.parameters == '" + csc.param_name + "' " +
+    "AND (datasets.name == '" + csc.dataset_name + "' OR datasets.name GLOB '" + prefix + "[0-9]*') " +
+    "AND results.build_id == (SELECT MAX(builds.id) FROM builds WHERE builds.libary_id == results.libary_id) " +
+    "ORDER BY " + size + ";";
+  csc.results = db.exec(sqlstr);
+
+  // By default, everything is active.
+  csc.active_libraries = {};
+  for (i = 0; i < csc.libraries.length; i++)
+  {
+    csc.active_libraries[csc.libraries[i]] = true;
+  }
+
+  clearChart();
+  buildChart();
+}
+
+// Get the points [size, runtime, library] of the given library.
+csc.libraryPoints = function(library)
+{
+  if (csc.results.length == 0) { return []; }
+
+  return csc.results[0].values.reduce(function(p, c) {
+      var name = c[2];
+      if (c[3] != null) { name += " (" + c[3] + "t)"; }
+      if (name == library && typeof c[1] == "number" && c[1] > 0) { p.push([c[0], c[1], name]); }
+      return p; }, []);
+}
+
+// Remove everything on the page that belongs to us.
+csc.clear = function()
+{
+  csc.clearChart();
+}
+
+// Remove everything we have in the chart.
+csc.clearChart = function()
+{
+  d3.select("svg").remove();
+  d3.selectAll(".d3-tip").remove();
+  d3.selectAll(".library-select-title").remove();
+  d3.selectAll(".library-select-div").remove();
+}
+
+// Build the chart and display it on screen.
+csc.buildChart = function()
+{
+  var lineResults = [];
+  for (i = 0; i < csc.libraries.length; i++)
+  {
+    lineResults.push(csc.active_libraries[csc.libraries[i]] ? csc.libraryPoints(csc.libraries[i]) : []);
+  }
+  var points = lineResults.reduce(function(p, c) { return p.concat(c); }, []);
+  if (points.length == 0) { return; }
+
+  // Both axes use a log scale, so the slope of each line is the exponent.
+  var size_scale = d3.scale.log()
+      .domain([d3.min(points, function(d) { return d[0]; }), d3.max(points, function(d) { return d[0]; })])
+      .range([0, width]);
+  var runtime_scale = d3.scale.log()
+      .domain([d3.min(points, function(d) { return d[1]; }), d3.max(points, function(d) { return d[1]; })])
+      .range([height, 0]);
+
+  // Set up axes.
+  var xAxis = d3.svg.axis().scale(size_scale).orient("bottom").ticks(5, d3.format(",d"));
+  var yAxis = d3.svg.axis().scale(runtime_scale).orient("left").ticks(5, d3.format(".2s"));
+
+  // Create svg object.
+  var svg = d3.select(".svgholder").append("svg")
+      .attr("width", width + margin.left + margin.right)
+      .attr("height", height + margin.top + margin.bottom)
+      .append("g")
+      .attr("transform", "translate(" + margin.left + "," + margin.top + ")");
+
+  // Add x axis.
+  svg.append("g").attr("id", "xaxis")
+      .attr("class", "x axis")
+      .attr("transform", "translate(0, " + height + ")")
+      .call(xAxis)
+      .append("text")
+      .attr("x", width)
+      .attr("y", -6)
+      .style("text-anchor", "end")
+      .text(csc.dimension == "rows" ? "Instances" : "Attributes");
+
+  // Add y axis.
+  svg.append("g")
+      .attr("class", "y axis")
+      .call(yAxis)
+      .append("text")
+      .attr("transform", "rotate(-90)")
+      .attr("y", 6)
+      .attr("dy", ".71em")
+      .style("text-anchor", "end")
+      .text("Runtime (s)");
+
+  // Create tooltips.
+  var tip = d3.tip()
+      .attr("class", "d3-tip")
+      .offset([-10, 0])
+      .html(function(d) {
+          return "<strong>" + d[2] + "; n = " + d[0] + ":</strong> <span style='color:yellow'>" + d[1].toFixed(3) + "s</span>"; }
+      );
+  svg.call(tip);
+
+  // Add all of the data points.
+  var lineFunc = d3.svg.line()
+      .x(function(d) { return size_scale(d[0]); })
+      .y(function(d) { return runtime_scale(d[1]); });
+
+  for (i = 0; i < lineResults.length; i++)
+  {
+    if (lineResults[i].length == 0)
+      continue;
+
+    svg.append('svg:path')
+        .attr('d', lineFunc(lineResults[i]))
+        .attr('stroke', color(csc.exponents[csc.libraries[i]][0]))
+        .attr('stroke-width', 2)
+        .attr('fill', 'none');
+    svg.selectAll("dot").data(lineResults[i]).enter().append("circle")
+        .attr("r", 4)
+        .attr("cx", function(d) { return size_scale(d[0]); })
+        .attr("cy", function(d) { return runtime_scale(d[1]); })
+        .attr('fill', color(csc.exponents[csc.libraries[i]][0]))
+        .on('mouseover', tip.show)
+        .on('mouseout', tip.hide);
+  }
+
+  // Create the library selector, the label contains the fitted exponent.
+  var librarySelectTitle = d3.select(".legendholder").append("div")
+      .attr("class", "library-select-title");
+  librarySelectTitle.append("div")
+      .attr("class", "library-select-title-text")
+      .text("Libraries (time ~ n^k):");
+
+  var libraryDivs = d3.select(".legendholder").selectAll("input")
+      .data(csc.libraries)
+      .enter()
+      .append("div")
+      .attr("class", "library-select-div")
+      .attr("id", function(d) { return d + '-library-checkbox-div'; });
+
+  libraryDivs.append("label")
+      .attr('for', function(d) { return d + '-library-checkbox'; })
+      .style('background', function(d) { return color(csc.exponents[d][0]); })
+      .attr('class', 'library-select-color');
+  libraryDivs.append("input")
+      .property("checked", function(d) { return csc.active_libraries[d]; })
+      .attr("type", "checkbox")
+      .attr("id", function(d) { return d + '-library-checkbox'; })
+      .attr('class', 'library-select-box')
+      .attr("onClick", function(d, i) { return "csc.toggleLibrary(\"" + d + "\");"; });
+
+  libraryDivs.append("label")
+      .attr('for', function(d) { return d + '-library-checkbox'; })
+      .attr('class', 'library-select-label')
+      .text(function(d) { return d + ": k = " + csc.exponents[d][1].toFixed(2) + " (r2 " + csc.exponents[d][2].toFixed(2) + ")"; });
+}
+
+// Toggle a library to on or off.
+csc.toggleLibrary = function(library)
+{
+  csc.active_libraries[library] = !csc.active_libraries[library];
+
+  clearChart();
+  buildChart();
+}
@@ -0,0 +1,334 @@
+// Define namespace: ptc = phase-timing-comparison.
+var ptc = ptc = ptc || {};
+
+ptc.method_name = ""; // Name of currently selected method.
+ptc.param_name = ""; // Name of currently selected parameters.
+ptc.dataset_name = ""; // Name of currently selected dataset.
+ptc.libraries = [];
+ptc.phases = [];
+ptc.active_phases = {};
+ptc.results = [];
+
+// The total time contains the other phases, it is not stacked.
+ptc.total_phase = "total_time";
+// The part of the total time that isn't covered by a named phase.
+ptc.other_phase = "other";
+
+// Static bindings of phase names to colors.
+ptc.color = d3.scale.category10();
+
+// This chart type has been selected.  What do we do now?
+ptc.onTypeSelect = function()
+{
+  // The user needs to be able to select a method, parameters and a dataset.
+  var selectHolder = d3.select(".selectholder");
+  selectHolder.append("label")
+      .attr("for", "method_select")
+      .attr("class", "method-select-label")
+      .text("Select method:");
+  selectHolder.append("select")
+      .attr("id", "method_select")
+      .attr("onchange", "ptc.methodSelect()");
+  selectHolder.append("label")
+      .attr("for", "param_select")
+      .attr("class", "param-select-label")
+      .text("Select parameters:");
+  selectHolder.append("select")
+      .attr("id", "param_select")
+      .attr("onchange", "ptc.paramSelect()");
+  selectHolder.append("br");
+  selectHolder.append("label")
+      .attr("for", "main_dataset_select")
+      .attr("class", "main-dataset-select-label")
+      .text("Select dataset:");
+  selectHolder.append("select")
+      .attr("id", "main_dataset_select")
+      .attr("onchange", "ptc.datasetSelect()");
+
+  ptc.listMethods();
+}
+
+// List the methods with phase timings.
+ptc.listMethods = function()
+{
+  var methods = db.exec("SELECT DISTINCT methods.name FROM methods, phase_timings WHERE methods.id == phase_timings.method_id ORDER BY name;");
+  var method_select_box = document.getElementById("method_select");
+
+  // Remove old things.
+  clearSelectBox(method_select_box);
+  clearSelectBox(document.getElementById("param_select"));
+  clearSelectBox(document.getElementById("main_dataset_select"));
+  if (methods.length == 0) { return; }
+
+  // Add new things.
+  for (i = 0; i < methods[0].values.length; i++)
+  {
+    var new_option = document.createElement("option");
+    new_option.text = methods[0].values[i];
+    method_select_box.add(new_option);
+  }
+  method_select_box.selectedIndex = -1;
+}
+
+// Called when the user selects a method.
+ptc.methodSelect = function()
+{
+  var method_select_box = document.getElementById("method_select");
+  ptc.method_name = method_select_box.options[method_select_box.selectedIndex].text;
+
+  var sqlstr = "SELECT methods.parameters, COUNT(DISTINCT phase_timings.libary_id) FROM methods, phase_timings WHERE methods.name == '" + ptc.method_name + "' AND methods.id == phase_timings.method_id GROUP BY methods.parameters;";
+  var params = db.exec(sqlstr);
+
+  // Loop through results and fill the second list box.
+  var param_select_box = document.getElementById("param_select");
+  clearSelectBox(param_select_box);
+  clearSelectBox(document.getElementById("main_dataset_select"));
+  for (i = 0; i < params[0].values.length; i++)
+  {
+    var new_option = document.createElement("option");
+    if (params[0].values[i][0])
+    {
+      new_option.text = params[0].values[i][0] + " (" + params[0].values[i][1] + " libraries)";
+    }
+    else
+    {
+      new_option.text = "[no parameters] (" + params[0].values[i][1] + " libraries)";
+    }
+    param_select_box.add(new_option);
+  }
+  param_select_box.selectedIndex = -1;
+}
+
+// Called when a set of parameters is selected.
+ptc.paramSelect = function()
+{
+  var param_select_box = document.getElementById("param_select");
+  var param_name_full = param_select_box.options[param_select_box.selectedIndex].text;
+
+  // Parse out actual parameters.
+  ptc.param_name = param_name_full.split("(")[0].replace(/^\s+|\s+$/g, '');
+  if (ptc.param_name == "[no parameters]") { ptc.param_name = ""; }
+
+  var sqlstr = "SELECT DISTINCT datasets.name FROM phase_timings, datasets, methods WHERE phase_timings.dataset_id == datasets.id AND phase_timings.method_id == methods.id " +
+    "AND methods.name == '" + ptc.method_name + "' AND methods.parameters == '" + ptc.param_name + "' ORDER BY datasets.name;";
+  var datasets = db.exec(sqlstr);
+
+  var dataset_select_box = document.getElementById("main_dataset_select");
+  clearSelectBox(dataset_select_box);
+  for (i = 0; i < datasets[0].values.length; i++)
+  {
+    var new_option = document.createElement("option");
+    new_option.text = datasets[0].values[i][0];
+    dataset_select_box.add(new_option);
+  }
+  dataset_select_box.selectedIndex = -1;
+}
+
+// Called when a dataset is selected.  Now we are ready to draw the chart.
+ptc.datasetSelect = function()
+{
+  var dataset_select_box = document.getElementById("main_dataset_select");
+  ptc.dataset_name = dataset_select_box.options[dataset_select_box.selectedIndex].text;
+
+  // Use the mean over all trials of the latest build of each library.
+  var sqlstr = "SELECT libraries.name, phase_timings.phase, AVG(phase_timings.time) FROM phase_timings, datasets, methods, libraries " +
+    "WHERE phase_timings.dataset_id == datasets.id AND phase_timings.method_id == methods.id AND libraries.id == phase_timings.libary_id " +
+    "AND methods.name == '" + ptc.method_name + "' AND methods.parameters == '" + ptc.param_name + "' AND datasets.name == '" + ptc.dataset_name + "' " +
+    "AND phase_timings.build_id == (SELECT MAX(builds.id) FROM builds WHERE builds.libary_id == phase_timings.libary_id) " +
+    "GROUP BY libraries.name, phase_timings.phase ORDER BY libraries.name, MIN(phase_timings.id);";
+  ptc.results = ptc.stackResults(db.exec(sqlstr));
+
+  // By default, every phase is active.
+  ptc.active_phases = {};
+  for (i = 0; i < ptc.phases.length; i++)
+  {
+    ptc.active_phases[ptc.phases[i]] = true;
+  }
+
+  clearChart();
+  buildChart();
+}
+
+// Convert the [library, phase, time] rows into one list of [library, phase,
+// time] segments per library.  The total time isn't stacked; the part of the
+// total time that isn't covered by the named phases is shown as 'other'.
+ptc.stackResults = function(rows)
+{
+  ptc.libraries = [];
+  ptc.phases = [];
+  if (rows.length == 0) { return []; }
+
+  var results = {};
+  var totals = {};
+  for (i = 0; i < rows[0].values.length; i++)
+  {
+    var row = rows[0].values[i];
+    if (ptc.libraries.indexOf(row[0]) < 0)
+    {
+      ptc.libraries.push(row[0]);
+      results[row[0]] = [];
+    }
+
+    if (row[1] == ptc.total_phase)
+    {
+      totals[row[0]] = row[2];
+      continue;
+    }
+
+    results[row[0]].push([row[0], row[1], row[2]]);
+    if (ptc.phases.indexOf(row[1]) < 0) { ptc.phases.push(row[1]); }
+  }
+
+  for (i = 0; i < ptc.libraries.length; i++)
+  {
+    var library = ptc.libraries[i];
+    var sum = results[library].reduce(function(p, c) { return p + c[2]; }, 0);
+    if (library in totals && totals[library] - sum > 1e-9)
+    {
+      results[library].push([library, ptc.other_phase, totals[library] - sum]);
+      if (ptc.phases.indexOf(ptc.other_phase) < 0) { ptc.phases.push(ptc.other_phase); }
+    }
+  }
+  ptc.color.domain(ptc.phases);
+
+  return ptc.libraries.map(function(d) { return results[d]; });
+}
+
+// Remove everything on the page that belongs to us.
+ptc.clear = function()
+{
+  ptc.clearChart();
+}
+
+// Remove everything we have in the chart.
+ptc.clearChart = function()
+{
+  d3.select("svg").remove();
+  d3.selectAll(".d3-tip").remove();
+  d3.selectAll(".library-select-title").remove();
+  d3.selectAll(".library-select-div").remove();
+}
+
+// Build the chart and display it on screen.
+ptc.buildChart = function()
+{
+  // Compute the stacked segments [library, phase, time, start] of the active
+  // phases.
+  var segments = [];
+  var max_time = 0;
+  for (i = 0; i < ptc.results.length; i++)
+  {
+    var start = 0;
+    for (j = 0; j < ptc.results[i].length; j++)
+    {
+      var d = ptc.results[i][j];
+      if (!ptc.active_phases[d[1]]) { continue; }
+
+      segments.push([d[0], d[1], d[2], start]);
+      start += d[2];
+    }
+    max_time = Math.max(max_time, start);
+  }
+
+  // Set up scales.
+  var library_scale = d3.scale.ordinal()
+      .domain(ptc.libraries)
+      .rangeRoundBands([0, width], .3);
+  var time_scale = d3.scale.linear()
+      .domain([0, max_time || 1])
+      .range([height, 0]);
+
+  // Set up axes.
+  var xAxis = d3.svg.axis().scale(library_scale).orient("bottom");
+  var yAxis = d3.svg.axis().scale(time_scale).orient("left").tickFormat(d3.format(".2f"));
+
+  // Create svg object.
+  var svg = d3.select(".svgholder").append("svg")
+      .attr("width", width + margin.left + margin.right)
+      .attr("height", height + margin.top + margin.bottom)
+      .append("g")
+      .attr("transform", "translate(" + margin.left + "," + margin.top + ")");
+
+  // Add x axis.
+  svg.append("g").attr("id", "xaxis")
+      .attr("class", "x axis")
+      .attr("transform", "translate(0, " + height + ")")
+      .call(xAxis)
+      .selectAll("text")
+      .style("text-anchor", "end")
+      .attr("dx", "-.8em")
+      .attr("dy", ".15em")
+      .attr("transform", "rotate(-65)");
+
+  // Add y axis.
+  svg.append("g")
+      .attr("class", "y axis")
+      .call(yAxis)
+      .append("text")
+      .attr("transform", "rotate(-90)")
+      .attr("y", 6)
+      .attr("dy", ".71em")
+      .style("text-anchor", "end")
+      .text("Runtime (s)");
+
+  // Create tooltips.
+  var tip = d3.tip()
+      .attr("class", "d3-tip")
+      .offset([-10, 0])
+      .html(function(d) {
+          return "<strong>" + d[0] + "; " + d[1] + ":</strong> <span style='color:yellow'>" + d[2].toFixed(4) + "s</span>"; }
+      );
+  svg.call(tip);
+
+  // Add the stacked bars.
+  svg.selectAll(".phase-bar")
+      .data(segments)
+      .enter().append("rect")
+      .attr("class", "phase-bar")
+      .attr("x", function(d) { return library_scale(d[0]); })
+      .attr("width", library_scale.rangeBand())
+      .attr("y", function(d) { return time_scale(d[3] + d[2]); })
+      .attr("height", function(d) { return time_scale(d[3]) - time_scale(d[3] + d[2]); })
+      .style("fill", function(d) { return ptc.color(d[1]); })
+      .on('mouseover', tip.show)
+      .on('mouseout', tip.hide);
+
+  // Create the phase selector.
+  var phaseSelectTitle = d3.select(".legendholder").append("div")
+      .attr("class", "library-select-title");
+  phaseSelectTitle.append("div")
+      .attr("class", "library-select-title-text")
+      .text("Phases:");
+
+  var phaseDivs = d3.select(".legendholder").selectAll("input")
+      .data(ptc.phases)
+      .enter()
+      .append("div")
+      .attr("class", "library-select-div")
+      .attr("id", function(d) { return d + '-phase-checkbox-div'; });
+
+  phaseDivs.append("label")
+      .attr('for', function(d) { return d + '-phase-checkbox'; })
+      .style('background', ptc.color)
+      .attr('class', 'library-select-color');
+  phaseDivs.append("input")
+      .property("checked", function(d) { return ptc.active_phases[d]; })
+      .attr("type", "checkbox")
+      .attr("id", function(d) { return d + '-phase-checkbox'; })
+      .attr('class', 'library-select-box')
+      .attr("onClick", function(d, i) { return "ptc.togglePhase(\"" + d + "\");"; });
+
+  phaseDivs.append("label")
+      .attr('for', function(d) { return d + '-phase-checkbox'; })
+      .attr('class', 'library-select-label')
+      .text(function(d) { return d; });
+}
+
+// Toggle a phase to on or off.
+ptc.togglePhase = function(phase)
+{
+  ptc.active_phases[phase] = !ptc.active_phases[phase];
+
+  clearChart();
+  buildChart();
+}
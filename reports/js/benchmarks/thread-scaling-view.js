@@ -0,0 +1,367 @@
+// Define namespace: tsc = thread-scaling-comparison.
+var tsc = tsc = tsc || {};
+
+tsc.method_name = ""; // Name of currently selected method.
+tsc.param_name = ""; // Name of currently selected parameters.
+tsc.dataset_name = ""; // Name of currently selected dataset.
+tsc.mode = "runtime"; // Currently selected y axis (runtime, speedup, efficiency).
+tsc.libraries = [];
+tsc.active_libraries = [];
+tsc.results = [];
+
+// This chart type has been selected.  What do we do now?
+tsc.onTypeSelect = function()
+{
+  // The user needs to be able to select a method, parameters and a dataset.
+  var selectHolder = d3.select(".selectholder");
+  selectHolder.append("label")
+      .attr("for", "method_select")
+      .attr("class", "method-select-label")
+      .text("Select method:");
+  selectHolder.append("select")
+      .attr("id", "method_select")
+      .attr("onchange", "tsc.methodSelect()");
+  selectHolder.append("label")
+      .attr("for", "param_select")
+      .attr("class", "param-select-label")
+      .text("Select parameters:");
+  selectHolder.append("select")
+      .attr("id", "param_select")
+      .attr("onchange", "tsc.paramSelect()");
+  selectHolder.append("br");
+  selectHolder.append("label")
+      .attr("for", "main_dataset_select")
+      .attr("class", "main-dataset-select-label")
+      .text("Select dataset:");
+  selectHolder.append("select")
+      .attr("id", "main_dataset_select")
+      .attr("onchange", "tsc.datasetSelect()");
+  selectHolder.append("label")
+      .attr("for", "mode_select")
+      .attr("class", "param-select-label")
+      .text("Show:");
+  selectHolder.append("select")
+      .attr("id", "mode_select")
+      .attr("onchange", "tsc.modeSelect()");
+
+  tsc.listMethods();
+  tsc.listModes();
+}
+
+// List the y axis modes.
+tsc.listModes = function()
+{
+  var mode_select_box = document.getElementById("mode_select");
+  clearSelectBox(mode_select_box);
+
+  var options = ["runtime", "speedup", "efficiency"];
+  for (i = 0; i < options.length; i++)
+  {
+    var new_option = document.createElement("option");
+    new_option.text = options[i];
+    mode_select_box.add(new_option);
+  }
+  mode_select_box.selectedIndex = 0;
+}
+
+// List the methods with results for more than one thread count.
+tsc.listMethods = function()
+{
+  var methods = db.exec("SELECT DISTINCT methods.name FROM methods, results WHERE methods.id == results.method_id AND results.threads IS NOT NULL ORDER BY name;");
+  var method_select_box = document.getElementById("method_select");
+
+  // Remove old things.
+  clearSelectBox(method_select_box);
+  clearSelectBox(document.getElementById("param_select"));
+  clearSelectBox(document.getElementById("main_dataset_select"));
+  if (methods.length == 0) { return; }
+
+  // Add new things.
+  for (i = 0; i < methods[0].values.length; i++)
+  {
+    var new_option = document.createElement("option");
+    new_option.text = methods[0].values[i];
+    method_select_box.add(new_option);
+  }
+  method_select_box.selectedIndex = -1;
+}
+
+// Called when the user selects a method.
+tsc.methodSelect = function()
+{
+  var method_select_box = document.getElementById("method_select");
+  tsc.method_name = method_select_box.options[method_select_box.selectedIndex].text;
+
+  var sqlstr = "SELECT DISTINCT methods.parameters, results.libary_id, COUNT(DISTINCT results.libary_id) FROM methods, results WHERE methods.name == '" + tsc.method_name + "' AND methods.id == results.method_id AND results.threads IS NOT NULL GROUP BY methods.parameters;";
+  var params = db.exec(sqlstr);
+
+  // Loop through results and fill the second list box.
+  var param_select_box = document.getElementById("param_select");
+  clearSelectBox(param_select_box);
+  clearSelectBox(document.getElementById("main_dataset_select"));
+  for (i = 0; i < params[0].values.length; i++)
+  {
+    var new_option = document.createElement("option");
+    if (params[0].values[i][0])
+    {
+      new_option.text = params[0].values[i][0] + " (" + params[0].values[i][2] + " libraries)";
+    }
+    else
+    {
+      new_option.text = "[no parameters] (" + params[0].values[i][2] + " libraries)";
+    }
+    param_select_box.add(new_option);
+  }
+  param_select_box.selectedIndex = -1;
+}
+
+// Called when a set of parameters is selected.
+tsc.paramSelect = function()
+{
+  var param_select_box = document.getElementById("param_select");
+  var param_name_full = param_select_box.options[param_select_box.selectedIndex].text;
+
+  // Parse out actual parameters.
+  tsc.param_name = param_name_full.split("(")[0].replace(/^\s+|\s+$/g, '');
+  if (tsc.param_name == "[no parameters]") { tsc.param_name = ""; }
+
+  var sqlstr = "SELECT DISTINCT datasets.name FROM results, datasets, methods WHERE results.dataset_id == datasets.id AND results.method_id == methods.id " +
+    "AND methods.name == '" + tsc.method_name + "' AND methods.parameters == '" + tsc.param_name + "' AND results.threads IS NOT NULL ORDER BY datasets.name;";
+  var datasets = db.exec(sqlstr);
+
+  var dataset_select_box = document.getElementById("main_dataset_select");
+  clearSelectBox(dataset_select_box);
+  for (i = 0; i < datasets[0].values.length; i++)
+  {
+    var new_option = document.createElement("option");
+    new_option.text = datasets[0].values[i][0];
+    dataset_select_box.add(new_option);
+  }
+  dataset_select_box.selectedIndex = -1;
+}
+
+// Called when a dataset is selected.  Now we are ready to draw the chart.
+tsc.datasetSelect = function()
+{
+  var dataset_select_box = document.getElementById("main_dataset_select");
+  tsc.dataset_name = dataset_select_box.options[dataset_select_box.selectedIndex].text;
+
+  // Use the results of the latest build of each library.
+  var sqlstr = "SELECT results.threads, results.time, results.var, libraries.name FROM results, datasets, methods, libraries " +
+    "WHERE results.dataset_id == datasets.id AND results.method_id == methods.id AND libraries.id == results.libary_id " +
+    "AND methods.name == '" + tsc.method_name + "' AND methods.parameters == '" + tsc.param_name + "' AND datasets.name == '" + tsc.dataset_name + "' " +
+    "AND results.threads IS NOT NULL AND results.build_id == (SELECT MAX(builds.id) FROM builds WHERE builds.libary_id == results.libary_id) " +
+    "ORDER BY libraries.name, results.threads;";
+  tsc.results = db.exec(sqlstr);
+
+  // Obtain unique list of libraries.
+  tsc.libraries = tsc.results[0].values.map(function(d) { return d[3]; }).reduce(function(p, c) { if(p.indexOf(c) < 0) p.push(c); return p; }, []);
+
+  // By default, everything is active.
+  tsc.active_libraries = {};
+  for (i = 0; i < tsc.libraries.length; i++)
+  {
+    tsc.active_libraries[tsc.libraries[i]] = true;
+  }
+
+  clearChart();
+  buildChart();
+}
+
+// Called when the y axis mode is changed.
+tsc.modeSelect = function()
+{
+  var mode_select_box = document.getElementById("mode_select");
+  tsc.mode = mode_select_box.options[mode_select_box.selectedIndex].text;
+
+  if (tsc.results.length > 0)
+  {
+    clearChart();
+    buildChart();
+  }
+}
+
+// Compute the points [threads, value, runtime, library] for a library.  The
+// speedup and the parallel efficiency are relative to the smallest thread
+// count with a successful run: speedup = T(p0) / T(p), efficiency =
+// p0 * T(p0) / (p * T(p)).
+tsc.libraryPoints = function(library)
+{
+  var runs = tsc.results[0].values.reduce(function(p, c) { if(c[3] == library && typeof c[1] == "number" && c[1] > 0) { p.push(c); } return p; }, []);
+  if (runs.length == 0) { return []; }
+
+  var base = runs[0];
+  return runs.map(function(d) {
+      var value = d[1];
+      if (tsc.mode == "speedup") { value = base[1] / d[1]; }
+      else if (tsc.mode == "efficiency") { value = (base[0] * base[1]) / (d[0] * d[1]); }
+      return [d[0], value, d[1], d[3]];
+  });
+}
+
+// Remove everything on the page that belongs to us.
+tsc.clear = function()
+{
+  tsc.clearChart();
+}
+
+// Remove everything we have in the chart.
+tsc.clearChart = function()
+{
+  d3.select("svg").remove();
+  d3.selectAll(".d3-tip").remove();
+  d3.selectAll(".library-select-title").remove();
+  d3.selectAll(".library-select-div").remove();
+}
+
+// Build the chart and display it on screen.
+tsc.buildChart = function()
+{
+  var lineResults = [];
+  for (i = 0; i < tsc.libraries.length; i++)
+  {
+    lineResults.push(tsc.active_libraries[tsc.libraries[i]] ? tsc.libraryPoints(tsc.libraries[i]) : []);
+  }
+  var points = lineResults.reduce(function(p, c) { return p.concat(c); }, []);
+
+  // Set up scales; the thread counts are usually powers of two.
+  var max_threads = d3.max(tsc.results[0].values, function(d) { return d[0]; });
+  var thread_scale = d3.scale.log().base(2)
+      .domain([d3.min(tsc.results[0].values, function(d) { return d[0]; }), Math.max(max_threads, 2)])
+      .range([0, width]);
+
+  var max_value = d3.max(points, function(d) { return d[1]; }) || 1;
+  if (tsc.mode == "speedup") { max_value = Math.max(max_value, max_threads); }
+  else if (tsc.mode == "efficiency") { max_value = Math.max(max_value, 1); }
+  var value_scale = d3.scale.linear().domain([0, max_value]).range([height, 0]);
+
+  // Set up axes.
+  var xAxis = d3.svg.axis().scale(thread_scale).orient("bottom")
+      .tickValues(tsc.results[0].values.map(function(d) { return d[0]; }).reduce(function(p, c) { if(p.indexOf(c) < 0) p.push(c); return p; }, []))
+      .tickFormat(d3.format("d"));
+  var yAxis = d3.svg.axis().scale(value_scale).orient("left").tickFormat(d3.format(".2f"));
+
+  var label = "Runtime (s)";
+  if (tsc.mode == "speedup") { label = "Speedup"; }
+  else if (tsc.mode == "efficiency") { label = "Parallel efficiency"; }
+
+  // Create svg object.
+  var svg = d3.select(".svgholder").append("svg")
+      .attr("width", width + margin.left + margin.right)
+      .attr("height", height + margin.top + margin.bottom)
+      .append("g")
+      .attr("transform", "translate(" + margin.left + "," + margin.top + ")");
+
+  // Add x axis.
+  svg.append("g").attr("id", "xaxis")
+      .attr("class", "x axis")
+      .attr("transform", "translate(0, " + height + ")")
+      .call(xAxis)
+      .append("text")
+      .attr("x", width)
+      .attr("y", -6)
+      .style("text-anchor", "end")
+      .text("Threads");
+
+  // Add y axis.
+  svg.append("g")
+      .attr("class", "y axis")
+      .call(yAxis)
+      .append("text")
+      .attr("transform", "rotate(-90)")
+      .attr("y", 6)
+      .attr("dy", ".71em")
+      .style("text-anchor", "end")
+      .text(label);
+
+  // Add the ideal scaling reference line.
+  if (tsc.mode != "runtime" && points.length > 0)
+  {
+    var min_threads = thread_scale.domain()[0];
+    var ideal = tsc.mode == "speedup" ?
+        [[min_threads, 1], [max_threads, max_threads / min_threads]] :
+        [[min_threads, 1], [max_threads, 1]];
+    svg.append('svg:path')
+        .attr('d', d3.svg.line()
+            .x(function(d) { return thread_scale(d[0]); })
+            .y(function(d) { return value_scale(d[1]); })(ideal))
+        .attr('stroke', '#888888')
+        .attr('stroke-width', 1)
+        .attr('stroke-dasharray', '4,4')
+        .attr('fill', 'none');
+  }
+
+  // Create tooltips.
+  var tip = d3.tip()
+      .attr("class", "d3-tip")
+      .offset([-10, 0])
+      .html(function(d) {
+          var text = "<strong>" + d[3] + "; " + d[0] + " threads:</strong> <span style='color:yellow'>" + d[2].toFixed(2) + "s";
+          if (tsc.mode != "runtime") { text += " (" + tsc.mode + " " + d[1].toFixed(2) + ")"; }
+          return text + "</span>"; }
+      );
+  svg.call(tip);
+
+  // Add all of the data points.
+  var lineFunc = d3.svg.line()
+      .x(function(d) { return thread_scale(d[0]); })
+      .y(function(d) { return value_scale(d[1]); });
+
+  for (i = 0; i < lineResults.length; i++)
+  {
+    if (lineResults[i].length == 0)
+      continue;
+
+    svg.append('svg:path')
+        .attr('d', lineFunc(lineResults[i]))
+        .attr('stroke', color(tsc.libraries[i]))
+        .attr('stroke-width', 2)
+        .attr('fill', 'none');
+    svg.selectAll("dot").data(lineResults[i]).enter().append("circle")
+        .attr("r", 4)
+        .attr("cx", function(d) { return thread_scale(d[0]); })
+        .attr("cy", function(d) { return value_scale(d[1]); })
+        .attr('fill', function(d) { return color(d[3]); })
+        .on('mouseover', tip.show)
+        .on('mouseout', tip.hide);
+  }
+
+  // Create the library selector.
+  var librarySelectTitle = d3.select(".legendholder").append("div")
+      .attr("class", "library-select-title");
+  librarySelectTitle.append("div")
+      .attr("class", "library-select-title-text")
+      .text("Libraries:");
+
+  var libraryDivs = d3.select(".legendholder").selectAll("input")
+      .data(tsc.libraries)
+      .enter()
+      .append("div")
+      .attr("class", "library-select-div")
+      .attr("id", function(d) { return d + '-library-checkbox-div'; });
+
+  libraryDivs.append("label")
+      .attr('for', function(d) { return d + '-library-checkbox'; })
+      .style('background', color)
+      .attr('class', 'library-select-color');
+  libraryDivs.append("input")
+      .property("checked", function(d) { return tsc.active_libraries[d]; })
+      .attr("type", "checkbox")
+      .attr("id", function(d) { return d + '-library-checkbox'; })
+      .attr('class', 'library-select-box')
+      .attr("onClick", function(d, i) { return "tsc.toggleLibrary(\"" + d + "\");"; });
+
+  libraryDivs.append("label")
+      .attr('for', function(d) { return d + '-library-checkbox'; })
+      .attr('class', 'library-select-label')
+      .text(function(d) { return d; });
+}
+
+// Toggle a library to on or off.
+tsc.toggleLibrary = function(library)
+{
+  tsc.active_libraries[library] = !tsc.active_libraries[library];
+
+  clearChart();
+  buildChart();
+}
@@ -0,0 +1,128 @@
+'''
+  @file bindings_unit_test.py
+
+  Test for the in-process mlpack backend.
+'''
+
+import unittest
+
+import os, sys, inspect, shutil, subprocess, tempfile
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from bindings import *
+
+import numpy as np
+
+# An 'mlpack_nbc' executable which prints the option table.
+EXECUTABLE = """#!/bin/sh
+if [ "$1" = "-h" ]; then
+  cat <<EOF
+Parametric Naive Bayes Classifier
+
+Required input options:
+
+  --training_file (-t) [string]
+                                A file containing the training set.
+Optional input options:
+
+  --incremental_variance (-I)   The variance of each class will be calculated
+                                incrementally.
+  --test_file (-T) [string]     A file containing the test set.
+  --verbose (-v)                Display informational messages.
+Optional output options:
+
+  --output_file (-o) [string]   The file in which the predicted labels for the
+                                test set will be written.  Default value
+                                'output.csv'.
+EOF
+  exit 0
+fi
+echo "[INFO ]   total_time: 1.500000s"
+"""
+
+# An 'mlpack' module with the nbc binding; the timer is printed to the file
+# descriptor like the library does.
+MODULE = """
+import os
+def nbc(training=None, test=None, incremental_variance=False, verbose=False,
+    copy_all_inputs=True):
+  assert not copy_all_inputs and verbose and incremental_variance
+  os.write(1, b"[INFO ]   training: 0.250000s\\n")
+  return {"output": test[:, 0] * 2}
+"""
+
+'''
+Test the mlpack Python bindings backend.
+'''
+class MlpackBindings_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.executable = os.path.join(self.directory, "mlpack_nbc")
+    with open(self.executable, "w") as fid:
+      fid.write(EXECUTABLE)
+    os.chmod(self.executable, 0o755)
+    with open(os.path.join(self.directory, "mlpack.py"), "w") as fid:
+      fid.write(MODULE)
+
+    self.data = os.path.join(self.directory, "data.csv")
+    np.savetxt(self.data, np.arange(6.0).reshape(3, 2), delimiter=",")
+
+    sys.path.insert(0, self.directory)
+    Executables.cacheFile = os.path.join(self.directory, "executables.json")
+    Executables.cache = None
+    self.cmd = [self.executable, "-t", self.data, "-T", self.data, "-v", "-I"]
+
+  def tearDown(self):
+    sys.path.remove(self.directory)
+    sys.modules.pop("mlpack", None)
+    MlpackBindings.Configure(False)
+    Executables.cache = None
+    MlpackBindings.data = {}
+    shutil.rmtree(self.directory)
+
+  '''
+  Test the translation of the command line options.
+  '''
+  def test_Parameters(self):
+    params = MlpackBindings.Parameters(self.cmd + ["-o", "output.csv"])
+    self.assertEqual(sorted(params), ["copy_all_inputs",
+        "incremental_variance", "test", "training", "verbose"])
+    self.assertTrue(params["training"] is params["test"])
+    self.assertTrue(params["training"].flags["C_CONTIGUOUS"])
+
+    self.assertEqual(MlpackBindings.Parameters(self.cmd + ["-x", "1"]), None)
+    self.assertEqual(MlpackBindings.Parameters(self.cmd + ["-o"]), None)
+
+  '''
+  Test that the binding is called and the outputs are returned in memory.
+  '''
+  def test_Run(self):
+    MlpackBindings.Configure(True)
+    timers, outputs = MlpackBindings.Run(self.cmd, 10)
+
+    self.assertEqual(timers["training"], 0.25)
+    self.assertEqual(timers["loading_data"], 0.0)
+    self.assertTrue(timers["total_time"] < 1.5)
+    self.assertEqual(list(MlpackBindings.Output(outputs, ["predictions",
+        "output"], "output.csv")), [0.0, 4.0, 8.0])
+
+  '''
+  Test that the executable is used if the backend is disabled.
+  '''
+  def test_Executable(self):
+    timers, outputs = MlpackBindings.Run(self.cmd, 10)
+    self.assertEqual(timers["total_time"], 1.5)
+    self.assertEqual(outputs, None)
+
+if __name__ == '__main__':
+  unittest.main()
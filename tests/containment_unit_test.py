@@ -0,0 +1,233 @@
+'''
+  @file containment_unit_test.py
+
+  Test for the process group containment.
+'''
+
+import unittest
+
+import os, sys, inspect, tempfile, shutil, subprocess, time
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from containment import *
+from timers import *
+from timer import timeout
+
+'''
+Test the process group containment.
+'''
+class ProcessGroup_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.pidFile = os.path.join(self.directory, "pid")
+    self.load = ProcessGroup.QUIET_LOAD
+    ProcessGroup.QUIET_LOAD = 10000
+
+  def tearDown(self):
+    ProcessGroup.QUIET_LOAD = self.load
+    ProcessGroup.killed = []
+    shutil.rmtree(self.directory)
+
+  '''
+  Return the pid written by the test command.
+  '''
+  def Pid(self):
+    for i in range(50):
+      if os.path.isfile(self.pidFile) and os.path.getsize(self.pidFile):
+        break
+      time.sleep(0.1)
+    with open(self.pidFile) as fid:
+      return int(fid.read())
+
+  '''
+  Check whether the given process is running (zombies are dead).
+  '''
+  def Running(self, pid):
+    for i in range(50):
+      try:
+        with open("/proc/" + str(pid) + "/stat") as fid:
+          if fid.read().rsplit(")", 1)[1].split()[0] == "Z":
+            return False
+      except IOError:
+        return False
+      time.sleep(0.1)
+    return True
+
+  '''
+  Test that the grandchildren of a timed out command are killed, also if they
+  started their own session.
+  '''
+  def test_Timeout(self):
+    for prefix in ["", "setsid "]:
+      cmd = ["sh", "-c", prefix + "sleep 30 > /dev/null 2>&1 & echo $! > " +
+          self.pidFile + "; wait"]
+      self.assertRaises(subprocess.TimeoutExpired, Timers.Run, cmd, 1)
+      self.assertFalse(self.Running(self.Pid()))
+      os.remove(self.pidFile)
+
+    self.assertTrue(ProcessGroup.killed)
+    self.assertTrue(ProcessGroup.Settle())
+    self.assertEqual(ProcessGroup.killed, [])
+
+  '''
+  Test that the processes left by a finished command are killed.
+  '''
+  def test_Orphans(self):
+    cmd = ["sh", "-c", "sleep 30 > /dev/null 2>&1 & echo $! > " +
+        self.pidFile + "; echo 'total_time: 1.5s'"]
+    self.assertEqual(Timers.Run(cmd, 10)["total_time"], 1.5)
+    self.assertFalse(self.Running(self.Pid()))
+
+  '''
+  Test that the process tree of the timeout subprocess is killed.
+  '''
+  def test_Subprocess(self):
+    pidFile = self.pidFile
+    def Run(q):
+      process = subprocess.Popen(["sleep", "30"])
+      with open(pidFile, "w") as fid:
+        fid.write(str(process.pid))
+      time.sleep(30)
+
+    self.assertEqual(timeout(Run, 1), -2)
+    self.assertFalse(self.Running(self.Pid()))
+
+'''
+Test the process tree.
+'''
+class Descendants_Test(unittest.TestCase):
+
+  '''
+  Test that the descendants of a process are found.
+  '''
+  def test_Descendants(self):
+    process = subprocess.Popen(["sh", "-c", "sleep 5 & sleep 5; wait"])
+    try:
+      for i in range(50):
+        descendants = ProcessGroup.Descendants(process.pid)
+        if len(descendants) >= 2:
+          break
+        time.sleep(0.05)
+      self.assertEqual(len(descendants), 2)
+
+      # The children files and the scan of all processes agree.
+      children = ProcessGroup.Children(process.pid)
+      if children is not None:
+        self.assertEqual(sorted(children), sorted(descendants))
+    finally:
+      for pid in descendants + [process.pid]:
+        try:
+          os.kill(pid, 9)
+        except OSError:
+          pass
+      process.wait()
+
+'''
+Test the memory limit.
+'''
+class MemoryLimit_Test(unittest.TestCase):
+
+  def tearDown(self):
+    MemoryLimit.Configure(None)
+
+  '''
+  Test that a command over the limit is reported as out of memory.
+  '''
+  def test_Command(self):
+    MemoryLimit.Configure(64)
+    cmd = [sys.executable, "-c", "b = bytearray(%d << 20); " +
+        "print('total_time: 1.0s')"]
+
+    self.assertEqual(Timers.Run([cmd[0], cmd[1], cmd[2] % 8])["total_time"],
+        1.0)
+    self.assertFalse(MemoryLimit.oom)
+    self.assertEqual(MemoryLimit.Check(-1), -1)
+
+    self.assertRaises(subprocess.CalledProcessError, Timers.Run, [cmd[0],
+        cmd[1], cmd[2] % 512])
+    self.assertTrue(MemoryLimit.oom)
+    self.assertTrue(MemoryLimit.peak > 0)
+    self.assertEqual(MemoryLimit.Check(-1), MemoryLimit.OOM)
+    self.assertEqual(MemoryLimit.Check(-2), -2)
+
+  '''
+  Test that the limit is applied to the timeout subprocess.
+  '''
+  def test_Subprocess(self):
+    def Run(q):
+      data = bytearray(1 << 30)
+      q.put(1.0)
+
+    MemoryLimit.Configure(None)
+    self.assertEqual(MemoryLimit.Start(os.getpid()), None)
+
+    MemoryLimit.Configure(256)
+    self.assertEqual(timeout(Run, 60), -1)
+    self.assertTrue(MemoryLimit.oom)
+
+  '''
+  Test that the first unsuccessful trial selects the time label, even after a
+  successful trial.
+  '''
+  def test_Trials(self):
+    from jobs import RunTasks, TimeLabel
+
+    self.assertEqual(TimeLabel([1.0, 2.0], 60, 2), "1.500000")
+    self.assertEqual(TimeLabel([1.0, -2], 60, 3), ">60")
+    self.assertEqual(TimeLabel([1.0, MemoryLimit.OOM], 60, 3), "oom")
+    self.assertEqual(TimeLabel([1.0, -1], 60, 3), "failure")
+
+    # The second trial exceeds the memory limit, the third isn't executed.
+    sizes = [8, 512, 8]
+    class Script(object):
+      def __init__(self, dataset, timeout=0, verbose=True):
+        pass
+
+      def RunTiming(self, options):
+        try:
+          return Timers.Run([sys.executable, "-c", "b = bytearray(%d << 20)"
+              "; print('total_time: 1.0s')" % sizes.pop(0)])["total_time"]
+        except subprocess.CalledProcessError:
+          return -1
+
+    MemoryLimit.Configure(64)
+    result = RunTasks({"options": "", "timeout": 60, "tasks": ["timing"],
+        "trials": 3}, Script, "dataset.csv")
+    self.assertEqual(result["time"], "oom")
+    self.assertEqual(sizes, [8])
+
+  '''
+  Test that a trial keeps the named timers only if it was successful.
+  '''
+  def test_RunTrial(self):
+    from jobs import RunTrial
+
+    class Script(object):
+      timers = {"total_time": 1.0}
+
+      def RunTiming(self, options):
+        return float(options) if options else -1
+
+    MemoryLimit.Configure(None)
+    MemoryLimit.oom = False
+    time, timers, memory, interference = RunTrial(Script(), "1.0")
+    self.assertEqual(time, 1.0)
+    self.assertEqual(timers, {"total_time": 1.0})
+    self.assertEqual(memory, MemoryLimit.peak)
+
+    time, timers, memory, interference = RunTrial(Script(), "")
+    self.assertEqual(time, -1)
+    self.assertEqual(timers, None)
+
+if __name__ == '__main__':
+  unittest.main()
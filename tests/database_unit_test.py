@@ -0,0 +1,135 @@
+'''
+  @file database_unit_test.py
+
+  Test for the database merge.
+'''
+
+import unittest
+
+import os, sys, inspect, tempfile, shutil
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from database import *
+
+'''
+Test the database merge.
+'''
+class Merge_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  '''
+  Create a database with a single result.
+  '''
+  def CreateDatabase(self, name, library, dataset, time, host=None):
+    db = Database(os.path.join(self.directory, name))
+    db.CreateTables()
+    libraryId = db.NewLibrary(library)
+    buildId = db.NewBuild(libraryId)
+    datasetId = db.NewDataset(dataset, 1, 2, 3)
+    methodId = db.NewMethod("PCA", "-d 2", "None")
+    db.NewResult(buildId, libraryId, time, 0, datasetId, methodId)
+    db.NewMetricResult(buildId, libraryId, "{'ACC': 1}", datasetId, methodId)
+    if host:
+      db.NewBuildInfo(buildId, host, "{}")
+    return db
+
+  '''
+  Test that the ids are remapped and the merge is idempotent.
+  '''
+  def test_Merge(self):
+    target = self.CreateDatabase("target.db", "mlpack", "wine", 1.5)
+    self.CreateDatabase("source.db", "shogun", "iris", 2.5, "node1")
+    source = os.path.join(self.directory, "source.db")
+
+    self.assertEqual(target.Merge(source, "other"), 1)
+    self.assertEqual(target.Merge(source, "other"), 0)
+
+    target.cur.execute("SELECT l.name, d.name, m.name, r.time FROM results r " +
+        "JOIN libraries l ON l.id = r.libary_id JOIN datasets d ON " +
+        "d.id = r.dataset_id JOIN methods m ON m.id = r.method_id")
+    self.assertEqual(sorted(target.cur.fetchall()), [
+        ("mlpack", "wine", "PCA", 1.5), ("shogun", "iris", "PCA", 2.5)])
+
+    # The method is shared, the host of the source build is kept.
+    target.cur.execute("SELECT COUNT(*) FROM methods")
+    self.assertEqual(target.cur.fetchall()[0][0], 1)
+    target.cur.execute("SELECT COUNT(*) FROM metrics")
+    self.assertEqual(target.cur.fetchall()[0][0], 2)
+    buildId = target.GetLatestBuildFromLibary(target.GetLibrary(
+        "shogun")[0][0])[0][0]
+    self.assertEqual(target.GetBuildInfo(buildId)[0][0], "node1")
+
+  '''
+  Test that a build without host information gets the given host.
+  '''
+  def test_MergeHost(self):
+    target = self.CreateDatabase("target.db", "mlpack", "wine", 1.5)
+    self.CreateDatabase("source.db", "mlpack", "wine", 3.0)
+
+    self.assertEqual(target.Merge(os.path.join(self.directory, "source.db"),
+        "node2"), 1)
+    target.cur.execute("SELECT host FROM build_info")
+    self.assertEqual(target.cur.fetchall(), [("node2",)])
+    target.cur.execute("SELECT COUNT(DISTINCT dataset_id) FROM results")
+    self.assertEqual(target.cur.fetchall()[0][0], 1)
+
+  '''
+  Test that the phase timings of a result are replaced and merged.
+  '''
+  def test_PhaseTimings(self):
+    target = self.CreateDatabase("target.db", "mlpack", "wine", 1.5)
+    source = self.CreateDatabase("source.db", "flann", "wine", 0.5)
+    source.NewPhaseTimings(1, 1, 1, 1, [{"tree_building": 2.0}])
+    source.NewPhaseTimings(1, 1, 1, 1, [{"tree_building": 1.0,
+        "computing_neighbors": 4.0}, {"tree_building": 3.0,
+        "computing_neighbors": 2.0}])
+    self.assertEqual(source.GetPhaseTimings(1, 1, 1), [("tree_building", 2.0,
+        2), ("computing_neighbors", 3.0, 2)])
+
+    target.Merge(os.path.join(self.directory, "source.db"))
+    buildId = target.GetLatestBuildFromLibary(target.GetLibrary(
+        "flann")[0][0])[0][0]
+    self.assertEqual(len(target.GetPhaseTimings(buildId, 1, 1)), 2)
+
+  '''
+  Test that a copied build keeps all result columns and the phase timings.
+  '''
+  def test_CopyBuild(self):
+    db = Database(os.path.join(self.directory, "copy.db"))
+    db.CreateTables()
+    libraryId = db.NewLibrary("mlpack")
+    buildId = db.NewBuild(libraryId)
+    datasetId = db.NewDataset("wine", 1, 2, 3)
+    methodId = db.NewMethod("PCA", "-d 2", "None")
+    db.NewResult(buildId, libraryId, 1.5, 0.1, datasetId, methodId, 4,
+        "node0", '{"total_time": 1.5}', 2048, '{"tainted": 0}')
+    db.NewPhaseTimings(buildId, libraryId, methodId, datasetId,
+        [{"total_time": 1.5}], 4)
+
+    newBuildId = db.NewBuild(libraryId)
+    db.CopyLatestBuildFromLibary(buildId, newBuildId)
+
+    db.cur.execute("SELECT libary_id, time, var, dataset_id, method_id, " +
+        "threads, placement, phases, memory, interference FROM results " +
+        "ORDER BY build_id")
+    old, new = db.cur.fetchall()
+    self.assertEqual(old, new)
+    self.assertEqual(db.GetPhaseTimings(newBuildId, methodId, datasetId),
+        [("total_time", 1.5, 1)])
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,165 @@
+'''
+  @file distributed_unit_test.py
+
+  Test for the distributed coordinator and worker.
+'''
+
+import unittest
+
+import os, sys, inspect, tempfile, shutil, threading
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from distributed import *
+
+'''
+Test the job queue.
+'''
+class JobQueue_Test(unittest.TestCase):
+
+  '''
+  Test that a job of a lost worker is requeued and only completed once.
+  '''
+  def test_Requeue(self):
+    queue = JobQueue([{"id": "a"}, {"id": "b"}])
+
+    self.assertEqual(queue.Next("w1")["id"], "a")
+    self.assertEqual(queue.Requeue("w1"), ["a"])
+    self.assertEqual(queue.Next("w2")["id"], "a")
+    self.assertEqual(queue.Next("w2")["id"], "b")
+    self.assertEqual(queue.Next("w2"), None)
+
+    self.assertTrue(queue.Complete("a", 1))
+    self.assertFalse(queue.Complete("a", 2))
+    self.assertFalse(queue.Finished())
+    self.assertTrue(queue.Complete("b", 3))
+    self.assertTrue(queue.Finished())
+    self.assertEqual([r for j, r in queue.results], [1, 3])
+
+  '''
+  Test the address parser.
+  '''
+  def test_ParseAddress(self):
+    self.assertEqual(ParseAddress("localhost:5000"), (("localhost", 5000),
+        "AF_INET"))
+    self.assertEqual(ParseAddress(":5000"), (("localhost", 5000), "AF_INET"))
+    self.assertEqual(ParseAddress("/tmp/benchmark.sock"),
+        ("/tmp/benchmark.sock", "AF_UNIX"))
+
+'''
+Test the authentication keys.
+'''
+class AuthKey_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.environment = os.environ.pop(AUTHKEY_ENV, None)
+
+  def tearDown(self):
+    os.environ.pop(AUTHKEY_ENV, None)
+    if self.environment is not None:
+      os.environ[AUTHKEY_ENV] = self.environment
+    shutil.rmtree(self.directory)
+
+  '''
+  Test that a non-local address requires an explicit key.
+  '''
+  def test_Remote(self):
+    address, family = ParseAddress("0.0.0.0:5000")
+    self.assertRaises(ValueError, AuthKey, None, address, family, True)
+    self.assertRaises(ValueError, Worker, "coordinator-host:5000", None)
+    self.assertEqual(AuthKey("secret", address, family), b"secret")
+
+    os.environ[AUTHKEY_ENV] = "environment"
+    self.assertEqual(AuthKey(None, address, family), b"environment")
+
+  '''
+  Test the generated key of a local address.
+  '''
+  def test_Local(self):
+    self.assertTrue(IsLocalAddress(*ParseAddress("127.0.0.1:5000")))
+    self.assertTrue(IsLocalAddress(*ParseAddress(":5000")))
+
+    address, family = ParseAddress(os.path.join(self.directory, "c.sock"))
+    self.assertRaises(ValueError, AuthKey, None, address, family)
+
+    key = AuthKey(None, address, family, create=True)
+    self.assertEqual(len(key), 64)
+    self.assertEqual(os.stat(KeyFile(address, family)).st_mode & 0o777, 0o600)
+    self.assertEqual(AuthKey(None, address, family), key)
+    self.assertNotEqual(AuthKey(None, address, family, create=True), key)
+
+  '''
+  Test a local coordinator and worker without an explicit key.
+  '''
+  def test_Run(self):
+    address = os.path.join(self.directory, "coordinator.sock")
+    stored = []
+    coordinator = Coordinator([{"id": "a", "library": "lib", "method": "M"}],
+        address, lambda j, r: stored.append(r), heartbeat=1)
+    thread = threading.Thread(target=coordinator.Run)
+    thread.start()
+
+    self.assertEqual(Worker(address, lambda job: 1).Run(), 1)
+    thread.join(30)
+    self.assertEqual(stored, [1])
+    self.assertFalse(os.path.exists(address + ".key"))
+
+'''
+Test the coordinator with several workers.
+'''
+class Coordinator_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.address = os.path.join(self.directory, "coordinator.sock")
+    self.stored = []
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  '''
+  Run all jobs with two workers; a third worker is lost while running a job.
+  '''
+  def test_WorkerLoss(self):
+    jobs = [{"id": str(i), "library": "lib", "method": "M"} for i in range(10)]
+    coordinator = Coordinator(jobs, self.address, lambda j, r:
+        self.stored.append((j["id"], r)), key="test", heartbeat=1)
+    thread = threading.Thread(target=coordinator.Run)
+    thread.start()
+
+    # This worker takes a job and disconnects without a result.
+    connection = Client(self.address, "AF_UNIX", authkey=b"test")
+    connection.send(("get",))
+    lost = connection.recv()[1]["id"]
+    connection.close()
+
+    workers = [Worker(self.address, lambda job: int(job["id"]) * 2, "test",
+        name=str(i)) for i in range(2)]
+    counts = []
+    threads = [threading.Thread(target=lambda w: counts.append(w.Run()),
+        args=(w,)) for w in workers]
+    for t in threads:
+      t.start()
+    for t in threads:
+      t.join(30)
+    thread.join(30)
+
+    self.assertEqual(sum(counts), 10)
+    self.assertEqual(sorted(self.stored), sorted((str(i), i * 2) for i in
+        range(10)))
+    self.assertTrue((lost, int(lost) * 2) in self.stored)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,112 @@
+'''
+  @file executables_unit_test.py
+
+  Test for the executable metadata cache.
+'''
+
+import unittest
+
+import os, sys, inspect, tempfile, shutil
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from executables import *
+
+# An executable which counts its calls.
+EXECUTABLE = """#!/bin/sh
+echo "$1" >> "$(dirname "$0")/calls"
+if [ "$1" = "--version" ]; then
+  echo "mlpack_pca: part of mlpack 2.0.1."
+  exit 0
+fi
+cat <<EOF
+Principal Components Analysis
+
+This program performs principal components analysis on the given dataset.
+
+Required input options:
+
+  --input_file (-i) [string]    Input dataset to perform PCA on.
+Optional input options:
+
+  --new_dimensionality (-d) [int]
+                                Desired dimensionality of output dataset.
+  --scale (-s)                  If set, the data will be scaled.
+  --version (-V)                Display the version of mlpack.
+Optional output options:
+
+  --output_file (-o) [string]   File to save modified dataset to.
+EOF
+"""
+
+'''
+Test the executable metadata cache.
+'''
+class Executables_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.executable = os.path.join(self.directory, "mlpack_pca")
+    with open(self.executable, "w") as fid:
+      fid.write(EXECUTABLE)
+    os.chmod(self.executable, 0o755)
+
+    Executables.cacheFile = os.path.join(self.directory, "cache",
+        "executables.json")
+    Executables.cache = None
+
+  def tearDown(self):
+    Executables.cache = None
+    shutil.rmtree(self.directory)
+
+  '''
+  Return the number of calls of the executable.
+  '''
+  def Calls(self):
+    with open(os.path.join(self.directory, "calls")) as fid:
+      return len(fid.readlines())
+
+  '''
+  Test the parsed metadata.
+  '''
+  def test_Info(self):
+    info = Executables.Info(self.executable)
+    self.assertTrue(info["description"].startswith(
+        "Principal Components Analysis\n"))
+    self.assertEqual(info["version"], "mlpack_pca: part of mlpack 2.0.1.")
+    self.assertEqual(info["options"]["-d"], ["new_dimensionality", "int",
+        False])
+    self.assertEqual(info["options"]["--scale"], ["scale", None, False])
+    self.assertEqual(info["options"]["-o"], ["output_file", "string", True])
+    self.assertEqual(Executables.Info(os.path.join(self.directory,
+        "missing")), None)
+
+  '''
+  Test that the executable is only probed again if it changes.
+  '''
+  def test_Cache(self):
+    Executables.Info(self.executable)
+    self.assertEqual(self.Calls(), 2)
+
+    # The cache is shared by all instances and persistent.
+    Executables.Info(self.executable)
+    Executables.cache = None
+    self.assertEqual(Executables.Info(self.executable)["version"],
+        "mlpack_pca: part of mlpack 2.0.1.")
+    self.assertEqual(self.Calls(), 2)
+
+    stat = os.stat(self.executable)
+    os.utime(self.executable, (stat.st_atime, stat.st_mtime + 10))
+    Executables.Info(self.executable)
+    self.assertEqual(self.Calls(), 4)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,101 @@
+'''
+  @file generator_unit_test.py
+
+  Test for the synthetic dataset generator.
+'''
+
+import unittest
+
+import os, sys, inspect, tempfile, shutil
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from generator import *
+import numpy as np
+
+'''
+Test the synthetic dataset generator.
+'''
+class DatasetGenerator_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    DatasetGenerator.directory = self.directory
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  '''
+  Load an armadillo binary file.
+  '''
+  def LoadBinary(self, fileName):
+    with open(fileName, "rb") as fid:
+      self.assertEqual(fid.readline(), b"ARMA_MAT_BIN_FN008\n")
+      rows, columns = [int(v) for v in fid.readline().split()]
+      data = np.frombuffer(fid.read(), dtype="<f8")
+    return data.reshape(columns, rows).T
+
+  '''
+  Test that the csv and the binary file contain the same chunked data.
+  '''
+  def test_Blobs(self):
+    files = DatasetGenerator.Generate("blobs", {"kind": "blobs", "rows": 250,
+        "columns": 3, "centers": 4, "chunk": 100})
+
+    self.assertEqual(len(files), 4)
+    data = np.loadtxt(files[0], delimiter=",")
+    self.assertEqual(data.shape, (250, 3))
+    self.assertTrue(np.allclose(self.LoadBinary(files[1]), data, atol=1e-5))
+    self.assertEqual(np.loadtxt(files[2], delimiter=",").shape, (4, 3))
+
+  '''
+  Test that the datasets are reproducible.
+  '''
+  def test_Reproducible(self):
+    spec = {"kind": "neighbors", "rows": 50, "columns": 20, "queries": 10,
+        "formats": ["csv"]}
+    files = DatasetGenerator.Generate("knn", spec)
+    first = [open(f).read() for f in files]
+
+    for f in files:
+      os.remove(f)
+    files = DatasetGenerator.Generate("knn", spec)
+    self.assertEqual([open(f).read() for f in files], first)
+
+  '''
+  Test the classification train, test and label files.
+  '''
+  def test_Classification(self):
+    files = DatasetGenerator.Generate("cls", {"kind": "classification",
+        "rows": 100, "columns": 4, "classes": 3, "test": 20,
+        "formats": ["csv"]})
+
+    train = np.loadtxt(files[0], delimiter=",")
+    self.assertEqual(train.shape, (100, 5))
+    self.assertTrue(set(train[:, -1]).issubset(set([0, 1, 2])))
+    self.assertEqual(np.loadtxt(files[1], delimiter=",").shape, (20, 4))
+    self.assertEqual(np.loadtxt(files[2], delimiter=",").shape, (20,))
+
+  '''
+  Test the discrete hidden markov model sequence.
+  '''
+  def test_HMM(self):
+    files = DatasetGenerator.Generate("seq", {"kind": "hmm", "rows": 200,
+        "states": 3, "symbols": 4, "chunk": 64, "formats": ["csv"]})
+
+    observations = np.loadtxt(files[0], delimiter=",")
+    states = np.loadtxt(files[1], delimiter=",")
+    self.assertEqual(observations.shape, (200,))
+    self.assertTrue(set(observations).issubset(set(range(4))))
+    self.assertTrue(set(states).issubset(set(range(3))))
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,111 @@
+'''
+  @file graph_unit_test.py
+
+  Test for the massif parser and the chart downsampling.
+'''
+
+import unittest
+
+import os, sys, inspect, tempfile
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from graph import *
+
+massifLog = """desc: --depth=2
+cmd: mlpack_allknn -r wine.csv
+time_unit: i
+#-----------
+snapshot=0
+#-----------
+time=0
+mem_heap_B=0
+mem_heap_extra_B=0
+mem_stacks_B=0
+heap_tree=empty
+#-----------
+snapshot=1
+#-----------
+time=100
+mem_heap_B=4096
+mem_heap_extra_B=16
+mem_stacks_B=512
+heap_tree=peak
+n2: 4096 (heap allocation functions) malloc/new/new[], --alloc-fns, etc.
+ n1: 3072 0x4005F4: arma::Mat<double>::init_cold() (Mat_meat.hpp:400)
+  n0: 3072 0x4006A1: main (allknn_main.cpp:80)
+ n0: 1024 0x400700: mlpack::data::Load() (load.cpp:20)
+#-----------
+snapshot=2
+#-----------
+time=200
+mem_heap_B=1024
+mem_heap_extra_B=8
+mem_stacks_B=256
+heap_tree=empty
+"""
+
+'''
+Test the massif parser.
+'''
+class ParseMassifLog_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    fid, self.fileName = tempfile.mkstemp(suffix=".mout")
+    with os.fdopen(fid, "w") as f:
+      f.write(massifLog)
+
+  def tearDown(self):
+    os.remove(self.fileName)
+
+  '''
+  Test the snapshot values.
+  '''
+  def test_Snapshots(self):
+    massif = ParseMassifLog(self.fileName)
+    self.assertEqual(massif["snapshots"], [(0, 0, 0, 0), (100, 4096, 16, 512),
+        (200, 1024, 8, 256)])
+
+  '''
+  Test the peak snapshot and the allocation sites.
+  '''
+  def test_Peak(self):
+    massif = ParseMassifLog(self.fileName, topSites=1)
+    self.assertEqual(massif["peak"], 1)
+    self.assertEqual(len(massif["sites"]), 1)
+    self.assertEqual(massif["sites"][0][0], 3072)
+    self.assertTrue("init_cold" in massif["sites"][0][1])
+
+'''
+Test the largest-triangle-three-buckets downsampling.
+'''
+class DownsampleLTTB_Test(unittest.TestCase):
+
+  '''
+  Test that small series are not downsampled.
+  '''
+  def test_NoDownsampling(self):
+    points = [(i, i) for i in range(10)]
+    self.assertEqual(DownsampleLTTB(points, 20), list(range(10)))
+
+  '''
+  Test the number of points and that the spike is preserved.
+  '''
+  def test_Downsampling(self):
+    points = [(i, 1 if i != 500 else 100) for i in range(1000)]
+    indices = DownsampleLTTB(points, 50)
+    self.assertEqual(len(indices), 50)
+    self.assertEqual(indices[0], 0)
+    self.assertEqual(indices[-1], 999)
+    self.assertTrue(500 in indices)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,143 @@
+'''
+  @file interference_unit_test.py
+
+  Test for the interference monitor.
+'''
+
+import unittest
+
+import os, sys, inspect, subprocess, time, tempfile, shutil
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from interference import *
+
+'''
+Test the interference monitor.
+'''
+class Interference_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.settings = dict((name, getattr(Interference, name)) for name in
+        ["steal", "load", "frequency", "pressure"])
+
+  def tearDown(self):
+    Interference.Configure(self.settings)
+    Interference.Configure(None)
+
+  '''
+  Test the measured interference of a trial.
+  '''
+  def test_Monitor(self):
+    monitor = InterferenceMonitor()
+    monitor.start()
+    subprocess.check_call([sys.executable, "-c", "sum(range(10 ** 6))"])
+    summary = monitor.Stop()
+
+    self.assertEqual(sorted(summary), ["frequency", "io", "load", "memory",
+        "steal"])
+    if summary["steal"] is not None:
+      self.assertTrue(0 <= summary["steal"] <= 1)
+      self.assertTrue(summary["load"] >= 0)
+
+  '''
+  Test that the frequency is the ratio of the slowest CPU the trial runs on,
+  the idle CPUs of an unpinned host are ignored.
+  '''
+  def test_Frequency(self):
+    root = InterferenceMonitor.ROOT
+    InterferenceMonitor.ROOT = tempfile.mkdtemp()
+    try:
+      for cpu, current in [(0, 400), (1, 2000), (2, 1000)]:
+        path = os.path.join(InterferenceMonitor.ROOT, "cpu" + str(cpu),
+            "cpufreq")
+        os.makedirs(path)
+        for name, value in [("scaling_cur_freq", current),
+            ("scaling_max_freq", 2000)]:
+          with open(os.path.join(path, name), "w") as fid:
+            fid.write(str(value))
+
+      # The idle CPU 0 is clocked down.
+      self.assertEqual(InterferenceMonitor.Frequency([1]), 1.0)
+      self.assertEqual(InterferenceMonitor.Frequency([1, 2]), 0.5)
+      self.assertEqual(InterferenceMonitor.Frequency([]), None)
+    finally:
+      shutil.rmtree(InterferenceMonitor.ROOT)
+      InterferenceMonitor.ROOT = root
+
+  '''
+  Test that the CPU of a running child process is found.
+  '''
+  def test_BusyCPUs(self):
+    process = subprocess.Popen([sys.executable, "-c",
+        "import time\nend = time.time() + 5\nwhile time.time() < end: pass"])
+    try:
+      for i in range(50):
+        cpus = InterferenceMonitor.BusyCPUs()
+        if cpus:
+          break
+        time.sleep(0.05)
+      self.assertTrue(cpus)
+      self.assertTrue(all(cpu >= 0 for cpu in cpus))
+    finally:
+      process.kill()
+      process.wait()
+
+  '''
+  Test the thresholds.
+  '''
+  def test_Tainted(self):
+    Interference.Configure({"steal": 0.05, "load": 1, "frequency": 0.8,
+        "pressure": 0.1})
+    self.assertFalse(Interference.Tainted({"steal": 0.01, "load": 0.5,
+        "frequency": 0.9, "memory": None, "io": 0.0}))
+    self.assertTrue(Interference.Tainted({"steal": 0.1}))
+    self.assertTrue(Interference.Tainted({"load": 2.0}))
+    self.assertTrue(Interference.Tainted({"frequency": 0.5}))
+    self.assertTrue(Interference.Tainted({"io": 0.2}))
+
+  '''
+  Test that tainted trials are run again and the summary.
+  '''
+  def test_Run(self):
+    calls = []
+    def Trial(value):
+      calls.append(value)
+      time.sleep(0.05)
+      return value
+
+    # Disabled, the trial runs once without monitor.
+    self.assertEqual(Interference.Run(Trial, 1.0), 1.0)
+    self.assertEqual(Interference.last, None)
+
+    # Every trial is tainted (negative load threshold).
+    Interference.Configure({"reruns": 2, "load": -1})
+    self.assertEqual(Interference.Run(Trial, 2.0), 2.0)
+    self.assertEqual(calls.count(2.0), 3)
+    self.assertTrue(Interference.last["tainted"])
+    self.assertEqual(Interference.last["reruns"], 2)
+    tainted = Interference.last
+
+    # Unsuccessful trials aren't run again.
+    self.assertEqual(Interference.Run(Trial, -1), -1)
+    self.assertEqual(calls.count(-1), 1)
+
+    clean = {"steal": 0.0, "load": 0.1, "frequency": 0.95, "memory": None,
+        "io": 0.0, "tainted": False, "reruns": 0}
+    summary = Interference.Summary([clean, tainted, None])
+    self.assertEqual(summary["trials"], 2)
+    self.assertEqual(summary["tainted"], 1)
+    self.assertEqual(summary["reruns"], 2)
+    self.assertEqual(summary["memory"], tainted["memory"])
+    self.assertEqual(Interference.Summary([None]), None)
+
+if __name__ == '__main__':
+  unittest.main()
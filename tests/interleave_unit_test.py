@@ -0,0 +1,76 @@
+'''
+  @file interleave_unit_test.py
+
+  Test for the interleaved trial order.
+'''
+
+import unittest
+
+import os, sys, inspect
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from interleave import *
+
+'''
+Test the interleaved trial order.
+'''
+class Interleave_Test(unittest.TestCase):
+
+  def tearDown(self):
+    Interleave.seed = None
+    Interleave.random = None
+
+  '''
+  Test that the order is interleaved and reproducible with the seed.
+  '''
+  def test_Schedule(self):
+    Interleave.seed = 42
+    Interleave.Seed()
+    trials = {"mlpack": 3, "scikit": 3, "weka": 1}
+    order = Interleave.Schedule(trials)
+
+    # Every round contains one trial of every library.
+    self.assertEqual(sorted(order[:3]), ["mlpack", "scikit", "weka"])
+    self.assertEqual(sorted(order[3:5]), ["mlpack", "scikit"])
+    self.assertEqual(sorted(order[5:]), ["mlpack", "scikit"])
+
+    Interleave.Seed()
+    self.assertEqual(Interleave.Schedule(trials), order)
+
+    # Without a seed a random seed is recorded.
+    Interleave.seed = None
+    self.assertTrue(Interleave.Seed() is not None)
+
+  '''
+  Test that the trials of a library stop after an unsuccessful run.
+  '''
+  def test_Run(self):
+    calls = []
+    def Trial(name, time):
+      def Run():
+        calls.append(name)
+        if time is None:
+          raise Exception("failure")
+        return time
+      return Run
+
+    times = Interleave.Run({"mlpack": (3, Trial("mlpack", 1.0)),
+        "shogun": (3, Trial("shogun", -2)), "weka": (2, Trial("weka", None))})
+    self.assertEqual(times, {"mlpack": [1.0, 1.0, 1.0], "shogun": [-2],
+        "weka": []})
+    self.assertEqual(calls.count("shogun"), 1)
+    self.assertEqual(calls.count("weka"), 2)
+
+    # A successful trial doesn't hide the unsuccessful one.
+    results = [0.5, -3, 0.5, 0.5]
+    times = Interleave.Run({"mlpack": (4, lambda: results.pop(0))})
+    self.assertEqual(times, {"mlpack": [0.5, -3]})
+
+if __name__ == '__main__':
+  unittest.main()
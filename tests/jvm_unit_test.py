@@ -0,0 +1,131 @@
+'''
+  @file jvm_unit_test.py
+
+  Test for the persistent JVM client.
+'''
+
+import unittest
+
+import os, sys, inspect, tempfile, shutil, time
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from jvm import *
+
+# A 'java' executable which implements the server protocol of
+# BenchmarkServer.java; the timer is the process id of the JVM.
+JAVA = """#!%s
+import os, sys, socket, time
+if sys.argv[3] != "BenchmarkServer":
+  print("[INFO ]   total_time: %%d.0s" %% os.getpid())
+  sys.exit(0)
+
+server = socket.socket()
+server.bind(("127.0.0.1", 0))
+server.listen(1)
+print("PORT %%d" %% server.getsockname()[1], flush=True)
+connection, address = server.accept()
+for line in connection.makefile("r"):
+  fields = line.rstrip("\\n").split("\\t")
+  if fields[0] == "QUIT":
+    break
+  if fields[2] == "Slow":
+    # Every line arrives in time, but the whole run takes 5 seconds.
+    for i in range(20):
+      connection.sendall(b"[INFO ]   step: 0.0s\\n")
+      time.sleep(0.25)
+  if fields[2] == "Oom":
+    connection.sendall(b"java.lang.OutOfMemoryError: Java heap space\\n")
+  status = 0 if fields[2] == "Method" else 3
+  output = "[INFO ]   warmup: %%s.0s\\n[INFO ]   total_time: %%d.0s\\n#END %%d\\n"
+  connection.sendall((output %% (fields[1], os.getpid(), status)).encode())
+"""
+
+'''
+Test the persistent JVM client.
+'''
+class JVMServer_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.java = os.path.join(self.directory, "java")
+    with open(self.java, "w") as fid:
+      fid.write(JAVA % sys.executable)
+    os.chmod(self.java, 0o755)
+
+  def tearDown(self):
+    JVMServer.StopAll()
+    JVMServer.Configure(None)
+    MemoryLimit.Configure(None)
+    shutil.rmtree(self.directory)
+
+  '''
+  Test that the server is reused and the warm-up count is passed.
+  '''
+  def test_Server(self):
+    JVMServer.Configure({"warmup": 2})
+    cmd = [self.java, "-classpath", ".", "Method", "-i", "data.csv"]
+    first = JVMServer.Run(cmd, 10)
+    second = JVMServer.Run(cmd, 10)
+
+    self.assertEqual(first["warmup"], 2.0)
+    self.assertEqual(first["total_time"], second["total_time"])
+    self.assertEqual(len(JVMServer.servers), 1)
+    self.assertRaises(subprocess.CalledProcessError, JVMServer.Run,
+        [self.java, "-classpath", ".", "Other"], 10)
+
+  '''
+  Test that the timeout is the deadline of the whole run, including the
+  warm-up runs.
+  '''
+  def test_Timeout(self):
+    JVMServer.Configure({"warmup": 2})
+    start = time.time()
+    self.assertRaises(subprocess.TimeoutExpired, JVMServer.Run,
+        [self.java, "-classpath", ".", "Slow"], 1)
+    self.assertTrue(time.time() - start < 2.5)
+    self.assertEqual(len(JVMServer.servers), 0)
+
+  '''
+  Test the peak memory of the server runs and that an OutOfMemoryError is
+  out of memory.
+  '''
+  def test_Memory(self):
+    cmd = [self.java, "-classpath", ".", "Method"]
+
+    # The peak of a former run isn't reported for an unmonitored run.
+    MemoryLimit.peak = 1
+    JVMServer.Run(cmd, 10)
+    self.assertEqual(MemoryLimit.peak, None)
+
+    MemoryLimit.Configure(4096)
+    JVMServer.Run(cmd, 10)
+    self.assertTrue(MemoryLimit.peak > 0)
+    self.assertFalse(MemoryLimit.oom)
+
+    for limit in [4096, None]:
+      MemoryLimit.Configure(limit)
+      self.assertRaises(subprocess.CalledProcessError, JVMServer.Run,
+          [self.java, "-classpath", ".", "Oom"], 10)
+      self.assertEqual(MemoryLimit.Check(-1), MemoryLimit.OOM)
+
+  '''
+  Test that every command starts a new JVM with the cold start option.
+  '''
+  def test_ColdStart(self):
+    JVMServer.Configure({"server": False})
+    cmd = [self.java, "-classpath", ".", "Method"]
+    self.assertNotEqual(JVMServer.Run(cmd, 10)["total_time"],
+        JVMServer.Run(cmd, 10)["total_time"])
+    self.assertEqual(len(JVMServer.servers), 0)
+
+if __name__ == '__main__':
+  unittest.main()
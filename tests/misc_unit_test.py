@@ -0,0 +1,81 @@
+'''
+  @file misc_unit_test.py
+
+  Test for the dataset context.
+'''
+
+import unittest
+
+import os, sys, inspect, tempfile, shutil
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from misc import *
+
+import numpy as np
+
+'''
+Test the dataset context.
+'''
+class DatasetContext_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.dataset = []
+    for name, data in [("train.csv", [[1, 2, 0], [3, 4, 1]]),
+        ("test.csv", [[5, 6]]), ("labels.csv", [1])]:
+      self.dataset.append(os.path.join(self.directory, name))
+      np.savetxt(self.dataset[-1], np.array(data, ndmin=2), delimiter=",")
+
+  def tearDown(self):
+    DatasetContext.Deactivate()
+    shutil.rmtree(self.directory)
+
+  '''
+  Test that the files are loaded once while the context is active.
+  '''
+  def test_Reuse(self):
+    context = DatasetContext.Activate(self.dataset)
+    context.Preload()
+
+    self.assertTrue(LoadDataset(self.dataset[1]) is LoadDataset(
+        self.dataset[1]))
+    trainData, labels = SplitTrainData(self.dataset)
+    self.assertEqual(trainData.tolist(), [[1, 2], [3, 4]])
+    self.assertEqual(labels.tolist(), [0, 1])
+    self.assertTrue(trainData.base is LoadDataset(self.dataset[0]))
+
+    # Files which aren't part of the tuple are loaded as before.
+    other = os.path.join(self.directory, "other.csv")
+    shutil.copy(self.dataset[1], other)
+    self.assertFalse(LoadDataset(other) is LoadDataset(other))
+
+    DatasetContext.Deactivate()
+    self.assertFalse(LoadDataset(self.dataset[1]) is LoadDataset(
+        self.dataset[1]))
+
+  '''
+  Test that only the in-process scripts opt in to the preloaded arrays.
+  '''
+  def test_InProcess(self):
+    import types
+
+    external = types.ModuleType("external")
+    external.LoadDataset = LoadDataset
+    self.assertFalse(DatasetContext.InProcess(external))
+
+    inProcess = types.ModuleType("inProcess")
+    inProcess.IN_PROCESS = True
+    self.assertTrue(DatasetContext.InProcess(inProcess))
+    self.assertFalse(DatasetContext.InProcess(None))
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,94 @@
+'''
+  @file placement_unit_test.py
+
+  Test for the NUMA placement.
+'''
+
+import unittest
+
+import os, sys, inspect, shutil, tempfile
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from placement import *
+
+'''
+Test the NUMA placement.
+'''
+class Placement_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.files = SystemInfo.files
+    cpu = "/sys/devices/system/cpu/cpu"
+    SystemInfo.files = {"/sys/devices/system/node/node1/cpulist": "4-5,12-13\n",
+        cpu + "4/topology/thread_siblings_list": "4,12\n",
+        cpu + "5/topology/thread_siblings_list": "5,13\n",
+        cpu + "12/topology/thread_siblings_list": "4,12\n",
+        cpu + "13/topology/thread_siblings_list": "5,13\n"}
+
+    self.root = Placement.CPU_ROOT
+    Placement.CPU_ROOT = tempfile.mkdtemp()
+    self.Governor(4, "performance")
+    self.Governor(5, "powersave")
+
+  def tearDown(self):
+    SystemInfo.files = self.files
+    shutil.rmtree(Placement.CPU_ROOT)
+    Placement.CPU_ROOT = self.root
+
+  '''
+  Write the frequency governor of a fake CPU.
+
+  @param cpu - The CPU number.
+  @param governor - The governor.
+  '''
+  def Governor(self, cpu, governor):
+    path = os.path.join(Placement.CPU_ROOT, "cpu" + str(cpu), "cpufreq")
+    if not os.path.isdir(path):
+      os.makedirs(path)
+    with open(os.path.join(path, "scaling_governor"), "w") as fid:
+      fid.write(governor + "\n")
+
+  '''
+  Test the CPUs of a node with and without the SMT siblings.
+  '''
+  def test_NodeCPUs(self):
+    self.assertEqual(Placement.ParseCPUList("0-2,7"), [0, 1, 2, 7])
+    self.assertEqual(Placement.NodeCPUs(1), [4, 5, 12, 13])
+    self.assertEqual(Placement.NodeCPUs(1, smt=False), [4, 5])
+    self.assertEqual(Placement.NodeCPUs(2), [])
+
+  '''
+  Test that a governor mismatch is detected.
+  '''
+  def test_Check(self):
+    self.assertTrue(Placement.Check(None))
+    self.assertTrue(Placement.Check({"node": 1}))
+    self.assertFalse(Placement.Check({"node": 1, "smt": False,
+        "governor": "performance"}))
+    self.assertFalse(Placement.Check({"node": 1, "smt": False,
+        "governor": "powersave"}))
+
+  '''
+  Test that a governor change during the run is noticed.
+  '''
+  def test_CheckChange(self):
+    self.Governor(5, "performance")
+    settings = {"node": 1, "smt": False, "governor": "performance"}
+    self.assertTrue(Placement.Check(settings))
+
+    self.Governor(5, "powersave")
+    self.assertEqual(Placement.ReadGovernor(5), "powersave")
+    self.assertFalse(Placement.Check(settings))
+    self.assertEqual(Placement.ReadGovernor(6), None)
+
+if __name__ == '__main__':
+  unittest.main()
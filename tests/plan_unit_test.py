@@ -0,0 +1,170 @@
+'''
+  @file plan_unit_test.py
+
+  Test for the job plan and the shards.
+'''
+
+import unittest
+
+import os, sys, inspect, tempfile, shutil
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from plan import *
+
+import simplejson
+
+# Benchmark script which returns the number of rows of the dataset as time.
+script = """
+class TEST(object):
+  def __init__(self, dataset, timeout=0, verbose=True):
+    self.dataset = dataset
+
+  def RunTiming(self, options):
+    with open(self.dataset) as fid:
+      return float(len(fid.readlines()))
+"""
+
+'''
+Test the job plan and the shards.
+'''
+class Plan_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.fileName = os.path.join(self.directory, "plan.json")
+
+    jobs = []
+    for method in ["PCA", "KMEANS", "NBC"]:
+      for dataset in ["iris", "cities", "wine", "mnist"]:
+        job = {"library": "mlpack", "method": method, "options": "",
+            "dataset": "datasets/" + dataset + ".csv", "tasks": ["timing"],
+            "timeout": 60}
+        job["id"] = JobId(job)
+        jobs.append(job)
+
+    estimates = dict((job["id"], float((i * 7) % 11 + 1)) for i, job in
+        enumerate(jobs))
+    self.plan = {"version": PLAN_VERSION,
+        "general": [["database", "reports/benchmark.db"]],
+        "estimates": estimates, "jobs": jobs}
+    self.plan["hash"] = PlanHash(self.plan)
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  '''
+  Test that a saved plan is loaded unchanged and that modifications are
+  detected.
+  '''
+  def test_SaveLoad(self):
+    SavePlan(self.plan, self.fileName)
+    self.assertEqual(LoadPlan(self.fileName), self.plan)
+
+    # Modified estimates or general settings change the hash.
+    for key, value in [("estimates", {}), ("general", [["timeout", 1]])]:
+      plan = dict(self.plan)
+      plan[key] = value
+      SavePlan(plan, self.fileName)
+      self.assertEqual(LoadPlan(self.fileName), None)
+
+    self.plan["jobs"][0]["timeout"] = 120
+    SavePlan(self.plan, self.fileName)
+    self.assertEqual(LoadPlan(self.fileName), None)
+
+    # A job with a matching hash but an outdated id.
+    self.plan["hash"] = PlanHash(self.plan)
+    SavePlan(self.plan, self.fileName)
+    self.assertEqual(LoadPlan(self.fileName), None)
+
+    self.assertEqual(LoadPlan(os.path.join(self.directory, "missing")), None)
+
+  '''
+  Test the shard specification.
+  '''
+  def test_ParseShard(self):
+    self.assertEqual(ParseShard("1/1"), (0, 1))
+    self.assertEqual(ParseShard("3/4"), (2, 4))
+    for shard in ["0/4", "5/4", "1/0", "1", "a/b", "1/2/3"]:
+      self.assertRaises(ValueError, ParseShard, shard)
+
+  '''
+  Test that the shards are disjoint, cover the plan, are deterministic and
+  balanced.
+  '''
+  def test_ShardJobs(self):
+    count = 3
+    shards = [ShardJobs(self.plan, i, count) for i in range(count)]
+
+    ids = [job["id"] for shard in shards for job in shard]
+    self.assertEqual(len(ids), len(set(ids)))
+    self.assertEqual(sorted(ids), sorted(job["id"] for job in
+        self.plan["jobs"]))
+
+    # The shards don't depend on the order of the jobs in the plan.
+    self.plan["jobs"].reverse()
+    self.assertEqual([ShardJobs(self.plan, i, count) for i in range(count)],
+        shards)
+
+    estimates = self.plan["estimates"]
+    loads = [sum(estimates[job["id"]] for job in shard) for shard in shards]
+    self.assertTrue(max(loads) - min(loads) <= max(estimates.values()))
+
+    for shard in shards:
+      times = [estimates[job["id"]] for job in shard]
+      self.assertEqual(times, sorted(times, reverse=True))
+
+'''
+Test that the shards create the subsamples of the scaling mode.
+'''
+class ScalingPlan_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.scaling = (Scaling.directory, Scaling.seed)
+
+  def tearDown(self):
+    Scaling.directory, Scaling.seed = self.scaling
+    shutil.rmtree(self.directory)
+
+  '''
+  Test that a shard runs on a host without the subsamples.
+  '''
+  def test_Subsamples(self):
+    dataset = os.path.join(self.directory, "data.csv")
+    with open(dataset, "w") as fid:
+      fid.write("".join(str(i) + ",1\n" for i in range(16)))
+    with open(os.path.join(self.directory, "script.py"), "w") as fid:
+      fid.write(script)
+
+    scalingDirectory = os.path.join(self.directory, "scaling")
+    library = ("test", [dataset], 1, os.path.join(self.directory,
+        "script.py"), ["csv"], ["timing"], "TEST", [], None, ["rows"])
+    streamData = {"general": [["scalingDirectory", scalingDirectory],
+        ["scalingSeed", 7]], "TEST": {"": [library]}}
+    fileName = os.path.join(self.directory, "plan.json")
+    SavePlan(CompilePlan(streamData), fileName)
+
+    # The host of the shard has a clean dataset directory.
+    shutil.rmtree(scalingDirectory)
+    Scaling.directory, Scaling.seed = self.scaling
+
+    plan = LoadPlan(fileName)
+    times = sorted(float(RunJob(job)["time"]) for job in ShardJobs(plan, 0,
+        1))
+    self.assertEqual(times, [2.0, 4.0, 8.0, 16.0])
+    self.assertTrue(os.path.isdir(os.path.join(scalingDirectory, "seed-7")))
+
+if __name__ == '__main__':
+  unittest.main()
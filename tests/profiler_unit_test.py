@@ -0,0 +1,273 @@
+'''
+  @file profiler_unit_test.py
+
+  Test for the memory profiler.
+'''
+
+import unittest
+
+import os, sys, inspect, tempfile, shutil, subprocess, sqlite3, time
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from profiler import *
+
+import simplejson
+
+# Allocate about 50 MB in a child process of the profiled process.
+allocate = ("import subprocess, sys; subprocess.check_call([sys.executable, " +
+    "'-c', 'import time; x = bytearray(50 * 1024 * 1024); time.sleep(0.5)'])")
+
+# Benchmark script with a RunMemory() method used by the memory benchmark.
+script = """
+import sys
+from profiler import *
+
+class TEST(object):
+  def __init__(self, dataset, timeout=0, verbose=True):
+    self.timeout = timeout
+
+  def RunMemory(self, options, fileName, massifOptions=""):
+    return Profiler.MemoryUsage([sys.executable, "-c", %s], fileName,
+        self.timeout, massifOptions)
+""" % repr(allocate)
+
+config = """library: test
+methods:
+    TEST:
+        script: %(directory)s/memory_script.py
+        format: [csv]
+        run: ['memory']
+        datasets:
+            - files: ['%(directory)s/dataset.csv']
+"""
+
+'''
+Test the sampling memory profiler.
+'''
+class SampledMemory_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.mode = Profiler.memoryMode
+    self.rate = Profiler.sampleRate
+
+  def tearDown(self):
+    Profiler.memoryMode = self.mode
+    Profiler.sampleRate = self.rate
+    shutil.rmtree(self.directory)
+
+  '''
+  Test that the process tree contains the children of a process.
+  '''
+  def test_ProcessTree(self):
+    process = subprocess.Popen(["sh", "-c", "sleep 5 & sleep 5; wait"])
+    try:
+      for i in range(50):
+        pids = Profiler.ProcessTree(process.pid)
+        if len(pids) >= 3:
+          break
+        time.sleep(0.05)
+
+      self.assertEqual(pids[0], process.pid)
+      self.assertTrue(len(pids) >= 3)
+      self.assertEqual(sorted(Profiler.ScanProcessTree(process.pid)),
+          sorted(pids))
+    finally:
+      for pid in reversed(Profiler.ProcessTree(process.pid)):
+        try:
+          os.kill(pid, 9)
+        except OSError:
+          pass
+      process.wait()
+
+  '''
+  Test the memory values of a single process.
+  '''
+  def test_ProcessMemory(self):
+    rss, pss, uss = Profiler.ProcessMemory(os.getpid())
+    self.assertTrue(rss > 0)
+    self.assertTrue(0 < pss <= rss)
+    self.assertTrue(0 < uss <= rss)
+    self.assertEqual(Profiler.ProcessMemory(2 ** 22 + 1), None)
+
+  '''
+  Test that the memory of the children is included and the timeout.
+  '''
+  def test_SubprocessMemoryUsage(self):
+    process = subprocess.Popen([sys.executable, "-c", allocate])
+    memory = Profiler.SubprocessMemoryUsage(process, 10, 100)
+    self.assertFalse(memory["timeout"])
+    self.assertTrue(memory["peak_rss"] > 50 * 1024)
+    self.assertTrue(0 < len(memory["timeline"]) <= 10)
+    self.assertEqual(memory["rate"], 100)
+
+    process = subprocess.Popen(["sleep", "5"], start_new_session=True)
+    memory = Profiler.SubprocessMemoryUsage(process, 10, 100, timeout=0.2)
+    self.assertTrue(memory["timeout"])
+    self.assertEqual(process.returncode, -9)
+
+    # The grandchildren of the process are killed with the process group.
+    output = os.path.join(self.directory, "pid")
+    process = subprocess.Popen(["sh", "-c", "sleep 5 & echo $! > " + output +
+        "; wait"], start_new_session=True)
+    memory = Profiler.SubprocessMemoryUsage(process, 10, 100, timeout=0.5)
+    self.assertTrue(memory["timeout"])
+    with open(output) as fid:
+      pid = int(fid.read())
+    time.sleep(0.1)
+    try:
+      with open("/proc/" + str(pid) + "/stat") as fid:
+        state = fid.read().split()[2]
+    except IOError:
+      state = "X"
+    self.assertTrue(state in ("X", "Z"))
+
+  '''
+  Test the sampled memory report and the return codes.
+  '''
+  def test_SampledMemoryUsage(self):
+    output = os.path.join(self.directory, "memory.json")
+    Profiler.memoryMode = "sample"
+    self.assertEqual(Profiler.MemoryUsage([sys.executable, "-c", allocate],
+        output, 30, ""), None)
+    with open(output) as fid:
+      memory = simplejson.load(fid)
+    self.assertEqual(memory["type"], "sample")
+    self.assertTrue(memory["peak_rss"] > 50 * 1024)
+
+    self.assertEqual(Profiler.SampledMemoryUsage(["sleep", "5"], output, 0.2),
+        -2)
+    self.assertEqual(Profiler.SampledMemoryUsage(["false"], output, 5), -1)
+    self.assertEqual(Profiler.SampledMemoryUsage([os.path.join(self.directory,
+        "missing")], output, 5), -1)
+
+  '''
+  Test that the sample mode profiles the release executables.
+  '''
+  def test_ExecutablePath(self):
+    Profiler.memoryMode = "sample"
+    self.assertEqual(Profiler.ExecutablePath("release/", "debug/"), "release/")
+    Profiler.memoryMode = "massif"
+    self.assertEqual(Profiler.ExecutablePath("release/", "debug/"), "debug/")
+
+  '''
+  Test the sample mode and rate options of the memory benchmark.
+  '''
+  def test_MemoryBenchmark(self):
+    sys.path.insert(0, os.path.join(cmd_subfolder, "../benchmark"))
+    import memory_benchmark
+
+    with open(os.path.join(self.directory, "memory_script.py"), "w") as fid:
+      fid.write(script)
+    with open(os.path.join(self.directory, "dataset.csv"), "w") as fid:
+      fid.write("1,2,3\n4,5,6\n")
+    configfile = os.path.join(self.directory, "config.yaml")
+    with open(configfile, "w") as fid:
+      fid.write(config % {"directory": self.directory} +
+          "general:\n    database: 'reports/benchmark.db'\n")
+
+    cwd = os.getcwd()
+    os.chdir(self.directory)
+    try:
+      memory_benchmark.Main(configfile, None, True, None, False, "sample", 50)
+    finally:
+      os.chdir(cwd)
+
+    self.assertEqual(Profiler.memoryMode, "sample")
+    self.assertEqual(Profiler.sampleRate, 50)
+
+    con = sqlite3.connect(os.path.join(self.directory, "reports/benchmark.db"))
+    rows = con.execute("SELECT memory_info FROM memory").fetchall()
+    con.close()
+    self.assertEqual(len(rows), 1)
+    memory = simplejson.loads(rows[0][0])
+    self.assertEqual(memory["rate"], 50)
+    self.assertTrue(memory["peak_rss"] > 50 * 1024)
+
+'''
+Test the memory timeline and the in-process memory tracker.
+'''
+class MemoryTracker_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  '''
+  Test the peak values and the resolution of the timeline.
+  '''
+  def test_MemoryTimeline(self):
+    timeline = MemoryTimeline(4)
+    for i in range(10):
+      timeline.Add(i, [i, 2 * i, 9 - i])
+
+    result = timeline.Result()
+    self.assertEqual(result["samples"], 10)
+    self.assertEqual([result["peak_rss"], result["peak_pss"],
+        result["peak_uss"]], [9, 18, 9])
+    self.assertTrue(len(result["timeline"]) <= 4)
+    self.assertEqual([t[0] for t in result["timeline"]], [0, 4, 8])
+
+  '''
+  Test that the NumPy peak includes the arrays freed in the timed region.
+  '''
+  def test_MemoryTracker(self):
+    import numpy as np
+
+    tracker = MemoryTracker(rate=100)
+    tracker.Start()
+    data = np.ones((4 * 1024 * 1024, ))
+    time.sleep(3 * MemoryTracker.snapshotInterval)
+    del data
+    output = os.path.join(self.directory, "memory.json")
+    result = tracker.Stop(output)
+
+    self.assertEqual(result["type"], "tracemalloc")
+    self.assertTrue(result["numpy_allocated"] >= 32 * 1024)
+    self.assertTrue(result["tracemalloc_peak"] >= 32 * 1024)
+    self.assertTrue(result["peak_rss"] >= 32 * 1024)
+    with open(output) as fid:
+      self.assertEqual(simplejson.load(fid), result)
+
+  '''
+  Test the profile of the timed region of an in-process script.
+  '''
+  def test_InProcessMemoryUsage(self):
+    from timer import Timer
+
+    class Script(object):
+      def __init__(self, result):
+        self.result = result
+
+      def RunTiming(self, options):
+        with Timer() as timer:
+          data = bytearray(16 * 1024 * 1024)
+        return self.result
+
+    output = os.path.join(self.directory, "memory.json")
+    self.assertEqual(Profiler.InProcessMemoryUsage(Script(1.0), "", output),
+        None)
+    self.assertEqual(Timer.memoryOutput, None)
+    with open(output) as fid:
+      self.assertTrue(simplejson.load(fid)["tracemalloc_peak"] >= 16 * 1024)
+
+    os.remove(output)
+    self.assertEqual(Profiler.InProcessMemoryUsage(Script(-2), "", output), -2)
+    self.assertEqual(Profiler.InProcessMemoryUsage(Script(-1), "", output), -1)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,142 @@
+'''
+  @file scaling_unit_test.py
+
+  Test for the dataset-size scaling subsamples and the complexity fit.
+'''
+
+import unittest
+
+import os, sys, inspect, tempfile, shutil
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from scaling import *
+
+'''
+Test the dataset subsamples.
+'''
+class Subsample_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    Scaling.directory = os.path.join(self.directory, "scaling")
+
+    self.train = os.path.join(self.directory, "data_train.csv")
+    with open(self.train, "w") as f:
+      for i in range(64):
+        f.write(",".join(str(i * 10 + j) for j in range(4)) + ",1\n")
+
+    self.test = os.path.join(self.directory, "data_test.csv")
+    with open(self.test, "w") as f:
+      for i in range(8):
+        f.write(",".join(str(i * 10 + j) for j in range(4)) + "\n")
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  '''
+  Test the geometric sizes.
+  '''
+  def test_Sizes(self):
+    self.assertEqual(Scaling.Sizes(100, 4), [12, 25, 50, 100])
+    self.assertEqual(Scaling.Sizes(4, 5, 2), [2, 4])
+
+  '''
+  Test the row subsamples, the test set is not subsampled.
+  '''
+  def test_Rows(self):
+    datasets, sizes = Scaling.ExpandDatasets([[self.train, self.test]],
+        ["rows"])
+
+    self.assertEqual(len(datasets), 5)
+    self.assertEqual(datasets[-1], [self.train, self.test])
+    self.assertEqual(Scaling.Shape(datasets[0][0]), (4, 5))
+    self.assertEqual(datasets[0][1], self.test)
+    self.assertEqual(sizes["data-r4"], [("data", "rows", 4)])
+    self.assertEqual(sizes["data"], [("data", "rows", 64)])
+
+    # The subsamples are nested.
+    with open(datasets[0][0]) as small, open(datasets[1][0]) as large:
+      self.assertTrue(set(small).issubset(set(large)))
+
+  '''
+  Test the column subsamples, the labels are kept.
+  '''
+  def test_Columns(self):
+    datasets, sizes = Scaling.ExpandDatasets([[self.train, self.test]],
+        ["columns"])
+
+    self.assertEqual(len(datasets), 3)
+    self.assertEqual(Scaling.Shape(datasets[0][0]), (64, 2))
+    self.assertEqual(Scaling.Shape(datasets[0][1]), (8, 1))
+    with open(datasets[0][0]) as f:
+      self.assertEqual(f.readline(), "0,1\n")
+    self.assertEqual(sizes["data-c2"], [("data", "columns", 2)])
+    self.assertEqual(sizes["data"], [("data", "columns", 4)])
+
+  '''
+  Test that the row subsamples of another seed aren't reused.
+  '''
+  def test_Seed(self):
+    seed = Scaling.seed
+    try:
+      Scaling.seed = 1
+      first = Scaling.Subsample(self.train, "rows", 8)
+      Scaling.seed = 2
+      second = Scaling.Subsample(self.train, "rows", 8)
+    finally:
+      Scaling.seed = seed
+
+    self.assertNotEqual(first, second)
+    with open(first) as a, open(second) as b:
+      self.assertNotEqual(a.read(), b.read())
+
+  '''
+  Test that the shape is cached until the file changes.
+  '''
+  def test_Shape(self):
+    self.assertEqual(Scaling.Shape(self.test), (8, 4))
+
+    # The cached shape is used instead of scanning the file.
+    cache = Scaling.ShapePath(self.test)
+    with open(cache, "w") as f:
+      f.write("1,1")
+    self.assertEqual(Scaling.Shape(self.test), (1, 1))
+
+    # A changed file is scanned again.
+    with open(self.test, "a") as f:
+      f.write("0,0,0,0\n")
+    os.utime(self.test, (os.path.getmtime(cache) + 10,) * 2)
+    self.assertEqual(Scaling.Shape(self.test), (9, 4))
+
+'''
+Test the complexity exponent fit.
+'''
+class FitExponent_Test(unittest.TestCase):
+
+  '''
+  Test the exponent of a quadratic method.
+  '''
+  def test_Quadratic(self):
+    exponent, r2 = Scaling.FitExponent([(n, 0.5 * n ** 2) for n in
+        [16, 32, 64, 128]])
+    self.assertAlmostEqual(exponent, 2.0)
+    self.assertAlmostEqual(r2, 1.0)
+
+  '''
+  Test that a single size can't be fitted.
+  '''
+  def test_NotEnoughPoints(self):
+    self.assertEqual(Scaling.FitExponent([(16, 1.0), (16, 1.1)]), None)
+    self.assertEqual(Scaling.FitExponent([(16, 1.0), (32, 0)]), None)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,187 @@
+'''
+  @file schedule_unit_test.py
+
+  Test for the job cost model.
+'''
+
+import unittest
+
+import os, sys, inspect, tempfile, shutil
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from database import *
+from schedule import *
+
+'''
+Test the job cost model.
+'''
+class CostModel_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.db = Database(os.path.join(self.directory, "benchmark.db"))
+    self.db.CreateTables()
+
+    mlpack = self.db.NewLibrary("mlpack")
+    pca = self.db.NewMethod("PCA", "-d 2", "PCA")
+    kmeans = self.db.NewMethod("KMEANS", "", "KMEANS")
+    iris = self.db.NewDataset("iris", 1, 4, 150)
+    cities = self.db.NewDataset("cities", 10, 9, 329)
+
+    for time in ["1.000000", "2.000000", "failure"]:
+      build = self.db.NewBuild(mlpack)
+      self.db.NewResult(build, mlpack, time, 0, iris, pca)
+    self.db.NewResult(build, mlpack, ">30", 0, cities, kmeans)
+
+  def tearDown(self):
+    self.db.con.close()
+    shutil.rmtree(self.directory)
+
+  '''
+  Create a job.
+  '''
+  def Job(self, method, options, dataset, trials=3):
+    return {"id": method + dataset, "library": "mlpack", "method": method,
+        "options": options, "dataset": "datasets/" + dataset + ".csv",
+        "tasks": ["timing"], "trials": trials, "timeout": 60}
+
+  '''
+  Test the estimates of known and unknown cells.
+  '''
+  def test_Estimate(self):
+    model = CostModel(self.db.GetResultHistory())
+
+    # The median of the former results (the failure is ignored).
+    self.assertEqual(model.Trial(self.Job("PCA", "-d 2", "iris")), 1.5)
+    self.assertEqual(model.Estimate(self.Job("PCA", "-d 2", "iris")), 4.5)
+    # The thread counts of a sweep are separate cells.
+    sweep = CostModel([(1, "mlpack", "PCA", "-d 2", "iris", 1, "1.0", None),
+        (1, "mlpack", "PCA", "-d 2", "iris", 1, "8.0", 4)])
+    job = self.Job("PCA", "-d 2", "iris")
+    self.assertEqual(sweep.Trial(job), 1.0)
+    self.assertEqual(sweep.Trial(dict(job, threads=4)), 8.0)
+    # The timeout is used as lower bound of the time.
+    self.assertEqual(model.Trial(self.Job("KMEANS", "", "cities")), 30.0)
+    # Unknown options: dataset size times the time per MB of the method.
+    self.assertEqual(model.Trial(self.Job("PCA", "-d 3", "cities")), 15.0)
+    # Unknown method: the median time per MB of all methods.
+    self.assertEqual(model.Trial(self.Job("NBC", "", "cities")), 20.0)
+
+    # Without history every job gets the default estimate.
+    self.assertEqual(CostModel().Trial(self.Job("PCA", "-d 2", "iris")), 1.0)
+
+  '''
+  Test the longest processing time first order and the progress.
+  '''
+  def test_Order(self):
+    model = CostModel(self.db.GetResultHistory())
+    jobs = [self.Job("PCA", "-d 2", "iris"), self.Job("KMEANS", "", "cities"),
+        self.Job("PCA", "-d 2", "iris", 30)]
+    ordered = model.Order(jobs)
+    self.assertEqual([job["trials"] for job in ordered], [3, 30, 3])
+    self.assertEqual(ordered[0]["method"], "KMEANS")
+
+    progress = Progress(jobs[:2], model)
+    self.assertEqual(progress.total, 94.5)
+    self.assertEqual(progress.Status(), "0/2 jobs, ETA -")
+    progress.Complete(jobs[1])
+    self.assertTrue(progress.Status().startswith("1/2 jobs, ETA 0:00:00"))
+
+  '''
+  Test the dataset order and the progress of the sequential runner.
+  '''
+  def test_ScheduleDatasets(self):
+    sys.path.insert(0, os.path.join(cmd_subfolder, "../benchmark"))
+    import run_benchmark
+
+    model = CostModel(self.db.GetResultHistory())
+    jobs = {"iris": self.Job("PCA", "-d 2", "iris"),
+        "cities": self.Job("PCA", "-d 2", "cities")}
+    progress = Progress(list(jobs.values()), model)
+
+    datasets = []
+    for dataset in run_benchmark.ScheduleDatasets(["datasets/iris.csv",
+        "datasets/cities.csv", "datasets/wine.csv"], jobs, model, progress):
+      datasets.append(dataset)
+      if dataset == "datasets/iris.csv":
+        continue
+      self.assertEqual(progress.finished, len(datasets) - 1)
+
+    self.assertEqual(datasets, ["datasets/cities.csv", "datasets/iris.csv",
+        "datasets/wine.csv"])
+    self.assertEqual(progress.finished, 2)
+
+'''
+Test the predicted timeouts.
+'''
+class TimeoutPredictor_Test(unittest.TestCase):
+
+  '''
+  Create the history of a cell with the given results.
+  '''
+  def History(self, results, threads=None):
+    return [(build, "weka", "ALLKNN", "-k 3", "corel", 10, result, threads)
+        for build, result in enumerate(results)]
+
+  '''
+  Test the skip and the re-probe of the timed out cells.
+  '''
+  def test_Skip(self):
+    cell = ("weka", "ALLKNN", "-k 3", "corel")
+    skipped = TimeoutPredictor.SKIPPED
+
+    predictor = TimeoutPredictor(self.History([">9000", ">9000"]), 3)
+    self.assertTrue(predictor.Skip(*cell, timeout=9000))
+    # A longer timeout or another cell is run.
+    self.assertFalse(predictor.Skip(*cell, timeout=20000))
+    self.assertFalse(predictor.Skip("weka", "ALLKNN", "-k 3", "iris", 9000))
+    # The prediction is disabled by default.
+    self.assertFalse(TimeoutPredictor(self.History([">9000", ">9000"])).Skip(
+        *cell, timeout=9000))
+
+    # Only the last result of a build is used.
+    history = self.History([">9000", ">9000"])
+    history.append((1, "weka", "ALLKNN", "-k 3", "corel", 10, "1.000000",
+        None))
+    self.assertFalse(TimeoutPredictor(history, 3).Skip(*cell, timeout=9000))
+
+    # The thread counts of a sweep are separate cells, the last result of a
+    # build with another thread count doesn't hide the timeouts.
+    history = []
+    for build in range(2):
+      history.append((build, "weka", "ALLKNN", "-k 3", "corel", 10, ">9000",
+          1))
+      history.append((build, "weka", "ALLKNN", "-k 3", "corel", 10, "1.0",
+          16))
+    predictor = TimeoutPredictor(history, 3)
+    self.assertTrue(predictor.Skip(*cell, timeout=9000, threads=1))
+    self.assertFalse(predictor.Skip(*cell, timeout=9000, threads=16))
+    self.assertFalse(predictor.Skip(*cell, timeout=9000))
+
+    # Failures and fast runs aren't skipped.
+    for results in [[">9000"], ["failure", ">9000"], ["1.0", ">9000"]]:
+      self.assertFalse(TimeoutPredictor(self.History(results), 3).Skip(*cell,
+          timeout=9000))
+
+    # Every third build runs the cell again.
+    results = [">9000", ">9000", skipped]
+    self.assertTrue(TimeoutPredictor(self.History(results), 3).Skip(*cell,
+        timeout=9000))
+    results.append(skipped)
+    self.assertFalse(TimeoutPredictor(self.History(results), 3).Skip(*cell,
+        timeout=9000))
+    results.append(">9000")
+    self.assertTrue(TimeoutPredictor(self.History(results), 3).Skip(*cell,
+        timeout=9000))
+
+if __name__ == '__main__':
+  unittest.main()
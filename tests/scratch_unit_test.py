@@ -0,0 +1,78 @@
+'''
+  @file scratch_unit_test.py
+
+  Test for the per-job scratch directories.
+'''
+
+import unittest
+
+import os, sys, inspect, tempfile, shutil
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from scratch import *
+from timers import *
+
+'''
+Test the scratch directories.
+'''
+class Scratch_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.cwd = os.getcwd()
+    self.directory = tempfile.mkdtemp()
+    os.chdir(self.directory)
+    with open("data.csv", "w") as fid:
+      fid.write("1,2\n")
+
+  def tearDown(self):
+    Scratch.Remove()
+    os.chdir(self.cwd)
+    shutil.rmtree(self.directory)
+
+  '''
+  Test that the executable writes its output files to the scratch directory.
+  '''
+  def test_Command(self):
+    self.assertEqual(Scratch.Path("output.csv"), "output.csv")
+    directory = Scratch.Create("data.csv")
+    self.assertEqual(Scratch.Path("output.csv"), os.path.join(directory,
+        "output.csv"))
+    if os.access("/dev/shm", os.W_OK):
+      self.assertTrue(directory.startswith("/dev/shm/"))
+
+    cmd = Scratch.Command(["sh", "-c", "cp \"$0\" output.csv; echo " +
+        "'total_time: 1.0s'", "data.csv"])
+    self.assertEqual(cmd[3], os.path.join(self.directory, "data.csv"))
+    self.assertEqual(Timers.Run(cmd, 10, Scratch.directory)["total_time"],
+        1.0)
+    self.assertTrue(os.path.isfile(Scratch.Path("output.csv")))
+    self.assertFalse(os.path.isfile("output.csv"))
+
+    # Only the inputs of the job are converted, the output files are written to
+    # the scratch directory even if the current directory has a file with the
+    # same name.
+    with open("output.csv", "w") as fid:
+      fid.write("leftover\n")
+    cmd = Scratch.Command(["./tool", "-i", "data.csv", "-o", "output.csv",
+        "--output_file=output.csv"])
+    self.assertEqual(cmd, [os.path.join(self.directory, "tool"), "-i",
+        os.path.join(self.directory, "data.csv"), "-o", "output.csv",
+        "--output_file=output.csv"])
+
+    # Creating the directory of the next job removes the old directory.
+    Scratch.Create()
+    self.assertFalse(os.path.exists(directory))
+    Scratch.Remove()
+    self.assertEqual(Scratch.directory, None)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,71 @@
+'''
+  @file system_unit_test.py
+
+  Test for the host information.
+'''
+
+import unittest
+
+import os, sys, inspect, subprocess
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from system import *
+
+'''
+Test the host information.
+'''
+class SystemInfo_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.files = SystemInfo.files
+    SystemInfo.files = {"/proc/cpuinfo": "processor\t: 0\nmodel name\t: " +
+        "Test CPU\nflags\t\t: sse2 avx fpu\n\nprocessor\t: 1\nmodel name\t: " +
+        "Other CPU\n", "/sys/devices/system/cpu/intel_pstate/no_turbo": "1\n"}
+
+  def tearDown(self):
+    SystemInfo.files = self.files
+
+  '''
+  Test that the cached cpuinfo of the first processor is used.
+  '''
+  def test_CPUInfo(self):
+    self.assertEqual(SystemInfo.GetCPUInfo()["model name"], "Test CPU")
+    self.assertEqual(SystemInfo.GetCPUFlags(), "avx fpu sse2")
+    self.assertEqual(SystemInfo.GetTurbo(), "off")
+
+  '''
+  Test that the fingerprint only depends on the hardware and software setup.
+  '''
+  def test_Fingerprint(self):
+    info = {"host": "a", "cpu_model": "Test CPU", "numa": {"node0": "0-3"}}
+    other = dict(info, host="b")
+    self.assertEqual(SystemInfo.Fingerprint(info),
+        SystemInfo.Fingerprint(other))
+    self.assertNotEqual(SystemInfo.Fingerprint(info),
+        SystemInfo.Fingerprint(dict(info, governor="powersave")))
+
+  '''
+  Test that the host information doesn't import numpy and scikit into the
+  benchmark process.
+  '''
+  def test_ModuleVersion(self):
+    self.assertNotEqual(SystemInfo.GetModuleVersion("pytest"), "N/A")
+    self.assertEqual(SystemInfo.GetModuleVersion("no-such-package"), "N/A")
+
+    script = ("import sys; sys.path.insert(0, " + repr(cmd_subfolder) + "); " +
+        "from system import *; SystemInfo.GetHostInfo(); " +
+        "print('numpy' in sys.modules or 'sklearn' in sys.modules)")
+    output = subprocess.check_output([sys.executable, "-c", script])
+    self.assertEqual(output.decode("utf-8").strip(), "False")
+
+if __name__ == '__main__':
+  unittest.main()
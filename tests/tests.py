@@ -29,7 +29,28 @@ modules = [
 #'benchmark_pca',
 'benchmark_range_search',
 'benchmark_sparse_coding',
-'benchmark_svr'
+'benchmark_svr',
+'graph_unit_test',
+'scaling_unit_test',
+'generator_unit_test',
+'distributed_unit_test',
+'database_unit_test',
+'system_unit_test',
+'placement_unit_test',
+'timers_unit_test',
+'jvm_unit_test',
+'bindings_unit_test',
+'misc_unit_test',
+'timer_unit_test',
+'executables_unit_test',
+'scratch_unit_test',
+'schedule_unit_test',
+'interleave_unit_test',
+'containment_unit_test',
+'interference_unit_test',
+'threads_unit_test',
+'plan_unit_test',
+'profiler_unit_test'
 #'metrics_unit_test'
 ]
 
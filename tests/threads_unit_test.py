@@ -0,0 +1,170 @@
+'''
+  @file threads_unit_test.py
+
+  Test for the thread count settings.
+'''
+
+import unittest
+
+import os, sys, inspect, tempfile, shutil, types
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from threads import *
+from parser import *
+
+config = """library: test
+methods:
+    TEST:
+        script: methods/test/test.py
+        format: [csv]
+        run: ['timing']
+        threads: [1, 2, 4]
+        datasets:
+            - files: ['datasets/iris.csv']
+    SINGLE:
+        script: methods/test/single.py
+        format: [csv]
+        run: ['timing']
+        threads: 8
+        datasets:
+            - files: ['datasets/wine.csv']
+    DEFAULT:
+        script: methods/test/default.py
+        format: [csv]
+        run: ['timing']
+        datasets:
+            - files: ['datasets/wine.csv']
+"""
+
+'''
+Estimator with the n_jobs parameter.
+'''
+class JobsEstimator(object):
+  def __init__(self, n_clusters=8, n_jobs=None):
+    pass
+
+'''
+Estimator without the n_jobs parameter.
+'''
+class SerialEstimator(object):
+  def __init__(self, n_clusters=8):
+    pass
+
+'''
+Test the thread count settings.
+'''
+class Threads_Test(unittest.TestCase):
+
+  '''
+  Test initialization.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.variables = Threads.THREAD_VARIABLES + [Threads.THREADS_ENV,
+        Threads.JAVA_OPTIONS]
+    self.environment = dict((v, os.environ.get(v)) for v in self.variables)
+
+    for variable in self.variables:
+      os.environ.pop(variable, None)
+    os.environ[Threads.JAVA_OPTIONS] = "-Xmx1g"
+
+  def tearDown(self):
+    Threads.Reset()
+    for variable, value in self.environment.items():
+      if value is None:
+        os.environ.pop(variable, None)
+      else:
+        os.environ[variable] = value
+    sys.modules.pop("threadpoolctl", None)
+    shutil.rmtree(self.directory)
+
+  '''
+  Test that the environment variables are set and restored.
+  '''
+  def test_ApplyReset(self):
+    Threads.Apply(4)
+    for variable in Threads.THREAD_VARIABLES + [Threads.THREADS_ENV]:
+      self.assertEqual(os.environ[variable], "4")
+    self.assertEqual(os.environ[Threads.JAVA_OPTIONS],
+        "-Xmx1g -XX:ActiveProcessorCount=4")
+    self.assertEqual(Threads.Count(), 4)
+
+    # A second Apply() starts from the original environment.
+    Threads.Apply(2)
+    self.assertEqual(os.environ[Threads.JAVA_OPTIONS],
+        "-Xmx1g -XX:ActiveProcessorCount=2")
+
+    Threads.Reset()
+    for variable in Threads.THREAD_VARIABLES + [Threads.THREADS_ENV]:
+      self.assertFalse(variable in os.environ)
+    self.assertEqual(os.environ[Threads.JAVA_OPTIONS], "-Xmx1g")
+    self.assertEqual(Threads.Count(), 1)
+    self.assertEqual(Threads.Count(0), 0)
+
+    # None keeps the library defaults.
+    Threads.Apply(None)
+    self.assertFalse(Threads.THREADS_ENV in os.environ)
+    self.assertEqual(Threads.MatlabFlags(), "")
+
+    Threads.Apply(1)
+    self.assertEqual(Threads.MatlabFlags(), "-singleCompThread ")
+
+  '''
+  Test the n_jobs argument of the scikit estimators.
+  '''
+  def test_JobsArgument(self):
+    self.assertEqual(Threads.JobsArgument(JobsEstimator), {"n_jobs": 1})
+    self.assertEqual(Threads.JobsArgument(SerialEstimator), {})
+    self.assertEqual(Threads.JobsArgument(None), {})
+
+    Threads.Apply(4)
+    self.assertEqual(Threads.JobsArgument(JobsEstimator), {"n_jobs": 4})
+    self.assertEqual(Threads.JobsArgument(SerialEstimator), {})
+
+  '''
+  Test that the thread pools are limited to the current thread count.
+  '''
+  def test_LimitThreadPools(self):
+    limits = []
+    module = types.ModuleType("threadpoolctl")
+    module.threadpool_limits = lambda **kwargs: limits.append(kwargs) or kwargs
+    sys.modules["threadpoolctl"] = module
+
+    self.assertEqual(Threads.LimitThreadPools(), None)
+    self.assertEqual(limits, [])
+
+    Threads.Apply(2)
+    self.assertEqual(Threads.LimitThreadPools(), {"limits": 2})
+    self.assertEqual(limits, [{"limits": 2}])
+
+    # Without threadpoolctl the thread pools are left unchanged.
+    sys.modules["threadpoolctl"] = None
+    self.assertEqual(Threads.LimitThreadPools(), None)
+
+  '''
+  Test that the thread list of a method is expanded into library tuples.
+  '''
+  def test_Parser(self):
+    configfile = os.path.join(self.directory, "config.yaml")
+    with open(configfile, "w") as fid:
+      fid.write(config)
+
+    streamData = Parser(configfile, verbose=False).StreamMerge()
+    tuples = streamData["TEST"][""]
+    self.assertEqual([t[8] for t in tuples], [1, 2, 4])
+    for t in tuples:
+      self.assertEqual(t[0], "test")
+      self.assertEqual(t[1], ["datasets/iris.csv"])
+      self.assertEqual(t[3], "methods/test/test.py")
+
+    self.assertEqual([t[8] for t in streamData["SINGLE"][""]], [8])
+    self.assertEqual([t[8] for t in streamData["DEFAULT"][""]], [None])
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,101 @@
+'''
+  @file timer_unit_test.py
+
+  Test for the result channel of the timeout subprocess.
+'''
+
+import unittest
+
+import os, sys, inspect, time, signal
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from timer import *
+
+'''
+Test the result channel.
+'''
+class Results_Test(unittest.TestCase):
+
+  def tearDown(self):
+    Results.models = False
+
+  '''
+  Test that the results of the subprocess are passed to the caller.
+  '''
+  def test_Results(self):
+    results = Results()
+    def Run(q):
+      results.Put(predictions=[1, 2, 3], model="model")
+      q.put(0.5)
+
+    self.assertEqual(timeout(Run, 10, results), 0.5)
+    self.assertEqual(results.Get("predictions"), [1, 2, 3])
+    self.assertEqual(results.Get("model"), None)
+    self.assertEqual(results.path, None)
+
+    Results.models = True
+    self.assertEqual(timeout(Run, 10, results), 0.5)
+    self.assertEqual(results.Get("model"), "model")
+
+  '''
+  Test that the results of a failed or timed out run are dropped.
+  '''
+  def test_Failure(self):
+    results = Results()
+    def Fail(q):
+      results.Put(predictions=[1])
+      q.put(-1)
+
+    def Sleep(q):
+      results.Put(predictions=[1])
+      time.sleep(10)
+
+    self.assertEqual(timeout(Fail, 10, results), -1)
+    self.assertEqual(results.Get("predictions"), None)
+    self.assertEqual(timeout(Sleep, 1, results), -2)
+    self.assertEqual(results.Get("predictions"), None)
+    self.assertEqual(results.path, None)
+
+  '''
+  Test that a model which can't be pickled doesn't drop the other results.
+  '''
+  def test_Unpicklable(self):
+    Results.models = True
+    results = Results()
+    def Run(q):
+      results.Put(predictions=[1], model=lambda x: x)
+      q.put(0.5)
+
+    self.assertEqual(timeout(Run, 10, results), 0.5)
+    self.assertEqual(results.Get("predictions"), [1])
+    self.assertEqual(results.Get("model"), None)
+
+  '''
+  Test that the channel is cleaned up if the caller is interrupted.
+  '''
+  def test_Interrupt(self):
+    results = Results()
+    def Sleep(q):
+      time.sleep(10)
+
+    def Interrupt(signum, frame):
+      raise KeyboardInterrupt()
+
+    handler = signal.signal(signal.SIGALRM, Interrupt)
+    signal.alarm(1)
+    try:
+      with self.assertRaises(KeyboardInterrupt):
+        timeout(Sleep, 10, results)
+    finally:
+      signal.alarm(0)
+      signal.signal(signal.SIGALRM, handler)
+    self.assertEqual(results.path, None)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,65 @@
+'''
+  @file timers_unit_test.py
+
+  Test for the structured timer protocol.
+'''
+
+import unittest
+
+import os, sys, inspect
+
+# Import the util path, this method even works if the path contains
+# symlinks to modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], '../util')))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from timers import *
+
+'''
+Test the timer extraction.
+'''
+class Timers_Test(unittest.TestCase):
+
+  '''
+  Test the mlpack and the weka timer output.
+  '''
+  def test_Parse(self):
+    timers = Timers.Parse(b"[INFO ] Program timers:\n" +
+        b"[INFO ]   loading_data: 0.012500s\n" +
+        b"[INFO ]   k: 3\n" +
+        b"[INFO ]   tree_building: 1.5e-03s\n" +
+        b"[INFO ]   total_time: 2.000000s (0 mins, 2.0 secs)\n" +
+        b"loading_data: 0,25s\n")
+
+    self.assertEqual(list(timers), ["loading_data", "tree_building",
+        "total_time"])
+    self.assertEqual(timers["loading_data"], 0.25)
+    self.assertEqual(timers["tree_building"], 0.0015)
+    self.assertEqual(Timers.Total(timers, ["total_time", "-loading_data"]),
+        1.75)
+    self.assertEqual(Timers.Total(timers, ["saving_data"]), None)
+
+  '''
+  Test that the output of a command is streamed and the timeout is handled.
+  '''
+  def test_Run(self):
+    timers = Timers.Run([sys.executable, "-c", "print('x' * 100000);" +
+        "print('[INFO ]   total_time: 0.5s')"])
+    self.assertEqual(timers, {"total_time": 0.5})
+
+    self.assertRaises(subprocess.TimeoutExpired, Timers.Run, [sys.executable,
+        "-c", "import time; time.sleep(10)"], 0.5)
+    self.assertRaises(subprocess.CalledProcessError, Timers.Run,
+        [sys.executable, "-c", "import sys; sys.exit(1)"])
+
+  '''
+  Test the mean of several trials.
+  '''
+  def test_Mean(self):
+    self.assertEqual(Timers.Mean([{"a": 1.0, "b": 2.0}, {"a": 3.0}]),
+        {"a": 2.0, "b": 2.0})
+
+if __name__ == '__main__':
+  unittest.main()
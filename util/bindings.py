@@ -0,0 +1,241 @@
+'''
+  @file bindings.py
+
+  Run the mlpack methods in-process through the mlpack Python bindings
+  instead of the mlpack_* executables.
+'''
+
+import os
+import sys
+import inspect
+import time
+import ctypes
+import tempfile
+import subprocess
+import collections
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+import timer
+from timers import *
+from executables import *
+from scratch import *
+
+'''
+This class translates an mlpack command line into a call of the corresponding
+mlpack Python binding. The options are mapped with the option table of the
+executable (see Executables.Info()), the input files are loaded once (outside
+of the measured time) and passed as contiguous NumPy arrays, so the binding
+uses the data without a copy. Only the binding call is timed. The outputs
+(e.g. the predictions) are returned in memory.
+
+Commands the bindings can't handle (e.g. model files, unknown options or non
+csv files) run the executable as before. The backend is enabled with the
+'mlpackBindings' setting of the general block:
+
+  mlpackBindings: true
+'''
+class MlpackBindings(object):
+
+  # Use the bindings if they are importable.
+  enabled = False
+
+  # The executables with a different binding name.
+  NAMES = {"allknn": "knn", "allkfn": "kfn", "allkrann": "krann",
+      "gmm": "gmm_train"}
+
+  # The timers which are not part of a binding call.
+  IO_TIMERS = ["loading_data", "saving_data", "loading_time", "saving_time"]
+
+  # The loaded input files.
+  data = {}
+
+  '''
+  Set the bindings setting.
+
+  @param enabled - Use the bindings if True.
+  '''
+  @staticmethod
+  def Configure(enabled):
+    MlpackBindings.enabled = bool(enabled)
+
+  '''
+  Get the binding function for the given executable.
+
+  @param executable - The name of the mlpack executable.
+  @return The binding function or None if the bindings aren't available.
+  '''
+  @staticmethod
+  def Binding(executable):
+    name = os.path.basename(executable)
+    if not name.startswith("mlpack_"):
+      return None
+    name = name[len("mlpack_"):]
+
+    try:
+      import mlpack
+    except ImportError:
+      return None
+    return getattr(mlpack, MlpackBindings.NAMES.get(name, name), None)
+
+  '''
+  Load the given input file, the arrays are reused for all trials.
+
+  @param fileName - The csv file.
+  @return The contiguous array.
+  '''
+  @staticmethod
+  def Load(fileName):
+    if fileName not in MlpackBindings.data:
+      import numpy as np
+      MlpackBindings.data[fileName] = np.ascontiguousarray(np.genfromtxt(
+          fileName, delimiter=","), dtype=np.float64)
+    return MlpackBindings.data[fileName]
+
+  '''
+  Translate the arguments of an mlpack command into the parameters of the
+  binding.
+
+  @param cmd - The command (list of arguments).
+  @return Dictionary with the parameters or None if the command isn't
+  supported.
+  '''
+  @staticmethod
+  def Parameters(cmd):
+    info = Executables.Info(cmd[0])
+    if not info or not info["options"]:
+      return None
+    options = info["options"]
+
+    params = {}
+    args = list(cmd[1:])
+    while args:
+      arg = args.pop(0)
+      value = None
+      if arg.startswith("--") and "=" in arg:
+        arg, value = arg.split("=", 1)
+      if arg not in options:
+        return None
+
+      name, kind, output = options[arg]
+      if kind is None:
+        params[name] = True
+        continue
+
+      if value is None:
+        if not args:
+          return None
+        value = args.pop(0)
+
+      # The outputs are returned by the binding.
+      if output:
+        if name.endswith("model_file"):
+          return None
+        continue
+
+      if name.endswith("_file"):
+        if name.endswith("model_file") or not value.endswith(".csv"):
+          return None
+        params[name[:-len("_file")]] = MlpackBindings.Load(value)
+      elif kind == "int":
+        params[name] = int(value)
+      elif kind == "double":
+        params[name] = float(value)
+      elif kind == "string":
+        params[name] = value
+      else:
+        return None
+
+    # The binding may use the arrays without a copy.
+    params["copy_all_inputs"] = False
+    return params
+
+  '''
+  Run the given mlpack command with the Python bindings if possible. Like
+  Timers.Run(), the function raises subprocess.TimeoutExpired if the command
+  doesn't finish in time and subprocess.CalledProcessError if the command
+  fails. The binding call is executed in the timeout subprocess; the input
+  arrays are shared with the subprocess, the outputs are passed back through a
+  temporary file.
+
+  @param cmd - The command (list of arguments).
+  @param timeout - The timeout in seconds (0 or None for no timeout).
+  @return Tuple (timers, outputs) with the ordered dictionary of the timers in
+  seconds and the dictionary of the binding outputs (None if the executable
+  was used).
+  '''
+  @staticmethod
+  def Run(cmd, timeout=None):
+    binding = MlpackBindings.Binding(cmd[0]) if (
+        MlpackBindings.enabled) else None
+    params = MlpackBindings.Parameters(cmd) if binding else None
+    if params is None:
+      # The executable writes its output files to the scratch directory.
+      return Timers.Run(Scratch.Command(cmd), timeout, Scratch.directory), None
+
+    import numpy as np
+    outputFile = tempfile.NamedTemporaryFile(suffix=".npz", delete=False)
+    outputFile.close()
+
+    def RunBinding(q):
+      # Capture the timers printed by the library.
+      log = tempfile.TemporaryFile()
+      os.dup2(log.fileno(), 1)
+
+      try:
+        start = time.time()
+        outputs = binding(**params)
+        elapsed = time.time() - start
+      except Exception as e:
+        q.put(-1)
+        return -1
+
+      ctypes.CDLL(None).fflush(None)
+      log.seek(0)
+      timers = Timers.Parse(log.read())
+      timers.setdefault("total_time", elapsed)
+      for name in MlpackBindings.IO_TIMERS:
+        timers.setdefault(name, 0.0)
+
+      np.savez(outputFile.name, **dict((k, np.asarray(v)) for k, v in
+          outputs.items() if isinstance(v, (np.ndarray, list))))
+      q.put(list(timers.items()))
+      return elapsed
+
+    try:
+      r = timer.timeout(RunBinding, timeout if timeout else None)
+      if r == -2:
+        raise subprocess.TimeoutExpired(cmd, timeout)
+      if not isinstance(r, list):
+        raise subprocess.CalledProcessError(-1, cmd)
+
+      with np.load(outputFile.name) as data:
+        outputs = dict((k, data[k]) for k in data.files)
+    finally:
+      os.remove(outputFile.name)
+
+    return collections.OrderedDict(r), outputs
+
+  '''
+  Get an output of the last run or load the output file of the executable.
+
+  @param outputs - The outputs of the binding or None.
+  @param names - The possible names of the output (e.g. ['predictions',
+  'output']), the names differ between the mlpack versions.
+  @param fileName - The output file of the executable (in the scratch
+  directory).
+  @return The output array.
+  '''
+  @staticmethod
+  def Output(outputs, names, fileName):
+    for name in names:
+      if outputs and name in outputs:
+        return outputs[name]
+    from misc import LoadDataset
+    return LoadDataset(Scratch.Path(fileName))
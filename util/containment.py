@@ -0,0 +1,444 @@
+'''
+  @file containment.py
+
+  Process group and memory containment of the benchmark runs.
+'''
+
+import os
+import sys
+import inspect
+import signal
+import time
+import threading
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+
+'''
+This class contains every run in its own process group (session). If a run
+times out, the whole process tree is killed: the process group and all
+descendants, including the helpers which started their own session (e.g.
+MATLAB helpers, JVM threads or the OpenMP workers of a forked library). The
+next run doesn't start before the killed processes are gone and the CPUs are
+quiet, so the orphans of a timed out run can't skew the following
+measurements.
+'''
+class ProcessGroup(object):
+
+  # The CPU usage (in cores) below which the system is considered quiet.
+  QUIET_LOAD = 0.5
+
+  # The maximum time in seconds to wait for a quiet system.
+  QUIET_WAIT = 30
+
+  # The interval in seconds of the CPU usage samples.
+  INTERVAL = 0.2
+
+  # The killed process groups since the last check.
+  killed = []
+
+  '''
+  Start a new session (and process group) in the current process, used in the
+  forked timeout subprocess.
+  '''
+  @staticmethod
+  def Detach():
+    try:
+      os.setsid()
+    except OSError:
+      # The process is already a group leader.
+      pass
+
+  '''
+  Get the child processes of the given process from the children files of
+  its threads.
+
+  @param pid - The process id.
+  @return List of process ids or None if the kernel doesn't provide the
+  children files.
+  '''
+  @staticmethod
+  def Children(pid):
+    path = "/proc/" + str(pid) + "/task/"
+    try:
+      tasks = os.listdir(path)
+    except OSError:
+      return []
+
+    # The children files need CONFIG_PROC_CHILDREN.
+    if tasks and not os.path.exists(path + tasks[0] + "/children"):
+      return None
+
+    children = []
+    for task in tasks:
+      try:
+        with open(path + task + "/children") as fid:
+          children.extend(int(child) for child in fid.read().split())
+      except (IOError, OSError, ValueError):
+        continue
+    return children
+
+  '''
+  Get the process ids of all descendants of the given process. Only the
+  process tree is visited if the kernel provides the children files,
+  otherwise all processes are scanned.
+
+  @param pid - The process id.
+  @return List of process ids.
+  '''
+  @staticmethod
+  def Descendants(pid):
+    if not os.path.exists("/proc/" + str(pid)):
+      return []
+
+    children = ProcessGroup.Children(pid)
+    if children is not None:
+      descendants = []
+      while children:
+        child = children.pop()
+        descendants.append(child)
+        children.extend(ProcessGroup.Children(child) or [])
+      return descendants
+
+    children = {}
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+      if not entry.isdigit():
+        continue
+      try:
+        with open("/proc/" + entry + "/stat") as fid:
+          # The command name may contain spaces, the fields follow the ')'.
+          ppid = int(fid.read().rsplit(")", 1)[1].split()[1])
+      except (IOError, OSError, IndexError, ValueError):
+        continue
+      children.setdefault(ppid, []).append(int(entry))
+
+    descendants = []
+    stack = [pid]
+    while stack:
+      for child in children.get(stack.pop(), []):
+        descendants.append(child)
+        stack.append(child)
+    return descendants
+
+  '''
+  Check whether the given process group has running processes.
+
+  @param pgid - The process group id.
+  @return True if the group has processes.
+  '''
+  @staticmethod
+  def Alive(pgid):
+    try:
+      os.killpg(pgid, 0)
+    except ProcessLookupError:
+      return False
+    except OSError:
+      # The group exists but belongs to another user.
+      return True
+    return True
+
+  '''
+  Kill the process tree of the given process group leader: the descendants
+  are collected first, since they are moved to init when their parents die.
+
+  @param pid - The process id of the group leader.
+  @return True if a process was killed.
+  '''
+  @staticmethod
+  def Kill(pid):
+    killed = False
+    for child in ProcessGroup.Descendants(pid):
+      try:
+        os.kill(child, signal.SIGKILL)
+        killed = True
+      except OSError:
+        pass
+
+    try:
+      os.killpg(pid, signal.SIGKILL)
+      killed = True
+    except OSError:
+      pass
+
+    if killed:
+      ProcessGroup.killed.append(pid)
+    return killed
+
+  '''
+  Get the busy and the total CPU time of the system.
+
+  @return Tuple (busy, total) in clock ticks or None if not available.
+  '''
+  @staticmethod
+  def CPUTimes():
+    try:
+      with open("/proc/stat") as fid:
+        values = [int(v) for v in fid.readline().split()[1:]]
+    except (IOError, OSError, ValueError):
+      return None
+
+    # The idle and the iowait time.
+    idle = sum(values[3:5])
+    return (sum(values[:8]) - idle, sum(values[:8]))
+
+  '''
+  Measure the CPU usage of the system.
+
+  @param interval - The measurement interval in seconds.
+  @return The number of busy cores or None if not available.
+  '''
+  @staticmethod
+  def Load(interval=None):
+    start = ProcessGroup.CPUTimes()
+    time.sleep(interval or ProcessGroup.INTERVAL)
+    end = ProcessGroup.CPUTimes()
+    if not start or not end or end[1] <= start[1]:
+      return None
+
+    cores = os.cpu_count() or 1
+    return cores * (end[0] - start[0]) / float(end[1] - start[1])
+
+  '''
+  Wait until the processes of the killed groups are gone and the CPUs are
+  quiet, called before the next run. The check only runs if a process tree was
+  killed since the last check.
+
+  @return True if the system is quiet.
+  '''
+  @staticmethod
+  def Settle():
+    if not ProcessGroup.killed:
+      return True
+    groups, ProcessGroup.killed = ProcessGroup.killed, []
+
+    deadline = time.time() + ProcessGroup.QUIET_WAIT
+    while any(map(ProcessGroup.Alive, groups)) and time.time() < deadline:
+      time.sleep(ProcessGroup.INTERVAL)
+
+    load = None
+    while time.time() < deadline:
+      load = ProcessGroup.Load()
+      if load is None or load < ProcessGroup.QUIET_LOAD:
+        return True
+
+    Log.Warn("The system isn't quiet after the timeout (" +
+        "{0:.2f}".format(load or 0) + " busy cores), the next " +
+        "measurement may be disturbed.")
+    return False
+
+'''
+This class limits the memory of every run, so a runaway library can't push
+the host into swap or trigger the OOM killer on unrelated jobs. The limit is
+set in MB in the general block:
+
+  memoryLimit: 4096
+
+The limit is applied to the data segment (RLIMIT_DATA, the heap and the
+private mappings) of the run, so a run over the limit fails to allocate
+memory. A failed run is reported as out of memory if it printed an allocation
+error, was killed by the kernel or its peak memory reached the limit; the peak
+memory of the last run is sampled while it runs.
+'''
+class MemoryLimit(object):
+
+  # The memory limit of a run in MB, None for no limit.
+  limit = None
+
+  # The return value of an unsuccessful run which exceeded the memory limit
+  # (-1: failure, -2: timeout).
+  OOM = -3
+
+  # The exit code of the timeout subprocess after a MemoryError.
+  EXIT_CODE = 3
+
+  # The share of the limit above which a failed run is out of memory.
+  THRESHOLD = 0.9
+
+  # The interval in seconds of the memory samples.
+  INTERVAL = 0.1
+
+  # The number of memory samples between two scans of the process tree, the
+  # new processes are found with the next scan.
+  SCAN = 5
+
+  # The output of the failed allocations (C++, Python, Java, C).
+  MARKERS = [b"bad_alloc", b"MemoryError", b"OutOfMemoryError",
+      b"Cannot allocate memory", b"out of memory", b"Out of memory"]
+
+  # True if the last run exceeded the memory limit.
+  oom = False
+
+  # The peak memory (resident set size) of the last run in KB.
+  peak = None
+
+  '''
+  Set the memory limit.
+
+  @param limit - The memory limit in MB, None for no limit.
+  '''
+  @staticmethod
+  def Configure(limit):
+    MemoryLimit.limit = limit
+
+  '''
+  Apply the memory limit to the current process, used in the forked process
+  of a run.
+  '''
+  @staticmethod
+  def Apply():
+    if not MemoryLimit.limit:
+      return
+
+    import resource
+    size = int(MemoryLimit.limit) << 20
+    resource.setrlimit(getattr(resource, "RLIMIT_DATA", resource.RLIMIT_AS),
+        (size, size))
+
+  '''
+  Check whether the given output line reports a failed allocation.
+
+  @param line - The output line (bytes).
+  @return True if the line reports a failed allocation.
+  '''
+  @staticmethod
+  def Marker(line):
+    return any(marker in line for marker in MemoryLimit.MARKERS)
+
+  '''
+  Start to sample the memory of the given process tree.
+
+  @param pid - The id of the root process.
+  @return The monitor or None if there is no memory limit.
+  '''
+  @staticmethod
+  def Start(pid):
+    MemoryLimit.oom = False
+    MemoryLimit.peak = None
+    if not MemoryLimit.limit:
+      return None
+
+    monitor = MemoryMonitor(pid)
+    monitor.start()
+    return monitor
+
+  '''
+  Stop the memory monitor and decide whether the run exceeded the memory
+  limit.
+
+  @param monitor - The monitor (see Start()).
+  @param failed - True if the run was unsuccessful (but didn't time out).
+  @param killed - True if the run was killed by a signal of the kernel.
+  @param marker - True if the run reported a failed allocation.
+  @return True if the run exceeded the memory limit.
+  '''
+  @staticmethod
+  def Stop(monitor, failed, killed=False, marker=False):
+    if monitor is None:
+      return False
+
+    MemoryLimit.peak = monitor.Stop()
+    MemoryLimit.oom = failed and (killed or marker or MemoryLimit.peak >=
+        MemoryLimit.THRESHOLD * MemoryLimit.limit * 1024)
+
+    if MemoryLimit.oom:
+      Log.Warn("The run exceeded the memory limit of " +
+          str(MemoryLimit.limit) + " MB (peak " +
+          str(MemoryLimit.peak // 1024) + " MB).")
+    return MemoryLimit.oom
+
+  '''
+  Convert the time of an unsuccessful run which exceeded the memory limit.
+
+  @param time - The time returned by RunTiming().
+  @return MemoryLimit.OOM if the run exceeded the memory limit, otherwise the
+  given time.
+  '''
+  @staticmethod
+  def Check(time):
+    return MemoryLimit.OOM if time == -1 and MemoryLimit.oom else time
+
+'''
+This class samples the resident set size of a process tree in a background
+thread and keeps the peak value.
+'''
+class MemoryMonitor(threading.Thread):
+
+  '''
+  Create the monitor of the given process tree.
+
+  @param pid - The id of the root process.
+  '''
+  def __init__(self, pid):
+    threading.Thread.__init__(self)
+    self.daemon = True
+    self.pid = pid
+    self.peak = 0
+    self.pids = [pid]
+    self.samples = 0
+    self.stopped = threading.Event()
+
+  '''
+  Get the value of the given field of the status file of a process.
+
+  @param pid - The id of the process.
+  @param field - The name of the field, e.g. 'VmRSS'.
+  @return The value in KB (0 if the process has terminated).
+  '''
+  @staticmethod
+  def Status(pid, field):
+    try:
+      with open("/proc/" + str(pid) + "/status") as fid:
+        for line in fid:
+          if line.startswith(field + ":"):
+            return int(line.split()[1])
+    except (IOError, OSError, ValueError):
+      pass
+    return 0
+
+  '''
+  Reset the peak resident set size (VmHWM) of a long-running process, so the
+  peak of the next run doesn't include the former runs.
+
+  @param pid - The id of the process.
+  '''
+  @staticmethod
+  def ResetPeak(pid):
+    try:
+      with open("/proc/" + str(pid) + "/clear_refs", "w") as fid:
+        fid.write("5")
+    except (IOError, OSError):
+      pass
+
+  '''
+  Sample the memory of the process tree: the resident set size of all
+  processes, at least the peak resident set size of the root process. The
+  process tree is only scanned every MemoryLimit.SCAN samples.
+  '''
+  def Sample(self):
+    if self.samples % MemoryLimit.SCAN == 0:
+      self.pids = [self.pid] + ProcessGroup.Descendants(self.pid)
+    self.samples += 1
+
+    rss = sum(MemoryMonitor.Status(pid, "VmRSS") for pid in self.pids)
+    self.peak = max(self.peak, rss, MemoryMonitor.Status(self.pid, "VmHWM"))
+
+  def run(self):
+    while not self.stopped.is_set():
+      self.Sample()
+      self.stopped.wait(MemoryLimit.INTERVAL)
+
+  '''
+  Stop the sampling.
+
+  @return The peak memory in KB.
+  '''
+  def Stop(self):
+    self.stopped.set()
+    self.join()
+    return self.peak
@@ -106,6 +106,29 @@ class Database:
           FOREIGN KEY(method_id) REFERENCES methods(id) ON DELETE CASCADE
         );
         """)
+    # Update results table schema.
+    self.AddColumn("results", "threads", "INTEGER")
+    self.AddColumn("results", "placement", "TEXT")
+    self.AddColumn("results", "phases", "TEXT")
+    self.AddColumn("results", "memory", "INTEGER")
+    self.AddColumn("results", "interference", "TEXT")
+
+  '''
+  Add the given column to the given table if the table doesn't contain the
+  column (update of an existing database schema).
+
+  @param table - The name of the table.
+  @param column - The name of the column.
+  @param definition - The column type definition.
+  '''
+  def AddColumn(self, table, column, definition):
+    try:
+      self.cur.execute("SELECT " + column + " FROM " + table)
+      self.cur.fetchall()
+    except sqlite3.OperationalError as e:
+      self.cur.execute("ALTER TABLE " + table + " ADD COLUMN " + column + " " +
+          definition)
+      self.cur.fetchall()
 
   '''
   Create a new metric results table
@@ -168,6 +191,73 @@ class Database:
         """)
 
     '''
+  Create a new complexity table, which contains the empirical complexity
+  exponents of the dataset-size scaling mode.
+  '''
+  def CreateComplexityTable(self):
+    self.con.executescript("""
+        CREATE TABLE IF NOT EXISTS complexity (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          build_id INTEGER NOT NULL,
+          libary_id INTEGER NOT NULL,
+          method_id INTEGER NOT NULL,
+          dataset_id INTEGER NOT NULL,
+          dimension TEXT NOT NULL,
+          exponent REAL NOT NULL,
+          r2 REAL NOT NULL,
+          points INTEGER NOT NULL,
+          threads INTEGER,
+
+          FOREIGN KEY(build_id) REFERENCES builds(id) ON DELETE CASCADE,
+          FOREIGN KEY(libary_id) REFERENCES libraries(id) ON DELETE CASCADE,
+          FOREIGN KEY(dataset_id) REFERENCES datasets(id) ON DELETE CASCADE,
+          FOREIGN KEY(method_id) REFERENCES methods(id) ON DELETE CASCADE
+        );
+        """)
+
+  '''
+  Create a new phase timings table, which contains the named timers of every
+  timing trial.
+  '''
+  def CreatePhaseTimingsTable(self):
+    self.con.executescript("""
+        CREATE TABLE IF NOT EXISTS phase_timings (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          build_id INTEGER NOT NULL,
+          libary_id INTEGER NOT NULL,
+          method_id INTEGER NOT NULL,
+          dataset_id INTEGER NOT NULL,
+          trial INTEGER NOT NULL,
+          phase TEXT NOT NULL,
+          time REAL NOT NULL,
+          threads INTEGER,
+
+          FOREIGN KEY(build_id) REFERENCES builds(id) ON DELETE CASCADE,
+          FOREIGN KEY(libary_id) REFERENCES libraries(id) ON DELETE CASCADE,
+          FOREIGN KEY(dataset_id) REFERENCES datasets(id) ON DELETE CASCADE,
+          FOREIGN KEY(method_id) REFERENCES methods(id) ON DELETE CASCADE
+        );
+        CREATE INDEX IF NOT EXISTS phase_timings_result ON phase_timings
+          (build_id, method_id, dataset_id);
+        """)
+
+  '''
+  Create a new build information table, which contains the host name and the
+  system information of the machine that produced the build.
+  '''
+  def CreateBuildInfoTable(self):
+    self.con.executescript("""
+        CREATE TABLE IF NOT EXISTS build_info (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          build_id INTEGER NOT NULL UNIQUE,
+          host TEXT NOT NULL,
+          info TEXT NOT NULL,
+
+          FOREIGN KEY(build_id) REFERENCES builds(id) ON DELETE CASCADE
+        );
+        """)
+
+  '''
   Create a method information table.
   '''
   def CreateMethodInfoTable(self):
@@ -194,6 +284,9 @@ class Database:
     self.CreateMemoryTable()
     self.CreateMethodInfoTable()
     self.CreateMetricBootstrapTable()
+    self.CreateComplexityTable()
+    self.CreateBuildInfoTable()
+    self.CreatePhaseTimingsTable()
 
   '''
   Add a new build record to the builds table.
@@ -208,6 +301,30 @@ class Database:
       self.cur.execute("SELECT last_insert_rowid()")
       return self.cur.fetchall()[0][0]
 
+  '''
+  Add the host and system information of the given build.
+
+  @param buildId - The id of the build.
+  @param host - The host name.
+  @param info - The system information as (json) string.
+  '''
+  def NewBuildInfo(self, buildId, host, info):
+    with self.con:
+      self.cur.execute("INSERT OR REPLACE INTO build_info VALUES (NULL,?,?,?)",
+          (buildId, host, info))
+
+  '''
+  Get the host and system information of the given build.
+
+  @param buildId - The id of the build.
+  @return A list with the (host, info) record.
+  '''
+  def GetBuildInfo(self, buildId):
+    with self.con:
+      self.cur.execute("SELECT host, info FROM build_info WHERE build_id=" +
+          str(buildId))
+      return self.cur.fetchall()
+
   '''
   Add a new metrics result record to the metric table.
   @param buildId - The id of the build.
@@ -340,11 +457,23 @@ class Database:
   @param var - The variance of the build.
   @param datasetId - The id of the dataset.
   @param methodId - The id of the method.
-  '''
-  def NewResult(self, buildId, libaryId, time, var, datasetId, methodId):
+  @param threads - The thread count of the run (None if not controlled).
+  @param placement - The NUMA placement of the run (None if not controlled).
+  @param phases - The mean of the named timers as (json) string.
+  @param memory - The peak memory of the last run in KB (None if not
+  measured).
+  @param interference - The interference summary of the trials as (json)
+  string.
+  '''
+  def NewResult(self, buildId, libaryId, time, var, datasetId, methodId,
+      threads=None, placement=None, phases=None, memory=None,
+      interference=None):
     with self.con:
-      self.cur.execute("INSERT INTO results VALUES (NULL,?,?,?,?,?,?)",
-        (buildId, libaryId, time, var, datasetId, methodId))
+      self.cur.execute("INSERT INTO results (build_id, libary_id, time, var, " +
+        "dataset_id, method_id, threads, placement, phases, memory, " +
+        "interference) VALUES (?,?,?,?,?,?,?,?,?,?,?)", (buildId, libaryId,
+        time, var, datasetId, methodId, threads, placement, phases, memory,
+        interference))
 
   '''
   Get the specified result from the results table.
@@ -353,13 +482,15 @@ class Database:
   @param libaryId - The if ot the library.
   @param datasetId - The id of the dataset.
   @param methodId - The id of the method.
+  @param threads - The thread count of the run (None if not controlled).
   @return The specified result record.
   '''
-  def GetResult(self, buildId, libaryId, datasetId, methodId):
+  def GetResult(self, buildId, libaryId, datasetId, methodId, threads=None):
     with self.con:
       self.cur.execute("SELECT * FROM results WHERE build_id=" + str(buildId)
           + " AND libary_id=" + str(libaryId) + " AND dataset_id="
-          + str(datasetId) + " AND method_id=" + str(methodId))
+          + str(datasetId) + " AND method_id=" + str(methodId)
+          + " AND threads IS ?", (threads,))
       return self.cur.fetchall()
 
   '''
@@ -372,16 +503,28 @@ class Database:
   @param var - The variance of the build.
   @param datasetId - The id of the dataset.
   @param methodId - The id of the method.
-  '''
-  def UpdateResult(self, buildId, libaryId, time, var, datasetId, methodId):
+  @param threads - The thread count of the run (None if not controlled).
+  @param placement - The NUMA placement of the run (None if not controlled).
+  @param phases - The mean of the named timers as (json) string.
+  @param memory - The peak memory of the last run in KB (None if not
+  measured).
+  @param interference - The interference summary of the trials as (json)
+  string.
+  '''
+  def UpdateResult(self, buildId, libaryId, time, var, datasetId, methodId,
+      threads=None, placement=None, phases=None, memory=None,
+      interference=None):
     with self.con:
-      if self.GetResult(buildId, libaryId, datasetId, methodId):
+      if self.GetResult(buildId, libaryId, datasetId, methodId, threads):
         self.cur.execute("UPDATE results SET time=" + str(time) + ",var="
-            + str(var) + " WHERE build_id=" + str(buildId) + " AND libary_id="
+            + str(var) + ",placement=?,phases=?,memory=?,interference=? " +
+            "WHERE build_id=" + str(buildId) + " AND libary_id="
             + str(libaryId) + " AND dataset_id=" + str(datasetId)
-            + " AND method_id=" + str(methodId))
+            + " AND method_id=" + str(methodId) + " AND threads IS ?",
+            (placement, phases, memory, interference, threads))
       else:
-        self.NewResult(buildId, libaryId, time, var, datasetId, methodId)
+        self.NewResult(buildId, libaryId, time, var, datasetId, methodId,
+            threads, placement, phases, memory, interference)
 
   '''
   Get the method id from the methods table with the given name and parameters.
@@ -469,12 +612,20 @@ class Database:
         return [(-1,)]
 
   def CopyLatestBuildFromLibary(self, buildId, newBuildId):
-    self.cur.execute("SELECT * FROM results WHERE build_id=" + str(buildId))
+    self.cur.execute("SELECT libary_id, time, var, dataset_id, method_id, " +
+        "threads, placement, phases, memory, interference FROM results " +
+        "WHERE build_id=" + str(buildId) + " ORDER BY id")
     results = self.cur.fetchall()
     with self.con:
       for res in results:
-        self.cur.execute("INSERT INTO results VALUES (NULL,?,?,?,?,?,?)",
-            (newBuildId, res[2], res[3], res[4], res[5], res[6]))
+        self.NewResult(newBuildId, *res)
+
+      # Copy the named timers of every trial.
+      self.cur.execute("INSERT INTO phase_timings (build_id, libary_id, " +
+          "method_id, dataset_id, trial, phase, time, threads) SELECT ?, " +
+          "libary_id, method_id, dataset_id, trial, phase, time, threads " +
+          "FROM phase_timings WHERE build_id=? ORDER BY id", (newBuildId,
+          buildId))
 
   '''
   Get a list of all methods.
@@ -494,10 +645,17 @@ class Database:
   @return A list with the results.
   '''
   def GetMethodResultsForLibary(self, buildId, methodId):
+    # If the build contains a thread scaling sweep we use the results with the
+    # highest thread count.
     with self.con:
-      self.cur.execute("SELECT * FROM results JOIN datasets ON" +
+      self.cur.execute("SELECT results.id, results.build_id, " +
+          "results.libary_id, results.time, results.var, results.dataset_id, " +
+          "results.method_id, datasets.* FROM results JOIN datasets ON" +
           " results.dataset_id = datasets.id WHERE build_id=" + str(buildId) +
-          " AND method_id=" + str(methodId) + " ORDER BY datasets.name")
+          " AND method_id=" + str(methodId) + " AND (threads IS NULL OR " +
+          "threads=(SELECT MAX(threads) FROM results AS r WHERE " +
+          "r.build_id=results.build_id AND r.method_id=results.method_id AND " +
+          "r.dataset_id=results.dataset_id)) ORDER BY datasets.name")
       return self.cur.fetchall()
 
   '''
@@ -601,6 +759,101 @@ class Database:
         " AND build_id="+ str(buildId) + " AND method_id=" + str(methodId))
       return self.cur.fetchall()
 
+  '''
+  Add a new complexity record to the complexity table, an existing record with
+  the same parameters is replaced.
+
+  @param buildId - The build id.
+  @param libaryId - The id of the library.
+  @param methodId - The id of the method.
+  @param datasetId - The id of the full dataset.
+  @param dimension - The scaling dimension ('rows' or 'columns').
+  @param exponent - The fitted complexity exponent.
+  @param r2 - The coefficient of determination of the fit.
+  @param points - The number of dataset sizes used for the fit.
+  @param threads - The thread count of the benchmark run.
+  '''
+  def NewComplexityResult(self, buildId, libaryId, methodId, datasetId,
+      dimension, exponent, r2, points, threads=None):
+    with self.con:
+      self.cur.execute("DELETE FROM complexity WHERE build_id=? AND " +
+          "libary_id=? AND method_id=? AND dataset_id=? AND dimension=? AND " +
+          "threads IS ?", (buildId, libaryId, methodId, datasetId, dimension,
+          threads))
+      self.cur.execute("INSERT INTO complexity VALUES (NULL,?,?,?,?,?,?,?,?,?)",
+          (buildId, libaryId, methodId, datasetId, dimension, exponent, r2,
+          points, threads))
+
+  '''
+  Add the named timers of the timing trials of a result to the phase timings
+  table; the existing timers of the result are replaced.
+
+  @param buildId - The id of the build.
+  @param libaryId - The id of the library.
+  @param methodId - The id of the method.
+  @param datasetId - The id of the dataset.
+  @param trials - List with the timer dictionary of every trial.
+  @param threads - The thread count of the run (None if not controlled).
+  '''
+  def NewPhaseTimings(self, buildId, libaryId, methodId, datasetId, trials,
+      threads=None):
+    with self.con:
+      self.cur.execute("DELETE FROM phase_timings WHERE build_id=? AND " +
+          "libary_id=? AND method_id=? AND dataset_id=? AND threads IS ?",
+          (buildId, libaryId, methodId, datasetId, threads))
+      self.cur.executemany("INSERT INTO phase_timings VALUES " +
+          "(NULL,?,?,?,?,?,?,?,?)", [(buildId, libaryId, methodId, datasetId,
+          trial + 1, phase, time, threads) for trial, timers in
+          enumerate(trials) for phase, time in timers.items()])
+
+  '''
+  Get the mean of the named timers of the given result.
+
+  @param buildId - The id of the build.
+  @param methodId - The id of the method.
+  @param datasetId - The id of the dataset.
+  @return A list with the (phase, mean time, trials) records.
+  '''
+  def GetPhaseTimings(self, buildId, methodId, datasetId):
+    with self.con:
+      self.cur.execute("SELECT phase, AVG(time), COUNT(*) FROM phase_timings " +
+          "WHERE build_id=? AND method_id=? AND dataset_id=? GROUP BY phase " +
+          "ORDER BY MIN(id)", (buildId, methodId, datasetId))
+      return self.cur.fetchall()
+
+  '''
+  Get the timing results of all builds.
+
+  @return A list with the (build id, library name, method name, parameters,
+  dataset name, dataset size, time, threads) results ordered by the build.
+  '''
+  def GetResultHistory(self):
+    with self.con:
+      self.cur.execute("SELECT results.build_id, libraries.name, " +
+          "methods.name, methods.parameters, datasets.name, datasets.size, " +
+          "results.time, results.threads FROM results JOIN libraries ON results.libary_id = " +
+          "libraries.id JOIN methods ON results.method_id = methods.id JOIN " +
+          "datasets ON results.dataset_id = datasets.id ORDER BY " +
+          "results.build_id, results.id")
+      return self.cur.fetchall()
+
+  '''
+  Get the complexity exponents of the given method.
+
+  @param buildId - The id of the build.
+  @param methodId - The id of the method.
+  @return A list with the (dataset name, dimension, exponent, r2, points,
+  threads) results.
+  '''
+  def GetComplexityResults(self, buildId, methodId):
+    with self.con:
+      self.cur.execute("SELECT datasets.name, dimension, exponent, r2, " +
+          "points, threads FROM complexity JOIN datasets ON " +
+          "complexity.dataset_id = datasets.id WHERE build_id=" + str(buildId) +
+          " AND method_id=" + str(methodId) + " ORDER BY datasets.name, " +
+          "dimension, threads")
+      return self.cur.fetchall()
+
   '''
   Get the information of the given method.
 
@@ -635,3 +888,127 @@ class Database:
       self.cur.execute("SELECT parameters FROM methods WHERE id=" +
           str(methodId))
       return self.cur.fetchall()
+
+  '''
+  Get the column names of the given table.
+
+  @param table - The name of the table (e.g. 'source.results').
+  @return List of the column names.
+  '''
+  def GetColumns(self, table):
+    schema, _, name = table.rpartition(".")
+    schema = schema + "." if schema else ""
+    self.cur.execute("PRAGMA " + schema + "table_info(" + name + ")")
+    return [row[1] for row in self.cur.fetchall()]
+
+  '''
+  Merge the given database into this database. The library, method and
+  dataset ids are remapped by name, every build of the source database gets a
+  new build id. Builds which are already in this database (same library and
+  build timestamp) are skipped, so a database can be merged more than once.
+  Everything is copied in one transaction with INSERT ... SELECT statements.
+
+  @param sourcePath - Path to the database which should be merged.
+  @param host - Host name for the builds without build information.
+  @return The number of merged builds.
+  '''
+  def Merge(self, sourcePath, host="unknown"):
+    # Tables with a build_id column which are copied.
+    tables = ["results", "metrics", "bootstrap", "memory", "complexity",
+        "phase_timings", "build_info"]
+    # Columns which are remapped to the ids of this database.
+    mapping = {"build_id": "build_map.new", "libary_id": "lib_map.new",
+        "dataset_id": "dataset_map.new", "method_id": "method_map.new"}
+
+    self.con.isolation_level = None
+    self.cur.execute("ATTACH DATABASE ? AS source", (sourcePath,))
+    try:
+      self.cur.execute("BEGIN")
+      sourceTables = [row[0] for row in self.cur.execute(
+          "SELECT name FROM source.sqlite_master WHERE type='table'")]
+
+      # Add the libraries, datasets and methods which are not available.
+      self.cur.execute("INSERT INTO libraries (name) SELECT DISTINCT name " +
+          "FROM source.libraries WHERE name NOT IN (SELECT name FROM " +
+          "main.libraries)")
+      columns = [c for c in self.GetColumns("source.datasets") if c != "id"]
+      self.cur.execute("INSERT INTO datasets (" + ",".join(columns) + ") " +
+          "SELECT " + ",".join(columns) + " FROM source.datasets WHERE name " +
+          "NOT IN (SELECT name FROM main.datasets) GROUP BY name")
+      self.cur.execute("INSERT INTO methods (name, parameters, alias) " +
+          "SELECT name, parameters, " + ("alias" if "alias" in
+          self.GetColumns("source.methods") else "'None'") + " FROM " +
+          "source.methods s WHERE NOT EXISTS (SELECT 1 FROM main.methods m " +
+          "WHERE m.name IS s.name AND m.parameters IS s.parameters) " +
+          "GROUP BY name, parameters")
+
+      # Create the id mappings. The statements are executed one by one,
+      # executescript() would commit the transaction.
+      for statement in """
+          CREATE TEMP TABLE lib_map AS SELECT s.id AS old, MIN(m.id) AS new
+              FROM source.libraries s JOIN main.libraries m ON s.name = m.name
+              GROUP BY s.id;
+          CREATE TEMP TABLE dataset_map AS SELECT s.id AS old, m.id AS new
+              FROM source.datasets s JOIN main.datasets m ON s.name = m.name;
+          CREATE TEMP TABLE method_map AS SELECT s.id AS old, MIN(m.id) AS new
+              FROM source.methods s JOIN main.methods m ON
+              s.name IS m.name AND s.parameters IS m.parameters GROUP BY s.id;
+          CREATE TEMP TABLE build_map AS SELECT b.id AS old,
+              b.id + (SELECT IFNULL(MAX(id), 0) FROM main.builds) AS new,
+              b.build AS build, lib_map.new AS libary_id
+              FROM source.builds b JOIN lib_map ON lib_map.old = b.libary_id
+              WHERE NOT EXISTS (SELECT 1 FROM main.builds t WHERE
+              t.libary_id = lib_map.new AND t.build = b.build);
+          INSERT INTO main.builds (id, build, libary_id)
+              SELECT new, build, libary_id FROM build_map
+          """.split(";"):
+        self.cur.execute(statement)
+
+      for table in tables:
+        if table not in sourceTables:
+          continue
+
+        # Copy the columns available in both databases, the remaining columns
+        # use the default value.
+        targetColumns = self.GetColumns("main." + table)
+        columns = [c for c in self.GetColumns("source." + table) if c != "id"
+            and c in targetColumns]
+        values = [mapping.get(c, "s." + c) for c in columns]
+
+        joins = " JOIN build_map ON build_map.old = s.build_id"
+        for column, name in [("libary_id", "lib_map"),
+            ("dataset_id", "dataset_map"), ("method_id", "method_map")]:
+          if column in columns:
+            joins += " JOIN " + name + " ON " + name + ".old = s." + column
+
+        self.cur.execute("INSERT INTO main." + table + " (" +
+            ",".join(columns) + ") SELECT " + ",".join(values) + " FROM " +
+            "source." + table + " s" + joins)
+
+      # Record the host of the builds without build information.
+      self.cur.execute("INSERT INTO build_info (build_id, host, info) " +
+          "SELECT new, ?, '{}' FROM build_map WHERE new NOT IN " +
+          "(SELECT build_id FROM build_info)", (host,))
+
+      # Copy the method descriptions which are not available.
+      if "method_info" in sourceTables:
+        self.cur.execute("INSERT INTO method_info (method_id, info) " +
+            "SELECT method_map.new, MIN(s.info) FROM source.method_info s " +
+            "JOIN method_map ON method_map.old = s.method_id WHERE " +
+            "method_map.new NOT IN (SELECT method_id FROM main.method_info) " +
+            "GROUP BY method_map.new")
+
+      self.cur.execute("SELECT COUNT(*) FROM build_map")
+      builds = self.cur.fetchall()[0][0]
+
+      self.cur.execute("COMMIT")
+    except Exception:
+      self.cur.execute("ROLLBACK")
+      raise
+    finally:
+      for table in ["lib_map", "dataset_map", "method_map", "build_map"]:
+        self.cur.execute("DROP TABLE IF EXISTS temp." + table)
+      self.cur.execute("DETACH DATABASE source")
+      self.con.isolation_level = ""
+
+    return builds
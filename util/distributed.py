@@ -0,0 +1,436 @@
+'''
+  @file distributed.py
+
+  Coordinator and worker classes to distribute the benchmark jobs over
+  several machines. The coordinator serves the jobs over a TCP or Unix socket,
+  the workers pull the jobs, run them and send the results back.
+'''
+
+import os
+import sys
+import inspect
+import collections
+import threading
+import socket
+import time
+import tempfile
+import binascii
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+
+from multiprocessing.connection import Listener, Client
+
+# Environment variable with the key used to authenticate the workers.
+AUTHKEY_ENV = "BENCHMARK_AUTHKEY"
+
+'''
+Parse the given address. An address with a port ('host:port') is a TCP
+address, every other address is the path of a Unix socket.
+
+@param address - The address string.
+@return Tuple (address, family) for the multiprocessing connection.
+'''
+def ParseAddress(address):
+  host, sep, port = address.rpartition(":")
+  if sep and port.isdigit():
+    return ((host if host else "localhost", int(port)), "AF_INET")
+  return (address, "AF_UNIX")
+
+'''
+Check if the given address is only reachable from the local machine (a Unix
+socket or a loopback address).
+
+@param address - The address (see ParseAddress()).
+@param family - The address family.
+@return True if the address is local.
+'''
+def IsLocalAddress(address, family):
+  if family == "AF_UNIX":
+    return True
+  host = address[0]
+  return host in ("localhost", "::1") or host.startswith("127.")
+
+'''
+Return the file which holds the generated key of a local address. The key
+file of a Unix socket is next to the socket, the key file of a loopback
+address is in the temporary folder.
+
+@param address - The address (see ParseAddress()).
+@param family - The address family.
+@return The path of the key file.
+'''
+def KeyFile(address, family):
+  if family == "AF_UNIX":
+    return address + ".key"
+  return os.path.join(tempfile.gettempdir(), "benchmark-" + str(address[1]) +
+      ".key")
+
+'''
+Return the key used to authenticate the connections. The connections pass
+pickled messages, so every peer which knows the key can run code on the
+coordinator and the workers: a non-local address requires an explicit key;
+for a local address the coordinator generates a random key and stores it in
+a key file, which is only readable by the user, for the local workers.
+
+@param key - The key or None to use the BENCHMARK_AUTHKEY environment variable.
+@param address - The address (see ParseAddress()).
+@param family - The address family.
+@param create - Generate the key of a local address (coordinator) instead of
+reading it from the key file (worker).
+@return The key as bytes.
+'''
+def AuthKey(key, address, family, create=False):
+  key = key if key else os.environ.get(AUTHKEY_ENV)
+  if key:
+    return key.encode("utf-8") if not isinstance(key, bytes) else key
+
+  if not IsLocalAddress(address, family):
+    raise ValueError("An authentication key is required for the address " +
+        str(address) + ", set " + AUTHKEY_ENV + " or use the -k option.")
+
+  fileName = KeyFile(address, family)
+  if create:
+    key = binascii.hexlify(os.urandom(32))
+    try:
+      os.remove(fileName)
+    except OSError:
+      pass
+    # Fail if another user created the file in the meantime.
+    fid = os.open(fileName, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fid, "wb") as fid:
+      fid.write(key)
+    return key
+
+  try:
+    if os.stat(fileName).st_uid != os.getuid():
+      raise ValueError("The key file " + fileName + " belongs to another user.")
+    with open(fileName, "rb") as fid:
+      return fid.read().strip()
+  except (IOError, OSError):
+    raise ValueError("No key file " + fileName + ", start the coordinator " +
+        "first or set " + AUTHKEY_ENV + ".")
+
+'''
+This class holds the state of all jobs. A job is either pending, running on
+exactly one worker or done. The jobs of a lost worker are requeued and the
+first result of a job wins, so no job is stored twice.
+'''
+class JobQueue(object):
+
+  '''
+  Create the queue with the given jobs.
+
+  @param jobs - List of job dictionaries with an 'id' key.
+  '''
+  def __init__(self, jobs):
+    self.lock = threading.Condition()
+    self.jobs = collections.OrderedDict((job["id"], job) for job in jobs)
+    self.pending = collections.deque(self.jobs)
+    self.running = {}
+    self.done = set()
+    self.results = collections.deque()
+
+  '''
+  Get the next pending job and assign it to the given worker.
+
+  @param worker - The name of the worker.
+  @return The job or None if there is no pending job.
+  '''
+  def Next(self, worker):
+    with self.lock:
+      while self.pending:
+        jobId = self.pending.popleft()
+        if jobId not in self.done and jobId not in self.running:
+          self.running[jobId] = worker
+          return self.jobs[jobId]
+      return None
+
+  '''
+  Mark the given job as done and keep the result.
+
+  @param jobId - The id of the job.
+  @param result - The result of the job.
+  @return True if this is the first result of the job.
+  '''
+  def Complete(self, jobId, result=None):
+    with self.lock:
+      if jobId in self.done or jobId not in self.jobs:
+        return False
+      self.running.pop(jobId, None)
+      self.done.add(jobId)
+      self.results.append((self.jobs[jobId], result))
+      self.lock.notify_all()
+      return True
+
+  '''
+  Requeue the running jobs of the given worker.
+
+  @param worker - The name of the worker.
+  @return List of the requeued job ids.
+  '''
+  def Requeue(self, worker):
+    with self.lock:
+      jobIds = [jobId for jobId, w in self.running.items() if w == worker]
+      for jobId in jobIds:
+        del self.running[jobId]
+        # Requeued jobs are executed next.
+        self.pending.appendleft(jobId)
+      self.lock.notify_all()
+      return jobIds
+
+  '''
+  Check if all jobs are done.
+
+  @return True if all jobs are done.
+  '''
+  def Finished(self):
+    with self.lock:
+      return len(self.done) == len(self.jobs)
+
+  '''
+  Wait until all jobs are done or the timeout expired.
+
+  @param timeout - The timeout in seconds.
+  @return True if all jobs are done.
+  '''
+  def Wait(self, timeout=None):
+    with self.lock:
+      return self.lock.wait_for(lambda: len(self.done) == len(self.jobs),
+          timeout)
+
+'''
+This class implements the coordinator. Every worker connection is handled by
+its own thread; the results are passed to the store function in the thread
+that called Run(), so the database connection is only used by one thread.
+'''
+class Coordinator(object):
+
+  '''
+  Create the coordinator.
+
+  @param jobs - List of jobs.
+  @param address - The TCP ('host:port') or Unix socket address.
+  @param store - Function called with (job, result) for every first result.
+  @param key - The authentication key.
+  @param heartbeat - A worker is lost if it doesn't send a message within
+  three heartbeat intervals (in seconds).
+  '''
+  def __init__(self, jobs, address, store, key=None, heartbeat=10):
+    self.queue = JobQueue(jobs)
+    self.store = store
+    self.heartbeat = heartbeat
+    self.workers = 0
+
+    address, family = ParseAddress(address)
+    # The key file of a generated key is removed after the run.
+    self.keyFile = None
+    if not key and not os.environ.get(AUTHKEY_ENV):
+      self.keyFile = KeyFile(address, family)
+    key = AuthKey(key, address, family, create=True)
+
+    if family == "AF_UNIX" and os.path.exists(address):
+      os.remove(address)
+    self.listener = Listener(address, family, authkey=key)
+    self.address = self.listener.address
+
+  '''
+  Serve the jobs until all jobs are done.
+  '''
+  def Run(self):
+    thread = threading.Thread(target=self.Accept)
+    thread.daemon = True
+    thread.start()
+
+    Log.Info("Coordinator: " + str(self.address) + " (" +
+        str(len(self.queue.jobs)) + " jobs)")
+
+    while True:
+      finished = self.queue.Wait(1)
+      # Store the results in this thread.
+      while self.queue.results:
+        job, result = self.queue.results.popleft()
+        self.store(job, result)
+      if finished:
+        break
+
+    self.listener.close()
+    if isinstance(self.address, str) and os.path.exists(self.address):
+      os.remove(self.address)
+    if self.keyFile and os.path.exists(self.keyFile):
+      os.remove(self.keyFile)
+
+  '''
+  Accept the worker connections.
+  '''
+  def Accept(self):
+    while not self.queue.Finished():
+      try:
+        connection = self.listener.accept()
+      except Exception:
+        # The listener was closed or the authentication failed.
+        if self.queue.Finished():
+          break
+        continue
+
+      self.workers += 1
+      thread = threading.Thread(target=self.Serve, args=(connection,
+          "worker-" + str(self.workers)))
+      thread.daemon = True
+      thread.start()
+
+  '''
+  Serve the requests of a single worker.
+
+  @param connection - The worker connection.
+  @param name - The name of the worker.
+  '''
+  def Serve(self, connection, name):
+    try:
+      while True:
+        # A worker which doesn't send messages (e.g. heartbeats) is lost.
+        if not connection.poll(self.heartbeat * 3):
+          Log.Warn("Worker timeout: " + name)
+          break
+
+        message = connection.recv()
+        if message[0] == "hello":
+          name = message[1] + " (" + name + ")"
+          Log.Info("Worker connected: " + name)
+        elif message[0] == "get":
+          job = self.queue.Next(name)
+          if job:
+            Log.Info("Job " + job["id"] + " -> " + name + ": " +
+                job["library"] + " " + job["method"])
+            # The worker uses the heartbeat interval of the coordinator.
+            connection.send(("job", job, self.heartbeat))
+          elif self.queue.Finished():
+            connection.send(("done",))
+            break
+          else:
+            # All remaining jobs are running, they might be requeued.
+            connection.send(("wait", 1))
+        elif message[0] == "result":
+          if not self.queue.Complete(message[1], message[2]):
+            Log.Warn("Ignore duplicate result of job " + str(message[1]))
+    except (EOFError, OSError) as e:
+      pass
+    finally:
+      for jobId in self.queue.Requeue(name):
+        Log.Warn("Worker lost: " + name + ", requeue job " + jobId)
+      connection.close()
+
+'''
+This class implements the worker, which pulls the jobs from the coordinator
+and runs them.
+'''
+class Worker(object):
+
+  '''
+  Create the worker.
+
+  @param address - The TCP ('host:port') or Unix socket address.
+  @param run - Function to run a job, returns the result.
+  @param key - The authentication key.
+  @param name - The name of the worker.
+  '''
+  def __init__(self, address, run, key=None, name=None):
+    self.address, self.family = ParseAddress(address)
+    self.run = run
+    self.key = key
+    # The key file of a local address is read when the worker connects, so
+    # the worker can be started before the coordinator.
+    if not IsLocalAddress(self.address, self.family):
+      AuthKey(key, self.address, self.family)
+    self.heartbeat = 10
+    self.name = name if name else socket.gethostname() + ":" + str(os.getpid())
+    self.lock = threading.Lock()
+
+  '''
+  Send a message to the coordinator. The heartbeat thread and the worker
+  thread share the connection.
+
+  @param connection - The coordinator connection.
+  @param message - The message.
+  '''
+  def Send(self, connection, message):
+    with self.lock:
+      connection.send(message)
+
+  '''
+  Send heartbeat messages until the event is set.
+
+  @param connection - The coordinator connection.
+  @param event - Stop event.
+  '''
+  def Heartbeat(self, connection, event):
+    while not event.wait(self.heartbeat):
+      try:
+        self.Send(connection, ("heartbeat",))
+      except Exception:
+        break
+
+  '''
+  Connect to the coordinator, retry until the coordinator is available.
+
+  @param retries - The number of connection attempts.
+  @return The connection.
+  '''
+  def Connect(self, retries=30):
+    for attempt in range(retries):
+      try:
+        return Client(self.address, self.family, authkey=AuthKey(self.key,
+            self.address, self.family))
+      except (OSError, EOFError, ValueError) as e:
+        if attempt == retries - 1:
+          raise
+        time.sleep(1)
+
+  '''
+  Pull and run jobs until the coordinator has no more jobs.
+
+  @return The number of executed jobs.
+  '''
+  def Run(self):
+    count = 0
+    connection = self.Connect()
+    self.Send(connection, ("hello", self.name))
+    try:
+      while True:
+        self.Send(connection, ("get",))
+        message = connection.recv()
+        if message[0] == "done":
+          break
+        elif message[0] == "wait":
+          time.sleep(message[1])
+          continue
+
+        job, self.heartbeat = message[1], message[2]
+        Log.Info("Job " + job["id"] + ": " + job["library"] + " " +
+            job["method"])
+
+        event = threading.Event()
+        thread = threading.Thread(target=self.Heartbeat, args=(connection,
+            event))
+        thread.daemon = True
+        thread.start()
+        try:
+          result = self.run(job)
+        finally:
+          event.set()
+          thread.join()
+
+        self.Send(connection, ("result", job["id"], result))
+        count += 1
+    except EOFError:
+      Log.Info("Coordinator closed the connection.")
+    finally:
+      connection.close()
+
+    return count
@@ -0,0 +1,173 @@
+'''
+  @file executables.py
+
+  Persistent cache of the executable metadata (description, version and
+  options) which is parsed from the help output of the mlpack executables.
+'''
+
+import os
+import sys
+import inspect
+import re
+import shlex
+import shutil
+import subprocess
+import simplejson
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+
+'''
+This class probes an executable once ('<executable> -h' and '--version') and
+stores the metadata in a cache file. The entries are keyed by the path of the
+executable and are probed again if the modification time of the executable
+changes, so the wrapper constructors don't start a process for every dataset
+and bootstrap instance.
+'''
+class Executables(object):
+
+  # The cache file.
+  cacheFile = os.path.join(".cache", "executables.json")
+
+  # The loaded cache entries: path -> metadata.
+  cache = None
+
+  # The description is the text before the option list.
+  DESCRIPTION_PATTERN = re.compile(r"(.*?)Required.*?options:", re.DOTALL)
+
+  # An option of the help output: '--name (-n) [type]'.
+  OPTION_PATTERN = re.compile(r"^\s+--(\w+)(?: \((-\w)\))?(?: \[([^\]]+)\])?")
+
+  '''
+  Load the cache file.
+
+  @return Dictionary with the cache entries.
+  '''
+  @staticmethod
+  def Load():
+    if Executables.cache is None:
+      Executables.cache = {}
+      try:
+        with open(Executables.cacheFile) as fid:
+          Executables.cache = simplejson.load(fid)
+      except (IOError, OSError, ValueError):
+        pass
+    return Executables.cache
+
+  '''
+  Write the cache file, the file is replaced atomically.
+  '''
+  @staticmethod
+  def Save():
+    directory = os.path.dirname(Executables.cacheFile)
+    try:
+      if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+      tmpFile = Executables.cacheFile + "." + str(os.getpid())
+      with open(tmpFile, "w") as fid:
+        simplejson.dump(Executables.cache, fid, sort_keys=True, indent=1)
+      os.replace(tmpFile, Executables.cacheFile)
+    except (IOError, OSError) as e:
+      Log.Warn("Could not write the executable cache: " + str(e))
+
+  '''
+  Parse the option table of the help output.
+
+  @param text - The help output.
+  @return Dictionary with the option names (long and short) -> [name, type,
+  output].
+  '''
+  @staticmethod
+  def ParseOptions(text):
+    options = {}
+    output = False
+    for line in text.splitlines():
+      if line.strip().endswith("options:"):
+        output = "output" in line.lower()
+        continue
+
+      match = Executables.OPTION_PATTERN.match(line)
+      if match:
+        name, short, kind = match.groups()
+        options["--" + name] = [name, kind, output]
+        if short:
+          options[short] = [name, kind, output]
+    return options
+
+  '''
+  Run the executable with the given argument and return the output.
+
+  @param executable - The executable.
+  @param argument - The argument.
+  @return The output or None if the command failed.
+  '''
+  @staticmethod
+  def Output(executable, argument):
+    try:
+      return subprocess.check_output([executable, argument],
+          stderr=subprocess.STDOUT, shell=False).decode("utf-8", "replace")
+    except Exception as e:
+      return None
+
+  '''
+  Probe the given executable.
+
+  @param executable - The executable.
+  @return Dictionary with the metadata or None if the executable can't be run.
+  '''
+  @staticmethod
+  def Probe(executable):
+    text = Executables.Output(executable, "-h")
+    if text is None:
+      return None
+
+    match = Executables.DESCRIPTION_PATTERN.match(text)
+    options = Executables.ParseOptions(text)
+
+    version = ""
+    if "--version" in options:
+      version = (Executables.Output(executable, "--version") or "").strip()
+
+    return {"description": match.group(1) if match else "",
+        "version": version, "options": options}
+
+  '''
+  Get the metadata of the given executable.
+
+  @param executable - The executable (e.g. MLPACK_BIN + 'mlpack_pca').
+  @return Dictionary with the 'description', 'version' and 'options' of the
+  executable or None if the executable can't be run.
+  '''
+  @staticmethod
+  def Info(executable):
+    cmd = shlex.split(executable)
+    if not cmd:
+      return None
+
+    path = shutil.which(cmd[-1]) or cmd[-1]
+    try:
+      path = os.path.realpath(path)
+      mtime = os.stat(path).st_mtime
+    except OSError:
+      return None
+
+    cache = Executables.Load()
+    entry = cache.get(path)
+    if entry and entry.get("mtime") == mtime:
+      return entry
+
+    entry = Executables.Probe(path)
+    if entry is None:
+      return None
+
+    entry["mtime"] = mtime
+    cache[path] = entry
+    Executables.Save()
+    return entry
@@ -0,0 +1,481 @@
+'''
+  @file generator.py
+
+  Functions to generate seeded, reproducible synthetic datasets. The datasets
+  are generated and written in chunks, so large datasets can be created in
+  bounded memory.
+'''
+
+import os
+import sys
+import inspect
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from misc import *
+
+'''
+This class writes a dataset chunk by chunk as csv file and as armadillo binary
+file (the 'bin' format). The binary file contains the matrix in the same
+orientation as the csv file.
+'''
+class DatasetWriter(object):
+
+  '''
+  Open the dataset files.
+
+  @param fileName - The name of the csv file, the binary file uses the same
+  name with the 'bin' extension.
+  @param rows - The number of rows of the dataset.
+  @param columns - The number of columns of the dataset.
+  @param formats - List of formats to write ('csv', 'bin').
+  @param integer - The number of trailing integer columns (e.g. labels).
+  '''
+  def __init__(self, fileName, rows, columns, formats, integer=0):
+    self.rows = rows
+    self.columns = columns
+    self.row = 0
+    self.files = []
+    self.fmt = ["%.8g"] * (columns - integer) + ["%d"] * integer
+
+    self.csv = None
+    if "csv" in formats:
+      self.csv = open(fileName, "w")
+      self.files.append(fileName)
+
+    self.bin = None
+    if "bin" in formats:
+      binFile = os.path.splitext(fileName)[0] + ".bin"
+      self.bin = open(binFile, "wb")
+      self.bin.write(("ARMA_MAT_BIN_FN008\n%d %d\n" % (rows,
+          columns)).encode("ascii"))
+      self.header = self.bin.tell()
+      # Allocate the file, every chunk is written to its final position.
+      self.bin.truncate(self.header + rows * columns * 8)
+      self.files.append(binFile)
+
+  '''
+  Write the next rows of the dataset.
+
+  @param chunk - Matrix with the next rows.
+  '''
+  def Write(self, chunk):
+    import numpy as np
+
+    if chunk.ndim == 1:
+      chunk = chunk.reshape(-1, 1)
+
+    if self.csv:
+      np.savetxt(self.csv, chunk, delimiter=",", fmt=self.fmt)
+
+    if self.bin:
+      # Armadillo stores the matrix in column-major order, so every column of
+      # the chunk is written to the corresponding column of the file.
+      data = np.asarray(chunk, dtype="<f8")
+      for column in range(self.columns):
+        self.bin.seek(self.header + (column * self.rows + self.row) * 8)
+        self.bin.write(np.ascontiguousarray(data[:, column]).tobytes())
+
+    self.row += chunk.shape[0]
+
+  '''
+  Close the dataset files.
+  '''
+  def Close(self):
+    for fid in [self.csv, self.bin]:
+      if fid:
+        fid.close()
+
+'''
+This class implements the generators for the different dataset kinds. Every
+dataset is defined by a name and a specification, e.g.
+
+  blobs-1M: {kind: blobs, rows: 1000000, columns: 16, centers: 8, seed: 1}
+
+The generated data only depends on the specification, the chunk with the index
+i uses its own random state seeded with (seed, i).
+'''
+class DatasetGenerator(object):
+
+  # The dataset kinds and the methods the datasets are intended for.
+  KINDS = {
+      "blobs": "Gaussian blobs (KMEANS, GMM)",
+      "lowrank": "Non-negative low-rank matrix (PCA, NMF)",
+      "classification": "Labelled classes (NBC, LOGISTIC_REGRESSION, " +
+          "PERCEPTRON)",
+      "hmm": "Hidden markov model sequence (HMMTRAIN, HMMVITERBI, ...)",
+      "neighbors": "High-dimensional data with a low intrinsic dimension " +
+          "(ALLKNN, LSH, FASTMKS)"}
+
+  # Default values of the specification.
+  DEFAULTS = {"rows": 10000, "columns": 10, "seed": 42, "chunk": 100000,
+      "formats": ["csv", "bin"]}
+
+  # Folder which contains the generated datasets.
+  directory = "datasets"
+
+  '''
+  Generate the dataset with the given name if the files are not available or
+  the specification has changed.
+
+  @param name - The name of the dataset.
+  @param spec - Dictionary with the specification of the dataset.
+  @return List of the dataset files.
+  '''
+  @staticmethod
+  def Generate(name, spec):
+    import simplejson
+
+    if "_" in name:
+      Log.Fatal("Synthetic dataset names can't contain '_': " + name)
+      return []
+
+    kind = spec.get("kind")
+    if kind not in DatasetGenerator.KINDS:
+      Log.Fatal("Unknown synthetic dataset kind: " + str(kind))
+      return []
+
+    settings = dict(DatasetGenerator.DEFAULTS)
+    settings.update(spec)
+
+    # The specification is stored next to the dataset, so we can decide if the
+    # dataset has to be generated again.
+    CreateDirectoryStructure([DatasetGenerator.directory])
+    specFile = os.path.join(DatasetGenerator.directory, name + ".spec")
+    specText = simplejson.dumps(settings, sort_keys=True)
+    if os.path.isfile(specFile):
+      with open(specFile, "r") as fid:
+        files = fid.readline().strip().split(",")
+        if fid.readline().strip() == specText and all(os.path.isfile(f)
+            for f in files):
+          return files
+
+    Log.Info("Generate synthetic dataset: " + name + " (" + kind + ")")
+    if kind == "blobs":
+      files = DatasetGenerator.Blobs(name, settings)
+    elif kind == "lowrank":
+      files = DatasetGenerator.LowRank(name, settings)
+    elif kind == "classification":
+      files = DatasetGenerator.Classification(name, settings)
+    elif kind == "hmm":
+      files = DatasetGenerator.HMM(name, settings)
+    elif kind == "neighbors":
+      files = DatasetGenerator.Neighbors(name, settings)
+
+    with open(specFile, "w") as fid:
+      fid.write(",".join(files) + "\n" + specText + "\n")
+
+    return files
+
+  '''
+  Generate all datasets of the given dictionary.
+
+  @param datasets - Dictionary with the dataset name as key and the
+  specification as value.
+  @param names - Generate only the datasets with the given names.
+  @return List of the dataset files.
+  '''
+  @staticmethod
+  def GenerateAll(datasets, names=None):
+    files = []
+    for name, spec in sorted(datasets.items()):
+      if names is None or name in names:
+        files.extend(DatasetGenerator.Generate(name, spec))
+    return files
+
+  '''
+  Generate the synthetic datasets which are used by the given dataset files.
+
+  @param datasets - Dictionary with the dataset name as key and the
+  specification as value.
+  @param files - List of dataset files or lists of dataset files.
+  @return List of the dataset files.
+  '''
+  @staticmethod
+  def GenerateUsed(datasets, files):
+    names = set(NormalizeDatasetName(f) for f in files)
+    return DatasetGenerator.GenerateAll(datasets, [name for name in datasets
+        if name in names])
+
+  '''
+  Generate the synthetic datasets of the 'synthetic' setting of the general
+  block which are used by the methods of the given config.
+
+  @param streamData - The merged config (see Parser.StreamMerge()).
+  @return List of the dataset files.
+  '''
+  @staticmethod
+  def GenerateConfig(streamData):
+    datasets = dict(streamData.get("general", [])).get("synthetic")
+    if not datasets:
+      return []
+
+    files = []
+    for method, sets in streamData.items():
+      if method == "general":
+        continue
+      for options, libraries in sets.items():
+        for library in libraries:
+          files.extend(library[1])
+
+    return DatasetGenerator.GenerateUsed(datasets, files)
+
+  '''
+  Return the path of a dataset file.
+
+  @param name - The name of the dataset.
+  @param suffix - The suffix of the file (e.g. '_train').
+  @return The path of the csv file.
+  '''
+  @staticmethod
+  def Path(name, suffix=""):
+    return os.path.join(DatasetGenerator.directory, name + suffix + ".csv")
+
+  '''
+  Return the random state for the parameters or the chunk with the given index.
+
+  @param settings - The dataset specification.
+  @param index - The index of the chunk or None for the model parameters.
+  @return The random state.
+  '''
+  @staticmethod
+  def RandomState(settings, index=None):
+    import numpy as np
+    if index is None:
+      return np.random.RandomState([settings["seed"], 0])
+    return np.random.RandomState([settings["seed"], 1, index])
+
+  '''
+  Generate the rows of a dataset chunk by chunk.
+
+  @param rows - The number of rows.
+  @param settings - The dataset specification.
+  @param offset - Offset of the chunk index, used to generate independent sets
+  with the same specification (e.g. train and test set).
+  @return Generator which yields (random state, number of rows) tuples.
+  '''
+  @staticmethod
+  def Chunks(rows, settings, offset=0):
+    chunk = settings["chunk"]
+    for index, start in enumerate(range(0, rows, chunk)):
+      yield (DatasetGenerator.RandomState(settings, offset + index),
+          min(chunk, rows - start))
+
+  '''
+  Gaussian blobs: the points are drawn from isotropic gaussians around the
+  centers. The centers are written to the '_centroids' file.
+
+  @param name - The name of the dataset.
+  @param settings - The dataset specification (centers, std).
+  @return List of the dataset files.
+  '''
+  @staticmethod
+  def Blobs(name, settings):
+    rows, columns = settings["rows"], settings["columns"]
+    k = settings.get("centers", 8)
+    std = settings.get("std", 1.0)
+
+    centers = DatasetGenerator.RandomState(settings).uniform(-10, 10,
+        (k, columns))
+
+    writer = DatasetWriter(DatasetGenerator.Path(name), rows, columns,
+        settings["formats"])
+    for rng, n in DatasetGenerator.Chunks(rows, settings):
+      labels = rng.randint(k, size=n)
+      writer.Write(centers[labels] + rng.normal(0, std, (n, columns)))
+    writer.Close()
+
+    centroids = DatasetWriter(DatasetGenerator.Path(name, "_centroids"), k,
+        columns, settings["formats"])
+    centroids.Write(centers)
+    centroids.Close()
+
+    return writer.files + centroids.files
+
+  '''
+  Low-rank matrix: product of two non-negative random matrices with the given
+  rank plus non-negative noise.
+
+  @param name - The name of the dataset.
+  @param settings - The dataset specification (rank, noise).
+  @return List of the dataset files.
+  '''
+  @staticmethod
+  def LowRank(name, settings):
+    rows, columns = settings["rows"], settings["columns"]
+    rank = settings.get("rank", 5)
+    noise = settings.get("noise", 0.01)
+
+    basis = DatasetGenerator.RandomState(settings).uniform(0, 1,
+        (rank, columns))
+
+    writer = DatasetWriter(DatasetGenerator.Path(name), rows, columns,
+        settings["formats"])
+    for rng, n in DatasetGenerator.Chunks(rows, settings):
+      weights = rng.uniform(0, 1, (n, rank))
+      writer.Write(weights.dot(basis) + abs(rng.normal(0, noise,
+          (n, columns))))
+    writer.Close()
+
+    return writer.files
+
+  '''
+  Labelled classification set: every class is a gaussian around a random
+  mean. The train set contains the labels as last column, the labels of the
+  test set are written to the '_labels' file.
+
+  @param name - The name of the dataset.
+  @param settings - The dataset specification (classes, test, separation).
+  @return List of the dataset files.
+  '''
+  @staticmethod
+  def Classification(name, settings):
+    import numpy as np
+
+    rows, columns = settings["rows"], settings["columns"]
+    classes = settings.get("classes", 2)
+    test = settings.get("test", max(rows // 4, 1))
+    separation = settings.get("separation", 1.0)
+
+    means = DatasetGenerator.RandomState(settings).normal(0, separation,
+        (classes, columns))
+
+    train = DatasetWriter(DatasetGenerator.Path(name, "_train"), rows,
+        columns + 1, settings["formats"], integer=1)
+    for rng, n in DatasetGenerator.Chunks(rows, settings):
+      labels = rng.randint(classes, size=n)
+      points = means[labels] + rng.normal(0, 1, (n, columns))
+      train.Write(np.column_stack((points, labels)))
+    train.Close()
+
+    # Use other chunk indices for the test set, so the test points are
+    # independent of the train points.
+    testSet = DatasetWriter(DatasetGenerator.Path(name, "_test"), test,
+        columns, settings["formats"])
+    testLabels = DatasetWriter(DatasetGenerator.Path(name, "_labels"), test, 1,
+        settings["formats"], integer=1)
+    offset = (rows + settings["chunk"] - 1) // settings["chunk"]
+    for rng, n in DatasetGenerator.Chunks(test, settings, offset):
+      labels = rng.randint(classes, size=n)
+      testSet.Write(means[labels] + rng.normal(0, 1, (n, columns)))
+      testLabels.Write(labels)
+    testSet.Close()
+    testLabels.Close()
+
+    return train.files + testSet.files + testLabels.files
+
+  '''
+  Hidden markov model sequence: the hidden states are a markov chain with a
+  random transition matrix, the observations are gaussian (or discrete if the
+  number of symbols is given). The hidden states are written to the '_labels'
+  file.
+
+  @param name - The name of the dataset.
+  @param settings - The dataset specification (states, symbols).
+  @return List of the dataset files.
+  '''
+  @staticmethod
+  def HMM(name, settings):
+    import numpy as np
+
+    rows = settings["rows"]
+    states = settings.get("states", 5)
+    symbols = settings.get("symbols")
+    columns = 1 if symbols else settings["columns"]
+
+    rng = DatasetGenerator.RandomState(settings)
+    # Prefer self transitions, so the sequences contain longer segments.
+    transition = rng.dirichlet(np.ones(states), states) + np.eye(states) * 2
+    transition = np.cumsum(transition / transition.sum(axis=1)[:, None],
+        axis=1)
+    if symbols:
+      emission = np.cumsum(rng.dirichlet(np.ones(symbols), states), axis=1)
+    else:
+      means = rng.uniform(-5, 5, (states, columns))
+
+    observations = DatasetWriter(DatasetGenerator.Path(name), rows, columns,
+        settings["formats"], integer=1 if symbols else 0)
+    labels = DatasetWriter(DatasetGenerator.Path(name, "_labels"), rows, 1,
+        settings["formats"], integer=1)
+    state = 0
+    for rng, n in DatasetGenerator.Chunks(rows, settings):
+      # The transition of every row as a map of the previous to the next state
+      # (maps[t, s] is the state of row t if row t - 1 is in state s).
+      uniform = rng.uniform(size=n)
+      maps = np.empty((n, states), dtype=np.intp)
+      for s in range(states):
+        maps[:, s] = np.minimum(np.searchsorted(transition[s], uniform),
+            states - 1)
+
+      # The markov chain is sequential, so we compose the maps with a prefix
+      # scan (log2(n) vectorized steps instead of a loop over the rows); the
+      # last state of the previous chunk is the start of the current chunk.
+      step = 1
+      while step < n:
+        maps[step:] = np.take_along_axis(maps[step:], maps[:-step], axis=1)
+        step *= 2
+      sequence = maps[:, state]
+      if n:
+        state = int(sequence[-1])
+
+      if symbols:
+        # Draw the symbols of all rows of a state in one batch.
+        uniform = rng.uniform(size=n)
+        points = np.empty(n, dtype=int)
+        for s in range(states):
+          selected = sequence == s
+          points[selected] = np.minimum(np.searchsorted(emission[s],
+              uniform[selected]), symbols - 1)
+      else:
+        points = means[sequence] + rng.normal(0, 1, (n, columns))
+
+      observations.Write(points)
+      labels.Write(sequence)
+    observations.Close()
+    labels.Close()
+
+    return observations.files + labels.files
+
+  '''
+  High-dimensional dataset: the points lie close to a random linear subspace
+  with the given intrinsic dimension. If the number of queries is given, an
+  independent query set is written to the '_query' file.
+
+  @param name - The name of the dataset.
+  @param settings - The dataset specification (intrinsic, queries, noise).
+  @return List of the dataset files.
+  '''
+  @staticmethod
+  def Neighbors(name, settings):
+    rows, columns = settings["rows"], settings["columns"]
+    intrinsic = settings.get("intrinsic", min(10, columns))
+    queries = settings.get("queries", 0)
+    noise = settings.get("noise", 0.1)
+
+    embedding = DatasetGenerator.RandomState(settings).normal(0, 1,
+        (intrinsic, columns))
+
+    files = []
+    offset = 0
+    for suffix, count in [("", rows), ("_query", queries)]:
+      if count <= 0:
+        continue
+
+      writer = DatasetWriter(DatasetGenerator.Path(name, suffix), count,
+          columns, settings["formats"])
+      for rng, n in DatasetGenerator.Chunks(count, settings, offset):
+        latent = rng.normal(0, 1, (n, intrinsic))
+        writer.Write(latent.dot(embedding) + rng.normal(0, noise,
+            (n, columns)))
+      writer.Close()
+
+      files.extend(writer.files)
+      offset = (rows + settings["chunk"] - 1) // settings["chunk"]
+
+    return files
@@ -65,10 +65,11 @@ def GenerateBarChartMetric(results,libraries, fileName, datasetName, bestlib="ml
             timingData[dataset][l] = time
 
           # We can only plot scalar values so we jump over the other.
-          if time == "failure":
+          if time == "failure" or time == "oom":
             failure += 1
             continue
-          elif str(time).count(">") > 0:
+          elif (str(time).count(">") > 0 or
+              time == "skipped-predicted-timeout"):
             timeouts += 1
             continue
 
@@ -103,7 +104,7 @@ def GenerateBarChartMetric(results,libraries, fileName, datasetName, bestlib="ml
     for i in range(len(libraries)):
       c = libraries[i] + ','
       for dataset, timings in timingData.items():
-        if timings[i] == 'failure' or '>' in str(timings[i]) or '-' == timings[i]:
+        if not isFloat(timings[i]):
           c += '0,'
         else:
           c += str(timings[i]) + ','
@@ -170,10 +171,10 @@ def GenerateBarChart(results, libraries, fileName, bestlib="mlpack"):
         timingData[dataset][l] = time
 
       # We can only plot scalar values so we jump over the other.
-      if time == "failure":
+      if time == "failure" or time == "oom":
         failure += 1
         continue
-      elif str(time).count(">") > 0:
+      elif str(time).count(">") > 0 or time == "skipped-predicted-timeout":
         timeouts += 1
         continue
 
@@ -209,7 +210,7 @@ def GenerateBarChart(results, libraries, fileName, bestlib="mlpack"):
     for i in range(len(libraries)):
       c = libraries[i] + ','
       for dataset, timings in timingData.items():
-        if timings[i] == 'failure' or ('>' in str(timings[i])) or '-' == timings[i]:
+        if not isFloat(timings[i]):
           c += '0,'
         else:
           c += str(timings[i]) + ','
@@ -248,29 +249,152 @@ def GenerateBarChart(results, libraries, fileName, bestlib="mlpack"):
 
   return (len(timingData), totalTime, failure, timeouts, bestLibCount, timingData, fileName + '.js', build)
 
+'''
+Parse the given massif logfile in a single pass. The logfile is read line by
+line, so we never keep the whole file in memory.
+
+@param massiflogFile - The massif logfile.
+@param topSites - The number of allocation sites to extract from the peak
+snapshot.
+@return Dictionary with the snapshots [(time, heap, heapExtra, stacks)], the
+index of the peak snapshot and the top allocation sites [(bytes, site)] of the
+peak snapshot.
+'''
+def ParseMassifLog(massiflogFile, topSites=10):
+  snapshots = []
+  peak = -1
+  sites = []
+
+  # The values of the current snapshot.
+  snapshot = None
+  inPeakTree = False
+
+  with open(massiflogFile, "r") as fid:
+    for line in fid:
+      if line.startswith("snapshot="):
+        if snapshot:
+          snapshots.append(tuple(snapshot))
+        snapshot = [0, 0, 0, 0]
+        inPeakTree = False
+      elif snapshot is None:
+        # Skip the header (desc, cmd, time_unit).
+        continue
+      elif line.startswith("time="):
+        snapshot[0] = int(line[5:])
+      elif line.startswith("mem_heap_B="):
+        snapshot[1] = int(line[11:])
+      elif line.startswith("mem_heap_extra_B="):
+        snapshot[2] = int(line[17:])
+      elif line.startswith("mem_stacks_B="):
+        snapshot[3] = int(line[13:])
+      elif line.startswith("heap_tree="):
+        # Massif marks the peak snapshot, if there are several peak snapshots
+        # (massif only keeps the last one) we use the last one.
+        if line.strip() == "heap_tree=peak":
+          peak = len(snapshots)
+          inPeakTree = True
+          sites = []
+      elif inPeakTree and line.startswith(" n"):
+        # The direct children of the root node are the allocation sites, e.g.
+        # ' n1: 800 0x4005F4: foo (a.c:10)'.
+        field = line.strip().split(" ", 2)
+        if len(field) == 3:
+          sites.append((int(field[1]), field[2]))
+
+  if snapshot:
+    snapshots.append(tuple(snapshot))
+
+  # Use the snapshot with the highest memory usage if massif didn't mark a
+  # peak snapshot.
+  if peak < 0 and snapshots:
+    total = [s[1] + s[2] + s[3] for s in snapshots]
+    peak = total.index(max(total))
+
+  sites = sorted(sites, key=lambda site: site[0], reverse=True)[:topSites]
+  return {"snapshots": snapshots, "peak": peak, "sites": sites}
+
+'''
+Downsample the given points with the largest-triangle-three-buckets algorithm.
+The algorithm keeps the first and the last point and selects for every bucket
+the point that forms the largest triangle with the previous selected point and
+the average of the next bucket, so the visual shape of the data is preserved.
+
+@param points - List of (x, y) tuples.
+@param threshold - The maximum number of points.
+@return The indices of the selected points.
+'''
+def DownsampleLTTB(points, threshold):
+  n = len(points)
+  if threshold >= n or threshold < 3:
+    return list(range(n))
+
+  indices = [0]
+  bucketSize = (n - 2) / float(threshold - 2)
+
+  a = 0
+  for i in range(threshold - 2):
+    # The range of the next bucket, used to calculate the average point.
+    nextStart = int((i + 1) * bucketSize) + 1
+    nextEnd = min(int((i + 2) * bucketSize) + 1, n)
+    if nextStart >= nextEnd:
+      nextStart, nextEnd = n - 1, n
+
+    avgX = sum(points[j][0] for j in range(nextStart, nextEnd))
+    avgY = sum(points[j][1] for j in range(nextStart, nextEnd))
+    avgX /= float(nextEnd - nextStart)
+    avgY /= float(nextEnd - nextStart)
+
+    # The range of the current bucket.
+    start = int(i * bucketSize) + 1
+    end = int((i + 1) * bucketSize) + 1
+
+    ax, ay = points[a]
+    maxArea = -1
+    for j in range(start, end):
+      area = abs((ax - avgX) * (points[j][1] - ay) -
+          (ax - points[j][0]) * (avgY - ay))
+      if area > maxArea:
+        maxArea = area
+        a = j
+    indices.append(a)
+
+  indices.append(n - 1)
+  return indices
+
 '''
 Generate a memory chart with the specified informations.
 
 @param massiflogFile - The massif logfile.
+@param datasetName - The name of the dataset.
+@param maxPoints - The maximum number of points in the chart, the snapshots are
+downsampled with the largest-triangle-three-buckets algorithm.
+@return The filename of the chart, the container name and the parsed massif
+informations (see ParseMassifLog).
 '''
-def CreateMassifChart(massiflogFile, datasetName):
-  # Read the massif logfile.
+def CreateMassifChart(massiflogFile, datasetName, maxPoints=200):
+  # Parse the massif logfile.
   try:
-    with open(massiflogFile, "r") as fid:
-      content = fid.read()
-  except IOError as e:
+    massif = ParseMassifLog(massiflogFile)
+  except (IOError, ValueError) as e:
     Log.Fatal("Exception: " + str(e))
     return
 
-  # Parse the massif logfile.
-  memHeapB = [(int(i) / 1024) + 0.0001 for i in re.findall(r"mem_heap_B=(\d*)", content)]
-  memHeapExtraB = [(int(i) / 1024) + 0.0001 for i in  re.findall(r"mem_heap_extra_B=(\d*)", content)]
-  memStackB = [(int(i) / 1024) + 0.0001 for i in  re.findall(r"mem_stacks_B=(\d*)", content)]
+  snapshots = massif["snapshots"]
 
-  # Plot the memory information.
-  X = list(range(len(memHeapExtraB)))
-  X = [x+0.0001 for x in X]
+  # Downsample the snapshots, we use the total memory to select the points but
+  # we always keep the peak snapshot.
+  points = [(i, s[1] + s[2] + s[3]) for i, s in enumerate(snapshots)]
+  indices = DownsampleLTTB(points, maxPoints)
+  if massif["peak"] >= 0 and massif["peak"] not in indices:
+    indices = sorted(indices + [massif["peak"]])
+  snapshots = [snapshots[i] for i in indices]
+
+  memHeapB = [(s[1] / 1024) + 0.0001 for s in snapshots]
+  memHeapExtraB = [(s[2] / 1024) + 0.0001 for s in snapshots]
+  memStackB = [(s[3] / 1024) + 0.0001 for s in snapshots]
 
+  # Plot the memory information.
+  X = [x + 0.0001 for x in indices]
 
   build = str(abs(hash(datetime.datetime.now())+hash(datetime.datetime.now())))
 
@@ -285,23 +409,77 @@ def CreateMassifChart(massiflogFile, datasetName):
     memHeapExtra = 'memHeapExtraB, ' + str(memHeapExtraB)[1:-1]  + '\n'
     fid.write(memHeapExtra.encode('UTF-8'))
 
-    memHeapB = 'memHeapB, ' + str(memHeapB)[1:-1]  + '\n'
-    fid.write(memHeapB.encode('UTF-8'))
+    memHeap = 'memHeapB, ' + str(memHeapB)[1:-1]  + '\n'
+    fid.write(memHeap.encode('UTF-8'))
 
-    memStackB = 'memStackB, ' + str(memStackB)[1:-1]
-    fid.write(memStackB.encode('UTF-8'))
+    memStack = 'memStackB, ' + str(memStackB)[1:-1]
+    fid.write(memStack.encode('UTF-8'))
 
   content = {}
   content['container'] = build
   content['type'] = 'area'
   content['title'] = datasetName
   content['subtitle'] = 'Hide data series by clicking the legend item.'
+  if massif["peak"] >= 0:
+    peak = massif["snapshots"][massif["peak"]]
+    content['subtitle'] = 'Peak: ' + str((peak[1] + peak[2] + peak[3]) // 1024)
+    content['subtitle'] += ' KB (snapshot ' + str(massif["peak"]) + ')'
   content['xAxisLabels'] = 'false'
   content['xAxisRotation'] = '0' if len(header) < 130 else '-45'
   content['yAxis'] = 'memory [KB]'
   content['tooltipText'] = 'KB'
   content['data'] = fileName + '.csv'
 
+  with open('reports/' + fileName + '.js', 'wb+') as fid:
+      c = chartTemplate % content
+      fid.write(c.encode('UTF-8'))
+
+  return (fileName + '.js', build, massif)
+
+'''
+Generate a memory chart for the sampled memory informations.
+
+@param memoryInfo - JSON string with the peak values and the memory timeline.
+@param datasetName - The name of the dataset.
+@return The filename of the chart and the container name.
+'''
+def CreateSampledMemoryChart(memoryInfo, datasetName):
+  memory = simplejson.loads(memoryInfo)
+  timeline = memory["timeline"]
+
+  build = str(abs(hash(datetime.datetime.now())+hash(datetime.datetime.now())))
+
+  fileName = 'graphs/memory_' + str(build)
+
+  header = 'dummy,' + ','.join(str(t[0]) for t in timeline) + '\n'
+
+  # Write the csv file that contains the data.
+  with open('reports/' + fileName + '.csv', 'wb+') as fid:
+    fid.write(header.encode('UTF-8'))
+
+    for i, name in enumerate(['RSS', 'PSS', 'USS']):
+      line = name + ',' + ','.join(str(t[i + 1]) for t in timeline)
+      if i < 2:
+        line += '\n'
+      fid.write(line.encode('UTF-8'))
+
+  content = {}
+  content['container'] = build
+  content['type'] = 'line'
+  content['title'] = datasetName
+  content['subtitle'] = 'Peak RSS: ' + str(memory["peak_rss"]) + ' KB, Peak PSS: '
+  content['subtitle'] += str(memory["peak_pss"]) + ' KB, Peak USS: '
+  content['subtitle'] += str(memory["peak_uss"]) + ' KB'
+  if memory["type"] == "tracemalloc":
+    content['subtitle'] += ', Tracemalloc Peak: ' + str(memory["tracemalloc_peak"])
+    content['subtitle'] += ' KB, NumPy Peak: ' + str(memory["numpy_allocated"])
+    content['subtitle'] += ' KB'
+  content['xAxisLabels'] = 'false'
+  content['xAxisRotation'] = '0'
+  content['yAxis'] = 'memory [KB]'
+  content['tooltipText'] = 'KB'
+  content['data'] = fileName + '.csv'
+
   with open('reports/' + fileName + '.js', 'wb+') as fid:
       c = chartTemplate % content
       fid.write(c.encode('UTF-8'))
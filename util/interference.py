@@ -0,0 +1,311 @@
+'''
+  @file interference.py
+
+  Monitor of the background interference (CPU steal, load of other processes,
+  CPU frequency and memory/io pressure) during the timing trials.
+'''
+
+import os
+import sys
+import inspect
+import time
+import threading
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from containment import *
+
+'''
+This class measures the interference of every timing trial. A trial is
+tainted if the CPU steal, the load of other processes, the CPU frequency drop
+or the memory/io pressure passes the threshold; tainted trials can be run
+again. The settings are set in the general block, e.g.:
+
+  interference: {reruns: 2, steal: 0.02, load: 0.5, frequency: 0.7,
+      pressure: 0.05}
+'''
+class Interference(object):
+
+  # Monitor the trials.
+  enabled = False
+
+  # The number of times a tainted trial is run again.
+  reruns = 0
+
+  # The share of the CPU time stolen by the hypervisor.
+  steal = 0.02
+
+  # The CPU usage (in cores) of the other processes.
+  load = 0.5
+
+  # The minimum ratio of the current and the maximum CPU frequency.
+  frequency = 0.7
+
+  # The share of the time in which some tasks stalled on memory or io.
+  pressure = 0.05
+
+  # The interference of the last trial.
+  last = None
+
+  '''
+  Set the monitor settings.
+
+  @param settings - True or dictionary with the thresholds and the number of
+  reruns, False or None disables the monitor.
+  '''
+  @staticmethod
+  def Configure(settings):
+    Interference.enabled = bool(settings)
+    settings = settings if isinstance(settings, dict) else {}
+    Interference.reruns = int(settings.get("reruns", 0))
+    for name in ["steal", "load", "frequency", "pressure"]:
+      if name in settings:
+        setattr(Interference, name, float(settings[name]))
+
+  '''
+  Check whether the given interference passes a threshold.
+
+  @param summary - The interference of a trial (see InterferenceMonitor).
+  @return True if the trial is tainted.
+  '''
+  @staticmethod
+  def Tainted(summary):
+    def Above(name, threshold):
+      return summary.get(name) is not None and summary[name] > threshold
+
+    return (Above("steal", Interference.steal) or
+        Above("load", Interference.load) or
+        Above("memory", Interference.pressure) or
+        Above("io", Interference.pressure) or
+        (summary.get("frequency") is not None and
+        summary["frequency"] < Interference.frequency))
+
+  '''
+  Run a timing trial with the interference monitor. A successful but tainted
+  trial is run again (at most 'reruns' times).
+
+  @param function - The trial function, e.g. instance.RunTiming.
+  @param args - The arguments of the function.
+  @return The return value of the function.
+  '''
+  @staticmethod
+  def Run(function, *args):
+    Interference.last = None
+    if not Interference.enabled:
+      return function(*args)
+
+    for run in range(Interference.reruns + 1):
+      monitor = InterferenceMonitor()
+      monitor.start()
+      try:
+        result = function(*args)
+      finally:
+        summary = monitor.Stop()
+
+      summary["tainted"] = Interference.Tainted(summary)
+      summary["reruns"] = run
+      Interference.last = summary
+
+      if not summary["tainted"] or result is None or result < 0:
+        break
+      Log.Warn("Tainted trial (" + ", ".join(k + " " + str(v) for k, v in
+          sorted(summary.items()) if k not in ["tainted", "reruns"]) + ").")
+    return result
+
+  '''
+  Summarize the interference of several trials: the worst value of every
+  measure and the number of tainted trials and reruns.
+
+  @param trials - List of trial interferences (None entries are ignored).
+  @return Dictionary with the summary or None if there is no trial.
+  '''
+  @staticmethod
+  def Summary(trials):
+    trials = [trial for trial in trials if trial]
+    if not trials:
+      return None
+
+    summary = {"trials": len(trials),
+        "tainted": sum(1 for trial in trials if trial["tainted"]),
+        "reruns": sum(trial["reruns"] for trial in trials)}
+    for name, worst in [("steal", max), ("load", max), ("memory", max),
+        ("io", max), ("frequency", min)]:
+      values = [trial[name] for trial in trials if trial.get(name) is not None]
+      summary[name] = worst(values) if values else None
+    return summary
+
+'''
+This class samples the interference of the system while a trial runs. The CPU
+and pressure counters are compared at the start and the end of the trial, the
+CPU frequency of the CPUs the trial runs on is sampled in the background
+thread.
+'''
+class InterferenceMonitor(threading.Thread):
+
+  # The interval in seconds of the frequency samples.
+  INTERVAL = 0.5
+
+  # The sysfs folder of the CPUs.
+  ROOT = "/sys/devices/system/cpu"
+
+  '''
+  Start the measurement.
+  '''
+  def __init__(self):
+    threading.Thread.__init__(self)
+    self.daemon = True
+    self.stopped = threading.Event()
+    self.frequencies = []
+    self.startTime = time.time()
+    self.cpu = InterferenceMonitor.CPUTimes()
+    self.own = InterferenceMonitor.OwnTime()
+    self.stalls = dict((name, InterferenceMonitor.Stall(name)) for name in
+        ["memory", "io"])
+
+  '''
+  Get the total, the busy and the stolen CPU time of the system.
+
+  @return Tuple (total, busy, steal) in clock ticks or None.
+  '''
+  @staticmethod
+  def CPUTimes():
+    try:
+      with open("/proc/stat") as fid:
+        values = [int(v) for v in fid.readline().split()[1:9]]
+    except (IOError, OSError, ValueError):
+      return None
+
+    values += [0] * (8 - len(values))
+    total = sum(values)
+    return (total, total - values[3] - values[4] - values[7], values[7])
+
+  '''
+  Get the CPU time of the benchmark process and all its descendants, the time
+  of the terminated children is included. Only the process tree of the
+  benchmark process is read (see ProcessGroup.Descendants()).
+
+  @return The CPU time in clock ticks.
+  '''
+  @staticmethod
+  def OwnTime():
+    ticks = 0
+    for pid in [os.getpid()] + ProcessGroup.Descendants(os.getpid()):
+      try:
+        with open("/proc/" + str(pid) + "/stat") as fid:
+          fields = fid.read().rsplit(")", 1)[1].split()
+        ticks += sum(int(v) for v in fields[11:15])
+      except (IOError, OSError, IndexError, ValueError):
+        continue
+    return ticks
+
+  '''
+  Get the total stall time of the given resource (pressure stall
+  information).
+
+  @param name - The resource, 'memory' or 'io'.
+  @return The 'some' stall time in microseconds or None if not available.
+  '''
+  @staticmethod
+  def Stall(name):
+    try:
+      with open("/proc/pressure/" + name) as fid:
+        for line in fid:
+          if line.startswith("some"):
+            return int(line.split("total=")[1])
+    except (IOError, OSError, IndexError, ValueError):
+      pass
+    return None
+
+  '''
+  Get the CPUs the trial runs on: the CPUs of the running processes of the
+  benchmark process tree. The idle CPUs are left out, they are often
+  clocked down and would taint every trial on an unpinned host.
+
+  @return Set of CPU numbers.
+  '''
+  @staticmethod
+  def BusyCPUs():
+    cpus = set()
+    for pid in [os.getpid()] + ProcessGroup.Descendants(os.getpid()):
+      try:
+        with open("/proc/" + str(pid) + "/stat") as fid:
+          # The command name may contain spaces, the fields follow the ')'.
+          fields = fid.read().rsplit(")", 1)[1].split()
+        if fields[0] == "R":
+          cpus.add(int(fields[36]))
+      except (IOError, OSError, IndexError, ValueError):
+        continue
+    return cpus
+
+  '''
+  Get the ratio of the current and the maximum frequency of the slowest of
+  the given CPUs, so a throttled core of the trial isn't hidden by another
+  core at full speed.
+
+  @param cpus - The CPU numbers (see BusyCPUs()).
+  @return The ratio or None if not available.
+  '''
+  @staticmethod
+  def Frequency(cpus):
+    ratios = []
+    for cpu in cpus:
+      path = os.path.join(InterferenceMonitor.ROOT, "cpu" + str(cpu),
+          "cpufreq")
+      try:
+        with open(os.path.join(path, "scaling_cur_freq")) as fid:
+          current = int(fid.read())
+        with open(os.path.join(path, "scaling_max_freq")) as fid:
+          maximum = int(fid.read())
+      except (IOError, OSError, ValueError):
+        continue
+      if maximum > 0:
+        ratios.append(current / float(maximum))
+    return min(ratios) if ratios else None
+
+  def run(self):
+    while True:
+      frequency = InterferenceMonitor.Frequency(InterferenceMonitor.BusyCPUs())
+      if frequency is not None:
+        self.frequencies.append(frequency)
+      if self.stopped.wait(InterferenceMonitor.INTERVAL):
+        break
+
+  '''
+  Stop the measurement.
+
+  @return Dictionary with the CPU steal (share of the CPU time), the load of
+  the other processes (in cores), the mean frequency ratio and the memory and
+  io pressure (share of the time).
+  '''
+  def Stop(self):
+    self.stopped.set()
+    if self.is_alive():
+      self.join()
+
+    elapsed = max(time.time() - self.startTime, 1e-6)
+    summary = {"steal": None, "load": None, "frequency": None}
+
+    cpu = InterferenceMonitor.CPUTimes()
+    if self.cpu and cpu and cpu[0] > self.cpu[0]:
+      total = float(cpu[0] - self.cpu[0])
+      cores = os.cpu_count() or 1
+      own = (InterferenceMonitor.OwnTime() - self.own) / total * cores
+      summary["steal"] = round((cpu[2] - self.cpu[2]) / total, 4)
+      summary["load"] = round(max((cpu[1] - self.cpu[1]) / total * cores -
+          own, 0), 4)
+
+    if self.frequencies:
+      summary["frequency"] = round(sum(self.frequencies) /
+          len(self.frequencies), 4)
+
+    for name, start in self.stalls.items():
+      end = InterferenceMonitor.Stall(name)
+      summary[name] = None if start is None or end is None else round(
+          (end - start) / (elapsed * 1e6), 4)
+    return summary
@@ -0,0 +1,92 @@
+'''
+  @file interleave.py
+
+  Randomized and interleaved trial order of the libraries of one method,
+  options and dataset group.
+'''
+
+import os
+import sys
+import inspect
+import random
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+
+'''
+This class runs the timing trials of several libraries in a randomized,
+interleaved order: every round runs one trial of every library in a random
+order, so slow drift (thermal throttling, background jobs, page cache state)
+is spread over all libraries instead of showing up as a difference between
+them. The order is reproducible with the recorded seed.
+'''
+class Interleave(object):
+
+  # Run the trials interleaved.
+  enabled = False
+
+  # The seed of the trial order, a random seed is used if None.
+  seed = None
+
+  # The random generator of the current run.
+  random = None
+
+  '''
+  Initialize the random generator of the trial order.
+
+  @return The seed.
+  '''
+  @staticmethod
+  def Seed():
+    if Interleave.seed is None:
+      Interleave.seed = random.SystemRandom().randint(0, 2 ** 31 - 1)
+    Interleave.random = random.Random(Interleave.seed)
+    Log.Info("Interleave seed: " + str(Interleave.seed))
+    return Interleave.seed
+
+  '''
+  Get the randomized, interleaved trial order.
+
+  @param trials - Dictionary with the number of trials of every key.
+  @return List of keys, one entry per trial.
+  '''
+  @staticmethod
+  def Schedule(trials):
+    if Interleave.random is None:
+      Interleave.Seed()
+
+    order = []
+    for trial in range(max(list(trials.values()) + [0])):
+      keys = [key for key in trials if trials[key] > trial]
+      Interleave.random.shuffle(keys)
+      order.extend(keys)
+    return order
+
+  '''
+  Run the trials of all keys in the interleaved order. Like the sequential
+  trials, the trials of a key stop after the first unsuccessful run.
+
+  @param runs - Dictionary with the (number of trials, trial function) tuple
+  of every key; the function returns the time of the trial or a negative value
+  if the run was unsuccessful.
+  @return Dictionary with the list of trial times of every key.
+  '''
+  @staticmethod
+  def Run(runs):
+    times = dict((key, []) for key in runs)
+    for key in Interleave.Schedule(dict((key, run[0]) for key, run in
+        runs.items())):
+      if times[key] and times[key][-1] < 0:
+        continue
+
+      try:
+        times[key].append(runs[key][1]())
+      except Exception as e:
+        Log.Fatal("Exception: " + str(e))
+    return times
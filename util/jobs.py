@@ -0,0 +1,448 @@
+'''
+  @file jobs.py
+
+  Functions to expand the config into independent benchmark jobs, to run a
+  single job and to store the job results in the database.
+'''
+
+import os
+import sys
+import inspect
+import hashlib
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from loader import *
+from convert import *
+from misc import *
+from threads import *
+from scaling import *
+from generator import *
+from system import *
+from placement import *
+from timers import *
+from jvm import *
+from bindings import *
+from timer import Results
+from scratch import *
+from containment import *
+from interference import *
+
+import simplejson
+
+'''
+Expand the merged config into a list of jobs. Every job is a dictionary that
+contains everything to benchmark one library/method/options/dataset
+combination, so it can be executed on another machine.
+
+@param streamData - The merged config (see Parser.StreamMerge()).
+@param blocks - Run only the specified library blocks (list or None).
+@param methodBlocks - Run only the specified methods (list or None).
+@return List of jobs.
+'''
+def ExpandJobs(streamData, blocks=None, methodBlocks=None):
+  timeout = 23000
+  bootstrapCount = 10
+  synthetic = {}
+  placement = None
+  jvm = None
+  bindings = False
+  keepModels = False
+  memoryLimit = None
+  interference = None
+
+  if "general" in streamData:
+    for key, value in streamData["general"]:
+      if key == "timeout":
+        timeout = value
+      if key == "bootstrap":
+        bootstrapCount = value
+      if key == "synthetic":
+        synthetic = value
+      if key == "placement":
+        placement = value
+      if key == "jvm":
+        jvm = value
+      if key == "mlpackBindings":
+        bindings = value
+      if key == "keepModels":
+        keepModels = value
+      if key == "memoryLimit":
+        memoryLimit = value
+      if key == "interference":
+        interference = value
+      if key == "scalingSteps":
+        Scaling.steps = value
+      if key == "scalingSeed":
+        Scaling.seed = value
+      if key == "scalingDirectory":
+        Scaling.directory = value
+
+  jobs = []
+  for method, sets in streamData.items():
+    if method == "general":
+      continue
+    if methodBlocks and method not in methodBlocks:
+      continue
+
+    for options, libraries in sets.items():
+      for library in libraries:
+        if blocks and library[0] not in blocks:
+          continue
+
+        datasets = [(dataset, None) for dataset in library[1]]
+        if library[9]:
+          datasets = ExpandScaling(library[1], library[9])
+
+        for dataset, scaling in datasets:
+          job = {"method": method, "options": options, "library": library[0],
+              "dataset": dataset, "trials": library[2], "script": library[3],
+              "format": library[4], "tasks": library[5], "alias": library[6],
+              "threads": library[8], "timeout": timeout,
+              "bootstrap": bootstrapCount, "placement": placement,
+              "jvm": jvm, "bindings": bindings,
+              "keepModels": keepModels, "memoryLimit": memoryLimit,
+              "interference": interference}
+
+          # The workers generate the synthetic datasets and the subsamples
+          # themselves, the data only depends on the specification.
+          if scaling:
+            job["scaling"] = scaling
+          name = NormalizeDatasetName(scaling["source"] if scaling else
+              dataset)
+          if name in synthetic:
+            job["synthetic"] = {name: synthetic[name]}
+
+          job["id"] = JobId(job)
+          jobs.append(job)
+
+  return jobs
+
+'''
+Expand the datasets of the dataset-size scaling mode. Every subsample is
+described by its source dataset, the dimension, the size and the subsample
+settings, so a worker can create the subsample (see RunJob()).
+
+@param datasets - List of datasets.
+@param dimensions - List of scaling dimensions.
+@return List of (dataset, specification) tuples; the specification is None
+for the original datasets.
+'''
+def ExpandScaling(datasets, dimensions):
+  expanded = []
+  for dataset in datasets:
+    subsamples, sizes = Scaling.ExpandDatasets([dataset], dimensions)
+    for subsample in subsamples:
+      if subsample == dataset:
+        expanded.append((dataset, None))
+        continue
+
+      name, dimension, size = sizes[NormalizeDatasetName(subsample)][0]
+      expanded.append((subsample, {"source": dataset, "dimension": dimension,
+          "size": size, "seed": Scaling.seed,
+          "directory": Scaling.directory}))
+  return expanded
+
+'''
+Create the subsample of a job of the dataset-size scaling mode.
+
+@param scaling - The specification of the subsample (see ExpandScaling()).
+@return The subsampled dataset.
+'''
+def CreateSubsample(scaling):
+  Scaling.seed = scaling["seed"]
+  Scaling.directory = scaling["directory"]
+  return Scaling.Subsample(scaling["source"], scaling["dimension"],
+      scaling["size"])
+
+'''
+Calculate the id of the given job. The id only depends on the job settings, so
+the same config always results in the same ids.
+
+@param job - The job dictionary.
+@return The job id.
+'''
+def JobId(job):
+  settings = dict((k, v) for k, v in job.items() if k != "id")
+  return hashlib.sha1(simplejson.dumps(settings,
+      sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+'''
+Return the dataset in one of the given formats; convert the dataset if the
+format isn't available.
+
+@param dataset - Dataset file or list of dataset files.
+@param format - List of supported file formats.
+@return Tuple (dataset, list of converted files which should be removed).
+'''
+def PrepareDataset(dataset, format):
+  files = [dataset] if isinstance(dataset, str) else dataset
+
+  datasetList = []
+  modifiedList = []
+  for data in files:
+    mdata = CheckFileExtension(data, format)
+
+    # Check if the dataset is available.
+    if os.path.isfile(mdata):
+      datasetList.append(mdata)
+    else:
+      # Convert the dataset in the given format.
+      convert = Convert(data, format[0])
+      datasetList.append(convert.modifiedDataset)
+      modifiedList.append(convert.modifiedDataset)
+
+  if isinstance(dataset, str):
+    return (datasetList[0], modifiedList)
+  return (datasetList, modifiedList)
+
+'''
+Run the given job with the existing method scripts.
+
+@param job - The job dictionary (see ExpandJobs()).
+@return Dictionary with the results of the job.
+'''
+def RunJob(job):
+  result = {"id": job["id"], "host": SystemInfo.GetHostInfo()}
+
+  scaling = job.get("scaling")
+  if job.get("synthetic"):
+    DatasetGenerator.GenerateUsed(job["synthetic"], [scaling["source"] if
+        scaling else job["dataset"]])
+
+  try:
+    module = Loader.ImportModuleFromPath(job["script"])
+    methodCall = getattr(module, job["method"])
+  except Exception as e:
+    Log.Fatal("Could not load the script: " + job["script"])
+    Log.Fatal("Exception: " + str(e))
+    result["error"] = str(e)
+    return result
+
+  # Refuse to run the job if the frequency governor doesn't match.
+  if not Placement.Check(job.get("placement")):
+    result["error"] = "frequency governor mismatch"
+    return result
+
+  JVMServer.Configure(job.get("jvm"))
+  MlpackBindings.Configure(job.get("bindings"))
+  Results.models = job.get("keepModels", False)
+  MemoryLimit.Configure(job.get("memoryLimit"))
+  Interference.Configure(job.get("interference"))
+  Threads.Apply(job["threads"])
+  result["placement"] = Placement.Apply(job.get("placement"))
+  if scaling:
+    try:
+      CreateSubsample(scaling)
+    except (IOError, OSError) as e:
+      Log.Fatal("Could not create the subsample: " + str(e))
+      result["error"] = str(e)
+      return result
+
+  dataset, modified = PrepareDataset(job["dataset"], job["format"])
+  Scratch.Create(dataset)
+  try:
+    result["dataset"] = DatasetInfo(job["dataset"])
+    result.update(RunTasks(job, methodCall, dataset))
+  except Exception as e:
+    Log.Fatal("Exception: " + str(e))
+    result["error"] = str(e)
+  finally:
+    DatasetContext.Deactivate()
+    Scratch.Remove()
+    RemoveDataset(modified)
+    Threads.Apply(None)
+    Placement.Reset()
+
+  return result
+
+'''
+Get the time label of the given trials. The trials stop at the first
+unsuccessful run, so a negative time is always the last one and its value
+selects the label: -2 timeout, MemoryLimit.OOM memory limit exceeded, otherwise
+failure.
+
+@param time - List with the times of the trials.
+@param timeout - The timeout in seconds.
+@param trials - The number of trials.
+@return The time label, e.g. '1.234000', '>9000', 'oom' or 'failure'.
+'''
+def TimeLabel(time, timeout, trials):
+  if time and time[-1] < 0:
+    if time[-1] == -2:
+      return ">" + str(timeout)
+    if time[-1] == MemoryLimit.OOM:
+      return "oom"
+    return "failure"
+  return "{0:.6f}".format(sum(time) / trials)
+
+'''
+Run a single timing trial of the given method instance, with the memory limit
+and the interference monitor.
+
+@param instance - The method instance.
+@param options - Extra options for the method.
+@return Tuple (time, timers, memory, interference): the time (or a negative
+value if the run was unsuccessful, see TimeLabel()), the named timers of a
+successful trial or None (see Timers.Run()), the peak memory and the
+interference of the trial.
+'''
+def RunTrial(instance, options):
+  time = MemoryLimit.Check(Interference.Run(instance.RunTiming, options))
+  timers = getattr(instance, "timers", None) if time >= 0 else None
+  return (time, timers, MemoryLimit.peak, Interference.last)
+
+'''
+Run the timing, metric and bootstrap tasks of the given job.
+
+@param job - The job dictionary.
+@param methodCall - The method class of the script.
+@param dataset - The (converted) dataset.
+@return Dictionary with the task results.
+'''
+def RunTasks(job, methodCall, dataset):
+  result = {}
+  options = job["options"]
+  timeout = job["timeout"]
+
+  # Load the dataset tuple once for the timing, metric and bootstrap tasks of
+  # the scripts which use the loaded arrays.
+  context = DatasetContext.Activate(dataset)
+  if DatasetContext.InProcess(sys.modules.get(methodCall.__module__)):
+    try:
+      context.Preload()
+    except Exception as e:
+      Log.Warn("Could not load the dataset: " + str(e))
+
+  instance = methodCall(dataset, timeout=timeout, verbose=False)
+  result["description"] = getattr(instance, "description", None)
+
+  if "timing" in job["tasks"]:
+    time = []
+    phases = []
+    interference = []
+    memory = None
+    for trial in range(job["trials"]):
+      try:
+        trialTime, timers, memory, last = RunTrial(instance, options)
+      except Exception as e:
+        Log.Fatal("Exception: " + str(e))
+        continue
+
+      time.append(trialTime)
+      interference.append(last)
+      if timers:
+        phases.append(timers)
+
+      # Method unsuccessful.
+      if trialTime < 0:
+        break
+
+    # Set the correct time label.
+    result["time"] = TimeLabel(time, timeout, job["trials"])
+
+    # The peak memory of the last trial.
+    result["memory"] = memory
+    result["interference"] = Interference.Summary(interference)
+
+    # Get the variance.
+    result["var"] = 0
+    if len(time) != 0:
+      avg = sum(time) / len(time)
+      result["var"] = sum((avg - value) ** 2 for value in time) / len(time)
+
+    if phases:
+      result["phases"] = Timers.Mean(phases)
+      result["phase_trials"] = phases
+
+  if "metric" in job["tasks"]:
+    try:
+      result["metrics"] = instance.RunMetrics(options)
+    except Exception as e:
+      Log.Fatal("Exception: " + str(e))
+
+  if "bootstrap" in job["tasks"]:
+    bootstrapMetrics = {}
+    bootstrapCounter = 0
+    for i in range(job["bootstrap"]):
+      instance = methodCall(dataset, timeout=timeout, verbose=False)
+      metrics = instance.RunMetrics(options)
+
+      # Merge the obtained metrics with the existing.
+      if metrics:
+        bootstrapCounter += 1
+        bootstrapMetrics = { m: metrics.get(m, 0) + bootstrapMetrics.get(m, 0)
+            for m in set(metrics) }
+
+    # Normalize each obtained metric.
+    for m in bootstrapMetrics:
+      bootstrapMetrics[m] = float("{0:.6f}".format(round(bootstrapMetrics[m] /
+          bootstrapCounter, 5)))
+    result["bootstrap"] = bootstrapMetrics
+
+  return result
+
+'''
+Store the results of a job in the database.
+
+@param db - The database object.
+@param job - The job dictionary.
+@param result - The job results (see RunJob()).
+@param builds - Dictionary with the (build id, library id) of every library and
+host, new builds are created for libraries without a build.
+'''
+def StoreJobResult(db, job, result, builds):
+  if "dataset" not in result:
+    return
+
+  # Every host gets its own build, so the results of different machines are
+  # not mixed.
+  name = job["library"]
+  hostInfo = result.get("host", {})
+  key = (name, hostInfo.get("host"))
+  if key not in builds:
+    libraryId = db.GetLibrary(name)
+    libraryId = libraryId[0][0] if libraryId else db.NewLibrary(name)
+    builds[key] = (db.NewBuild(libraryId), libraryId)
+    if hostInfo:
+      db.NewBuildInfo(builds[key][0], hostInfo["host"],
+          simplejson.dumps(hostInfo))
+  buildId, libraryId = builds[key]
+
+  methodId = db.GetMethod(job["method"], job["options"])
+  methodId = methodId[0][0] if methodId else db.NewMethod(job["method"],
+      job["options"], "None")
+  db.UpdateMethod(methodId, job["alias"])
+
+  datasetId = db.GetDataset(result["dataset"][0])
+  datasetId = datasetId[0][0] if datasetId else db.NewDataset(
+      *result["dataset"])
+
+  # Only store the description in the databse if there isn't a description.
+  if result.get("description") and not db.GetMethodInfo(methodId):
+    db.NewMethodInfo(methodId, result["description"])
+
+  if "time" in result:
+    db.NewResult(buildId, libraryId, result["time"], result["var"], datasetId,
+        methodId, job["threads"], result.get("placement"),
+        simplejson.dumps(result["phases"]) if "phases" in result else None,
+        result.get("memory"), simplejson.dumps(result["interference"]) if
+        result.get("interference") else None)
+
+  if result.get("phase_trials"):
+    db.NewPhaseTimings(buildId, libraryId, methodId, datasetId,
+        result["phase_trials"], job["threads"])
+
+  if result.get("metrics"):
+    db.NewMetricResult(buildId, libraryId, simplejson.dumps(result["metrics"]),
+        datasetId, methodId)
+
+  if "bootstrap" in result:
+    db.NewBootstrapResult(buildId, libraryId,
+        simplejson.dumps(result["bootstrap"]), datasetId, methodId)
@@ -0,0 +1,223 @@
+'''
+  @file jvm.py
+
+  Client of the long-lived weka benchmark server (methods/weka/src/
+  BenchmarkServer.java), which removes the JVM startup from every trial.
+'''
+
+import os
+import sys
+import inspect
+import atexit
+import socket
+import subprocess
+import collections
+import time
+import signal
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from timers import *
+from containment import *
+
+'''
+This class runs the java benchmark commands in a persistent JVM. A server is
+started for every classpath and JVM environment (e.g. the JAVA_TOOL_OPTIONS
+of the thread count) and reused for all following commands. With the cold
+start option every command starts a fresh JVM as before.
+
+The settings are passed with the 'jvm' setting of the general block:
+
+  jvm: {server: true, warmup: 1}
+'''
+class JVMServer(object):
+
+  # Start a fresh JVM for every command if False.
+  server = True
+
+  # The number of warm-up runs (output discarded) before the measured run.
+  warmup = 1
+
+  # The main class of the server.
+  MAIN_CLASS = "BenchmarkServer"
+
+  # Environment variables which are read at the JVM startup.
+  JVM_VARIABLES = ["JAVA_TOOL_OPTIONS", "JAVA_HOME"]
+
+  # The running servers: key -> (process, connection, reader).
+  servers = {}
+
+  '''
+  Set the server settings.
+
+  @param settings - Dictionary with the 'server' and 'warmup' settings or None.
+  '''
+  @staticmethod
+  def Configure(settings):
+    settings = settings if settings else {}
+    JVMServer.server = settings.get("server", True)
+    JVMServer.warmup = int(settings.get("warmup", 1))
+
+  '''
+  Split a java command line into (java, classpath, main class, arguments).
+
+  @param cmd - The command (list of arguments).
+  @return The tuple or None if the command isn't a plain java command.
+  '''
+  @staticmethod
+  def SplitCommand(cmd):
+    if len(cmd) < 4 or os.path.basename(cmd[0]) != "java" or cmd[1] not in (
+        "-classpath", "-cp"):
+      return None
+    return (cmd[0], cmd[2], cmd[3], cmd[4:])
+
+  '''
+  Start a new server or return the running server for the given settings.
+
+  @param java - The java executable.
+  @param classpath - The classpath.
+  @return Tuple (key, (process, connection, reader)) of the server.
+  '''
+  @staticmethod
+  def Start(java, classpath):
+    key = (java, classpath) + tuple(os.environ.get(v, "") for v in
+        JVMServer.JVM_VARIABLES)
+    if key in JVMServer.servers:
+      if JVMServer.servers[key][0].poll() is None:
+        return key, JVMServer.servers[key]
+      JVMServer.Stop(key)
+
+    process = subprocess.Popen([java, "-classpath", classpath,
+        JVMServer.MAIN_CLASS], stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL, start_new_session=True,
+        preexec_fn=MemoryLimit.Apply if MemoryLimit.limit else None)
+
+    # The JVM may print messages (e.g. the picked up JAVA_TOOL_OPTIONS) before
+    # the port.
+    port = None
+    for line in process.stdout:
+      if line.startswith(b"PORT "):
+        port = int(line.split()[1])
+        break
+    process.stdout.close()
+
+    if port is None:
+      process.kill()
+      process.wait()
+      raise OSError("Could not start the benchmark server: " + classpath)
+
+    connection = socket.create_connection(("127.0.0.1", port))
+    JVMServer.servers[key] = (process, connection, connection.makefile("rb"))
+    Log.Info("Started the benchmark server (port " + str(port) + ").")
+    return key, JVMServer.servers[key]
+
+  '''
+  Stop the given server.
+
+  @param key - The key of the server.
+  '''
+  @staticmethod
+  def Stop(key):
+    process, connection, reader = JVMServer.servers.pop(key)
+    try:
+      connection.sendall(b"QUIT\n")
+    except OSError:
+      pass
+    reader.close()
+    connection.close()
+
+    try:
+      process.wait(5)
+    except subprocess.TimeoutExpired:
+      ProcessGroup.Kill(process.pid)
+      process.wait()
+
+  '''
+  Stop all running servers.
+  '''
+  @staticmethod
+  def StopAll():
+    for key in list(JVMServer.servers):
+      JVMServer.Stop(key)
+
+  '''
+  Run the given java command and parse the timers of its output. Like
+  Timers.Run(), the function raises subprocess.TimeoutExpired if the command
+  doesn't finish in time and subprocess.CalledProcessError if the command
+  fails. If the server is disabled (cold start) or the command isn't a plain
+  java command, a fresh JVM is started. The memory of the server is sampled
+  during the run (see MemoryLimit); a run which fails with an
+  OutOfMemoryError is out of memory.
+
+  @param cmd - The command (list of arguments).
+  @param timeout - The timeout in seconds (0 or None for no timeout).
+  @return Ordered dictionary with the timers in seconds.
+  '''
+  @staticmethod
+  def Run(cmd, timeout=None):
+    command = JVMServer.SplitCommand(cmd)
+    if not JVMServer.server or not command:
+      return Timers.Run(cmd, timeout)
+
+    java, classpath, mainClass, args = command
+    ProcessGroup.Settle()
+    key, (process, connection, reader) = JVMServer.Start(java, classpath)
+
+    # The warm-up runs are executed before the measured run, the timeout is the
+    # deadline of the whole run (like a fresh JVM), so the remaining time is
+    # set before every read.
+    timers = collections.OrderedDict()
+    status = None
+    marker = False
+    deadline = time.time() + timeout if timeout else None
+    MemoryMonitor.ResetPeak(process.pid)
+    monitor = MemoryLimit.Start(process.pid)
+    try:
+      connection.settimeout(timeout if timeout else None)
+      connection.sendall(("\t".join(["RUN", str(JVMServer.warmup), mainClass] +
+          args) + "\n").encode("utf-8"))
+      while True:
+        if deadline:
+          remaining = deadline - time.time()
+          if remaining <= 0:
+            raise socket.timeout()
+          connection.settimeout(remaining)
+
+        line = reader.readline()
+        if not line:
+          break
+        if line.startswith(b"#END "):
+          status = int(line.split()[1])
+          break
+        Timers.ParseLine(line, timers)
+        marker = marker or MemoryLimit.Marker(line)
+    except socket.timeout:
+      # The job is still running, the server can't be reused.
+      ProcessGroup.Kill(process.pid)
+      MemoryLimit.Stop(monitor, False)
+      JVMServer.Stop(key)
+      raise subprocess.TimeoutExpired(cmd, timeout)
+
+    MemoryLimit.Stop(monitor, status != 0, process.poll() == -signal.SIGKILL,
+        marker)
+
+    # The heap of the JVM is limited as well (-Xmx), so an OutOfMemoryError
+    # is out of memory even without a memory limit.
+    if status != 0 and marker:
+      MemoryLimit.oom = True
+
+    if status is None:
+      # The server was terminated (e.g. System.exit() of the method).
+      JVMServer.Stop(key)
+      raise subprocess.CalledProcessError(-1, cmd)
+    if status != 0:
+      raise subprocess.CalledProcessError(status, cmd)
+    return timers
+
+atexit.register(JVMServer.StopAll)
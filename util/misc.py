@@ -170,6 +170,92 @@ def CreateDirectoryStructure(directories):
     if not os.path.exists(directory):
        os.makedirs(directory)
 
+'''
+This class holds the loaded arrays of one dataset tuple (train set, test set
+and true labels). The benchmark runner activates a context for every dataset
+tuple; while it is active, LoadDataset() and SplitTrainData() return the arrays
+of the context instead of reading the files again. Arrays which are loaded
+before the timing runs are shared with the forked timeout subprocesses, so the
+timing, metric and bootstrap tasks load every file only once.
+'''
+class DatasetContext(object):
+
+  # The active context.
+  current = None
+
+  '''
+  Create the context for the given dataset tuple, the files are loaded on
+  demand.
+
+  @param dataset - Dataset file or list of dataset files.
+  '''
+  def __init__(self, dataset):
+    self.files = [dataset] if isinstance(dataset, str) else list(dataset)
+    self.arrays = {}
+
+  '''
+  Load the given file of the dataset tuple.
+
+  @param fileName - The name of the file.
+  @param delimiter - The delimiter of the values.
+  @return The loaded array.
+  '''
+  def Load(self, fileName, delimiter=','):
+    key = (fileName, delimiter)
+    if key not in self.arrays:
+      import numpy as np
+      self.arrays[key] = np.genfromtxt(fileName, delimiter=delimiter)
+    return self.arrays[key]
+
+  '''
+  Get the train set and the train labels (last column of the first file).
+
+  @return Tuple (train set, train labels).
+  '''
+  def Train(self):
+    data = self.Load(self.files[0])
+    return (data[:,:-1], data[:, (data.shape[1] - 1)])
+
+  '''
+  Check if the given benchmark script loads the dataset in process. A script
+  marks this with the module level flag IN_PROCESS = True; the runner then
+  preloads the arrays of the dataset once (see Preload()) and the timing, metric
+  and bootstrap tasks of the script share them. Scripts which run external
+  executables only load a few files for the metrics, so they don't set the flag.
+
+  @param module - The module of the benchmark script.
+  @return True if the dataset should be preloaded.
+  '''
+  @staticmethod
+  def InProcess(module):
+    return getattr(module, "IN_PROCESS", False) is True
+
+  '''
+  Load all csv files of the dataset tuple.
+  '''
+  def Preload(self):
+    for fileName in self.files:
+      if fileName.endswith(".csv"):
+        self.Load(fileName)
+
+  '''
+  Create and activate the context for the given dataset tuple.
+
+  @param dataset - Dataset file or list of dataset files.
+  @return The active context.
+  '''
+  @staticmethod
+  def Activate(dataset):
+    DatasetContext.current = DatasetContext(dataset)
+    return DatasetContext.current
+
+  '''
+  Deactivate the current context and release the arrays.
+  '''
+  @staticmethod
+  def Deactivate():
+    DatasetContext.current = None
+
 '''
 Load a given dataset.
 
@@ -177,6 +263,10 @@ Load a given dataset.
 @ return The loaded dataset.
 '''
 def LoadDataset(dataset, delimiter=','):
+  context = DatasetContext.current
+  if context and dataset in context.files:
+    return context.Load(dataset, delimiter)
+
   import numpy as np
   return np.genfromtxt(dataset, delimiter=delimiter)
 
@@ -188,7 +278,10 @@ Split the train labels from the given train dataset.
 '''
 def SplitTrainData(dataset):
   import numpy as np
-  if dataset:
+  context = DatasetContext.current
+  if dataset and context and dataset[0] == context.files[0]:
+    return context.Train()
+  elif dataset:
     trainData = np.genfromtxt(dataset[0], delimiter=',')
     return (trainData[:,:-1], trainData[:, (trainData.shape[1] - 1)])
   else:
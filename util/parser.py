@@ -44,6 +44,8 @@ class Parser(object):
     self.OPTIONS = ''
     self.ALIAS = 'None'
     self.WATCH = ['None']
+    self.THREADS = [None]
+    self.SCALING = []
 
     try:
       Log.Info("Load config file: " + config, verbose)
@@ -180,12 +182,34 @@ class Parser(object):
       self.KeyWarnMsg("watch")
       watch = self.WATCH
 
+    # The thread counts for the thread scaling sweep. A single value is
+    # treated as a list with one element.
+    if "threads" in attributes:
+      threads = attributes["threads"]
+      if not isinstance(threads, list):
+        threads = [threads]
+      Log.Info("Threads: " + str(threads), self.verbose)
+    else:
+      threads = self.THREADS
+
+    # The dimensions ('rows', 'columns') of the dataset-size scaling mode. A
+    # single value is treated as a list with one element.
+    if "scaling" in attributes:
+      scaling = attributes["scaling"]
+      if not isinstance(scaling, list):
+        scaling = [scaling]
+      Log.Info("Scaling: " + str(scaling), self.verbose)
+    else:
+      scaling = self.SCALING
+
     # Generate a namedtuple with named fields (methodName, script, format, ...).
     attr = collections.namedtuple("attributes", ["methodName", "script",
-        "format", "datasets", "run", "iteration", "watch"])
+        "format", "datasets", "run", "iteration", "watch", "threads",
+        "scaling"])
 
     # Store all values in the namedtuple.
-    return attr(methodName, script, format, datasets, run, iteration, watch)
+    return attr(methodName, script, format, datasets, run, iteration, watch,
+        threads, scaling)
 
   '''
   Show emtpy value error message.
@@ -404,6 +428,17 @@ class Parser(object):
               # {'KPCA': d}
               # d = {'-k linear': [('mlpack', ['datasets/circle_data.csv'], 3,
               # 'methods/mlpack/kernel_pca.py', ['csv', 'txt'])]}
+              #
+              # The thread scaling sweep is expanded here, every thread count
+              # gets his own tuple (the ninth element of the tuple). The last
+              # element contains the dimensions of the dataset-size scaling
+              # mode.
+              tuples = [(libraryMapping.libraryName, dataset["files"],
+                  methodMapping.iteration, methodMapping.script,
+                  methodMapping.format, methodMapping.run, dataset["alias"],
+                  methodMapping.watch, threads, methodMapping.scaling) for
+                  threads in methodMapping.threads]
+
               if methodMapping.methodName in streamData:
                 # The main key/value already contains a dictionary with the
                 # given method name as key (e.g. KPCA). In this case we use the
@@ -417,34 +452,21 @@ class Parser(object):
                 if dataset["options"] in tempDict:
                   # Append the information for the libary to the already defined
                   # option.
-                  t = (libraryMapping.libraryName, dataset["files"],
-                    methodMapping.iteration, methodMapping.script,
-                    methodMapping.format, methodMapping.run, dataset["alias"],
-                    methodMapping.watch)
-                  tempDict[dataset["options"]].append(t)
+                  tempDict[dataset["options"]].extend(tuples)
 
                 # This is are new options for the specified method name. So we
                 # create the new entry for the option.
                 else:
                   # Store the infromation for the specified method name with the
                   # option values as key.
-                  t = (libraryMapping.libraryName, dataset["files"],
-                    methodMapping.iteration, methodMapping.script,
-                    methodMapping.format, methodMapping.run, dataset["alias"],
-                    methodMapping.watch)
-                  tempDict[dataset["options"]] = [t]
+                  tempDict[dataset["options"]] = tuples
 
               # Create the second dictionary if it doesn't exist.
               else:
                 d = {}
-                # Store the settings for the given method in a tuple.
-                t = (libraryMapping.libraryName, dataset["files"],
-                  methodMapping.iteration, methodMapping.script,
-                  methodMapping.format, methodMapping.run, dataset["alias"],
-                  methodMapping.watch)
 
                 # To access the method options we can use the options key.
-                d[dataset["options"]] = [t]
+                d[dataset["options"]] = tuples
                 # Store the initial second dictionary with the method name as
                 # key (e.g. KPCA) in the main key/value store.
                 streamData[methodMapping.methodName] = d
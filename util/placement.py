@@ -0,0 +1,208 @@
+'''
+  @file placement.py
+
+  Functions to place the benchmark runs on a single NUMA node and to check the
+  frequency governor before the timing runs.
+'''
+
+import os
+import sys
+import inspect
+import glob
+import ctypes
+import ctypes.util
+import platform
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from system import *
+
+'''
+This class implements the placement policies. The CPU affinity and the memory
+policy are set for the benchmark process and are inherited by the method
+subprocesses. The settings are passed with the 'placement' setting of the
+general block:
+
+  placement: {node: 0, smt: false, governor: performance}
+'''
+class Placement(object):
+
+  # The set_mempolicy system call numbers.
+  SET_MEMPOLICY = {"x86_64": 238, "amd64": 238, "aarch64": 237, "i386": 276,
+      "i686": 276, "ppc64le": 261, "ppc64": 261}
+
+  # Memory policy modes (see linux/mempolicy.h).
+  MPOL_DEFAULT = 0
+  MPOL_BIND = 2
+
+  # The original CPU affinity, used to restore the settings.
+  affinity = None
+
+  # The sysfs directory of the CPUs.
+  CPU_ROOT = "/sys/devices/system/cpu"
+
+  '''
+  Parse a CPU list like '0-3,8,10-11'.
+
+  @param cpuList - The CPU list string.
+  @return Sorted list of CPU ids.
+  '''
+  @staticmethod
+  def ParseCPUList(cpuList):
+    cpus = set()
+    for part in cpuList.strip().split(","):
+      if not part:
+        continue
+      first, sep, last = part.partition("-")
+      cpus.update(range(int(first), int(last if sep else first) + 1))
+    return sorted(cpus)
+
+  '''
+  Get the CPUs of the given NUMA node.
+
+  @param node - The NUMA node.
+  @param smt - If False only the first CPU of every core is used.
+  @return Sorted list of CPU ids.
+  '''
+  @staticmethod
+  def NodeCPUs(node, smt=True):
+    cpuList = SystemInfo.ReadFile("/sys/devices/system/node/node" + str(node) +
+        "/cpulist")
+    if cpuList is None:
+      return []
+
+    cpus = Placement.ParseCPUList(cpuList)
+    if smt:
+      return cpus
+
+    # Skip the SMT siblings, keep the first CPU of every core.
+    cores = []
+    for cpu in cpus:
+      siblings = SystemInfo.ReadFile("/sys/devices/system/cpu/cpu" + str(cpu) +
+          "/topology/thread_siblings_list")
+      if not siblings or Placement.ParseCPUList(siblings)[0] == cpu:
+        cores.append(cpu)
+    return cores
+
+  '''
+  Set the memory policy of the current process.
+
+  @param mode - The memory policy mode.
+  @param node - The NUMA node or None.
+  @return True if the policy was set.
+  '''
+  @staticmethod
+  def SetMemoryPolicy(mode, node=None):
+    number = Placement.SET_MEMPOLICY.get(platform.machine().lower())
+    if number is None or not sys.platform.startswith("linux"):
+      return False
+
+    try:
+      libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    except OSError:
+      return False
+
+    if node is None:
+      return libc.syscall(number, mode, None, ctypes.c_ulong(0)) == 0
+
+    # The node mask is an array of unsigned longs.
+    bits = ctypes.sizeof(ctypes.c_ulong) * 8
+    mask = (ctypes.c_ulong * (node // bits + 1))()
+    mask[node // bits] = 1 << (node % bits)
+    return libc.syscall(number, mode, mask, ctypes.c_ulong(len(mask) *
+        bits + 1)) == 0
+
+  '''
+  Read the current frequency governor of a CPU. The file is read on every call
+  (and not through the SystemInfo cache), since the governor can be changed
+  while the benchmark is running.
+
+  @param cpu - The CPU number.
+  @return The governor or None if it is not available.
+  '''
+  @staticmethod
+  def ReadGovernor(cpu):
+    try:
+      with open(os.path.join(Placement.CPU_ROOT, "cpu" + str(cpu), "cpufreq",
+          "scaling_governor")) as fid:
+        return fid.read().strip()
+    except IOError:
+      return None
+
+  '''
+  Check the frequency governor of the CPUs which are used for the benchmark.
+
+  @param settings - The placement settings.
+  @return True if the governor matches the required governor.
+  '''
+  @staticmethod
+  def Check(settings):
+    if not settings or not settings.get("governor"):
+      return True
+
+    cpus = Placement.NodeCPUs(settings["node"], settings.get("smt", True)) if (
+        "node" in settings) else [0]
+
+    for cpu in cpus:
+      governor = Placement.ReadGovernor(cpu)
+      if governor is None:
+        Log.Warn("Could not read the frequency governor of CPU " + str(cpu) +
+            ".")
+        continue
+
+      if governor != settings["governor"]:
+        Log.Fatal("The frequency governor of CPU " + str(cpu) + " is '" +
+            governor + "', expected '" + settings["governor"] + "'.")
+        return False
+    return True
+
+  '''
+  Bind the CPUs and the memory of the current process (and the method
+  subprocesses) to the NUMA node of the given settings.
+
+  @param settings - The placement settings or None.
+  @return The description of the placement (stored with the results) or None.
+  '''
+  @staticmethod
+  def Apply(settings):
+    Placement.Reset()
+    if not settings or "node" not in settings:
+      return None
+
+    node = settings["node"]
+    smt = settings.get("smt", True)
+    cpus = Placement.NodeCPUs(node, smt)
+    if not cpus:
+      Log.Warn("NUMA node " + str(node) + " not available.")
+      return None
+
+    Placement.affinity = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, cpus)
+
+    membind = Placement.SetMemoryPolicy(Placement.MPOL_BIND, node)
+    if not membind:
+      Log.Warn("Could not bind the memory to NUMA node " + str(node) + ".")
+
+    description = ("node" + str(node) + " cpus=" + ",".join(str(c) for c in
+        cpus) + " membind=" + ("yes" if membind else "no") + " smt=" +
+        ("on" if smt else "off"))
+    Log.Info("Placement: " + description)
+    return description
+
+  '''
+  Restore the CPU affinity and the memory policy changed by Apply().
+  '''
+  @staticmethod
+  def Reset():
+    if Placement.affinity is None:
+      return
+
+    os.sched_setaffinity(0, Placement.affinity)
+    Placement.SetMemoryPolicy(Placement.MPOL_DEFAULT)
+    Placement.affinity = None
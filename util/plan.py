@@ -0,0 +1,160 @@
+'''
+  @file plan.py
+
+  Functions to compile the config into a flat job plan and to split the plan
+  into deterministic, cost-balanced shards.
+'''
+
+import os
+import sys
+import inspect
+import hashlib
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from jobs import *
+from schedule import *
+
+import simplejson
+
+# The version of the plan format.
+PLAN_VERSION = 1
+
+'''
+Calculate the hash of the given plan. The hash covers everything but the hash
+itself (the version, the general block, the estimates and the jobs), since the
+general block and the estimates change the results and the shards as well.
+
+@param plan - The plan dictionary.
+@return The hash of the plan.
+'''
+def PlanHash(plan):
+  content = dict((k, v) for k, v in plan.items() if k != "hash")
+  return hashlib.sha1(simplejson.dumps(content, sort_keys=True).encode(
+      "utf-8")).hexdigest()
+
+'''
+Compile the config into a flat job plan: every (method, options, library,
+dataset) job with its settings, the stable job id and the estimated runtime.
+The estimates are part of the plan, so every host computes the same shards.
+
+@param streamData - The merged config (see Parser.StreamMerge()).
+@param blocks - Run only the specified library blocks (list or None).
+@param methodBlocks - Run only the specified methods (list or None).
+@param model - The cost model of the estimates (see CostModel).
+@return The plan dictionary.
+'''
+def CompilePlan(streamData, blocks=None, methodBlocks=None, model=None):
+  model = model if model else CostModel()
+  jobs = ExpandJobs(streamData, blocks, methodBlocks)
+
+  plan = {"version": PLAN_VERSION,
+      "general": [list(item) for item in streamData.get("general", [])],
+      "estimates": dict((job["id"], model.Estimate(job)) for job in jobs),
+      "jobs": jobs}
+  plan["hash"] = PlanHash(plan)
+  return plan
+
+'''
+Save the plan in the given file.
+
+@param plan - The plan dictionary.
+@param fileName - The name of the plan file.
+'''
+def SavePlan(plan, fileName):
+  CreateDirectoryStructure([os.path.dirname(fileName) or "."])
+  with open(fileName + ".tmp", "w") as fid:
+    simplejson.dump(plan, fid, sort_keys=True, indent=1)
+  os.rename(fileName + ".tmp", fileName)
+
+'''
+Load the plan of the given file and check the hash and the job ids.
+
+@param fileName - The name of the plan file.
+@return The plan dictionary or None if the plan is invalid.
+'''
+def LoadPlan(fileName):
+  try:
+    with open(fileName) as fid:
+      plan = simplejson.load(fid)
+  except (IOError, OSError, ValueError) as e:
+    Log.Fatal("Could not load the plan: " + str(e))
+    return None
+
+  if plan.get("version") != PLAN_VERSION:
+    Log.Fatal("Unsupported plan version: " + str(plan.get("version")))
+    return None
+  if (PlanHash(plan) != plan.get("hash") or
+      any(JobId(job) != job["id"] for job in plan["jobs"])):
+    Log.Fatal("The plan was modified: " + fileName)
+    return None
+  return plan
+
+'''
+Parse the shard specification 'i/N' (the shards are numbered from 1 to N).
+
+@param shard - The shard specification.
+@return Tuple (index, count), the index starts at 0.
+'''
+def ParseShard(shard):
+  try:
+    index, count = [int(value) for value in shard.split("/")]
+  except ValueError:
+    raise ValueError("Invalid shard '" + shard + "', expected 'i/N'.")
+  if count < 1 or not 1 <= index <= count:
+    raise ValueError("Invalid shard '" + shard + "', i must be in 1..N.")
+  return (index - 1, count)
+
+'''
+This class is the cost model of a loaded plan: the estimates are taken from the
+plan, so the progress matches the estimates of the shards.
+'''
+class PlanModel(object):
+
+  '''
+  Create the cost model of the given plan.
+
+  @param plan - The plan dictionary.
+  '''
+  def __init__(self, plan):
+    self.estimates = plan["estimates"]
+
+  '''
+  Get the estimated runtime of the given job.
+
+  @param job - The job dictionary.
+  @return The estimated runtime in seconds.
+  '''
+  def Estimate(self, job):
+    return self.estimates.get(job["id"], 0)
+
+'''
+Split the jobs of the plan into cost-balanced shards and return the jobs of
+the given shard. The jobs are assigned longest first to the shard with the
+smallest total estimate; the order only depends on the estimates and the job
+ids, so every host computes the same shards.
+
+@param plan - The plan dictionary.
+@param index - The index of the shard (starting at 0).
+@param count - The number of shards.
+@return The jobs of the shard (longest first).
+'''
+def ShardJobs(plan, index, count):
+  estimates = plan["estimates"]
+  jobs = sorted(plan["jobs"], key=lambda job: (-estimates.get(job["id"], 0),
+      job["id"]))
+
+  loads = [0.0] * count
+  shard = []
+  for job in jobs:
+    target = min(range(count), key=lambda i: (loads[i], i))
+    loads[target] += estimates.get(job["id"], 0)
+    if target == index:
+      shard.append(job)
+  return shard
@@ -23,6 +23,49 @@ This class implements functions the get profiling informations.
 '''
 class Profiler(object):
 
+  # The memory profiling mode used by MemoryUsage(), either 'massif' (valgrind
+  # massif) or 'sample' (sample the process tree through /proc).
+  memoryMode = "massif"
+
+  # The number of memory samples per second in the 'sample' mode.
+  sampleRate = 100
+
+  # The maximum number of samples kept in the memory timeline.
+  timelineSize = 200
+
+  '''
+  Profile the memory usage of the given command with the configured memory
+  profiling mode and save the ouput in the specified file.
+
+  @param command - Method command line to profile.
+  @param output - Save the report at the output path with the specified name.
+  @param timeout - The time until the timeout.
+  @param options - Specified massif options (only used in the 'massif' mode).
+  @return Returns -1 if the method was not successful, if the method was
+  successful save the report file in the specified file.
+  '''
+  @staticmethod
+  def MemoryUsage(command, output, timeout, options):
+    if Profiler.memoryMode == "sample":
+      return Profiler.SampledMemoryUsage(command, output, timeout,
+          Profiler.sampleRate)
+    else:
+      return Profiler.MassifMemoryUsage(command, output, timeout, options)
+
+  '''
+  Get the path of the executables used to profile the memory. Valgrind massif
+  needs the debug symbols, the 'sample' mode runs at native speed so we profile
+  the release executables (the debug build changes the speed and the
+  allocation pattern).
+
+  @param path - The path of the release executables.
+  @param debug - The path of the debug executables.
+  @return The path of the executables for the configured memory mode.
+  '''
+  @staticmethod
+  def ExecutablePath(path, debug):
+    return path if Profiler.memoryMode == "sample" else debug
+
   '''
   Use valgrind massif to get memory profiling information and save the ouput in
   the specified file.
@@ -68,36 +111,389 @@ class Profiler(object):
       return -1
 
   '''
-  Returns the memory used by a process and his children. We don't know when the
-  process is done so we have to poll to get the memory. To avoid memory overflow
-  we use a ringbuffer to limit the size of the memory values.
+  Sample the memory usage of the given command at the given rate and save the
+  peak values and a compact timeline as JSON in the specified file. In contrast
+  to valgrind massif the method runs at native speed.
 
-  @param process - Popen instance.
-  @param Buffersize - Memory value count.
-  @return List of memory values.
+  @param command - Method command line to profile.
+  @param output - Save the report at the output path with the specified name.
+  @param timeout - The time until the timeout.
+  @param rate - The number of samples per second.
+  @return Returns -1 if the method was not successful, -2 if the method timed
+  out, if the method was successful save the report file in the specified file.
   '''
   @staticmethod
-  def SubprocessMemoryUsage(process, Buffersize=200):
-    import psutil, time, collections
+  def SampledMemoryUsage(command, output, timeout, rate=100):
+    import subprocess, simplejson
 
-    # Create the process list with the main process and his childrens.
-    p = psutil.Process(process.pid)
-    children = list(p.get_children(recursive=True)) + [p]
+    try:
+      process = subprocess.Popen(command, stdout=subprocess.DEVNULL,
+          stderr=subprocess.DEVNULL, shell=False, start_new_session=True)
+    except Exception:
+      Log.Fatal("Could not execute command: " + str(command))
+      return -1
 
-    memoryTable = collections.deque(maxlen=Buffersize)
+    memory = Profiler.SubprocessMemoryUsage(process, Profiler.timelineSize,
+        rate, timeout)
 
-    # We have to poll to get the memory values.
-    while process.poll() == None:
+    if memory["timeout"]:
+      Log.Warn("Script timed out after " + str(timeout) + " seconds")
+      return -2
+    elif process.returncode != 0:
+      Log.Fatal("Could not execute command: " + str(command))
+      return -1
+
+    with open(output, "w") as fid:
+      simplejson.dump(memory, fid)
+
+  '''
+  Get the ids of the given process and all his children. We use the children
+  list of the kernel if it is available otherwise we have to scan the process
+  table.
+
+  @param pid - The id of the root process.
+  @return List of process ids.
+  '''
+  @staticmethod
+  def ProcessTree(pid):
+    if not os.path.exists("/proc/%d/task/%d/children" % (os.getpid(),
+        os.getpid())):
+      return Profiler.ScanProcessTree(pid)
+
+    pids = [pid]
+    i = 0
+    while i < len(pids):
       try:
-        for p in children:
-          memoryTable.append(int(p.get_memory_info()[0]))
-      # Sometimes a subprocess has terminated in the time between we measure the
-      # memory. In this case, we continue.
-      except psutil.NoSuchProcess:
+        for task in os.listdir("/proc/%d/task" % pids[i]):
+          with open("/proc/%d/task/%s/children" % (pids[i], task)) as fid:
+            pids.extend(int(c) for c in fid.read().split())
+      except (IOError, OSError):
+        # The process has terminated in the meantime.
+        pass
+      i += 1
+
+    return pids
+
+  '''
+  Get the ids of the given process and all his children by scanning the
+  parent ids of all processes in the process table.
+
+  @param pid - The id of the root process.
+  @return List of process ids.
+  '''
+  @staticmethod
+  def ScanProcessTree(pid):
+    parents = {}
+    for entry in os.listdir("/proc"):
+      if not entry.isdigit():
         continue
-      except psutil.AccessDenied:
+      try:
+        with open("/proc/" + entry + "/stat") as fid:
+          # The command name can contain spaces, so we split after the
+          # closing parenthesis.
+          stat = fid.read().rsplit(")", 1)[1].split()
+      except (IOError, OSError, IndexError):
         continue
+      parents.setdefault(int(stat[1]), []).append(int(entry))
+
+    pids = [pid]
+    i = 0
+    while i < len(pids):
+      pids.extend(parents.get(pids[i], []))
+      i += 1
+    return pids
+
+  '''
+  Get the memory usage of a single process. The resident set size (RSS), the
+  proportional set size (PSS) and the unique set size (USS) are read from
+  smaps_rollup, if the kernel doesn't provide that file we fall back to statm
+  and use the RSS for all values.
+
+  @param pid - The id of the process.
+  @return Tuple (rss, pss, uss) in KB or None if the process has terminated.
+  '''
+  @staticmethod
+  def ProcessMemory(pid):
+    try:
+      with open("/proc/%d/smaps_rollup" % pid) as fid:
+        values = {}
+        for line in fid:
+          field = line.split()
+          if len(field) == 3 and field[2] == "kB":
+            values[field[0][:-1]] = int(field[1])
+
+      uss = values.get("Private_Clean", 0) + values.get("Private_Dirty", 0)
+      return (values.get("Rss", 0), values.get("Pss", 0), uss)
+    except (IOError, OSError):
+      pass
+
+    try:
+      with open("/proc/%d/statm" % pid) as fid:
+        rss = int(fid.read().split()[1]) * (os.sysconf("SC_PAGE_SIZE") // 1024)
+      return (rss, rss, rss)
+    except (IOError, OSError, IndexError, ValueError):
+      return None
+
+  '''
+  Returns the memory used by a process and his children. We don't know when the
+  process is done so we have to poll to get the memory. The peak values are
+  tracked over all samples, to limit the size of the timeline we halve the
+  resolution of the timeline every time it exceeds the given size.
+
+  @param process - Popen instance, started with start_new_session=True so that
+  the whole process group is killed on timeout.
+  @param Buffersize - Maximum number of timeline samples.
+  @param rate - The number of samples per second.
+  @param timeout - The time until the process is killed. Default no timeout.
+  @return Dictionary with the peak values and the timeline [time, rss, pss,
+  uss] (all memory values in KB).
+  '''
+  @staticmethod
+  def SubprocessMemoryUsage(process, Buffersize=200, rate=100, timeout=None):
+    import time
+    from containment import ProcessGroup
+
+    interval = 1.0 / rate
+    timeline = MemoryTimeline(Buffersize)
+    timedOut = False
+
+    start = time.time()
+    # We have to poll to get the memory values.
+    while process.poll() == None:
+      elapsed = time.time() - start
+      if timeout and elapsed > timeout:
+        ProcessGroup.Kill(process.pid)
+        process.wait()
+        timedOut = True
+        break
+
+      # Sum up the memory of the process and all his children. Sometimes a
+      # subprocess has terminated in the time between we measure the memory.
+      # In this case, we skip the process.
+      sample = [0, 0, 0]
+      for pid in Profiler.ProcessTree(process.pid):
+        memory = Profiler.ProcessMemory(pid)
+        if memory:
+          sample = [s + m for s, m in zip(sample, memory)]
+
+      timeline.Add(elapsed, sample)
+      time.sleep(interval)
+
+    memory = timeline.Result()
+    memory["rate"] = rate
+    memory["timeout"] = timedOut
+    return memory
+
+  '''
+  Profile the memory usage of the timed region of an in-process benchmark
+  script (e.g. scikit, shogun, mlpy). The script is executed with RunTiming()
+  in the timeout() subprocess, every Timer inside the subprocess records the
+  memory statistics of the timed region with a MemoryTracker and writes them in
+  the specified file.
+
+  @param instance - The benchmark script instance.
+  @param options - Extra options for the method.
+  @param output - Save the report at the output path with the specified name.
+  @return Returns -1 if the method was not successful, -2 if the method timed
+  out, if the method was successful save the report file in the specified file.
+  '''
+  @staticmethod
+  def InProcessMemoryUsage(instance, options, output):
+    from timer import Timer
+
+    Timer.memoryOutput = output
+    try:
+      time = instance.RunTiming(options)
+    finally:
+      Timer.memoryOutput = None
+
+    if time == -2:
+      return -2
+    elif time is None or time < 0 or not os.path.isfile(output):
+      Log.Fatal("Could not profile the memory of the method.")
+      return -1
+
+'''
+This class stores the peak values and a compact timeline of memory samples. To
+limit the size of the timeline we halve the resolution of the timeline every
+time it exceeds the given size.
+'''
+class MemoryTimeline(object):
+
+  '''
+  Create the memory timeline.
+
+  @param size - Maximum number of timeline samples.
+  '''
+  def __init__(self, size=200):
+    self.size = size
+    self.stride = 1
+    self.count = 0
+    self.peak = [0, 0, 0]
+    self.timeline = []
+
+  '''
+  Add a new memory sample.
+
+  @param elapsed - The elapsed time in seconds.
+  @param sample - List with the rss, pss and uss values in KB.
+  '''
+  def Add(self, elapsed, sample):
+    self.peak = [max(p, s) for p, s in zip(self.peak, sample)]
+
+    if self.count % self.stride == 0:
+      self.timeline.append([round(elapsed, 4)] + list(sample))
+      if len(self.timeline) > self.size:
+        self.timeline = self.timeline[::2]
+        self.stride *= 2
+    self.count += 1
+
+  '''
+  Return the memory informations in the format used by the memory table.
+
+  @return Dictionary with the peak values and the timeline.
+  '''
+  def Result(self):
+    return {"type": "sample", "peak_rss": self.peak[0],
+        "peak_pss": self.peak[1], "peak_uss": self.peak[2],
+        "samples": self.count, "timeline": self.timeline}
+
+'''
+This class tracks the memory usage of the current process between Start() and
+Stop(): the peak RSS, PSS and USS, the tracemalloc peak and the peak of the
+memory held by NumPy arrays.
+'''
+class MemoryTracker(object):
+
+  # The interval in seconds of the NumPy memory samples; a tracemalloc snapshot
+  # copies all traces, so we take them less often than the memory samples.
+  snapshotInterval = 0.1
+
+  '''
+  Create the memory tracker.
+
+  @param rate - The number of samples per second.
+  @param size - Maximum number of timeline samples.
+  '''
+  def __init__(self, rate=None, size=None):
+    self.rate = rate if rate else Profiler.sampleRate
+    self.timeline = MemoryTimeline(size if size else Profiler.timelineSize)
+    self.numpy = [0, 0]
+
+  '''
+  Reset the peak values and start the memory tracking.
+  '''
+  def Start(self):
+    import threading, time, tracemalloc
+
+    # Reset the peak resident set size (VmHWM) of the process, this requires
+    # Linux 4.0+ otherwise the peak includes the memory used before the timed
+    # region.
+    try:
+      with open("/proc/self/clear_refs", "w") as fid:
+        fid.write("5")
+    except (IOError, OSError):
+      pass
+
+    tracemalloc.start()
+
+    self.running = True
+    self.start = time.time()
+    self.thread = threading.Thread(target=self.Sample)
+    self.thread.daemon = True
+    self.thread.start()
+
+  '''
+  Sample the memory of the current process until Stop() is called.
+  '''
+  def Sample(self):
+    import time
+
+    pid = os.getpid()
+    snapshot = 0
+    while self.running:
+      elapsed = time.time() - self.start
+      memory = Profiler.ProcessMemory(pid)
+      if memory:
+        self.timeline.Add(elapsed, memory)
+      if elapsed >= snapshot:
+        self.SampleNumpy()
+        snapshot = elapsed + MemoryTracker.snapshotInterval
+      time.sleep(1.0 / self.rate)
+
+  '''
+  Get the memory held by NumPy arrays, NumPy reports the array allocations in
+  its own tracemalloc domain.
+
+  @return Tuple (bytes, blocks) or None if NumPy isn't available.
+  '''
+  @staticmethod
+  def NumpyMemory():
+    import tracemalloc
+
+    try:
+      import numpy as np
+      domain = np.lib.tracemalloc_domain
+    except (ImportError, AttributeError):
+      return None
+
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.DomainFilter(True, domain)])
+    statistics = snapshot.statistics("filename")
+    return (sum(s.size for s in statistics), sum(s.count for s in statistics))
+
+  '''
+  Update the peak of the memory held by NumPy arrays. Tracing starts with the
+  timed region, so every trace is an allocation of the timed region.
+  '''
+  def SampleNumpy(self):
+    memory = MemoryTracker.NumpyMemory()
+    if memory and memory[0] >= self.numpy[0]:
+      self.numpy = list(memory)
+
+  '''
+  Stop the memory tracking and save the memory informations as JSON in the
+  specified file.
+
+  @param output - Save the report at the output path with the specified name.
+  @return Dictionary with the memory informations.
+  '''
+  def Stop(self, output=None):
+    import time, tracemalloc
+
+    # Take the last sample before we stop the tracking.
+    memory = Profiler.ProcessMemory(os.getpid())
+    if memory:
+      self.timeline.Add(time.time() - self.start, memory)
+
+    self.running = False
+    self.thread.join()
+
+    current, peak = tracemalloc.get_traced_memory()
+    self.SampleNumpy()
+    tracemalloc.stop()
+
+    result = self.timeline.Result()
+    result["type"] = "tracemalloc"
+    result["rate"] = self.rate
+    result["timeout"] = False
+    result["tracemalloc_peak"] = peak // 1024
+    result["numpy_allocated"] = self.numpy[0] // 1024
+    result["numpy_blocks"] = self.numpy[1]
+
+    # The kernel tracks the peak resident set size for us, so we don't miss
+    # a peak between two samples.
+    try:
+      with open("/proc/self/status") as fid:
+        for line in fid:
+          if line.startswith("VmHWM:"):
+            result["peak_rss"] = max(result["peak_rss"], int(line.split()[1]))
+    except (IOError, OSError, ValueError):
+      pass
 
-      time.sleep(0.01)
+    if output:
+      import simplejson
+      with open(output, "w") as fid:
+        simplejson.dump(result, fid)
 
-    return memoryTable
+    return result
@@ -0,0 +1,294 @@
+'''
+  @file scaling.py
+
+  Functions to derive row and column subsamples of a dataset for the
+  dataset-size scaling mode and to fit the empirical complexity exponent.
+'''
+
+import os
+import sys
+import inspect
+import math
+import random
+import hashlib
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from misc import *
+
+'''
+This class implements functions to create geometrically sized subsamples of a
+dataset. The subsamples are cached on disk and only regenerated if the source
+dataset changes.
+'''
+class Scaling(object):
+
+  # The supported scaling dimensions and the abbreviation used in the names of
+  # the subsampled datasets.
+  DIMENSIONS = {"rows": "r", "columns": "c"}
+
+  # Folder which contains the cached subsamples.
+  directory = "datasets/scaling"
+
+  # Number of sizes per dimension (including the full dataset); every size is
+  # half of the next bigger one.
+  steps = 5
+
+  # Seed used to select the rows, so the subsamples are reproducible. The row
+  # subsamples of every seed are cached in their own folder.
+  seed = 42
+
+  '''
+  Calculate the geometric sizes for the given dataset size.
+
+  @param n - Size of the full dataset.
+  @param steps - Number of sizes.
+  @param minimum - The smallest allowed size.
+  @return Sorted list of sizes, the last element is the full size.
+  '''
+  @staticmethod
+  def Sizes(n, steps, minimum=1):
+    sizes = []
+    for i in range(steps):
+      size = n >> i
+      if size < minimum:
+        break
+      if size not in sizes:
+        sizes.insert(0, size)
+    return sizes
+
+  '''
+  Return the path of the subsample of the given file.
+
+  @param fileName - The source dataset file.
+  @param dimension - The scaling dimension ('rows' or 'columns').
+  @param size - The size of the subsample.
+  @return Path of the subsample.
+  '''
+  @staticmethod
+  def SubsamplePath(fileName, dimension, size):
+    name, extension = os.path.splitext(os.path.basename(fileName))
+    # Keep the suffix (e.g. '_train') so that NormalizeDatasetName() returns
+    # the same name for all files of a dataset.
+    parts = name.split("_", 1)
+    parts[0] += "-" + Scaling.DIMENSIONS[dimension] + str(size)
+
+    # The selected rows depend on the seed.
+    directory = Scaling.directory
+    if dimension == "rows":
+      directory = os.path.join(directory, "seed-" + str(Scaling.seed))
+    return os.path.join(directory, "_".join(parts) + extension)
+
+  '''
+  Return the path of the cached shape of the given file.
+
+  @param fileName - The dataset file.
+  @return Path of the shape file.
+  '''
+  @staticmethod
+  def ShapePath(fileName):
+    key = hashlib.sha1(os.path.abspath(fileName).encode("utf-8")).hexdigest()
+    return os.path.join(Scaling.directory, "shapes",
+        os.path.basename(fileName) + "-" + key[:8] + ".shape")
+
+  '''
+  Count the rows and the columns of the given file. The shape is cached with
+  the subsamples, so the file is only scanned again if it changes.
+
+  @param fileName - The dataset file.
+  @return Tuple (rows, columns).
+  '''
+  @staticmethod
+  def Shape(fileName):
+    cache = Scaling.ShapePath(fileName)
+    if Scaling.IsCached(fileName, cache):
+      try:
+        with open(cache, "r") as fid:
+          rows, columns = [int(v) for v in fid.read().split(",")]
+        return (rows, columns)
+      except (IOError, OSError, ValueError):
+        pass
+
+    rows, columns = 0, 0
+    with open(fileName, "r") as fid:
+      for line in fid:
+        if rows == 0:
+          columns = line.count(",") + 1
+        rows += 1
+
+    CreateDirectoryStructure([os.path.dirname(cache)])
+    with open(cache + ".tmp", "w") as fid:
+      fid.write(str(rows) + "," + str(columns))
+    os.rename(cache + ".tmp", cache)
+    return (rows, columns)
+
+  '''
+  Get the shapes of the files of a dataset and the number of features. If
+  another file has one column less than the first file, the last column of the
+  first file contains the labels.
+
+  @param files - List of dataset files.
+  @return Tuple (shapes, label, features); label is True if the first file
+  contains a label column.
+  '''
+  @staticmethod
+  def Layout(files):
+    shapes = [Scaling.Shape(f) for f in files]
+    columns = shapes[0][1]
+    label = any(shape[1] == columns - 1 for shape in shapes[1:])
+    return (shapes, label, columns - 1 if label else columns)
+
+  '''
+  Write the subsample of a file. The file is read and written line by line, so
+  the dataset doesn't have to fit into memory.
+
+  @param fileName - The source dataset file.
+  @param output - The subsample file.
+  @param rows - Set of row indices to keep or None to keep all rows.
+  @param columns - Number of leading columns to keep or None.
+  @param label - Keep the last column (the labels) as well.
+  '''
+  @staticmethod
+  def WriteSubsample(fileName, output, rows=None, columns=None, label=False):
+    # Write to a temporary file first, so an interrupted run doesn't leave a
+    # truncated file in the cache.
+    temporary = output + ".tmp"
+    with open(fileName, "r") as source, open(temporary, "w") as target:
+      for i, line in enumerate(source):
+        if rows is not None and i not in rows:
+          continue
+        if columns is not None:
+          values = line.rstrip("\r\n").split(",")
+          selected = values[:columns]
+          if label:
+            selected.append(values[-1])
+          line = ",".join(selected) + "\n"
+        target.write(line)
+    os.rename(temporary, output)
+
+  '''
+  Create the subsample of the given dataset, use the cached version if the
+  subsample is newer than the source dataset. For a list of datasets (e.g.
+  train and test set) the rows are selected in all files with the same number
+  of rows as the first file and the columns in all files with the same number
+  of features.
+
+  @param dataset - Dataset file or a list of dataset files.
+  @param dimension - The scaling dimension ('rows' or 'columns').
+  @param size - The size of the subsample.
+  @return Subsampled dataset file or list of files.
+  '''
+  @staticmethod
+  def Subsample(dataset, dimension, size):
+    files = [dataset] if isinstance(dataset, str) else dataset
+    shapes, label, features = Scaling.Layout(files)
+    rows = shapes[0][0]
+
+    subsample = []
+    for fileName, shape in zip(files, shapes):
+      if dimension == "rows" and shape[0] == rows:
+        output = Scaling.SubsamplePath(fileName, dimension, size)
+        CreateDirectoryStructure([os.path.dirname(output)])
+        if not Scaling.IsCached(fileName, output):
+          # The subsamples are nested: every subsample contains the rows of
+          # the smaller ones.
+          order = list(range(rows))
+          random.Random(Scaling.seed).shuffle(order)
+          Scaling.WriteSubsample(fileName, output, rows=set(order[:size]))
+      elif dimension == "columns" and shape[1] in (features, features + 1):
+        output = Scaling.SubsamplePath(fileName, dimension, size)
+        CreateDirectoryStructure([os.path.dirname(output)])
+        if not Scaling.IsCached(fileName, output):
+          Scaling.WriteSubsample(fileName, output, columns=size,
+              label=shape[1] == features + 1 and label)
+      else:
+        output = fileName
+      subsample.append(output)
+
+    return subsample[0] if isinstance(dataset, str) else subsample
+
+  '''
+  Check if the cached subsample is up to date.
+
+  @param fileName - The source dataset file.
+  @param output - The subsample file.
+  @return True if the subsample can be used.
+  '''
+  @staticmethod
+  def IsCached(fileName, output):
+    return (os.path.isfile(output) and
+        os.path.getmtime(output) >= os.path.getmtime(fileName))
+
+  '''
+  Derive the subsamples of the given datasets.
+
+  @param datasets - List of datasets.
+  @param dimensions - List of scaling dimensions.
+  @return Tuple (datasets, sizes); the datasets list contains the original and
+  the subsampled datasets and sizes maps the normalized dataset name to a list
+  of (original dataset name, dimension, size) tuples.
+  '''
+  @staticmethod
+  def ExpandDatasets(datasets, dimensions):
+    expanded = []
+    sizes = {}
+    for dataset in datasets:
+      name = NormalizeDatasetName(dataset)
+      files = [dataset] if isinstance(dataset, str) else dataset
+
+      for dimension in dimensions:
+        if dimension not in Scaling.DIMENSIONS:
+          Log.Warn("Unknown scaling dimension: " + str(dimension))
+          continue
+
+        if not os.path.isfile(files[0]):
+          Log.Warn("Dataset not available for scaling: " + files[0])
+          break
+
+        # The column subsamples keep the label column, so the sizes count
+        # the features only.
+        shapes, label, features = Scaling.Layout(files)
+        if dimension == "rows":
+          steps = Scaling.Sizes(shapes[0][0], Scaling.steps, 2)
+        else:
+          steps = Scaling.Sizes(features, Scaling.steps, 1)
+
+        for size in steps[:-1]:
+          subsample = Scaling.Subsample(dataset, dimension, size)
+          expanded.append(subsample)
+          sizes.setdefault(NormalizeDatasetName(subsample), []).append(
+              (name, dimension, size))
+        sizes.setdefault(name, []).append((name, dimension, steps[-1]))
+
+      expanded.append(dataset)
+
+    return (expanded, sizes)
+
+  '''
+  Fit the empirical complexity exponent k of time = c * n^k with a least
+  squares fit in log-log space.
+
+  @param points - List of (size, time) tuples.
+  @return Tuple (exponent, r2) or None if there are not enough points.
+  '''
+  @staticmethod
+  def FitExponent(points):
+    points = [(math.log(n), math.log(t)) for n, t in points if n > 0 and t > 0]
+    if len(set(x for x, _ in points)) < 2:
+      return None
+
+    meanX = sum(x for x, _ in points) / len(points)
+    meanY = sum(y for _, y in points) / len(points)
+    sxx = sum((x - meanX) ** 2 for x, _ in points)
+    sxy = sum((x - meanX) * (y - meanY) for x, y in points)
+    syy = sum((y - meanY) ** 2 for _, y in points)
+
+    exponent = sxy / sxx
+    r2 = (sxy * sxy) / (sxx * syy) if syy > 0 else 1.0
+    return (exponent, r2)
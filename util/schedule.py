@@ -0,0 +1,281 @@
+'''
+  @file schedule.py
+
+  Cost model of the benchmark jobs, used to run the longest jobs first, to
+  estimate the remaining time of a run and to skip the jobs which will time
+  out.
+'''
+
+import os
+import sys
+import inspect
+import time
+import datetime
+import collections
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from misc import *
+
+'''
+Parse the time label of a result ('1.234000', '>9000' or 'failure').
+
+@param label - The time label.
+@return Tuple (time in seconds, timeout) or None if the run failed.
+'''
+def ParseTimeLabel(label):
+  if isinstance(label, (int, float)):
+    return (float(label), False) if label >= 0 else None
+
+  label = str(label)
+  if label.startswith(">") and isFloat(label[1:]):
+    return (float(label[1:]), True)
+  if isFloat(label):
+    return (float(label), False)
+  return None
+
+'''
+Return the median of the given values.
+
+@param values - List of numbers.
+@return The median.
+'''
+def Median(values):
+  values = sorted(values)
+  middle = len(values) // 2
+  if len(values) % 2:
+    return values[middle]
+  return (values[middle - 1] + values[middle]) / 2.0
+
+'''
+This class estimates the runtime of a job. The time of a trial is the median
+of the recent results of the same (library, method, options, dataset, threads)
+cell; a cell without history is estimated by the dataset size times the
+runtime per MB of the method (over all libraries and datasets).
+'''
+class CostModel(object):
+
+  # The number of recent results of a cell which are used.
+  HISTORY = 3
+
+  # The runtime per MB if there is no result of the method.
+  DEFAULT_RATE = 1.0
+
+  # The dataset size in MB if the dataset isn't available.
+  DEFAULT_SIZE = 1.0
+
+  '''
+  Create the cost model.
+
+  @param history - The result history (see Database.GetResultHistory()) or
+  None.
+  '''
+  def __init__(self, history=None):
+    self.times = {}
+    self.rates = {}
+    self.sizes = {}
+
+    for row in history or []:
+      buildId, library, method, options, dataset, size, label, threads = row
+      result = ParseTimeLabel(label)
+      if result is None:
+        continue
+
+      self.times.setdefault((library, method, options, dataset, threads),
+          []).append(result[0])
+      self.sizes[dataset] = size
+      if size:
+        self.rates.setdefault(method, []).append(result[0] / size)
+
+    allRates = [r for rates in self.rates.values() for r in rates]
+    self.defaultRate = Median(allRates) if allRates else self.DEFAULT_RATE
+
+  '''
+  Get the size of the dataset of the given job.
+
+  @param job - The job dictionary.
+  @return The size in MB.
+  '''
+  def Size(self, job):
+    name = NormalizeDatasetName(job["dataset"])
+    if self.sizes.get(name):
+      return self.sizes[name]
+
+    dataset = job["dataset"]
+    files = [dataset] if isinstance(dataset, str) else dataset
+    size = sum(os.path.getsize(f) for f in files if os.path.isfile(f))
+    return size / float(1 << 20) if size else self.DEFAULT_SIZE
+
+  '''
+  Estimate the time of a single run of the given job.
+
+  @param job - The job dictionary.
+  @return The estimated time in seconds.
+  '''
+  def Trial(self, job):
+    key = (job["library"], job["method"], job["options"],
+        NormalizeDatasetName(job["dataset"]), job.get("threads"))
+    if key in self.times:
+      estimate = Median(self.times[key][-self.HISTORY:])
+    else:
+      rates = self.rates.get(job["method"])
+      estimate = self.Size(job) * (Median(rates) if rates else
+          self.defaultRate)
+
+    timeout = job.get("timeout")
+    return min(estimate, timeout) if timeout else estimate
+
+  '''
+  Estimate the time of the given job (all trials and tasks).
+
+  @param job - The job dictionary.
+  @return The estimated time in seconds.
+  '''
+  def Estimate(self, job):
+    runs = 0
+    if "timing" in job["tasks"]:
+      runs += job["trials"]
+    if "metric" in job["tasks"]:
+      runs += 1
+    if "bootstrap" in job["tasks"]:
+      runs += job["bootstrap"]
+    return self.Trial(job) * max(runs, 1)
+
+  '''
+  Order the jobs longest processing time first, which minimizes the time
+  until the last worker finishes.
+
+  @param jobs - List of jobs.
+  @return The ordered list of jobs.
+  '''
+  def Order(self, jobs):
+    return sorted(jobs, key=lambda job: -self.Estimate(job))
+
+'''
+This class tracks the progress of a run. The remaining time is extrapolated
+from the elapsed time and the estimated cost of the finished jobs, so the
+estimate improves as jobs finish.
+'''
+class Progress(object):
+
+  '''
+  Create the progress of the given jobs.
+
+  @param jobs - List of jobs.
+  @param model - The cost model.
+  '''
+  def __init__(self, jobs, model):
+    self.estimates = dict((job["id"], model.Estimate(job)) for job in jobs)
+    self.jobs = len(jobs)
+    self.total = sum(self.estimates.values())
+    self.done = 0.0
+    self.finished = 0
+    self.start = time.time()
+
+  '''
+  Mark the given job as finished.
+
+  @param job - The job dictionary.
+  '''
+  def Complete(self, job):
+    if job["id"] in self.estimates:
+      self.done += self.estimates.pop(job["id"])
+      self.finished += 1
+
+  '''
+  Estimate the remaining time.
+
+  @return The remaining time in seconds or None if no job is finished.
+  '''
+  def Remaining(self):
+    if self.done <= 0:
+      return None
+    return (time.time() - self.start) * (self.total - self.done) / self.done
+
+  '''
+  Get the progress line.
+
+  @return The progress string, e.g. '12/40 jobs, ETA 0:42:10'.
+  '''
+  def Status(self):
+    remaining = self.Remaining()
+    eta = "-" if remaining is None else str(datetime.timedelta(
+        seconds=int(remaining)))
+    return (str(self.finished) + "/" + str(self.jobs) + " jobs, ETA " + eta)
+
+'''
+This class predicts the cells (library, method, options, dataset, threads)
+which will exceed the timeout: a cell is skipped if the results of its last builds were
+all timeouts of at least the current timeout. Every reprobe-th build runs the
+cell again, so a faster version of the library is still noticed.
+'''
+class TimeoutPredictor(object):
+
+  # The time label of the skipped cells.
+  SKIPPED = "skipped-predicted-timeout"
+
+  # The number of timed out builds before a cell is skipped.
+  HISTORY = 2
+
+  '''
+  Create the predictor.
+
+  @param history - The result history (see Database.GetResultHistory()) or
+  None.
+  @param reprobe - Run a skipped cell again every reprobe builds, 0 disables
+  the prediction.
+  '''
+  def __init__(self, history=None, reprobe=0):
+    self.reprobe = reprobe
+    self.outcomes = {}
+
+    # Keep the last result of every build.
+    builds = {}
+    for row in history or []:
+      buildId, library, method, options, dataset = row[:5]
+      key = (library, method, options, dataset, row[7])
+      builds.setdefault(key, collections.OrderedDict())[buildId] = row[6]
+
+    for key, results in builds.items():
+      self.outcomes[key] = list(results.values())
+
+  '''
+  Check whether the given cell should be skipped.
+
+  @param library - The name of the library.
+  @param method - The name of the method.
+  @param options - The options of the method.
+  @param dataset - The name of the dataset.
+  @param timeout - The current timeout in seconds.
+  @param threads - The thread count of the cell (None for the default).
+  @return True if the cell is expected to exceed the timeout.
+  '''
+  def Skip(self, library, method, options, dataset, timeout, threads=None):
+    if not self.reprobe:
+      return False
+
+    outcomes = self.outcomes.get((library, method, options, dataset,
+        threads), [])
+
+    # Count the builds since the last run of the cell.
+    skipped = 0
+    while skipped < len(outcomes) and outcomes[-1 - skipped] == self.SKIPPED:
+      skipped += 1
+    if skipped >= self.reprobe - 1:
+      return False
+
+    runs = [o for o in outcomes if o != self.SKIPPED][-self.HISTORY:]
+    if len(runs) < self.HISTORY:
+      return False
+
+    for label in runs:
+      result = ParseTimeLabel(label)
+      if not result or not result[1] or result[0] < timeout:
+        return False
+    return True
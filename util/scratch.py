@@ -0,0 +1,121 @@
+'''
+  @file scratch.py
+
+  Per-job scratch directories for the output files of the method executables.
+'''
+
+import os
+import sys
+import inspect
+import shutil
+import tempfile
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+
+'''
+This class manages the scratch directory of the current job. The method
+executables run inside the scratch directory, so their output files (e.g.
+neighbors.csv, output.csv or gmon.out) don't collide with the files of other
+jobs and are written to memory if a tmpfs is available. The runner creates the
+directory before the tasks of a job and removes it afterwards.
+
+Only the executables started through MlpackBindings.Run() use the scratch
+directory. The matlab wrappers still run in the current directory: matlab
+finds the scripts through the relative MATLABPATH and the dataset paths are
+part of the '-r' expression, so the scripts (e.g. LOGISTIC_REGRESSION.m) write
+their predictions to the current directory. The same holds for the JVM-based
+wrappers, the weka server keeps its startup directory.
+'''
+class Scratch(object):
+
+  # The tmpfs mount points which are used if they are writable.
+  ROOTS = ["/dev/shm"]
+
+  # The scratch directory of the current job or None.
+  directory = None
+
+  # The input files (e.g. the dataset files) of the jobs, keyed by the scratch
+  # directory.
+  inputs = {}
+
+  '''
+  Create a new scratch directory for the next job, the old directory is
+  removed.
+
+  @param inputs - Dataset file or list of input files of the job, relative
+  paths of these files are converted by Command().
+  @return The scratch directory.
+  '''
+  @staticmethod
+  def Create(inputs=None):
+    Scratch.Remove()
+
+    root = None
+    for path in Scratch.ROOTS:
+      if os.path.isdir(path) and os.access(path, os.W_OK):
+        root = path
+        break
+
+    Scratch.directory = tempfile.mkdtemp(prefix="benchmark-", dir=root)
+
+    files = [inputs] if isinstance(inputs, str) else (inputs or [])
+    Scratch.inputs[Scratch.directory] = set(os.path.normpath(f) for f in files)
+    return Scratch.directory
+
+  '''
+  Remove the scratch directory with all output files.
+  '''
+  @staticmethod
+  def Remove():
+    if Scratch.directory:
+      shutil.rmtree(Scratch.directory, ignore_errors=True)
+      Scratch.inputs.pop(Scratch.directory, None)
+      Scratch.directory = None
+
+  '''
+  Get the path of the given output file.
+
+  @param fileName - The name of the output file.
+  @return The path in the scratch directory or the file name if there is no
+  scratch directory.
+  '''
+  @staticmethod
+  def Path(fileName):
+    if Scratch.directory:
+      return os.path.join(Scratch.directory, fileName)
+    return fileName
+
+  '''
+  Prepare a command for the execution in the scratch directory: the relative
+  paths of the executable and of the input files of the job (see Create()) are
+  converted into absolute paths. All other arguments are kept, so the output
+  files are written to the scratch directory even if a file with the same name
+  exists in the current directory.
+
+  @param cmd - The command (list of arguments).
+  @return The converted command.
+  '''
+  @staticmethod
+  def Command(cmd):
+    if not Scratch.directory:
+      return cmd
+
+    inputs = Scratch.inputs.get(Scratch.directory, set())
+    converted = [cmd[0]]
+    if os.sep in cmd[0] and not os.path.isabs(cmd[0]):
+      converted[0] = os.path.abspath(cmd[0])
+
+    for arg in cmd[1:]:
+      option, sep, value = arg.rpartition("=")
+      if (value and not os.path.isabs(value) and
+          os.path.normpath(value) in inputs):
+        arg = option + sep + os.path.abspath(value)
+      converted.append(arg)
+    return converted
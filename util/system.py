@@ -23,12 +23,62 @@ import collections
 import sys
 import shlex
 import subprocess
+import glob
+import re
+import hashlib
 
 '''
 This class implements functions the get system informations.
 '''
 class SystemInfo(object):
 
+  # Cached contents of the /proc and /sys files.
+  files = {}
+
+  # Cached host information (see GetHostInfo()).
+  hostInfo = None
+
+  # Host information keys which describe the hardware and software setup and
+  # are used to calculate the host fingerprint.
+  FINGERPRINT = ["cpu_model", "cpu_flags", "cpu_cores", "memory", "governor",
+      "turbo", "numa", "kernel", "blas", "numpy", "sklearn"]
+
+  '''
+  Read the given (/proc or /sys) file, every file is read only once.
+
+  @param path - The path of the file.
+  @return The content of the file or None if the file isn't readable.
+  '''
+  @staticmethod
+  def ReadFile(path):
+    if path not in SystemInfo.files:
+      try:
+        with open(path, "r") as fid:
+          SystemInfo.files[path] = fid.read()
+      except (IOError, OSError):
+        SystemInfo.files[path] = None
+    return SystemInfo.files[path]
+
+  '''
+  Parse the first processor entry of /proc/cpuinfo.
+
+  @return Dictionary with the cpuinfo fields.
+  '''
+  @staticmethod
+  def GetCPUInfo():
+    info = {}
+    content = SystemInfo.ReadFile("/proc/cpuinfo")
+    if content:
+      for line in content.split("\n"):
+        if not line.strip():
+          if info:
+            break
+          continue
+        key, sep, value = line.partition(":")
+        if sep:
+          info[key.strip()] = value.strip()
+    return info
+
   '''
   Get the available memory of this machine.
 
@@ -37,11 +87,12 @@ class SystemInfo(object):
   @staticmethod
   def GetMemory():
     if sys.platform.startswith("posix") or sys.platform.startswith("linux"):
-      cmd = "free -m"
-      s = subprocess.check_output(cmd, stderr=subprocess.STDOUT, shell=True)
+      content = SystemInfo.ReadFile("/proc/meminfo")
+      match = re.search(r"MemTotal:\s+(\d+)", content if content else "")
+      if not match:
+        return 'N/A'
 
-      mem = s.decode().split('\n')[1].split()[1]
-      return str(float(mem) / 1024) + ' GB'
+      return str(float(match.group(1)) / 1024 / 1024) + ' GB'
 
     elif sys.platform.startswith('darwin'):
       cmd = shlex.split("sysctl -n hw.memsize")
@@ -61,16 +112,10 @@ class SystemInfo(object):
   @staticmethod
   def GetCPUModel():
     if sys.platform.startswith('posix') or sys.platform.startswith('linux'):
-      cmd = 'cat /proc/cpuinfo'
-      s = subprocess.check_output(cmd, stderr=subprocess.STDOUT,
-          shell=True).strip()
-      for line in s.decode().split("\n"):
-        if "model name" in line:
-          modelName = re.sub( ".*model name.*:", "", line, 1)
-          return modelName
-        elif "Processor" in line:
-          modelName = re.sub( ".*Processor.*:", "", line, 1)
-          return modelName
+      info = SystemInfo.GetCPUInfo()
+      for key in ["model name", "Processor", "cpu model"]:
+        if key in info:
+          return info[key]
       return 'N/A'
 
     elif sys.platform.startswith('darwin'):
@@ -95,15 +140,13 @@ class SystemInfo(object):
   @staticmethod
   def GetDistribution():
     if sys.platform.startswith('posix') or sys.platform.startswith('linux'):
-      try:
-        osInfo = platform.linux_distribution()
-        if len(osInfo) != 0:
-          return osInfo[0] + ' ' + osInfo[1]
-
-      except:
-        osInfo = platform.dist()
-        if len(osInfo) != 0:
-          return osInfo[0] + ' ' + osInfo[1]
+      # platform.linux_distribution() was removed in Python 3.8.
+      content = SystemInfo.ReadFile("/etc/os-release")
+      if content:
+        match = re.search(r'^PRETTY_NAME="?([^"\n]*)"?', content, re.M)
+        if match:
+          return match.group(1)
+      return 'N/A'
 
     elif sys.platform.startswith('darwin'):
       osInfo = platform.mac_ver()
@@ -164,3 +207,165 @@ class SystemInfo(object):
   @staticmethod
   def GetPlatform():
     return platform.machine()
+
+  '''
+  Get the CPU flags (instruction set extensions) of this machine.
+
+  @return Space separated list of the CPU flags or 'N/A'.
+  '''
+  @staticmethod
+  def GetCPUFlags():
+    info = SystemInfo.GetCPUInfo()
+    # ARM uses 'Features' instead of 'flags'.
+    flags = info.get("flags", info.get("Features"))
+    return " ".join(sorted(flags.split())) if flags else 'N/A'
+
+  '''
+  Get the frequency scaling governor of the first CPU.
+
+  @return The governor (e.g. 'performance') or 'N/A'.
+  '''
+  @staticmethod
+  def GetGovernor():
+    governor = SystemInfo.ReadFile(
+        "/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor")
+    return governor.strip() if governor else 'N/A'
+
+  '''
+  Get the turbo (boost) state of this machine.
+
+  @return 'on', 'off' or 'N/A'.
+  '''
+  @staticmethod
+  def GetTurbo():
+    # The intel_pstate driver has an inverted setting.
+    noTurbo = SystemInfo.ReadFile("/sys/devices/system/cpu/intel_pstate/no_turbo")
+    if noTurbo:
+      return "off" if noTurbo.strip() == "1" else "on"
+
+    boost = SystemInfo.ReadFile("/sys/devices/system/cpu/cpufreq/boost")
+    if boost:
+      return "on" if boost.strip() == "1" else "off"
+    return 'N/A'
+
+  '''
+  Get the NUMA layout of this machine.
+
+  @return Dictionary with the CPU list (e.g. '0-7,16-23') of every NUMA node.
+  '''
+  @staticmethod
+  def GetNUMANodes():
+    nodes = {}
+    for path in glob.glob("/sys/devices/system/node/node[0-9]*/cpulist"):
+      cpus = SystemInfo.ReadFile(path)
+      if cpus is not None:
+        nodes[os.path.basename(os.path.dirname(path))] = cpus.strip()
+    return nodes
+
+  '''
+  Get the kernel release of this machine.
+
+  @return The kernel release.
+  '''
+  @staticmethod
+  def GetKernel():
+    return platform.release()
+
+  # Script which prints the BLAS library numpy is linked against. numpy >= 1.25
+  # exposes the build configuration as dictionary.
+  BLAS_SCRIPT = """
+import numpy as np
+config = getattr(np.__config__, "CONFIG", None)
+blas = (config or {}).get("Build Dependencies", {}).get("blas", {})
+if blas.get("name"):
+  print(blas["name"] + " " + str(blas.get("version", "")))
+else:
+  for name in ["blas_opt_info", "openblas_info", "blas_mkl_info"]:
+    info = getattr(np.__config__, name, None)
+    if info and info.get("libraries"):
+      print(",".join(info["libraries"]))
+      break
+"""
+
+  '''
+  Get the BLAS library numpy is linked against. numpy is imported in a
+  subprocess, so that the benchmark process doesn't load numpy and the BLAS
+  thread pools before the thread count is set.
+
+  @return The name of the BLAS library or 'N/A'.
+  '''
+  @staticmethod
+  def GetBLAS():
+    try:
+      output = subprocess.check_output([sys.executable, "-c",
+          SystemInfo.BLAS_SCRIPT], stderr=subprocess.DEVNULL, timeout=60)
+    except (subprocess.SubprocessError, OSError):
+      return 'N/A'
+    return output.decode("utf-8").strip() or 'N/A'
+
+  '''
+  Get the version of the given python package from the installed package
+  metadata, without importing the package.
+
+  @param name - The distribution name of the package (e.g. 'scikit-learn').
+  @return The version of the package or 'N/A' if it isn't installed.
+  '''
+  @staticmethod
+  def GetModuleVersion(name):
+    try:
+      from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+      return 'N/A'
+
+    try:
+      return version(name)
+    except PackageNotFoundError:
+      return 'N/A'
+
+  '''
+  Calculate the fingerprint of the given host information. Machines with the
+  same hardware and software setup have the same fingerprint.
+
+  @param info - The host information (see GetHostInfo()).
+  @return The fingerprint.
+  '''
+  @staticmethod
+  def Fingerprint(info):
+    values = [str(info.get(key, 'N/A')) if key != "numa" else
+        str(sorted(info.get(key, {}).items())) for key in
+        SystemInfo.FINGERPRINT]
+    return hashlib.sha1("\n".join(values).encode("utf-8")).hexdigest()[:12]
+
+  '''
+  Get the host name and the system information of this machine. The
+  information is collected only once.
+
+  @return Dictionary with the system information.
+  '''
+  @staticmethod
+  def GetHostInfo():
+    if SystemInfo.hostInfo:
+      return SystemInfo.hostInfo
+
+    info = {"host": platform.node()}
+    for key, function in [("cpu_model", SystemInfo.GetCPUModel),
+        ("distribution", SystemInfo.GetDistribution),
+        ("platform", SystemInfo.GetPlatform),
+        ("memory", SystemInfo.GetMemory),
+        ("cpu_cores", SystemInfo.GetCPUCores),
+        ("cpu_flags", SystemInfo.GetCPUFlags),
+        ("governor", SystemInfo.GetGovernor),
+        ("turbo", SystemInfo.GetTurbo),
+        ("numa", SystemInfo.GetNUMANodes),
+        ("kernel", SystemInfo.GetKernel),
+        ("blas", SystemInfo.GetBLAS),
+        ("numpy", lambda: SystemInfo.GetModuleVersion("numpy")),
+        ("sklearn", lambda: SystemInfo.GetModuleVersion("scikit-learn"))]:
+      try:
+        info[key] = function()
+      except Exception:
+        info[key] = "N/A"
+
+    info["fingerprint"] = SystemInfo.Fingerprint(info)
+    SystemInfo.hostInfo = info
+    return info
@@ -144,6 +144,13 @@ function loadScript( url, callback ) {
 <div class="col-lg-2">Platform: %(Platform)s</div>
 <div class="col-lg-2">Memory: %(Memory)s</div>
 <div class="col-lg-2">CPU Cores: %(CPUCores)s</div>
+</div>
+<div class="row">
+<div class="col-lg-3">Host: %(Host)s</div>
+<div class="col-lg-3">Kernel: %(Kernel)s</div>
+<div class="col-lg-2">Governor: %(Governor)s</div>
+<div class="col-lg-2">Turbo: %(Turbo)s</div>
+<div class="col-lg-2">BLAS: %(BLAS)s</div>
 </div></div>
 
 <div class="panel panel-default">
@@ -234,10 +241,17 @@ memoryPanelTemplate = """
 <div class="panel panel-default">
   <div class="panel-body">
     <center><a href="%(massifFilePath)s">%(massifFile)s - Profiler Output</a></center>
-  </div>
+  </div>%(memorySites)s
 </div>
 """
 
+memorySitesTemplate = """
+<table class="table table-striped">
+<thead><tr><th>Peak Allocation Site</th><th>Memory</th></tr></thead>
+<tbody>%(sites)s</tbody>
+</table>
+"""
+
 panelTemplate = """
 <div class="accordion-group">
 <div class="accordion-heading"><a class="accordion-toggle" data-toggle="collapse" data-parent="#accordion2" href="#%(nameID)s">%(name)s</a></div>
@@ -0,0 +1,135 @@
+'''
+  @file threads.py
+
+  Functions to control the number of threads used by the benchmarked libraries.
+'''
+
+import os
+import sys
+import inspect
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+
+'''
+This class implements functions to set the thread count for the different
+library families. The settings are passed through environment variables, so
+they are inherited by the method subprocesses.
+'''
+class Threads(object):
+
+  # Environment variable with the thread count of the current benchmark run.
+  THREADS_ENV = "BENCHMARK_THREADS"
+
+  # Environment variables read by OpenMP and the BLAS/LAPACK implementations
+  # (mlpack, shogun, ann, flann and the numpy based libraries).
+  THREAD_VARIABLES = ["OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS",
+      "MKL_NUM_THREADS", "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS"]
+
+  # The JVM (weka) reads additional options from this environment variable.
+  JAVA_OPTIONS = "JAVA_TOOL_OPTIONS"
+
+  # The original environment, used to restore the settings.
+  environment = {}
+
+  '''
+  Set the thread count for all library families. If threads is None the
+  original environment is restored and every library uses its default.
+
+  @param threads - The number of threads or None.
+  '''
+  @staticmethod
+  def Apply(threads):
+    Threads.Reset()
+    if threads is None:
+      return
+
+    variables = Threads.THREAD_VARIABLES + [Threads.THREADS_ENV,
+        Threads.JAVA_OPTIONS]
+    for variable in variables:
+      Threads.environment[variable] = os.environ.get(variable)
+
+    for variable in Threads.THREAD_VARIABLES + [Threads.THREADS_ENV]:
+      os.environ[variable] = str(threads)
+
+    javaOptions = os.environ.get(Threads.JAVA_OPTIONS, "")
+    os.environ[Threads.JAVA_OPTIONS] = (javaOptions +
+        " -XX:ActiveProcessorCount=" + str(threads)).strip()
+
+    Log.Info("Threads: " + str(threads))
+
+  '''
+  Restore the environment variables changed by Apply().
+  '''
+  @staticmethod
+  def Reset():
+    for variable, value in Threads.environment.items():
+      if value is None:
+        os.environ.pop(variable, None)
+      else:
+        os.environ[variable] = value
+    Threads.environment = {}
+
+  '''
+  Get the thread count of the current benchmark run. Use this value for the
+  library arguments (e.g. the scikit n_jobs parameter).
+
+  @param default - The value to return if the thread count isn't set.
+  @return The thread count.
+  '''
+  @staticmethod
+  def Count(default=1):
+    threads = os.environ.get(Threads.THREADS_ENV)
+    return int(threads) if threads else default
+
+  '''
+  Get the n_jobs argument of the given scikit estimator. Newer scikit versions
+  removed the n_jobs parameter of some estimators (e.g. KMeans since 1.0),
+  these estimators use the OpenMP threads (OMP_NUM_THREADS) instead.
+
+  @param estimator - The estimator class.
+  @return Dictionary with the n_jobs argument or an empty dictionary if the
+  estimator doesn't accept the parameter.
+  '''
+  @staticmethod
+  def JobsArgument(estimator):
+    import inspect
+
+    try:
+      parameters = inspect.signature(estimator).parameters
+    except (TypeError, ValueError):
+      return {}
+    return {"n_jobs": Threads.Count()} if "n_jobs" in parameters else {}
+
+  '''
+  Limit the thread pools of the BLAS libraries already loaded into the current
+  process. The environment variables are only read when the libraries are
+  loaded, so we have to use threadpoolctl for the in-process methods.
+  '''
+  @staticmethod
+  def LimitThreadPools():
+    threads = os.environ.get(Threads.THREADS_ENV)
+    if not threads:
+      return None
+
+    try:
+      from threadpoolctl import threadpool_limits
+    except ImportError:
+      return None
+
+    return threadpool_limits(limits=int(threads))
+
+  '''
+  Get the matlab command line flags for the current thread count.
+
+  @return The matlab flags.
+  '''
+  @staticmethod
+  def MatlabFlags():
+    return "-singleCompThread " if Threads.Count(0) == 1 else ""
@@ -18,8 +18,12 @@ if cmd_subfolder not in sys.path:
   sys.path.insert(0, cmd_subfolder)
 
 from log import *
+from containment import *
 
 import time
+import signal
+import pickle
+import tempfile
 from multiprocessing import Process, Queue
 
 '''
@@ -27,10 +31,20 @@ This class implements three functions to measure the time.
 '''
 class Timer(object):
 
+  # If set, the memory informations of the timed region are saved in this file
+  # (see Profiler.InProcessMemoryUsage).
+  memoryOutput = None
+
   '''
   Start the timer.
   '''
   def __enter__(self):
+    self.__tracker = None
+    if Timer.memoryOutput:
+      from profiler import MemoryTracker
+      self.__tracker = MemoryTracker()
+      self.__tracker.Start()
+
     self.__start = time.time()
 
   '''
@@ -39,29 +53,147 @@ class Timer(object):
   def __exit__(self, type, value, traceback):
     self.__finish = time.time()
 
+    if self.__tracker:
+      self.__tracker.Stop(Timer.memoryOutput)
+
   '''
   Return the elapsed time of the timer.
   '''
   def ElapsedTime(self):
     return self.__finish - self.__start
 
+'''
+This class passes the results of the timeout subprocess (e.g. the predictions
+of the timing run) back to the caller through a temporary file, so the
+metrics don't have to train the model again. The trained model is only passed
+if the 'keepModels' setting of the general block is set:
+
+  keepModels: true
+'''
+class Results(object):
+
+  # Pass the trained model (pickled) with the other results.
+  models = False
+
+  '''
+  Create the empty result channel.
+  '''
+  def __init__(self):
+    self.path = None
+    self.values = {}
+
+  '''
+  Store the given results, called in the timeout subprocess.
+
+  @param values - The results, e.g. predictions=..., model=...
+  '''
+  def Put(self, **values):
+    if not self.path:
+      return
+
+    if not Results.models:
+      values.pop("model", None)
+
+    try:
+      data = pickle.dumps(values, pickle.HIGHEST_PROTOCOL)
+    except Exception:
+      # Some models can't be pickled, pass the other results.
+      values.pop("model", None)
+      data = pickle.dumps(values, pickle.HIGHEST_PROTOCOL)
+
+    with open(self.path, "wb") as fid:
+      fid.write(data)
+
+  '''
+  Get a result of the last run.
+
+  @param name - The name of the result.
+  @param default - The value if the result isn't available.
+  @return The result or the default value.
+  '''
+  def Get(self, name, default=None):
+    return self.values.get(name, default)
+
+  '''
+  Prepare the channel for a new run, the results of the last run are dropped.
+  '''
+  def Open(self):
+    self.values = {}
+    fd, self.path = tempfile.mkstemp(suffix=".pkl")
+    os.close(fd)
+
+  '''
+  Read the results of the subprocess and remove the temporary file.
+
+  @param success - Read the results if True, otherwise just clean up.
+  '''
+  def Close(self, success):
+    try:
+      if success and os.path.getsize(self.path) > 0:
+        with open(self.path, "rb") as fid:
+          self.values = pickle.load(fid)
+    except Exception as e:
+      Log.Warn("Could not read the results: " + str(e))
+    finally:
+      os.remove(self.path)
+      self.path = None
+
+'''
+Run the given function in the timeout subprocess. The thread pools of the
+libraries loaded in the subprocess are limited to the thread count of the
+current benchmark run. The subprocess starts a new process group, so the
+whole process tree can be killed on timeout, and the memory limit is applied
+to the subprocess.
+
+@param fun - The function to run.
+@param q - The queue to pass the return value.
+'''
+def RunLimited(fun, q):
+  from threads import Threads
+  ProcessGroup.Detach()
+  MemoryLimit.Apply()
+  Threads.LimitThreadPools()
+  try:
+    fun(q)
+  except MemoryError:
+    sys.exit(MemoryLimit.EXIT_CODE)
+
 '''
 This function implements a timeout for a function call.
 
 @param fun - Start the process with the given function.
 @param timeout - The time until the timeout. Default 9000 seconds.
+@param results - Optional Results channel which is filled by the function.
 @return The return value of the process.
 '''
-def timeout(fun, timeout=9000):
+def timeout(fun, timeout=9000, results=None):
+  if results:
+    results.Open()
+
+  # Wait for the processes of a killed run.
+  ProcessGroup.Settle()
+
   q = Queue()
-  p = Process(target=fun, args=(q,))
+  p = Process(target=RunLimited, args=(fun, q))
   p.start()
-  p.join(timeout)
+  monitor = MemoryLimit.Start(p.pid)
+  try:
+    p.join(timeout)
+  except BaseException:
+    ProcessGroup.Kill(p.pid)
+    MemoryLimit.Stop(monitor, False)
+    if results:
+      results.Close(False)
+    raise
 
   if p.is_alive():
-    # Terminate the process.
-    p.terminate()
+    # Kill the process tree.
+    ProcessGroup.Kill(p.pid)
     p.join()
+    MemoryLimit.Stop(monitor, False)
+
+    if results:
+      results.Close(False)
 
     Log.Warn("Script timed out after " + str(timeout) + " seconds")
     return -2
@@ -70,4 +202,12 @@ def timeout(fun, timeout=9000):
       r = q.get(timeout=3)
     except Exception as e:
       r = -1
+
+    # Kill the processes left by the function.
+    ProcessGroup.Kill(p.pid)
+    MemoryLimit.Stop(monitor, r == -1, p.exitcode == -signal.SIGKILL,
+        p.exitcode == MemoryLimit.EXIT_CODE)
+
+    if results:
+      results.Close(r != -1)
     return r
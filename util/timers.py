@@ -0,0 +1,172 @@
+'''
+  @file timers.py
+
+  Functions to run the method executables and to extract the named timers
+  ('name: 1.234s') from their output.
+'''
+
+import os
+import sys
+import inspect
+import re
+import collections
+import subprocess
+import threading
+import signal
+
+# Import the util path, this method even works if the path contains symlinks to
+# modules.
+cmd_subfolder = os.path.realpath(os.path.abspath(os.path.join(
+  os.path.split(inspect.getfile(inspect.currentframe()))[0], "")))
+if cmd_subfolder not in sys.path:
+  sys.path.insert(0, cmd_subfolder)
+
+from log import *
+from containment import *
+
+'''
+This class implements the structured timer protocol. Every method executable
+prints its timers as 'name: <seconds>s' lines (e.g. the mlpack timers or the
+Timers.java class of the weka methods). The output is streamed line by line,
+so verbose outputs are never held in memory.
+
+The wrappers declare the phases of the measured time with a list of timer
+names; names with a '-' prefix are subtracted, e.g.:
+
+  timerPhases = ["total_time", "-loading_data", "-saving_data"]
+'''
+class Timers(object):
+
+  # A timer line, mlpack prefixes the lines with the log level and some
+  # libraries print a decimal comma.
+  PATTERN = re.compile(r"(?:^|[\s\]])([A-Za-z_][\w.]*): ([-+]?\d+(?:[.,]\d+)?" +
+      r"(?:[eE][-+]?\d+)?)s(?:\s|$)")
+
+  '''
+  Parse the timer of the given line.
+
+  @param line - The output line (string or bytes).
+  @param timers - Dictionary to add the timer to.
+  @return The updated timers.
+  '''
+  @staticmethod
+  def ParseLine(line, timers):
+    if isinstance(line, bytes):
+      line = line.decode("utf-8", "replace")
+
+    for name, value in Timers.PATTERN.findall(line):
+      timers[name] = float(value.replace(",", "."))
+    return timers
+
+  '''
+  Parse all timers of the given output.
+
+  @param data - The output (string or bytes).
+  @return Ordered dictionary with the timers in seconds.
+  '''
+  @staticmethod
+  def Parse(data):
+    timers = collections.OrderedDict()
+    for line in data.splitlines():
+      Timers.ParseLine(line, timers)
+    return timers
+
+  '''
+  Run the given command and parse the timers of its output. Like
+  subprocess.check_output(), the function raises subprocess.TimeoutExpired if
+  the command doesn't finish in time and subprocess.CalledProcessError if the
+  command fails. The command runs in its own process group, the whole process
+  tree is killed on timeout and the processes left by the command are killed
+  when it finishes. The memory limit (see MemoryLimit) is applied to the
+  command.
+
+  @param cmd - The command (list of arguments).
+  @param timeout - The timeout in seconds (0 or None for no timeout).
+  @param cwd - The working directory of the command (None for the current
+  directory).
+  @return Ordered dictionary with the timers in seconds.
+  '''
+  @staticmethod
+  def Run(cmd, timeout=None, cwd=None):
+    timers = collections.OrderedDict()
+
+    # Wait for the processes of a killed run.
+    ProcessGroup.Settle()
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT, shell=False, cwd=cwd, start_new_session=True,
+        preexec_fn=MemoryLimit.Apply if MemoryLimit.limit else None)
+    monitor = MemoryLimit.Start(process.pid)
+    marker = False
+
+    # Kill the process if the timeout expired, the output is read in this
+    # thread.
+    expired = threading.Event()
+    def Kill():
+      expired.set()
+      ProcessGroup.Kill(process.pid)
+
+    watchdog = threading.Timer(timeout, Kill) if timeout else None
+    if watchdog:
+      watchdog.daemon = True
+      watchdog.start()
+
+    try:
+      for line in process.stdout:
+        Timers.ParseLine(line, timers)
+        if monitor and not marker:
+          marker = MemoryLimit.Marker(line)
+      process.wait()
+    finally:
+      if watchdog:
+        watchdog.cancel()
+      process.stdout.close()
+
+      # Kill the process tree, or the processes left by the command.
+      ProcessGroup.Kill(process.pid)
+      process.wait()
+      MemoryLimit.Stop(monitor, process.returncode != 0 and not
+          expired.is_set(), process.returncode == -signal.SIGKILL, marker)
+
+    if expired.is_set():
+      raise subprocess.TimeoutExpired(cmd, timeout)
+    if process.returncode != 0:
+      raise subprocess.CalledProcessError(process.returncode, cmd)
+    return timers
+
+  '''
+  Calculate the measured time of the given timers.
+
+  @param timers - Dictionary with the timers.
+  @param phases - List of the timer names which are part of the measured time,
+  names with a '-' prefix are subtracted.
+  @return The measured time in seconds or None if a timer is missing.
+  '''
+  @staticmethod
+  def Total(timers, phases):
+    time = 0
+    for phase in phases:
+      name = phase.lstrip("-")
+      if name not in timers:
+        Log.Fatal("Can't parse the timer: " + name)
+        return None
+      time += -timers[name] if phase.startswith("-") else timers[name]
+    return time
+
+  '''
+  Average the timers of several trials.
+
+  @param trials - List of timer dictionaries.
+  @return Ordered dictionary with the mean of every timer.
+  '''
+  @staticmethod
+  def Mean(trials):
+    timers = collections.OrderedDict()
+    counts = {}
+    for trial in trials:
+      for name, value in trial.items():
+        timers[name] = timers.get(name, 0) + value
+        counts[name] = counts.get(name, 0) + 1
+
+    for name in timers:
+      timers[name] = timers[name] / counts[name]
+    return timers